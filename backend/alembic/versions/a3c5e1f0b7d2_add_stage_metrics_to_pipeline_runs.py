@@ -0,0 +1,26 @@
+"""add_stage_metrics_to_pipeline_runs
+
+Revision ID: a3c5e1f0b7d2
+Revises: 5827486fadda
+Create Date: 2026-10-17 09:12:40.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c5e1f0b7d2'
+down_revision: Union[str, None] = '5827486fadda'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('pipeline_runs', sa.Column('stage_metrics', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('pipeline_runs', 'stage_metrics')
@@ -0,0 +1,49 @@
+"""add_backfill_checkpoints
+
+Revision ID: a5c3e9b7d1f8
+Revises: f3a9c7e1b5d4
+Create Date: 2026-10-17 20:05:37.614209
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5c3e9b7d1f8'
+down_revision: Union[str, None] = 'f3a9c7e1b5d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'backfill_checkpoints',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('source', sa.String(length=50), nullable=False),
+        sa.Column('query', sa.String(length=255), nullable=False),
+        sa.Column('slice_key', sa.String(length=100), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('page', sa.Integer(), nullable=False),
+        sa.Column('cursor', sa.String(length=100), nullable=True),
+        sa.Column('page_offset', sa.Integer(), nullable=False),
+        sa.Column('items_fetched', sa.Integer(), nullable=False),
+        sa.Column('records_stored', sa.Integer(), nullable=False),
+        sa.Column('records_updated', sa.Integer(), nullable=False),
+        sa.Column('records_failed', sa.Integer(), nullable=False),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('source', 'query', 'slice_key', name='uq_backfill_checkpoints_slice')
+    )
+    op.create_index(op.f('ix_backfill_checkpoints_id'), 'backfill_checkpoints', ['id'], unique=False)
+    op.create_index(op.f('ix_backfill_checkpoints_source'), 'backfill_checkpoints', ['source'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_backfill_checkpoints_source'), table_name='backfill_checkpoints')
+    op.drop_index(op.f('ix_backfill_checkpoints_id'), table_name='backfill_checkpoints')
+    op.drop_table('backfill_checkpoints')
@@ -0,0 +1,33 @@
+"""add_keyword_document_frequencies
+
+Revision ID: b6d2f4a8c1e9
+Revises: a3c5e1f0b7d2
+Create Date: 2026-10-17 11:04:52.517093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d2f4a8c1e9'
+down_revision: Union[str, None] = 'a3c5e1f0b7d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('keyword_document_frequencies',
+    sa.Column('term_hash', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('document_count', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('term_hash')
+    )
+    op.add_column('keywords', sa.Column('idf', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('keywords', 'idf')
+    op.drop_table('keyword_document_frequencies')
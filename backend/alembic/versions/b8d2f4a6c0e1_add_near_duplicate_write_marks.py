@@ -0,0 +1,33 @@
+"""add_near_duplicate_write_marks
+
+Revision ID: b8d2f4a6c0e1
+Revises: a5c3e9b7d1f8
+Create Date: 2026-10-18 09:12:06.482715
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d2f4a6c0e1'
+down_revision: Union[str, None] = 'a5c3e9b7d1f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'reddit_posts',
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True)
+    )
+    for table in ('articles', 'reddit_posts'):
+        op.create_index(op.f(f'ix_{table}_updated_at'), table, ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    for table in ('reddit_posts', 'articles'):
+        op.drop_index(op.f(f'ix_{table}_updated_at'), table_name=table)
+    op.drop_column('reddit_posts', 'updated_at')
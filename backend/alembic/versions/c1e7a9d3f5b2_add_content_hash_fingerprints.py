@@ -0,0 +1,31 @@
+"""add_content_hash_fingerprints
+
+Revision ID: c1e7a9d3f5b2
+Revises: b6d2f4a8c1e9
+Create Date: 2026-10-17 13:27:08.640215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c1e7a9d3f5b2'
+down_revision: Union[str, None] = 'b6d2f4a8c1e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows keep a NULL hash and are fingerprinted on their next fetch
+    op.add_column('reddit_posts', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column('articles', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column('pipeline_runs', sa.Column('enrichment_skipped', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('pipeline_runs', 'enrichment_skipped')
+    op.drop_column('articles', 'content_hash')
+    op.drop_column('reddit_posts', 'content_hash')
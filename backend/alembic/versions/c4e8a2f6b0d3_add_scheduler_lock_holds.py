@@ -0,0 +1,32 @@
+"""add_scheduler_lock_holds
+
+Revision ID: c4e8a2f6b0d3
+Revises: b8d2f4a6c0e1
+Create Date: 2026-10-19 10:04:51.217034
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a2f6b0d3'
+down_revision: Union[str, None] = 'b8d2f4a6c0e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'scheduler_lock_holds',
+        sa.Column('job_id', sa.String(length=200), nullable=False),
+        sa.Column('holder', sa.String(length=200), nullable=False),
+        sa.Column('held_until', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('job_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('scheduler_lock_holds')
@@ -0,0 +1,32 @@
+"""add_near_duplicate_signatures
+
+Revision ID: d4a8f2c6e0b3
+Revises: c1e7a9d3f5b2
+Create Date: 2026-10-17 15:02:44.318907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a8f2c6e0b3'
+down_revision: Union[str, None] = 'c1e7a9d3f5b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ('articles', 'reddit_posts'):
+        op.add_column(table, sa.Column('minhash', sa.LargeBinary(), nullable=True))
+        op.add_column(table, sa.Column('duplicate_of', sa.String(), nullable=True))
+        op.create_index(op.f(f'ix_{table}_duplicate_of'), table, ['duplicate_of'], unique=False)
+
+
+def downgrade() -> None:
+    for table in ('reddit_posts', 'articles'):
+        op.drop_index(op.f(f'ix_{table}_duplicate_of'), table_name=table)
+        op.drop_column(table, 'duplicate_of')
+        op.drop_column(table, 'minhash')
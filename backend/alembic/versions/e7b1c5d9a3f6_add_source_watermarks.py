@@ -0,0 +1,40 @@
+"""add_source_watermarks
+
+Revision ID: e7b1c5d9a3f6
+Revises: d4a8f2c6e0b3
+Create Date: 2026-10-17 16:11:05.527341
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b1c5d9a3f6'
+down_revision: Union[str, None] = 'd4a8f2c6e0b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'source_watermarks',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('source', sa.String(length=50), nullable=False),
+        sa.Column('key', sa.String(length=200), nullable=False),
+        sa.Column('last_seen_at', sa.DateTime(), nullable=True),
+        sa.Column('last_seen_ids', sa.JSON(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('source', 'key', name='uq_source_watermarks_source_key')
+    )
+    op.create_index(op.f('ix_source_watermarks_id'), 'source_watermarks', ['id'], unique=False)
+    op.create_index(op.f('ix_source_watermarks_source'), 'source_watermarks', ['source'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_source_watermarks_source'), table_name='source_watermarks')
+    op.drop_index(op.f('ix_source_watermarks_id'), table_name='source_watermarks')
+    op.drop_table('source_watermarks')
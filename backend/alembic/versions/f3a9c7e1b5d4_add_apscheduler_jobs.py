@@ -0,0 +1,35 @@
+"""add_apscheduler_jobs
+
+Revision ID: f3a9c7e1b5d4
+Revises: e7b1c5d9a3f6
+Create Date: 2026-10-17 18:42:13.208716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a9c7e1b5d4'
+down_revision: Union[str, None] = 'e7b1c5d9a3f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Layout of APScheduler's SQLAlchemyJobStore table
+    op.create_table(
+        'apscheduler_jobs',
+        sa.Column('id', sa.Unicode(length=191), nullable=False),
+        sa.Column('next_run_time', sa.Float(precision=25), nullable=True),
+        sa.Column('job_state', sa.LargeBinary(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_apscheduler_jobs_next_run_time'), 'apscheduler_jobs', ['next_run_time'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_apscheduler_jobs_next_run_time'), table_name='apscheduler_jobs')
+    op.drop_table('apscheduler_jobs')
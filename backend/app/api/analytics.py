@@ -8,7 +8,7 @@ from sqlalchemy import func, cast, Date
 from datetime import datetime, timedelta
 from app.db import get_db
 from app.models.reddit_post import RedditPost
-from app.services.cache_service import cached
+from app.services.cache_service import cache_service, cached
 from app.core.config import settings
 import logging
 
@@ -17,7 +17,11 @@ router = APIRouter()
 
 
 @router.get("/overview")
-@cached(prefix="analytics_overview", ttl=settings.CACHE_ANALYTICS_TTL)
+@cached(
+    prefix="analytics_overview",
+    ttl=settings.CACHE_ANALYTICS_TTL + settings.CACHE_STALE_TTL,
+    soft_ttl=settings.CACHE_ANALYTICS_TTL
+)
 async def get_analytics_overview(
     days: int = 30,
     db: Session = Depends(get_db)
@@ -169,3 +173,7 @@ async def get_analytics_overview(
     except Exception as e:
         logger.error(f"Error fetching analytics overview: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+# The dashboard's default view is recomputed after each pipeline run
+cache_service.register_refresher("analytics_overview", get_analytics_overview.refresh)
@@ -5,7 +5,7 @@ Handles CRUD operations for articles from all data sources
 from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, and_, desc, asc, func
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from datetime import datetime
 from app.db import get_db
 from app.models.article import Article
@@ -16,10 +16,14 @@ from app.schemas.article import (
     ArticleCreate
 )
 from app.services.news_service import NewsAPIService
-from app.services.sentiment_service import SentimentService
-from app.services.ner_service import get_ner_service
-from app.services.keyword_service import get_keyword_service
+from app.services.payload_archive import ReplaySource
+from app.services.ingestion_engine import IngestionEngine
+from app.services.watermark_service import load_source_watermarks, save_source_watermarks
+from app.services.ingestion_service import extract_article_entities, extract_article_keywords
+from app.services.pipeline_registry import Pipeline, PipelineContext, Stage, register_pipeline, run_pipeline
+from app.services.cache_service import cache_service
 from app.core.config import settings
+from app.core.executor import run_blocking
 import logging
 
 logger = logging.getLogger(__name__)
@@ -152,19 +156,25 @@ async def sync_news_articles(
     query: Optional[str] = Query(None, description="Search query (e.g., 'hasbro')"),
     sources: Optional[str] = Query(None, description="Comma-separated source IDs"),
     page_size: int = Query(20, ge=1, le=100, description="Number of articles to fetch"),
+    replay: bool = Query(False, description="Re-ingest archived payloads instead of calling NewsAPI"),
+    replay_from: Optional[str] = Query(None, description="First archive day to replay (YYYY-MM-DD)"),
+    replay_to: Optional[str] = Query(None, description="Last archive day to replay (YYYY-MM-DD)"),
+    reprocess: bool = Query(False, description="Re-run sentiment, NER and keywords on unchanged articles too"),
     db: Session = Depends(get_db)
 ):
     """
     Trigger manual sync of news articles from NewsAPI
 
     This endpoint fetches the latest news articles and stores them in the database.
-    The operation runs in the background to avoid blocking.
+    The operation runs in the background to avoid blocking. With ``replay``
+    the articles come from the payload archive and NewsAPI is not contacted;
+    add ``reprocess`` to re-score and re-enrich articles already stored.
 
     Categories: business, entertainment, general, health, science, sports, technology
     """
     try:
         # Validate NEWS_API_KEY exists
-        if not hasattr(settings, 'NEWS_API_KEY') or not settings.NEWS_API_KEY:
+        if not replay and not settings.NEWS_API_KEY:
             raise HTTPException(
                 status_code=500,
                 detail="NEWS_API_KEY not configured. Please add it to environment variables."
@@ -176,7 +186,12 @@ async def sync_news_articles(
             category=category,
             query=query,
             sources=sources,
-            page_size=page_size
+            page_size=page_size,
+            trigger_type="manual",
+            replay=replay,
+            replay_from=replay_from,
+            replay_to=replay_to,
+            reprocess=reprocess
         )
 
         return {
@@ -198,164 +213,147 @@ async def _sync_news_articles(
     category: Optional[str] = None,
     query: Optional[str] = None,
     sources: Optional[str] = None,
-    page_size: int = 20
+    page_size: int = 20,
+    trigger_type: str = "scheduled",
+    replay: bool = False,
+    replay_from: Optional[str] = None,
+    replay_to: Optional[str] = None,
+    reprocess: bool = False
 ):
     """
     Background task to fetch and store news articles
 
+    Runs the registered "news_pipeline" DAG: the staged IngestionEngine
+    fetches, scores and stores articles, then NER and keyword extraction run
+    in parallel on the stored articles. The run is recorded as a
+    "news_pipeline" PipelineRun. In replay mode the engine reads the payload
+    archive instead of NewsAPI.
+
     Args:
         category: News category filter
         query: Search query (e.g., 'hasbro')
         sources: Source IDs filter
         page_size: Number of articles to fetch
+        trigger_type: How the sync was triggered (manual, scheduled, api)
+        replay: Re-ingest archived payloads instead of fetching
+        replay_from: First archive day to replay (YYYY-MM-DD)
+        replay_to: Last archive day to replay (YYYY-MM-DD)
+        reprocess: Re-run sentiment, NER and keywords on unchanged articles too
     """
-    from app.db import get_session_local
-
-    SessionLocal = get_session_local()
-    db = SessionLocal()
+    await run_pipeline(
+        "news_pipeline",
+        trigger_type=trigger_type,
+        category=category,
+        query=query,
+        sources=sources,
+        page_size=page_size,
+        replay=replay,
+        replay_from=replay_from,
+        replay_to=replay_to,
+        reprocess=reprocess
+    )
+
+
+def _news_request(
+    category: Optional[str] = None,
+    query: Optional[str] = None,
+    sources: Optional[str] = None,
+    page_size: int = 20,
+    **kwargs
+) -> Dict[str, Any]:
+    """NewsAPIService fetch request for the sync parameters"""
+    # Use 'everything' endpoint if query is provided, otherwise 'top-headlines'
+    if query:
+        return {
+            "query": query, "page_size": page_size, "endpoint": "everything",
+            "watermark_key": f"everything:{query}",
+        }
+    return {
+        "category": category, "sources": sources, "page_size": page_size, "endpoint": "top-headlines",
+        "watermark_key": f"top-headlines:{category or ''}:{sources or ''}",
+    }
 
-    try:
-        logger.info(f"Starting news sync: category={category}, query={query}, sources={sources}, page_size={page_size}")
-
-        # Initialize News API service
-        news_service = NewsAPIService(api_key=settings.NEWS_API_KEY)
-
-        # Fetch articles - use 'everything' endpoint if query is provided, otherwise 'top-headlines'
-        if query:
-            # Use search endpoint for query-based searches
-            articles = await news_service.fetch_and_transform(
-                query=query,
-                page_size=page_size,
-                endpoint='everything'
-            )
-        else:
-            # Use top-headlines endpoint for category-based fetching
-            articles = await news_service.fetch_and_transform(
-                category=category,
-                sources=sources,
-                page_size=page_size,
-                endpoint='top-headlines'
-            )
 
-        logger.info(f"Fetched {len(articles)} articles from News API")
-
-        # Store articles with sentiment analysis
-        stored_count = 0
-        updated_count = 0
-        failed_count = 0
-
-        for article_data in articles:
-            try:
-                # Perform sentiment analysis on title + content
-                text_to_analyze = f"{article_data.get('title', '')} {article_data.get('content', '')}"
-                sentiment_score, sentiment_label = SentimentService.analyze_text(text_to_analyze)
-
-                # Check if article already exists
-                existing_article = db.query(Article).filter(
-                    Article.external_id == article_data['id']
-                ).first()
-
-                if existing_article:
-                    # Update existing article
-                    for key, value in article_data.items():
-                        if hasattr(existing_article, key):
-                            setattr(existing_article, key, value)
-
-                    # Update sentiment
-                    if sentiment_score is not None:
-                        existing_article.sentiment_score = sentiment_score
-                        existing_article.sentiment_label = sentiment_label
-                        existing_article.sentiment_analyzed_at = datetime.utcnow()
-
-                    updated_count += 1
-                else:
-                    # Create new article
-                    new_article = Article(
-                        external_id=article_data['id'],
-                        source_type=article_data['source_type'],
-                        source_name=article_data['source_name'],
-                        title=article_data['title'],
-                        content=article_data.get('content'),
-                        summary=article_data.get('summary'),
-                        url=article_data.get('url'),
-                        image_url=article_data.get('image_url'),
-                        author=article_data.get('author'),
-                        published_at=article_data['published_at'],
-                        sentiment_score=sentiment_score,
-                        sentiment_label=sentiment_label,
-                        sentiment_analyzed_at=datetime.utcnow() if sentiment_score else None,
-                        source_metadata=article_data.get('source_metadata')
-                    )
-
-                    db.add(new_article)
-                    stored_count += 1
-
-            except Exception as article_error:
-                logger.error(f"Error processing article: {str(article_error)}")
-                failed_count += 1
-
-        db.commit()
-
-        logger.info(
-            f"News sync completed. Stored: {stored_count}, Updated: {updated_count}, Failed: {failed_count}"
-        )
+def _run_extractor(extract, batches: List[Dict[str, Any]]) -> int:
+    """Run an article extractor over stored batches with a session owned by the executor thread"""
+    from app.db import get_session_local
 
-        # Extract entities for newly stored articles
-        if stored_count > 0:
-            try:
-                logger.info(f"Starting NER processing for {stored_count} new articles")
-                ner_service = get_ner_service()
-
-                # Get all newly created articles from this batch
-                for article_data in articles:
-                    if article_data['id']:  # Only process if we have the article ID
-                        article = db.query(Article).filter(
-                            Article.external_id == article_data['id']
-                        ).first()
-
-                        if article:
-                            try:
-                                entities = ner_service.process_article(article.id, db)
-                                logger.debug(f"Extracted {len(entities)} entities from article {article.id}")
-                            except Exception as ner_error:
-                                logger.error(f"NER processing failed for article {article.id}: {ner_error}")
-
-                logger.info("NER processing completed for new articles")
-            except Exception as ner_batch_error:
-                logger.error(f"NER batch processing failed: {ner_batch_error}")
-
-        # Extract keywords for newly stored articles
-        if stored_count > 0:
-            try:
-                logger.info(f"Starting keyword extraction for {stored_count} new articles")
-                keyword_service = get_keyword_service()
-
-                # Get all newly created articles from this batch
-                for article_data in articles:
-                    if article_data['id']:  # Only process if we have the article ID
-                        article = db.query(Article).filter(
-                            Article.external_id == article_data['id']
-                        ).first()
-
-                        if article:
-                            try:
-                                keywords = keyword_service.process_article(article.id, db)
-                                logger.debug(f"Extracted {len(keywords)} keywords from article {article.id}")
-                            except Exception as keyword_error:
-                                logger.error(f"Keyword extraction failed for article {article.id}: {keyword_error}")
-
-                logger.info("Keyword extraction completed for new articles")
-            except Exception as keyword_batch_error:
-                logger.error(f"Keyword batch processing failed: {keyword_batch_error}")
+    articles = [article for batch in batches for article in batch["articles"]]
+    id_map = {key: value for batch in batches for key, value in batch["id_map"].items()}
 
-    except Exception as e:
-        logger.error(f"News sync failed: {str(e)}")
-        db.rollback()
-        raise
+    db = get_session_local()()
+    try:
+        return extract(db, articles, id_map)
     finally:
         db.close()
 
 
+async def _ingest_stage(context: PipelineContext) -> Dict[str, Any]:
+    logger.info(f"Starting news sync: {context.params}")
+    params = context.params
+
+    news_service = NewsAPIService(api_key=settings.NEWS_API_KEY)
+    if params.get("replay"):
+        source = ReplaySource(news_service, "news", params.get("replay_from"), params.get("replay_to"))
+    else:
+        source = news_service
+        if settings.INCREMENTAL_FETCH_ENABLED:
+            news_service.watermarks = await run_blocking(load_source_watermarks, "news")
+
+    # Enrichment runs as the separate ner/keywords stages
+    engine = IngestionEngine(source, enrich=False, reprocess=bool(params.get("reprocess")))
+    result = await engine.run([_news_request(**context.params)])
+
+    context.stage_details["ingest"] = result["stages"]
+    context.add_counts({
+        key: result[key] for key in ("stored", "updated", "failed", "skipped_enrichment", "near_duplicates")
+    })
+    return {"batches": engine.to_enrich, "watermarks": None if params.get("replay") else news_service.watermarks}
+
+
+async def _ner_stage(context: PipelineContext) -> int:
+    entities = await run_blocking(_run_extractor, extract_article_entities, context.results["ingest"]["batches"])
+    context.add_counts({"entities": entities})
+    return entities
+
+
+async def _keywords_stage(context: PipelineContext) -> int:
+    keywords = await run_blocking(_run_extractor, extract_article_keywords, context.results["ingest"]["batches"])
+    context.add_counts({"keywords": keywords})
+    return keywords
+
+
+async def _watermark_stage(context: PipelineContext):
+    # Advance high-water marks only once every fetched article is stored
+    watermarks = context.results["ingest"]["watermarks"]
+    if settings.INCREMENTAL_FETCH_ENABLED and watermarks is not None and context.counts.get("failed", 0) == 0:
+        await run_blocking(save_source_watermarks, "news", watermarks)
+
+
+async def _cache_refresh_stage(context: PipelineContext):
+    # After enrichment, so refreshed entries include the new entities and keywords
+    logger.info("Refreshing article cache after pipeline execution...")
+    for pattern in ("cache:articles_*", "cache:news_*"):
+        await cache_service.arefresh_pattern(pattern)
+    logger.info("Article cache refreshed successfully")
+
+
+register_pipeline(Pipeline(
+    "news_pipeline",
+    [
+        # Fetch, dedupe, sentiment and persist stream through the ingestion
+        # engine's own queues; pages already retry per request, so a failed
+        # ingest isn't re-run here
+        Stage("ingest", _ingest_stage, retries=0),
+        Stage("ner", _ner_stage, depends_on=("ingest",)),
+        Stage("keywords", _keywords_stage, depends_on=("ingest",)),
+        Stage("watermarks", _watermark_stage, depends_on=("ingest",)),
+        Stage("cache_refresh", _cache_refresh_stage, depends_on=("ner", "keywords")),
+    ],
+    description="NewsAPI articles with sentiment, NER and keywords"
+))
+
+
 @router.get("/stats/sources")
 async def get_source_stats(db: Session = Depends(get_db)):
     """
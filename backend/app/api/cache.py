@@ -18,7 +18,7 @@ async def get_cache_stats():
         Cache statistics including hit rate, memory usage, and key count
     """
     try:
-        stats = cache_service.get_stats()
+        stats = await cache_service.aget_stats()
         return stats
     except Exception as e:
         logger.error(f"Error fetching cache stats: {str(e)}")
@@ -34,7 +34,7 @@ async def clear_cache():
         Success status
     """
     try:
-        success = cache_service.clear_all()
+        success = await cache_service.aclear_all()
         if success:
             return {
                 "status": "success",
@@ -55,6 +55,8 @@ async def delete_cache_pattern(pattern: str):
     """
     Delete cache entries matching a pattern
 
+    Resolved through the prefixes' tag sets, without scanning Redis keys.
+
     Args:
         pattern: Pattern to match (e.g., "reddit", "stats", "analytics")
 
@@ -64,7 +66,7 @@ async def delete_cache_pattern(pattern: str):
     try:
         # Convert simple pattern to Redis pattern
         redis_pattern = f"cache:{pattern}_*"
-        deleted = cache_service.delete_pattern(redis_pattern)
+        deleted = await cache_service.adelete_pattern(redis_pattern)
 
         return {
             "status": "success",
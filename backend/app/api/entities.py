@@ -118,6 +118,7 @@ async def get_trending_entities(
         description="Time window for trending calculation (24h, 7d, 30d)"
     ),
     limit: int = Query(20, ge=1, le=100, description="Number of trending entities to return"),
+    unique_stories: bool = Query(True, description="Count syndicated copies of a story once"),
     db: Session = Depends(get_db)
 ):
     """
@@ -139,7 +140,7 @@ async def get_trending_entities(
             )
 
         ner_service = get_ner_service()
-        trending = ner_service.get_trending_entities(db, time_window, limit)
+        trending = ner_service.get_trending_entities(db, time_window, limit, unique_stories)
 
         return EntityTrendingResponse(
             trending=[EntityTrending(**item) for item in trending],
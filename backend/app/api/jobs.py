@@ -17,7 +17,7 @@ from app.schemas.pipeline_run import (
     PipelineMetrics
 )
 from app.services.scheduler_service import scheduler_service
-from app.api.pipeline import _execute_pipeline
+from app.services.pipeline_registry import PipelineError, get_pipeline, list_pipelines, run_pipeline
 import logging
 
 logger = logging.getLogger(__name__)
@@ -30,16 +30,27 @@ async def get_scheduler_status():
     Get current scheduler status and all scheduled jobs
 
     Returns:
-        Scheduler status with list of jobs
+        Scheduler status with list of jobs and the worker holding each job's lock
     """
     try:
-        status_info = scheduler_service.get_status()
+        status_info = await scheduler_service.get_status_with_locks()
         return JobStatusResponse(**status_info)
     except Exception as e:
         logger.error(f"Error getting scheduler status: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/pipelines")
+async def get_registered_pipelines():
+    """
+    List the registered pipelines that can be scheduled
+
+    Returns:
+        Each pipeline's name, description and stage DAG
+    """
+    return {"pipelines": list_pipelines()}
+
+
 @router.post("/schedule", status_code=status.HTTP_201_CREATED)
 async def schedule_job(request: JobScheduleRequest):
     """
@@ -67,16 +78,22 @@ async def schedule_job(request: JobScheduleRequest):
             "trigger_type": "cron",
             "trigger_args": {"hour": 2, "minute": 0}
         }
+
+        ``params`` are passed to the pipeline, e.g. ``{"time_filter": "week"}``
+        for "reddit_pipeline" or ``{"query": "hasbro"}`` for "news_pipeline".
     """
     try:
-        # Map pipeline_name to actual function
-        pipeline_func = _execute_pipeline
+        get_pipeline(request.pipeline_name)
+    except PipelineError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
+    try:
         # Add job to scheduler
         success = scheduler_service.add_job(
-            func=pipeline_func,
+            func=run_pipeline,
             job_id=request.job_id,
             trigger_type=request.trigger_type,
+            kwargs={"pipeline_name": request.pipeline_name, "trigger_type": "scheduled", **request.params},
             **request.trigger_args
         )
 
@@ -94,6 +111,8 @@ async def schedule_job(request: JobScheduleRequest):
             "job": job_info
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error scheduling job: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -113,6 +113,7 @@ async def get_trending_keywords(
         regex="^(24h|7d|30d)$"
     ),
     limit: int = Query(20, ge=1, le=100, description="Number of trending keywords to return"),
+    unique_stories: bool = Query(True, description="Count syndicated copies of a story once"),
     db: Session = Depends(get_db),
 ):
     """
@@ -127,7 +128,7 @@ async def get_trending_keywords(
         from datetime import datetime
 
         keyword_service = get_keyword_service()
-        trending = keyword_service.get_trending_keywords(db, time_window, limit)
+        trending = keyword_service.get_trending_keywords(db, time_window, limit, unique_stories)
 
         return KeywordTrendingResponse(
             trending=trending,
@@ -3,18 +3,31 @@ Data Pipeline API Endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from sqlalchemy.orm import Session
-from datetime import datetime
+from typing import List, Dict, Any, Optional
 from app.db import get_db
 from app.models.reddit_post import RedditPost
-from app.models.pipeline_run import PipelineRun
-from app.services.reddit_service import RedditService
-from app.services.sentiment_service import SentimentService
+from app.services.reddit_service import RedditService, post_from_payload
+from app.services.payload_archive import load_payloads
+from app.services.ingestion_service import (
+    build_reddit_post_rows,
+    bulk_upsert_reddit_posts,
+    flag_near_duplicates,
+    partition_reddit_posts,
+    update_reddit_engagement
+)
+from app.services.watermark_service import load_source_watermarks, save_source_watermarks
+from app.services.pipeline_registry import (
+    Pipeline,
+    PipelineContext,
+    Stage,
+    register_pipeline,
+    run_pipeline as run_registered_pipeline
+)
 from app.services.cache_service import cache_service
 from app.core.config import settings
+from app.core.executor import run_blocking
 import logging
-import uuid
 import time
-import traceback
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -24,6 +37,10 @@ router = APIRouter()
 async def run_pipeline(
     background_tasks: BackgroundTasks,
     time_filter: str = "day",
+    replay: bool = False,
+    replay_from: Optional[str] = None,
+    replay_to: Optional[str] = None,
+    reprocess: bool = False,
     db: Session = Depends(get_db)
 ):
     """
@@ -32,6 +49,10 @@ async def run_pipeline(
     Args:
         background_tasks: FastAPI background tasks
         time_filter: Time filter for posts (hour, day, week, month, year, all)
+        replay: Re-ingest archived payloads instead of calling Reddit
+        replay_from: First archive day to replay (YYYY-MM-DD)
+        replay_to: Last archive day to replay (YYYY-MM-DD)
+        reprocess: Re-run sentiment on unchanged posts too, updating them in place
         db: Database session
 
     Returns:
@@ -42,189 +63,206 @@ async def run_pipeline(
         background_tasks.add_task(
             _execute_pipeline,
             time_filter=time_filter,
-            trigger_type="manual"
+            trigger_type="manual",
+            replay=replay,
+            replay_from=replay_from,
+            replay_to=replay_to,
+            reprocess=reprocess
         )
 
+        source = "archived payloads" if replay else f"time_filter={time_filter}"
         return {
             "status": "started",
-            "message": f"Pipeline started with time_filter={time_filter}. Processing in background."
+            "message": f"Pipeline started with {source}. Processing in background."
         }
     except Exception as e:
         logger.error(f"Error starting pipeline: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def _execute_pipeline(time_filter: str = "day", trigger_type: str = "scheduled"):
+async def _execute_pipeline(
+    time_filter: str = "day",
+    trigger_type: str = "scheduled",
+    replay: bool = False,
+    replay_from: Optional[str] = None,
+    replay_to: Optional[str] = None,
+    reprocess: bool = False
+):
     """
-    Execute the data pipeline with metrics tracking
+    Execute the Reddit pipeline with metrics tracking
+
+    Runs the registered "reddit_pipeline" DAG. Its blocking stages (PRAW,
+    TextBlob, SQLAlchemy) are handed to the pipeline executor, so the event
+    loop keeps serving requests meanwhile. In replay mode posts come from the
+    payload archive and Reddit is never contacted.
 
     Args:
         time_filter: Time filter for Reddit posts
         trigger_type: How the pipeline was triggered (manual, scheduled, api)
+        replay: Re-ingest archived payloads instead of fetching
+        replay_from: First archive day to replay (YYYY-MM-DD)
+        replay_to: Last archive day to replay (YYYY-MM-DD)
+        reprocess: Re-run sentiment on unchanged posts too, updating them in place
     """
-    from app.db import get_session_local
+    await run_registered_pipeline(
+        "reddit_pipeline",
+        trigger_type=trigger_type,
+        time_filter=time_filter,
+        replay=replay,
+        replay_from=replay_from,
+        replay_to=replay_to,
+        reprocess=reprocess
+    )
+
+
+def _fetch_reddit_posts(time_filter: str) -> Dict[str, Any]:
+    """
+    Fetch posts from the configured subreddits and search queries
 
-    SessionLocal = get_session_local()
-    db = SessionLocal()
+    Listings with a stored high-water mark only fetch posts newer than it.
 
-    # Generate unique run ID
-    run_id = str(uuid.uuid4())
-    start_time = time.time()
-    pipeline_run = None
+    Returns:
+        Dictionary with ``posts``, the advanced ``watermarks`` and ``source_metrics``
+    """
+    reddit_service = RedditService()
+    if settings.INCREMENTAL_FETCH_ENABLED:
+        reddit_service.watermarks = load_source_watermarks("reddit")
+
+    posts = reddit_service.fetch_posts_from_all_subreddits(
+        limit_per_subreddit=settings.REDDIT_POST_LIMIT,
+        time_filter=time_filter
+    )
+
+    # Fetch posts from search queries (e.g., "hasbro")
+    if reddit_service.search_queries:
+        logger.info(f"Searching Reddit for queries: {reddit_service.search_queries}")
+        posts.extend(reddit_service.fetch_posts_from_all_search_queries(
+            limit_per_query=settings.REDDIT_POST_LIMIT,
+            time_filter=time_filter
+        ))
+        logger.info(f"Total posts after search queries: {len(posts)}")
 
-    try:
-        logger.info(f"Starting data pipeline (run_id={run_id}) with time_filter={time_filter}")
-
-        # Create pipeline run record
-        pipeline_run = PipelineRun(
-            run_id=run_id,
-            pipeline_name="reddit_pipeline",
-            trigger_type=trigger_type,
-            status="running"
-        )
-        db.add(pipeline_run)
-        db.commit()
+    return {
+        "posts": posts,
+        "watermarks": reddit_service.watermarks if settings.INCREMENTAL_FETCH_ENABLED else None,
+        "source_metrics": reddit_service.source_metrics,
+    }
 
-        # Initialize Reddit service
-        reddit_service = RedditService()
 
-        # Fetch posts from all configured subreddits
-        posts = reddit_service.fetch_posts_from_all_subreddits(
-            limit_per_subreddit=settings.REDDIT_POST_LIMIT,
-            time_filter=time_filter
-        )
+def _replay_reddit_posts(start_date: Optional[str], end_date: Optional[str]) -> Dict[str, Any]:
+    """
+    Load archived Reddit payloads in the shape ``_fetch_reddit_posts`` returns
 
-        # Fetch posts from search queries (e.g., "hasbro")
-        if reddit_service.search_queries:
-            logger.info(f"Searching Reddit for queries: {reddit_service.search_queries}")
-            search_posts = reddit_service.fetch_posts_from_all_search_queries(
-                limit_per_query=settings.REDDIT_POST_LIMIT,
-                time_filter=time_filter
-            )
-            posts.extend(search_posts)
-            logger.info(f"Total posts after search queries: {len(posts)}")
-
-        # Store posts in database with sentiment analysis
-        stored_count = 0
-        updated_count = 0
-        failed_count = 0
-        sentiment_analyzed_count = 0
-        processing_times = []
-
-        for post_data in posts:
-            record_start = time.time()
-
-            try:
-                # Perform sentiment analysis
-                sentiment_score, sentiment_label = SentimentService.analyze_reddit_post(
-                    title=post_data.title,
-                    content=post_data.content
-                )
-
-                # Check if post already exists
-                existing_post = db.query(RedditPost).filter(
-                    RedditPost.id == post_data.id
-                ).first()
-
-                if existing_post:
-                    # Update existing post
-                    for key, value in post_data.model_dump().items():
-                        setattr(existing_post, key, value)
-
-                    # Update sentiment data
-                    if sentiment_score is not None:
-                        existing_post.sentiment_score = sentiment_score
-                        existing_post.sentiment_label = sentiment_label
-                        existing_post.sentiment_analyzed_at = datetime.utcnow()
-                        sentiment_analyzed_count += 1
-
-                    updated_count += 1
-                else:
-                    # Create new post with sentiment data
-                    new_post = RedditPost(**post_data.model_dump())
-
-                    if sentiment_score is not None:
-                        new_post.sentiment_score = sentiment_score
-                        new_post.sentiment_label = sentiment_label
-                        new_post.sentiment_analyzed_at = datetime.utcnow()
-                        sentiment_analyzed_count += 1
-
-                    db.add(new_post)
-                    stored_count += 1
-
-                # Track processing time
-                record_time = (time.time() - record_start) * 1000  # Convert to ms
-                processing_times.append(record_time)
-
-            except Exception as record_error:
-                logger.error(f"Error processing post {post_data.id}: {str(record_error)}")
-                failed_count += 1
-
-        db.commit()
-
-        # Invalidate cache after successful data update
-        logger.info("Invalidating cache after pipeline execution...")
-        cache_service.delete_pattern("cache:reddit_*")
-        cache_service.delete_pattern("cache:stats_*")
-        cache_service.delete_pattern("cache:analytics_*")
-        logger.info("Cache invalidated successfully")
-
-        # Calculate final metrics
-        end_time = time.time()
-        duration_seconds = end_time - start_time
-        total_processed = stored_count + updated_count + failed_count
-        avg_processing_time = sum(processing_times) / len(processing_times) if processing_times else 0
-
-        # Update pipeline run with success metrics
-        pipeline_run.status = "success"
-        pipeline_run.completed_at = datetime.utcnow()
-        pipeline_run.duration_seconds = duration_seconds
-        pipeline_run.records_processed = total_processed
-        pipeline_run.records_stored = stored_count
-        pipeline_run.records_updated = updated_count
-        pipeline_run.records_failed = failed_count
-        pipeline_run.avg_processing_time_ms = avg_processing_time
-
-        # Simple data quality score based on failure rate
-        if total_processed > 0:
-            pipeline_run.data_quality_score = ((total_processed - failed_count) / total_processed) * 100
-        else:
-            pipeline_run.data_quality_score = 100.0
-
-        db.commit()
-
-        logger.info(
-            f"Pipeline completed (run_id={run_id}). "
-            f"Duration: {duration_seconds:.2f}s, "
-            f"Stored: {stored_count}, Updated: {updated_count}, Failed: {failed_count}, "
-            f"Sentiment analyzed: {sentiment_analyzed_count}"
-        )
+    High-water marks are left alone: a replay says nothing about what Reddit
+    has published since.
+    """
+    start = time.perf_counter()
+    posts = [post_from_payload(payload) for payload in load_payloads("reddit", start_date, end_date)]
+    return {
+        "posts": posts,
+        "watermarks": None,
+        "source_metrics": {
+            "replay": {
+                "status": "success",
+                "posts": len(posts),
+                "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+            }
+        },
+    }
 
-    except Exception as e:
-        logger.error(f"Pipeline execution failed (run_id={run_id}): {str(e)}")
-
-        # Update pipeline run with failure information
-        if pipeline_run:
-            end_time = time.time()
-            duration_seconds = end_time - start_time
-
-            pipeline_run.status = "failed"
-            pipeline_run.completed_at = datetime.utcnow()
-            pipeline_run.duration_seconds = duration_seconds
-            pipeline_run.error_message = str(e)
-            pipeline_run.error_type = type(e).__name__
-            pipeline_run.stack_trace = traceback.format_exc()
-
-            try:
-                db.commit()
-            except Exception as commit_error:
-                logger.error(f"Failed to update pipeline run with error: {str(commit_error)}")
-
-        db.rollback()
-        raise
+
+def _partition_posts(posts: List[Any], reprocess: bool = False):
+    """Split fetched posts into new/changed and unchanged ones (all changed when reprocessing)"""
+    from app.db import get_session_local
+
+    db = get_session_local()()
+    try:
+        return partition_reddit_posts(db, posts, reprocess)
+    finally:
+        db.close()
+
+
+def _persist_posts(rows: List[Dict[str, Any]], unchanged: List[Any]) -> Dict[str, int]:
+    """Flag near-duplicates, upsert changed rows and refresh engagement of unchanged posts"""
+    from app.db import get_session_local
+
+    db = get_session_local()()
+    try:
+        duplicates = flag_near_duplicates(db, "reddit", rows, "id", "created_utc")
+        counts = bulk_upsert_reddit_posts(db, rows)
+        engagement = update_reddit_engagement(db, unchanged)
     finally:
         db.close()
 
+    counts["updated"] += engagement["updated"]
+    counts["failed"] += engagement["failed"]
+    counts["skipped_enrichment"] = engagement["updated"]
+    counts["near_duplicates"] = len(duplicates)
+    return counts
+
+
+async def _fetch_stage(context: PipelineContext) -> Dict[str, Any]:
+    params = context.params
+    if params.get("replay"):
+        fetched = await run_blocking(_replay_reddit_posts, params.get("replay_from"), params.get("replay_to"))
+    else:
+        fetched = await run_blocking(_fetch_reddit_posts, params.get("time_filter", "day"))
+    context.source_metrics.update(fetched["source_metrics"])
+    return fetched
+
+
+async def _dedupe_stage(context: PipelineContext):
+    return await run_blocking(
+        _partition_posts, context.results["fetch"]["posts"], bool(context.params.get("reprocess"))
+    )
+
+
+async def _sentiment_stage(context: PipelineContext):
+    changed, _ = context.results["dedupe"]
+    rows, failed = await run_blocking(build_reddit_post_rows, changed)
+    context.add_counts({
+        "failed": failed,
+        "sentiment_analyzed": sum(1 for row in rows if row["sentiment_score"] is not None),
+    })
+    return rows
+
+
+async def _persist_stage(context: PipelineContext) -> Dict[str, int]:
+    _, unchanged = context.results["dedupe"]
+    counts = await run_blocking(_persist_posts, context.results["sentiment"], unchanged)
+    context.add_counts(counts)
+    return counts
+
+
+async def _watermark_stage(context: PipelineContext):
+    # Advance high-water marks only once every fetched post is stored
+    watermarks = context.results["fetch"]["watermarks"]
+    if watermarks is not None and context.counts.get("failed", 0) == 0:
+        await run_blocking(save_source_watermarks, "reddit", watermarks)
+
+
+async def _cache_refresh_stage(context: PipelineContext):
+    # Hot keys are recomputed rather than deleted, so no reader pays for a cold miss
+    logger.info("Refreshing cache after pipeline execution...")
+    for pattern in ("cache:reddit_*", "cache:stats_*", "cache:analytics_*"):
+        await cache_service.arefresh_pattern(pattern)
+    logger.info("Cache refreshed successfully")
+
+
+register_pipeline(Pipeline(
+    "reddit_pipeline",
+    [
+        # PRAW calls already retry per request, so a failed listing isn't re-run here
+        Stage("fetch", _fetch_stage, retries=0),
+        Stage("dedupe", _dedupe_stage, depends_on=("fetch",)),
+        Stage("sentiment", _sentiment_stage, depends_on=("dedupe",)),
+        Stage("persist", _persist_stage, depends_on=("sentiment",)),
+        Stage("watermarks", _watermark_stage, depends_on=("persist",)),
+        Stage("cache_refresh", _cache_refresh_stage, depends_on=("persist",)),
+    ],
+    description="Reddit posts with sentiment analysis"
+))
+
 
 @router.get("/status")
 async def get_pipeline_status(db: Session = Depends(get_db)):
@@ -9,7 +9,7 @@ from app.db import get_db
 from app.models.reddit_post import RedditPost
 from app.schemas.reddit import RedditPostResponse, RedditPostList
 from app.services.reddit_service import RedditService
-from app.services.cache_service import cached
+from app.services.cache_service import cache_service, cached
 from app.core.config import settings
 import logging
 
@@ -115,6 +115,9 @@ async def get_subreddits(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+cache_service.register_refresher("reddit_subreddits", get_subreddits.refresh)
+
+
 @router.post("/test-connection")
 async def test_reddit_connection():
     """
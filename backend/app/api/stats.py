@@ -7,7 +7,7 @@ from sqlalchemy import func
 from app.db import get_db
 from app.models.reddit_post import RedditPost
 from app.schemas.reddit import PipelineStats
-from app.services.cache_service import cached
+from app.services.cache_service import cache_service, cached
 from app.core.config import settings
 import logging
 
@@ -16,7 +16,11 @@ router = APIRouter()
 
 
 @router.get("/overview", response_model=PipelineStats)
-@cached(prefix="stats_overview", ttl=settings.CACHE_STATS_TTL)
+@cached(
+    prefix="stats_overview",
+    ttl=settings.CACHE_STATS_TTL + settings.CACHE_STALE_TTL,
+    soft_ttl=settings.CACHE_STATS_TTL
+)
 async def get_statistics_overview(db: Session = Depends(get_db)):
     """
     Get overall statistics for the data pipeline
@@ -70,6 +74,9 @@ async def get_statistics_overview(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+cache_service.register_refresher("stats_overview", get_statistics_overview.refresh)
+
+
 @router.get("/subreddit/{subreddit_name}")
 @cached(prefix="stats_subreddit", ttl=settings.CACHE_STATS_TTL)
 async def get_subreddit_stats(subreddit_name: str, db: Session = Depends(get_db)):
@@ -41,10 +41,63 @@ class Settings(BaseSettings):
     REDDIT_SUBREDDITS: str = "python,javascript,machinelearning,datascience"
     REDDIT_SEARCH_QUERIES: str = "hasbro"  # Comma-separated search queries for Reddit
     REDDIT_POST_LIMIT: int = 100
+    REDDIT_FETCH_CONCURRENCY: int = 4  # Subreddit/search listings fetched in parallel (1 = sequential)
     PIPELINE_SCHEDULE_MINUTES: int = 60
+    SCHEDULER_LOCK_ENABLED: bool = True  # Run each scheduled job on one worker via a Redis lock (Postgres advisory lock fallback)
+    SCHEDULER_LOCK_TTL_SECONDS: int = 60  # Job lock lease; renewed every third of it while the job runs
+    SCHEDULER_PERSIST_JOBS: bool = True  # Keep scheduled jobs in the database so they survive restarts
+    SCHEDULER_MISFIRE_GRACE_SECONDS: int = 86400  # Catch up a run missed by up to this long (0 = always)
+    SCHEDULER_CATCHUP_SPACING_SECONDS: int = 60  # Gap between catch-up runs of jobs missed while down
+    INGEST_BATCH_SIZE: int = 500  # Rows per bulk INSERT ... ON CONFLICT statement
+    INGEST_QUEUE_BATCH_SIZE: int = 50  # Items per batch passed between ingestion engine stages
+    INGEST_QUEUE_SIZE: int = 4  # Batches buffered between two stages before upstream waits
+    PIPELINE_EXECUTOR_TYPE: str = "thread"  # thread, process - where blocking pipeline work runs
+    PIPELINE_EXECUTOR_WORKERS: int = 2  # Pipeline runs that can execute at once per API process
+    PIPELINE_STAGE_RETRIES: int = 2  # Extra attempts for a failed pipeline stage (its inputs are kept, not re-fetched)
+    PIPELINE_STAGE_RETRY_BACKOFF_SECONDS: float = 2.0  # First retry delay; doubles on each further attempt
+    INCREMENTAL_FETCH_ENABLED: bool = True  # Fetch only items newer than each listing's stored high-water mark
+    WATERMARK_OVERLAP_MINUTES: int = 60  # Re-request this far below a high-water mark to catch late-indexed items
+    WATERMARK_MAX_IDS: int = 500  # Item IDs remembered per listing to skip overlap items already seen
+
+    # Shared HTTP client (aiohttp session used by every HTTP data source)
+    HTTP_POOL_LIMIT: int = 100  # Open connections across all hosts
+    HTTP_POOL_LIMIT_PER_HOST: int = 10  # Open connections to any one host
+    HTTP_KEEPALIVE_SECONDS: float = 30.0  # Idle time before a pooled connection is closed
+    HTTP_DNS_CACHE_SECONDS: int = 300  # How long resolved host addresses are reused
+    HTTP_TIMEOUT_SECONDS: float = 30.0  # Default total timeout per request
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 10.0  # Default timeout for acquiring/opening a connection
+    SOURCE_RATE_LIMIT_SHARED: bool = False  # Pace data-source requests on one Redis schedule across worker processes
 
     # News Search Configuration
     NEWS_SEARCH_QUERIES: str = "hasbro"  # Comma-separated search queries for news
+    NEWS_API_REQUESTS_PER_SECOND: float = 1.0  # NewsAPI request pace, shared by every NewsAPIService (free tier: 1 req/s)
+    NEWS_STREAM_PREFETCH_PAGES: int = 1  # Pages fetched ahead while the current one is persisted
+    NEWS_BACKFILL_MAX_ITEMS: int = 1000  # Article budget per backfill slice
+
+    # Payload Archive Configuration
+    PAYLOAD_ARCHIVE_ENABLED: bool = False  # Write every fetch's raw payloads to the archive for offline replay
+    PAYLOAD_ARCHIVE_DIR: str = "data/archive"  # Archive root; files go to <source>/<YYYY-MM-DD>/*.ndjson.gz
+
+    # Backfill Configuration
+    BACKFILL_CONCURRENCY: int = 4  # Backfill slices processed at once
+    BACKFILL_BATCH_SIZE: int = 100  # Items committed (with their checkpoint) per transaction
+    BACKFILL_REDDIT_RATE_LIMIT: float = 60.0  # Reddit search pages per minute across all backfill slices
+    BACKFILL_PROGRESS_SECONDS: float = 10.0  # Interval between backfill progress reports
+
+    # NLP Configuration
+    NER_BATCH_SIZE: int = 64  # Texts per spaCy nlp.pipe batch
+    NER_N_PROCESS: int = 1  # spaCy worker processes for batched NER (1 = in-process)
+    KEYWORD_HASH_FEATURES: int = 2 ** 20  # Hash buckets for keyword document-frequency counts
+    KEYWORD_MODEL_MAX_DOCUMENTS: int = 20000  # Newest articles counted when rebuilding document frequencies
+    KEYWORD_MODEL_MIN_DOCUMENTS: int = 20  # Below this corpus size, keep per-document TF-IDF
+    KEYWORD_IDF_DRIFT_THRESHOLD: float = 0.1  # Relative IDF change that triggers a keyword rescore
+    KEYWORD_RESCORE_HOURS: int = 6
+    NEAR_DUPLICATE_ENABLED: bool = True  # Flag syndicated/cross-posted copies at ingest and skip their NER/keywords
+    NEAR_DUPLICATE_THRESHOLD: float = 0.8  # Estimated Jaccard similarity of word shingles that counts as a duplicate
+    NEAR_DUPLICATE_NUM_PERM: int = 128  # MinHash permutations (changing it invalidates stored signatures)
+    NEAR_DUPLICATE_BANDS: int = 32  # LSH bands; must divide NEAR_DUPLICATE_NUM_PERM
+    NEAR_DUPLICATE_SHINGLE_SIZE: int = 3  # Words per shingle
+    NEAR_DUPLICATE_WINDOW_HOURS: int = 72  # How far back incoming stories are compared
 
     # Redis Cache Configuration
     REDIS_HOST: str = "localhost"
@@ -56,6 +109,18 @@ class Settings(BaseSettings):
     CACHE_ANALYTICS_TTL: int = 600  # 10 minutes
     CACHE_STATS_TTL: int = 300  # 5 minutes
     CACHE_REDDIT_TTL: int = 180  # 3 minutes
+    CACHE_POOL_MAX_CONNECTIONS: int = 50  # Async Redis connections per worker
+    CACHE_SOCKET_TIMEOUT_SECONDS: float = 0.5  # Async connect/read timeout; a slow cache counts as a miss
+    CACHE_RETRY_SECONDS: float = 30.0  # How long the async client stays off after Redis becomes unreachable
+    CACHE_L1_ENABLED: bool = True  # In-process LRU in front of Redis, used while subscribed to invalidations
+    CACHE_L1_MAX_ENTRIES: int = 1000  # Decoded responses kept per worker
+    CACHE_L1_TTL_SECONDS: float = 30.0  # Default L1 lifetime; @cached(l1_ttl=...) overrides it per prefix
+    CACHE_INVALIDATION_CHANNEL: str = "cache:invalidate"  # Pub/sub channel carrying L1 invalidations
+    CACHE_LOCK_ENABLED: bool = True  # One worker recomputes a missed @cached key while the others wait
+    CACHE_LOCK_TTL_SECONDS: float = 10.0  # Recompute lock expiry; bounds how long a crashed holder stalls a key
+    CACHE_LOCK_WAIT_SECONDS: float = 2.0  # How long other workers wait for the holder's value before computing it
+    CACHE_LOCK_POLL_SECONDS: float = 0.05  # How often waiting workers check for the value
+    CACHE_STALE_TTL: int = 3600  # How long past its soft TTL a @cached(soft_ttl=...) value is served while it refreshes
 
     # Logging Configuration
     LOG_LEVEL: str = "INFO"  # DEBUG, INFO, WARNING, ERROR, CRITICAL
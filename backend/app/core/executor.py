@@ -0,0 +1,74 @@
+"""
+Pipeline Executor
+Runs blocking pipeline work (PRAW, NLP models, SQLAlchemy) off the event loop
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+import logging
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[Executor] = None
+
+
+def get_pipeline_executor() -> Executor:
+    """
+    Get or create the process-wide pipeline executor
+
+    PIPELINE_EXECUTOR_TYPE selects a thread pool (default) or a process pool.
+    Process pools use the "spawn" start method so workers never inherit the
+    parent's DB connections or scheduler threads; anything submitted to them
+    must be a module-level function with picklable arguments.
+    """
+    global _executor
+    if _executor is None:
+        workers = max(1, settings.PIPELINE_EXECUTOR_WORKERS)
+        if settings.PIPELINE_EXECUTOR_TYPE == "process":
+            _executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        elif settings.PIPELINE_EXECUTOR_TYPE == "thread":
+            _executor = ThreadPoolExecutor(
+                max_workers=workers,
+                thread_name_prefix="pipeline"
+            )
+        else:
+            raise ValueError(f"Unsupported executor type: {settings.PIPELINE_EXECUTOR_TYPE}")
+        logger.info(f"Pipeline executor started ({settings.PIPELINE_EXECUTOR_TYPE}, {workers} workers)")
+    return _executor
+
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking function in the pipeline executor and await its result
+
+    Args:
+        func: Function to run
+        *args: Positional arguments for the function
+        **kwargs: Keyword arguments for the function
+
+    Returns:
+        The function's return value (exceptions are re-raised)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_pipeline_executor(), partial(func, *args, **kwargs))
+
+
+def shutdown_pipeline_executor(wait: bool = True):
+    """
+    Shut down the pipeline executor
+
+    Args:
+        wait: Wait for running pipeline work to finish
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=wait)
+        _executor = None
+        logger.info("Pipeline executor shut down")
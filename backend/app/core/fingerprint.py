@@ -0,0 +1,99 @@
+"""
+Content Fingerprints
+Stable hashes of normalized text used to detect unchanged content
+"""
+import hashlib
+import unicodedata
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid",
+    "ref", "ref_src", "cmpid", "ocid", "smid", "guccounter", "_ga",
+})
+
+# Length of stable IDs in hex characters (128 bits)
+STABLE_ID_LENGTH = 32
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """
+    Normalize text so cosmetic differences don't change its fingerprint
+
+    Applies Unicode NFKC normalization, lowercases and collapses whitespace.
+
+    Args:
+        text: Text to normalize (None is treated as empty)
+
+    Returns:
+        Normalized text
+    """
+    if not text:
+        return ""
+    return " ".join(unicodedata.normalize("NFKC", text).lower().split())
+
+
+def content_fingerprint(title: Optional[str], content: Optional[str]) -> str:
+    """
+    Fingerprint a title and body
+
+    Args:
+        title: Title text
+        content: Body text
+
+    Returns:
+        64-character hex SHA-256 digest of the normalized title and content
+    """
+    normalized = f"{normalize_text(title)}\x1f{normalize_text(content)}"
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def canonicalize_url(url: Optional[str]) -> str:
+    """
+    Reduce a URL to a canonical form so trivially different links compare equal
+
+    Drops the scheme (http/https), a leading ``www.``, default ports, the
+    fragment, tracking parameters (``utm_*``, ``fbclid``, ...) and trailing
+    slashes, lowercases the host and sorts the remaining query parameters.
+
+    Args:
+        url: URL to canonicalize
+
+    Returns:
+        Canonical ``host/path?query`` string, or "" for an empty URL
+    """
+    if not url or not url.strip():
+        return ""
+
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/")
+
+    return urlunsplit(("", host, path, urlencode(query), "")).lstrip("/")
+
+
+def stable_id(*parts: Optional[str]) -> str:
+    """
+    Build a process-independent ID from text parts
+
+    Unlike the built-in ``hash``, which is salted per process, the digest is
+    the same on every run and every worker.
+
+    Args:
+        *parts: Text to identify (None is treated as empty)
+
+    Returns:
+        Hex SHA-256 digest truncated to STABLE_ID_LENGTH characters
+    """
+    key = "\x1f".join(part or "" for part in parts)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:STABLE_ID_LENGTH]
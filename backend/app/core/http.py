@@ -0,0 +1,137 @@
+"""
+HTTP Session Manager
+One pooled aiohttp session shared by every HTTP data source in the process
+"""
+import asyncio
+from collections import defaultdict
+from types import SimpleNamespace
+from typing import Dict, Any, Optional
+import logging
+
+import aiohttp
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPSessionManager:
+    """
+    Owns the process-wide ``aiohttp.ClientSession``
+
+    The session's connector keeps connections alive between requests, caps
+    connections per host and caches DNS lookups, so sources stop paying
+    TCP/TLS setup and DNS on every call. The FastAPI lifespan starts and
+    closes it; scripts get one lazily and should call ``close`` when done.
+
+    Requests can pass ``trace_request_ctx={"source": "<name>"}`` to have
+    their traffic counted per source in ``get_stats``.
+    """
+
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._counters: Dict[str, int] = defaultdict(int)
+        self._by_source: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        """Trace hooks feeding the connection-reuse counters"""
+        trace = aiohttp.TraceConfig()
+
+        def counter(name: str):
+            async def hook(session, context: SimpleNamespace, params):
+                self._counters[name] += 1
+                source = (context.trace_request_ctx or {}).get("source")
+                if source:
+                    self._by_source[source][name] += 1
+            return hook
+
+        trace.on_request_start.append(counter("requests"))
+        trace.on_request_exception.append(counter("request_errors"))
+        trace.on_connection_create_end.append(counter("connections_created"))
+        trace.on_connection_reuseconn.append(counter("connections_reused"))
+        trace.on_dns_cache_hit.append(counter("dns_cache_hits"))
+        trace.on_dns_cache_miss.append(counter("dns_cache_misses"))
+        return trace
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=settings.HTTP_POOL_LIMIT,
+            limit_per_host=settings.HTTP_POOL_LIMIT_PER_HOST,
+            keepalive_timeout=settings.HTTP_KEEPALIVE_SECONDS,
+            ttl_dns_cache=settings.HTTP_DNS_CACHE_SECONDS,
+            use_dns_cache=True
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(
+                total=settings.HTTP_TIMEOUT_SECONDS,
+                connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS
+            ),
+            trace_configs=[self._trace_config()]
+        )
+
+    async def start(self) -> aiohttp.ClientSession:
+        """Create the shared session on the running event loop"""
+        return self.session()
+
+    def session(self) -> aiohttp.ClientSession:
+        """
+        Get the shared session, creating it if needed
+
+        Must be called from a coroutine. A session is bound to the loop that
+        created it, so a caller on another loop (e.g. a script that ran
+        ``asyncio.run`` twice) gets a fresh one.
+
+        Returns:
+            The pooled ``aiohttp.ClientSession``
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            if self._session is not None and not self._session.closed:
+                logger.warning("HTTP session belongs to another event loop; creating a new one")
+            self._session = self._create_session()
+            self._loop = loop
+            logger.info(
+                f"HTTP session pool started (limit={settings.HTTP_POOL_LIMIT}, "
+                f"per host={settings.HTTP_POOL_LIMIT_PER_HOST})"
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared session and its pooled connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("HTTP session pool closed")
+        self._session = None
+        self._loop = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Connection pool statistics
+
+        Returns:
+            Dictionary with request/connection/DNS counters, the connection
+            reuse ratio, currently open connections and per-source counters
+        """
+        created = self._counters["connections_created"]
+        reused = self._counters["connections_reused"]
+        connector = self._session.connector if self._session is not None and not self._session.closed else None
+
+        return {
+            "active": connector is not None,
+            "requests": self._counters["requests"],
+            "request_errors": self._counters["request_errors"],
+            "connections_created": created,
+            "connections_reused": reused,
+            "reuse_ratio": round(reused / (created + reused), 4) if created + reused else 0.0,
+            "dns_cache_hits": self._counters["dns_cache_hits"],
+            "dns_cache_misses": self._counters["dns_cache_misses"],
+            "limit": settings.HTTP_POOL_LIMIT,
+            "limit_per_host": settings.HTTP_POOL_LIMIT_PER_HOST,
+            "sources": {source: dict(counts) for source, counts in self._by_source.items()},
+        }
+
+
+# Global HTTP session manager
+http_session_manager = HTTPSessionManager()
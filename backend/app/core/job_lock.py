@@ -0,0 +1,346 @@
+"""
+Scheduled Job Locks
+Distributed per-job locks so each scheduled run happens on one worker
+"""
+import asyncio
+import hashlib
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List
+import logging
+
+from redis import asyncio as aioredis
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+from app.db import get_engine
+from app.models.job_lock_hold import JobLockHold
+
+logger = logging.getLogger(__name__)
+
+# Extend the lock only while this worker still owns it
+_RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Extend the lock, or take it back if it's free (Redis was down when the
+# job's advisory lock was taken); 0 if another worker holds it
+_CLAIM_SCRIPT = """
+local holder = redis.call('GET', KEYS[1])
+if not holder or holder == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+    return 1
+end
+return 0
+"""
+
+# Release the lock if this worker owns it; a positive hold keeps it until then
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    if tonumber(ARGV[2]) > 0 then
+        return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+    end
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_holds = JobLockHold.__table__
+
+
+def get_worker_id() -> str:
+    """Identifier of this worker process (host:pid)"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _uses_advisory_locks() -> bool:
+    """True if the app database can take Postgres advisory locks"""
+    return get_engine().dialect.name == "postgresql"
+
+
+def _advisory_key(job_id: str) -> int:
+    """Signed 64-bit Postgres advisory lock key for a job"""
+    digest = hashlib.blake2b(f"{JobLock.KEY_PREFIX}{job_id}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def _advisory_lock(job_id: str) -> Optional[Connection]:
+    """
+    Take a job's Postgres advisory lock on a dedicated connection
+
+    The lock lives as long as the connection, so a crashed worker's lock goes
+    with its connection. A job still held by its last run counts as taken.
+
+    Returns:
+        The connection holding the lock, or None if another worker holds it
+    """
+    connection = get_engine().connect()
+    try:
+        acquired = connection.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": _advisory_key(job_id)}
+        ).scalar()
+        held_until = None
+        if acquired:
+            held_until = connection.execute(
+                select(_holds.c.held_until).where(_holds.c.job_id == job_id)
+            ).scalar()
+        connection.commit()
+    except Exception:
+        connection.close()
+        raise
+    if not acquired:
+        connection.close()
+        return None
+    if held_until is not None and held_until > datetime.utcnow():
+        _advisory_unlock(connection, job_id)
+        return None
+    return connection
+
+
+def _advisory_unlock(connection: Connection, job_id: str, worker_id: Optional[str] = None, hold_seconds: float = 0):
+    """
+    Release a job's advisory lock and return its connection to the pool
+
+    A positive ``hold_seconds`` is recorded as the job's hold row in the same
+    transaction, so the job stays taken without keeping the connection.
+    """
+    try:
+        if hold_seconds > 0:
+            connection.execute(delete(_holds).where(_holds.c.job_id == job_id))
+            connection.execute(insert(_holds).values(
+                job_id=job_id, holder=worker_id, held_until=datetime.utcnow() + timedelta(seconds=hold_seconds)
+            ))
+        connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _advisory_key(job_id)})
+        connection.commit()
+    finally:
+        connection.close()
+
+
+class JobLock:
+    """
+    Redis ``SET NX PX`` lock per scheduled job
+
+    Every worker's scheduler fires every job, and the first worker to take the
+    job's lock runs it; the others skip that run. The lock expires after
+    SCHEDULER_LOCK_TTL_SECONDS unless renewed, so a crashed worker can't hold
+    a job forever.
+
+    On PostgreSQL a run also needs the job's advisory lock on the app
+    database, which decides alone while Redis is unreachable. Both are taken
+    by the same worker, so a Redis outage never lets two workers run a job.
+    On other databases a Redis outage skips the run, since running it on
+    every worker at once is worse than missing it.
+    """
+
+    KEY_PREFIX = "scheduler:lock:"
+
+    def __init__(self, worker_id: Optional[str] = None):
+        self.worker_id = worker_id or get_worker_id()
+        self.ttl_ms = int(settings.SCHEDULER_LOCK_TTL_SECONDS * 1000)
+        self._redis: Optional[aioredis.Redis] = None
+        self._renew_script = None
+        self._claim_script = None
+        self._release_script = None
+        # job_id -> connection holding its advisory lock
+        self._advisory_locks: Dict[str, Connection] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return settings.SCHEDULER_LOCK_ENABLED
+
+    def _client(self) -> aioredis.Redis:
+        if self._redis is None:
+            self._redis = aioredis.Redis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=settings.REDIS_DB,
+                password=settings.REDIS_PASSWORD or None,
+                decode_responses=True,
+                socket_connect_timeout=1,
+                socket_timeout=1,
+            )
+            self._renew_script = self._redis.register_script(_RENEW_SCRIPT)
+            self._claim_script = self._redis.register_script(_CLAIM_SCRIPT)
+            self._release_script = self._redis.register_script(_RELEASE_SCRIPT)
+        return self._redis
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.KEY_PREFIX}{job_id}"
+
+    async def acquire(self, job_id: str) -> bool:
+        """
+        Try to take a job's lock
+
+        Args:
+            job_id: Scheduled job ID
+
+        Returns:
+            True if this worker should run the job
+        """
+        redis_error = None
+        try:
+            if not await self._client().set(self._key(job_id), self.worker_id, nx=True, px=self.ttl_ms):
+                return False
+        except Exception as e:
+            redis_error = e
+
+        if not _uses_advisory_locks():
+            if redis_error is not None:
+                logger.error(f"Job lock for '{job_id}' unavailable, skipping the run: {redis_error}")
+                return False
+            return True
+
+        if redis_error is not None:
+            logger.warning(f"Job lock for '{job_id}' unavailable in Redis, using the database lock: {redis_error}")
+        try:
+            connection = await asyncio.to_thread(_advisory_lock, job_id)
+        except Exception as e:
+            logger.error(f"Database lock for '{job_id}' unavailable, skipping the run: {e}")
+            connection = None
+        if connection is None:
+            if redis_error is None:
+                await self._release_redis(job_id)
+            return False
+        self._advisory_locks[job_id] = connection
+        return True
+
+    async def renew(self, job_id: str) -> bool:
+        """
+        Extend a held lock; False if this worker no longer holds it
+
+        With the advisory lock held, the Redis key is taken back if it's free
+        and Redis being unreachable doesn't matter. The key held by another
+        worker means the job was lost: the advisory lock is given up too.
+        """
+        self._client()
+        args = [self.worker_id, self.ttl_ms]
+        if job_id not in self._advisory_locks:
+            return bool(await self._renew_script(keys=[self._key(job_id)], args=args))
+
+        try:
+            claimed = await self._claim_script(keys=[self._key(job_id)], args=args)
+        except Exception as e:
+            logger.debug(f"Job lock for '{job_id}' still unavailable in Redis: {e}")
+            return True
+        if not claimed:
+            await self._release_advisory(job_id)
+        return bool(claimed)
+
+    async def release(self, job_id: str, hold_seconds: float = 0):
+        """
+        Release a held lock
+
+        Args:
+            job_id: Scheduled job ID
+            hold_seconds: Keep the lock this much longer, so sibling workers
+                whose trigger for the same run fires a little later skip it
+        """
+        await self._release_redis(job_id, hold_seconds)
+        await self._release_advisory(job_id, hold_seconds)
+
+    async def _release_redis(self, job_id: str, hold_seconds: float = 0):
+        try:
+            self._client()
+            await self._release_script(
+                keys=[self._key(job_id)],
+                args=[self.worker_id, max(0, int(hold_seconds * 1000))]
+            )
+        except Exception as e:
+            logger.warning(f"Could not release job lock for '{job_id}': {e}")
+
+    async def _release_advisory(self, job_id: str, hold_seconds: float = 0):
+        connection = self._advisory_locks.pop(job_id, None)
+        if connection is None:
+            return
+        try:
+            await asyncio.to_thread(_advisory_unlock, connection, job_id, self.worker_id, hold_seconds)
+        except Exception as e:
+            logger.warning(f"Could not release database lock for '{job_id}': {e}")
+
+    async def _keep_alive(self, job_id: str):
+        """Renew the lock until cancelled"""
+        interval = self.ttl_ms / 3000
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if not await self.renew(job_id):
+                    logger.warning(f"Lost job lock for '{job_id}' while it was running")
+                    return
+            except Exception as e:
+                logger.warning(f"Could not renew job lock for '{job_id}': {e}")
+
+    async def run(self, job_id: str, func, *args, hold_seconds: float = 0, **kwargs) -> bool:
+        """
+        Run ``func`` if this worker gets the job's lock
+
+        Args:
+            job_id: Scheduled job ID
+            func: Job function (sync or async)
+            *args: Positional arguments for ``func``
+            hold_seconds: See ``release``
+            **kwargs: Keyword arguments for ``func``
+
+        Returns:
+            True if the job ran here, False if another worker holds it (or
+            no lock backend is reachable)
+        """
+        if not self.enabled:
+            await _call(func, *args, **kwargs)
+            return True
+
+        if not await self.acquire(job_id):
+            holder = (await self.get_holders([job_id])).get(job_id)
+            logger.info(f"Skipping job '{job_id}': lock held by {holder}")
+            return False
+
+        keep_alive = asyncio.create_task(self._keep_alive(job_id))
+        try:
+            await _call(func, *args, **kwargs)
+        finally:
+            keep_alive.cancel()
+            await self.release(job_id, hold_seconds)
+        return True
+
+    async def get_holders(self, job_ids: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Workers currently holding the given jobs' locks
+
+        Args:
+            job_ids: Scheduled job IDs
+
+        Returns:
+            ``job_id -> worker ID`` (None if unheld); empty if Redis is unreachable
+        """
+        if not job_ids or not self.enabled:
+            return {}
+        try:
+            holders = await self._client().mget([self._key(job_id) for job_id in job_ids])
+        except Exception as e:
+            logger.warning(f"Could not read job lock holders: {e}")
+            return {}
+        return dict(zip(job_ids, holders))
+
+    def get_info(self) -> Dict[str, Any]:
+        """Lock configuration of this worker"""
+        return {
+            "enabled": self.enabled,
+            "backend": "redis",
+            "advisory_lock": _uses_advisory_locks(),
+            "worker_id": self.worker_id,
+            "ttl_seconds": self.ttl_ms / 1000,
+        }
+
+
+async def _call(func, *args, **kwargs):
+    result = func(*args, **kwargs)
+    if asyncio.iscoroutine(result):
+        await result
+
+
+# Global job lock for this worker
+job_lock = JobLock()
@@ -0,0 +1,184 @@
+"""
+Source Rate Limiting
+Paces outbound data-source requests to each source's quota
+"""
+import asyncio
+import math
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple
+import logging
+
+from redis import asyncio as aioredis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# GCRA reservation against Redis server time, so every worker process shares
+# one schedule. Returns how many milliseconds the caller must wait.
+_GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local wait = tat - tolerance - now
+if wait < 0 then wait = 0 end
+local new_tat = tat + interval
+redis.call('SET', KEYS[1], string.format('%d', new_tat), 'PX', math.ceil(new_tat - now) + 1000)
+return wait
+"""
+
+
+class RateLimiter:
+    """
+    Token bucket that delays callers instead of rejecting them
+
+    Implemented as GCRA (the "virtual scheduling" form of a token bucket):
+    each ``acquire`` reserves the next free slot and sleeps until it, so
+    concurrent callers are served in order at exactly ``rate_per_minute``
+    after an initial ``burst``. With ``shared=True`` the schedule lives in
+    Redis and is shared by every worker process; if Redis is unreachable the
+    limiter keeps pacing with its local schedule.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate_per_minute: float,
+        burst: int = 1,
+        shared: bool = False
+    ):
+        self.name = name
+        self.rate_per_minute = rate_per_minute
+        self.burst = max(1, burst)
+        self.shared = shared
+        self.interval = 60.0 / rate_per_minute if rate_per_minute > 0 else 0.0
+
+        self._tat = 0.0  # Theoretical arrival time of the next request (monotonic)
+        self._lock = threading.Lock()
+        self._redis: Optional[aioredis.Redis] = None
+        self._script = None
+
+        self.acquired = 0
+        self.waited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.shared_errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    def _reserve_local(self) -> float:
+        """Reserve the next slot on the in-process schedule"""
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat, now)
+            self._tat = tat + self.interval
+            return max(0.0, tat - (self.burst - 1) * self.interval - now)
+
+    async def _reserve_shared(self) -> float:
+        """Reserve the next slot on the Redis schedule"""
+        if self._script is None:
+            self._redis = aioredis.Redis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=settings.REDIS_DB,
+                password=settings.REDIS_PASSWORD or None,
+                socket_connect_timeout=1,
+                socket_timeout=1,
+            )
+            self._script = self._redis.register_script(_GCRA_SCRIPT)
+
+        # Whole milliseconds, rounded up so the shared schedule never runs fast
+        interval_ms = math.ceil(self.interval * 1000)
+        wait_ms = await self._script(
+            keys=[f"ratelimit:source:{self.name}"],
+            args=[interval_ms, (self.burst - 1) * interval_ms]
+        )
+        return int(wait_ms) / 1000
+
+    async def acquire(self) -> float:
+        """
+        Wait for this caller's request slot
+
+        Returns:
+            Seconds spent waiting
+        """
+        if not self.enabled:
+            return 0.0
+
+        wait = None
+        if self.shared:
+            try:
+                wait = await self._reserve_shared()
+            except Exception as e:
+                self.shared_errors += 1
+                logger.warning(f"Shared rate limit for {self.name} unavailable, pacing locally: {e}")
+        if wait is None:
+            wait = self._reserve_local()
+
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        self.acquired += 1
+        if wait > 0:
+            self.waited += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+        return wait
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Pacing statistics
+
+        Returns:
+            Dictionary with the configured rate, request and wait counters
+        """
+        return {
+            "rate_per_minute": self.rate_per_minute,
+            "burst": self.burst,
+            "backend": "redis" if self.shared else "local",
+            "acquired": self.acquired,
+            "waited": self.waited,
+            "total_wait_seconds": round(self.total_wait, 3),
+            "avg_wait_seconds": round(self.total_wait / self.acquired, 3) if self.acquired else 0.0,
+            "max_wait_seconds": round(self.max_wait, 3),
+            "shared_errors": self.shared_errors,
+        }
+
+
+# Limiters are per process, so every instance of a source shares its quota
+_rate_limiters: Dict[Tuple[str, float, int], RateLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str, rate_per_minute: float, burst: int = 1) -> RateLimiter:
+    """
+    Get or create the process-wide limiter for a source
+
+    Args:
+        name: Source name, also the Redis key when limits are shared
+        rate_per_minute: Requests allowed per minute (0 or less = unlimited)
+        burst: Requests allowed back to back before pacing starts
+
+    Returns:
+        The shared RateLimiter
+    """
+    key = (name, rate_per_minute, burst)
+    with _registry_lock:
+        limiter = _rate_limiters.get(key)
+        if limiter is None:
+            limiter = RateLimiter(name, rate_per_minute, burst, shared=settings.SOURCE_RATE_LIMIT_SHARED)
+            _rate_limiters[key] = limiter
+        return limiter
+
+
+def get_rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    """Pacing statistics of every enabled limiter, keyed by source name"""
+    with _registry_lock:
+        limiters = list(_rate_limiters.values())
+    return {limiter.name: limiter.get_stats() for limiter in limiters if limiter.enabled}
@@ -12,6 +12,7 @@ from tenacity import (
 )
 from typing import Callable, Type, Tuple
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -121,28 +122,35 @@ class CircuitBreaker:
         self.failure_count = 0
         self.last_failure_time = None
         self.state = "closed"  # closed, open, half-open
+        # Fetches run concurrently from worker threads; keep counter updates atomic
+        self._lock = threading.Lock()
 
     def record_success(self):
         """Record a successful operation"""
-        self.failure_count = 0
-        self.state = "closed"
+        with self._lock:
+            self.failure_count = 0
+            self.state = "closed"
         logger.debug("Circuit breaker: Success recorded, state=closed")
 
     def record_failure(self):
         """Record a failed operation"""
         from datetime import datetime
 
-        self.failure_count += 1
-        self.last_failure_time = datetime.utcnow()
+        with self._lock:
+            self.failure_count += 1
+            self.last_failure_time = datetime.utcnow()
+            failure_count = self.failure_count
+
+            if failure_count >= self.failure_threshold:
+                self.state = "open"
 
-        if self.failure_count >= self.failure_threshold:
-            self.state = "open"
+        if failure_count >= self.failure_threshold:
             logger.warning(
-                f"Circuit breaker: Opened after {self.failure_count} failures"
+                f"Circuit breaker: Opened after {failure_count} failures"
             )
         else:
             logger.warning(
-                f"Circuit breaker: Failure {self.failure_count}/{self.failure_threshold}"
+                f"Circuit breaker: Failure {failure_count}/{self.failure_threshold}"
             )
 
     def is_open(self) -> bool:
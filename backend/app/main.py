@@ -52,6 +52,21 @@ async def lifespan(app: FastAPI):
         logger.warning("Application will start but database operations may fail")
         # Don't raise - let the app start anyway, database endpoints will fail gracefully
 
+    # Startup: Open the shared HTTP connection pool used by data sources
+    try:
+        from app.core.http import http_session_manager
+        await http_session_manager.start()
+        logger.info("✓ HTTP session pool started")
+    except Exception as e:
+        logger.error(f"✗ Error starting HTTP session pool: {str(e)}")
+
+    # Startup: Subscribe this worker's L1 cache to invalidations
+    try:
+        from app.services.cache_service import cache_service
+        await cache_service.start_invalidation_listener()
+    except Exception as e:
+        logger.error(f"✗ Error starting cache invalidation listener: {str(e)}")
+
     # Startup: Initialize scheduler
     logger.info("Starting scheduler...")
     try:
@@ -104,6 +119,16 @@ async def lifespan(app: FastAPI):
         else:
             logger.warning("⚠ NEWS_API_KEY not configured, skipping news pipeline scheduling")
 
+        # Schedule keyword rescoring when corpus IDF drifts
+        from app.services.keyword_service import rescore_keyword_scores
+        scheduler_service.add_job(
+            func=rescore_keyword_scores,
+            job_id="keyword_rescore",
+            trigger_type="interval",
+            hours=settings.KEYWORD_RESCORE_HOURS
+        )
+        logger.info(f"✓ Keyword rescoring scheduled (every {settings.KEYWORD_RESCORE_HOURS} hours)")
+
     except Exception as e:
         logger.error(f"✗ Error starting scheduler: {str(e)}")
         logger.warning("Scheduler will not run but API endpoints will still work")
@@ -120,6 +145,34 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Error shutting down scheduler: {str(e)}")
 
+    # Shutdown: Close pooled HTTP connections once no job can use them
+    try:
+        from app.core.http import http_session_manager
+        await http_session_manager.close()
+    except Exception as e:
+        logger.error(f"Error closing HTTP session pool: {str(e)}")
+
+    # Shutdown: Close the async Redis cache pool
+    try:
+        from app.services.cache_service import cache_service
+        await cache_service.close()
+    except Exception as e:
+        logger.error(f"Error closing cache connection pool: {str(e)}")
+
+    # Shutdown: Stop the pipeline executor (lets an in-progress run finish)
+    try:
+        from app.core.executor import shutdown_pipeline_executor
+        shutdown_pipeline_executor(wait=True)
+    except Exception as e:
+        logger.error(f"Error shutting down pipeline executor: {str(e)}")
+
+    # Shutdown: Stop the Reddit fetch threads and drop their clients
+    try:
+        from app.services.reddit_service import shutdown_fetch_executor
+        shutdown_fetch_executor(wait=False)
+    except Exception as e:
+        logger.error(f"Error shutting down Reddit fetch executor: {str(e)}")
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
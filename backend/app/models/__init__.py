@@ -6,5 +6,10 @@ from app.models.pipeline_run import PipelineRun
 from app.models.article import Article
 from app.models.entity import Entity
 from app.models.keyword import Keyword
+from app.models.keyword_document_frequency import KeywordDocumentFrequency
+from app.models.source_watermark import SourceWatermark
+from app.models.backfill_checkpoint import BackfillCheckpoint
+from app.models.job_lock_hold import JobLockHold
 
-__all__ = ["RedditPost", "ContactMessage", "Visit", "PipelineRun", "Article", "Entity", "Keyword"]
+__all__ = ["RedditPost", "ContactMessage", "Visit", "PipelineRun", "Article", "Entity", "Keyword",
+           "KeywordDocumentFrequency", "SourceWatermark", "BackfillCheckpoint", "JobLockHold"]
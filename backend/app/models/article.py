@@ -2,7 +2,7 @@
 Article Model - Unified data model for content from all sources
 Represents articles, posts, tweets, etc. in a consistent format
 """
-from sqlalchemy import Column, String, Integer, Float, DateTime, Text, Boolean, JSON
+from sqlalchemy import Column, String, Integer, Float, DateTime, Text, Boolean, JSON, LargeBinary
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
@@ -34,6 +34,9 @@ class Article(Base):
     content = Column(Text, nullable=True)  # Full text content
     summary = Column(Text, nullable=True)  # Short summary/excerpt
     url = Column(String(1000), nullable=True)
+    content_hash = Column(String(64), nullable=True)  # Fingerprint of normalized title + content
+    minhash = Column(LargeBinary, nullable=True)  # MinHash signature of title + content shingles
+    duplicate_of = Column(String, nullable=True, index=True)  # external_id of the canonical copy of this story
     image_url = Column(String(1000), nullable=True)
 
     # Author/creator information
@@ -43,7 +46,7 @@ class Article(Base):
     # Timestamps
     published_at = Column(DateTime, nullable=False, index=True)  # When content was published
     retrieved_at = Column(DateTime, server_default=func.now(), nullable=False)  # When we fetched it
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), index=True)
 
     # Engagement metrics
     score = Column(Integer, default=0)  # Upvotes, likes, shares, etc.
@@ -0,0 +1,44 @@
+"""
+Backfill Checkpoint Model
+Progress of one backfill slice, so an interrupted backfill can resume
+"""
+from sqlalchemy import Column, Integer, String, DateTime, Text, UniqueConstraint, func
+from app.db.database import Base
+
+
+class BackfillCheckpoint(Base):
+    """
+    Position reached in one (source, query, slice) of a backfill
+
+    ``slice_key`` is the slice's time range: a day (``2026-09-17``) for news
+    or a Reddit time filter (``year``). ``page`` and ``cursor`` point at the
+    next page to request (a NewsAPI page number or a Reddit ``after``
+    fullname); ``page_offset`` counts the items of that page already
+    committed, so a resumed slice skips exactly those.
+    """
+    __tablename__ = "backfill_checkpoints"
+    __table_args__ = (
+        UniqueConstraint("source", "query", "slice_key", name="uq_backfill_checkpoints_slice"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    source = Column(String(50), nullable=False, index=True)  # reddit, news
+    query = Column(String(255), nullable=False)
+    slice_key = Column(String(100), nullable=False)
+    status = Column(String(20), nullable=False, default="pending")  # pending, running, done, failed
+    page = Column(Integer, nullable=False, default=1)  # Next page to request
+    cursor = Column(String(100), nullable=True)  # Reddit "after" fullname of the next page
+    page_offset = Column(Integer, nullable=False, default=0)  # Items of the next page already committed
+    items_fetched = Column(Integer, nullable=False, default=0)
+    records_stored = Column(Integer, nullable=False, default=0)
+    records_updated = Column(Integer, nullable=False, default=0)
+    records_failed = Column(Integer, nullable=False, default=0)
+    error_message = Column(Text, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return (
+            f"<BackfillCheckpoint(source={self.source}, query={self.query}, slice={self.slice_key}, "
+            f"status={self.status}, page={self.page})>"
+        )
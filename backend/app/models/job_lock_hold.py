@@ -0,0 +1,24 @@
+"""
+Job Lock Hold Model
+How long a finished scheduled run keeps its job locked, for the database lock
+"""
+from sqlalchemy import Column, String, DateTime
+from app.db.database import Base
+
+
+class JobLockHold(Base):
+    """
+    Hold left by the last run of a scheduled job
+
+    Redis keeps a hold by extending the lock key's expiry; the Postgres
+    advisory lock can't outlive its connection, so its hold is this row.
+    Workers taking the advisory lock skip the run until ``held_until``.
+    """
+    __tablename__ = "scheduler_lock_holds"
+
+    job_id = Column(String(200), primary_key=True)
+    holder = Column(String(200), nullable=False)  # Worker ID (host:pid)
+    held_until = Column(DateTime, nullable=False)  # UTC
+
+    def __repr__(self):
+        return f"<JobLockHold(job_id={self.job_id}, holder={self.holder}, held_until={self.held_until})>"
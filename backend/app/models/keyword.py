@@ -24,6 +24,7 @@ class Keyword(Base):
     # Keyword information
     keyword = Column(String(100), nullable=False, index=True)
     score = Column(Float, nullable=False)  # TF-IDF or importance score
+    idf = Column(Float, nullable=True)  # IDF the score was computed with (NULL = per-document fit, i.e. 1.0)
 
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,32 @@
+"""
+Keyword Document Frequency Model
+Incremental document-frequency counts behind keyword IDF scores
+"""
+from sqlalchemy import Column, Integer, DateTime, func
+from app.db.database import Base
+
+
+class KeywordDocumentFrequency(Base):
+    """
+    Number of keyworded documents containing each hashed term
+
+    Terms are hashed into a fixed number of buckets (KEYWORD_HASH_FEATURES),
+    so the table size is bounded no matter how large the vocabulary grows.
+    The row with ``term_hash == CORPUS_SIZE_BUCKET`` holds the total number
+    of documents counted; the row with ``term_hash == BOOTSTRAP_BUCKET``
+    exists once the counts have been rebuilt from the stored articles.
+    """
+    __tablename__ = "keyword_document_frequencies"
+
+    # Reserved bucket holding the corpus size
+    CORPUS_SIZE_BUCKET = -1
+
+    # Reserved bucket marking a completed rebuild (holds the documents counted)
+    BOOTSTRAP_BUCKET = -2
+
+    term_hash = Column(Integer, primary_key=True, autoincrement=False)
+    document_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<KeywordDocumentFrequency(term_hash={self.term_hash}, document_count={self.document_count})>"
@@ -29,6 +29,7 @@ class PipelineRun(Base):
     records_stored = Column(Integer, default=0)
     records_updated = Column(Integer, default=0)
     records_failed = Column(Integer, default=0)
+    enrichment_skipped = Column(Integer, default=0)  # Unchanged records that skipped sentiment/NER/keywords
 
     # Data Quality
     data_quality_score = Column(Float, nullable=True)  # 0-100 score
@@ -44,6 +45,7 @@ class PipelineRun(Base):
 
     # Source-specific metrics (JSON stored as text)
     source_metrics = Column(Text, nullable=True)  # JSON string with per-source stats
+    stage_metrics = Column(Text, nullable=True)  # JSON string with per-stage throughput/queue depth
 
     # Retry Information
     retry_count = Column(Integer, default=0)
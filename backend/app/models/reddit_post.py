@@ -1,7 +1,7 @@
 """
 Reddit Post Model
 """
-from sqlalchemy import Column, String, Integer, Float, DateTime, Text, Boolean
+from sqlalchemy import Column, String, Integer, Float, DateTime, Text, Boolean, LargeBinary
 from sqlalchemy.sql import func
 from app.db.database import Base
 
@@ -21,6 +21,10 @@ class RedditPost(Base):
     upvote_ratio = Column(Float)
     created_utc = Column(DateTime, index=True)
     retrieved_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), index=True)
+    content_hash = Column(String(64), nullable=True)  # Fingerprint of normalized title + content
+    minhash = Column(LargeBinary, nullable=True)  # MinHash signature of title + content shingles
+    duplicate_of = Column(String, nullable=True, index=True)  # id of the canonical post of this story
 
     # Sentiment Analysis Fields (will be populated later)
     sentiment_score = Column(Float, nullable=True)
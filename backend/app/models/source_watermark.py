@@ -0,0 +1,31 @@
+"""
+Source Watermark Model
+High-water marks that let scheduled fetches ask only for new items
+"""
+from sqlalchemy import Column, Integer, String, DateTime, JSON, UniqueConstraint, func
+from app.db.database import Base
+
+
+class SourceWatermark(Base):
+    """
+    Newest item seen per source listing
+
+    ``key`` identifies one listing of a source, e.g. ``r/python`` or
+    ``search:hasbro`` for Reddit and ``everything:hasbro`` for news.
+    ``last_seen_ids`` holds the items inside the overlap window below
+    ``last_seen_at``, so re-requested boundary items can be skipped.
+    """
+    __tablename__ = "source_watermarks"
+    __table_args__ = (
+        UniqueConstraint("source", "key", name="uq_source_watermarks_source_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    source = Column(String(50), nullable=False, index=True)  # reddit, news
+    key = Column(String(200), nullable=False)
+    last_seen_at = Column(DateTime, nullable=True)  # Newest created_utc / published_at seen (UTC)
+    last_seen_ids = Column(JSON, nullable=True)  # IDs seen within the overlap window
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<SourceWatermark(source={self.source}, key={self.key}, last_seen_at={self.last_seen_at})>"
@@ -23,6 +23,7 @@ class PipelineRunUpdate(BaseModel):
     records_stored: Optional[int] = None
     records_updated: Optional[int] = None
     records_failed: Optional[int] = None
+    enrichment_skipped: Optional[int] = None
     data_quality_score: Optional[float] = None
     validation_errors: Optional[int] = None
     avg_processing_time_ms: Optional[float] = None
@@ -30,6 +31,7 @@ class PipelineRunUpdate(BaseModel):
     error_type: Optional[str] = None
     stack_trace: Optional[str] = None
     source_metrics: Optional[str] = None
+    stage_metrics: Optional[str] = None
     retry_count: Optional[int] = None
 
 
@@ -47,11 +49,14 @@ class PipelineRunResponse(BaseModel):
     records_stored: int
     records_updated: int
     records_failed: int
+    enrichment_skipped: Optional[int] = 0
     data_quality_score: Optional[float]
     validation_errors: int
     avg_processing_time_ms: Optional[float]
     error_message: Optional[str]
     error_type: Optional[str]
+    source_metrics: Optional[str] = None
+    stage_metrics: Optional[str] = None
     retry_count: int
     is_retry: bool
 
@@ -79,6 +84,7 @@ class JobScheduleRequest(BaseModel):
     pipeline_name: str = Field(..., description="Name of the pipeline to run")
     trigger_type: str = Field(..., description="interval or cron")
     trigger_args: Dict[str, Any] = Field(..., description="Arguments for the trigger (e.g., {hours: 6} for interval)")
+    params: Dict[str, Any] = Field(default_factory=dict, description="Pipeline parameters (e.g., {time_filter: 'week'})")
 
 
 class JobResponse(BaseModel):
@@ -89,10 +95,13 @@ class JobResponse(BaseModel):
     trigger: str
     pending: bool
     metadata: Dict[str, Any]
+    lock: Optional[Dict[str, Any]] = Field(None, description="Worker holding the job's cross-worker lock")
 
 
 class JobStatusResponse(BaseModel):
     """Schema for overall scheduler status"""
     running: bool
+    leader: Optional[bool] = Field(None, description="Whether this worker's scheduler runs the jobs")
     total_jobs: int
     jobs: list[JobResponse]
+    lock: Optional[Dict[str, Any]] = Field(None, description="Job lock settings and this worker's ID")
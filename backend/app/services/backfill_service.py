@@ -0,0 +1,402 @@
+"""
+Backfill Service
+Resumable backfills split into checkpointed slices that run concurrently
+"""
+import asyncio
+import threading
+import time
+from contextlib import aclosing
+from dataclasses import dataclass
+from datetime import datetime, date, timedelta
+from typing import List, Dict, Any, Optional, AsyncIterator, Callable, Iterable, Tuple
+import logging
+
+from app.core.config import settings
+from app.core.executor import run_blocking
+from app.core.rate_limit import get_rate_limiter
+from app.models.backfill_checkpoint import BackfillCheckpoint
+from app.services.ingestion_service import ingest_reddit_posts, ingest_articles, enrich_articles
+from app.services.reddit_service import RedditService
+
+logger = logging.getLogger(__name__)
+
+# RedditService of this process's pipeline workers, built on first search
+_reddit_service: Optional[RedditService] = None
+_reddit_service_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class BackfillSlice:
+    """
+    One independently resumable unit of a backfill
+
+    Attributes:
+        source: "reddit" or "news"
+        query: Search query
+        slice_key: Reddit time filter (``year``) or news day (``2026-09-17``)
+    """
+    source: str
+    query: str
+    slice_key: str
+
+    def __str__(self) -> str:
+        return f"{self.source}:{self.query}:{self.slice_key}"
+
+
+def plan_reddit_slices(queries: Iterable[str], time_filters: Iterable[str] = ("year", "all")) -> List[BackfillSlice]:
+    """One slice per (query, Reddit time filter)"""
+    return [BackfillSlice("reddit", query, time_filter) for query in queries for time_filter in time_filters]
+
+
+def plan_news_slices(queries: Iterable[str], days_back: int, end: Optional[date] = None) -> List[BackfillSlice]:
+    """
+    One slice per (query, day), newest day first
+
+    Args:
+        queries: Search queries
+        days_back: Number of days to cover, ending with ``end``
+        end: Last day to backfill (default: today, UTC)
+    """
+    end = end or datetime.utcnow().date()
+    return [
+        BackfillSlice("news", query, (end - timedelta(days=offset)).isoformat())
+        for query in queries
+        for offset in range(days_back)
+    ]
+
+
+def load_checkpoints(slices: List[BackfillSlice], reset: bool = False) -> Dict[BackfillSlice, Dict[str, Any]]:
+    """
+    Load (creating missing) checkpoints for the given slices
+
+    Args:
+        slices: Slices of the backfill
+        reset: Start every slice over from its first page
+
+    Returns:
+        ``slice -> {status, page, cursor, page_offset, items_fetched}``
+    """
+    from app.db import get_session_local
+
+    db = get_session_local()()
+    try:
+        stored = {
+            (row.source, row.query, row.slice_key): row
+            for row in db.query(BackfillCheckpoint).filter(
+                BackfillCheckpoint.source.in_({s.source for s in slices})
+            )
+        }
+        rows = {}
+        for backfill_slice in slices:
+            row = stored.get((backfill_slice.source, backfill_slice.query, backfill_slice.slice_key))
+            if row is None:
+                row = BackfillCheckpoint(
+                    source=backfill_slice.source,
+                    query=backfill_slice.query,
+                    slice_key=backfill_slice.slice_key
+                )
+                db.add(row)
+            if row.status is None or reset:
+                row.status = "pending"
+                row.page = 1
+                row.cursor = None
+                row.page_offset = 0
+                row.items_fetched = row.records_stored = row.records_updated = row.records_failed = 0
+                row.error_message = None
+                row.completed_at = None
+            rows[backfill_slice] = row
+        db.commit()
+
+        return {
+            backfill_slice: {
+                "status": row.status,
+                "page": row.page,
+                "cursor": row.cursor,
+                "page_offset": row.page_offset,
+                "items_fetched": row.items_fetched,
+            }
+            for backfill_slice, row in rows.items()
+        }
+    finally:
+        db.close()
+
+
+def save_checkpoint(
+    backfill_slice: BackfillSlice,
+    counts: Optional[Dict[str, int]] = None,
+    items: int = 0,
+    **fields
+):
+    """
+    Update a slice's checkpoint
+
+    Args:
+        backfill_slice: The slice
+        counts: ``stored``/``updated``/``failed`` counts to add
+        items: Fetched items to add
+        **fields: Columns to set (status, page, cursor, page_offset, ...)
+    """
+    from app.db import get_session_local
+
+    db = get_session_local()()
+    try:
+        row = db.query(BackfillCheckpoint).filter_by(
+            source=backfill_slice.source,
+            query=backfill_slice.query,
+            slice_key=backfill_slice.slice_key
+        ).one()
+        for name, value in fields.items():
+            setattr(row, name, value)
+        if fields.get("status") == "done":
+            row.completed_at = datetime.utcnow()
+        row.items_fetched += items
+        if counts:
+            row.records_stored += counts.get("stored", 0)
+            row.records_updated += counts.get("updated", 0)
+            row.records_failed += counts.get("failed", 0)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _commit_batch(backfill_slice: BackfillSlice, items: List[Any], checkpoint: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Ingest one batch, then move the slice's checkpoint past it
+
+    The batch is written before the checkpoint, so a crash in between
+    re-ingests the batch on resume; the upserts make that harmless.
+
+    Returns:
+        ``stored``/``updated``/``failed`` counts of the batch
+    """
+    from app.db import get_session_local
+
+    db = get_session_local()()
+    try:
+        if backfill_slice.source == "reddit":
+            counts = ingest_reddit_posts(db, items, chunk_size=len(items))
+        else:
+            counts, id_map, enrich_ids = ingest_articles(db, items, chunk_size=len(items))
+            enrich_articles(db, items, {external_id: id_map[external_id] for external_id in enrich_ids})
+    finally:
+        db.close()
+
+    save_checkpoint(backfill_slice, counts=counts, items=len(items), **checkpoint)
+    return counts
+
+
+def _search_page(query: str, time_filter: str, after: Optional[str], page_size: int):
+    """
+    Fetch one Reddit search page in a pipeline executor worker
+
+    Module-level so process pool workers can run it: each worker process
+    builds its own RedditService on first use and keeps it (the service gives
+    every thread its own PRAW client).
+
+    Returns:
+        Tuple of (posts, ``after`` for the next page or None on the last page)
+    """
+    global _reddit_service
+    with _reddit_service_lock:
+        if _reddit_service is None:
+            _reddit_service = RedditService()
+    return _reddit_service.search_page(query, time_filter=time_filter, after=after, page_size=page_size)
+
+
+class BackfillEngine:
+    """
+    Process backfill slices concurrently, checkpointing every batch
+
+    Up to ``concurrency`` slices run at once. Requests stay within the
+    sources' rate limits: NewsAPI requests are paced by the service's own
+    limiter and Reddit search pages by BACKFILL_REDDIT_RATE_LIMIT. Each page
+    is committed in batches of ``batch_size`` items together with the
+    checkpoint position, so a restarted backfill skips finished slices and
+    continues the others at the first uncommitted item.
+
+    Usage:
+        engine = BackfillEngine()
+        summary = await engine.run(plan_reddit_slices(["hasbro"]))
+    """
+
+    def __init__(
+        self,
+        search_page: Callable[..., Tuple[List[Any], Optional[str]]] = _search_page,
+        news_service=None,
+        concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        page_size: int = 100,
+        max_items: Optional[int] = None
+    ):
+        """
+        Initialize the engine
+
+        Args:
+            search_page: Fetches one Reddit search page for "reddit" slices,
+                ``(query, time_filter, after, page_size) -> (posts, after)``;
+                runs in the pipeline executor, so with a process pool it must
+                be a module-level function
+            news_service: NewsAPIService for "news" slices
+            concurrency: Slices processed at once (default: BACKFILL_CONCURRENCY)
+            batch_size: Items per commit (default: BACKFILL_BATCH_SIZE)
+            page_size: Items requested per page (max 100 for both sources)
+            max_items: Item budget per slice and run (None = until the results
+                run out); a slice that spends it stays pending for the next run
+        """
+        self.search_page = search_page
+        self.news_service = news_service
+        self.concurrency = max(1, concurrency or settings.BACKFILL_CONCURRENCY)
+        self.batch_size = max(1, batch_size or settings.BACKFILL_BATCH_SIZE)
+        self.page_size = page_size
+        self.max_items = max_items
+        self.reddit_limiter = get_rate_limiter("reddit_backfill", settings.BACKFILL_REDDIT_RATE_LIMIT)
+        self.totals = {"items": 0, "stored": 0, "updated": 0, "failed": 0}
+        self.slices = {"total": 0, "done": 0, "paused": 0, "failed": 0, "skipped": 0}
+        self._started = time.perf_counter()
+
+    async def _pages(
+        self,
+        backfill_slice: BackfillSlice,
+        state: Dict[str, Any]
+    ) -> AsyncIterator[Tuple[List[Any], Dict[str, Any]]]:
+        """
+        Yield a slice's pages from its checkpoint on
+
+        Yields:
+            Tuples of (items, checkpoint fields pointing past the page)
+        """
+        page = state["page"]
+        if backfill_slice.source == "reddit":
+            after = state["cursor"]
+            while True:
+                await self.reddit_limiter.acquire()
+                posts, after = await run_blocking(
+                    self.search_page, backfill_slice.query, backfill_slice.slice_key, after, self.page_size
+                )
+                page += 1
+                # The last page finishes the slice in the same checkpoint write
+                yield posts, {"page": page, "cursor": after, **({"status": "done"} if after is None else {})}
+                if after is None:
+                    return
+        elif backfill_slice.source == "news":
+            day = backfill_slice.slice_key
+            async for raw in self.news_service.fetch_pages(
+                query=backfill_slice.query,
+                endpoint="everything",
+                page_size=self.page_size,
+                start_page=page,
+                sortBy="publishedAt",  # Stable page contents while resuming
+                **{"from": f"{day}T00:00:00", "to": f"{day}T23:59:59"}
+            ):
+                page += 1
+                yield self.news_service.transform_and_validate(raw), {"page": page}
+        else:
+            raise ValueError(f"Unsupported backfill source: {backfill_slice.source}")
+
+    async def _run_slice(self, backfill_slice: BackfillSlice, state: Dict[str, Any]):
+        """Process one slice from its checkpoint to the end of its results (or the item budget)"""
+        offset = state["page_offset"]
+        fetched = 0
+        logger.info(f"Backfill slice {backfill_slice} starting at page {state['page']} (offset {offset})")
+
+        try:
+            await run_blocking(save_checkpoint, backfill_slice, status="running", error_message=None)
+            pages = self._pages(backfill_slice, state)
+            async with aclosing(pages):
+                async for items, next_position in pages:
+                    # Items committed before an interruption are skipped
+                    items = items[offset:]
+                    if not items:
+                        await run_blocking(save_checkpoint, backfill_slice, page_offset=0, **next_position)
+                    for start in range(0, len(items), self.batch_size):
+                        batch = items[start:start + self.batch_size]
+                        if start + self.batch_size >= len(items):
+                            checkpoint = {"page_offset": 0, **next_position}
+                        else:
+                            checkpoint = {"page_offset": offset + start + len(batch)}
+                        counts = await run_blocking(_commit_batch, backfill_slice, batch, checkpoint)
+                        self._add(len(batch), counts)
+                    fetched += len(items)
+                    offset = 0
+
+                    exhausted = next_position.get("status") == "done"
+                    if self.max_items is not None and fetched >= self.max_items and not exhausted:
+                        # The checkpoint already points past the last batch, so the next run resumes there
+                        logger.info(f"Backfill slice {backfill_slice} reached its {self.max_items} item budget")
+                        await run_blocking(save_checkpoint, backfill_slice, status="pending")
+                        self.slices["paused"] += 1
+                        return
+
+            await run_blocking(save_checkpoint, backfill_slice, status="done")
+            self.slices["done"] += 1
+        except Exception as e:
+            logger.error(f"Backfill slice {backfill_slice} failed: {str(e)}")
+            self.slices["failed"] += 1
+            try:
+                await run_blocking(save_checkpoint, backfill_slice, status="failed", error_message=str(e))
+            except Exception as save_error:
+                logger.error(f"Could not record failure of {backfill_slice}: {str(save_error)}")
+
+    def _add(self, items: int, counts: Dict[str, int]):
+        self.totals["items"] += items
+        for key in ("stored", "updated", "failed"):
+            self.totals[key] += counts.get(key, 0)
+
+    def progress(self) -> Dict[str, Any]:
+        """Slice counts, record totals and throughput so far"""
+        elapsed = time.perf_counter() - self._started
+        return {
+            "slices": dict(self.slices),
+            **self.totals,
+            "elapsed_seconds": round(elapsed, 2),
+            "items_per_second": round(self.totals["items"] / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+
+    def _log_progress(self):
+        p = self.progress()
+        finished = sum(p["slices"][key] for key in ("done", "paused", "failed", "skipped"))
+        logger.info(
+            f"Backfill progress: {finished}/{p['slices']['total']} slices "
+            f"({p['slices']['paused']} paused, {p['slices']['failed']} failed), {p['items']} items, "
+            f"stored={p['stored']} updated={p['updated']} failed={p['failed']}, "
+            f"{p['items_per_second']} items/s"
+        )
+
+    async def _report_progress(self):
+        while True:
+            await asyncio.sleep(settings.BACKFILL_PROGRESS_SECONDS)
+            self._log_progress()
+
+    async def run(self, slices: List[BackfillSlice], reset: bool = False) -> Dict[str, Any]:
+        """
+        Run every unfinished slice
+
+        Args:
+            slices: Slices of the backfill
+            reset: Ignore existing checkpoints and start every slice over
+
+        Returns:
+            Final ``progress()``
+        """
+        self._started = time.perf_counter()
+        states = await run_blocking(load_checkpoints, slices, reset)
+        pending = [(s, state) for s, state in states.items() if state["status"] != "done"]
+        self.slices["total"] = len(slices)
+        self.slices["skipped"] = len(slices) - len(pending)
+        if self.slices["skipped"]:
+            logger.info(f"Skipping {self.slices['skipped']} backfill slices finished by an earlier run")
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run_one(backfill_slice: BackfillSlice, state: Dict[str, Any]):
+            async with semaphore:
+                await self._run_slice(backfill_slice, state)
+
+        reporter = asyncio.create_task(self._report_progress())
+        try:
+            await asyncio.gather(*(run_one(s, state) for s, state in pending))
+        finally:
+            reporter.cancel()
+
+        self._log_progress()
+        return self.progress()
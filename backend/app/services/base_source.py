@@ -2,12 +2,18 @@
 Base Data Source Abstraction Layer
 Provides common interface for all data sources (Reddit, News, Twitter, etc.)
 """
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 from datetime import datetime
 from enum import Enum
 import logging
 
+import aiohttp
+
+from app.core.http import http_session_manager
+from app.core.rate_limit import get_rate_limiter
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,13 +33,15 @@ class DataSourceConfig:
         self,
         source_type: SourceType,
         api_key: Optional[str] = None,
-        rate_limit: int = 100,
+        rate_limit: int = 100,  # Requests per minute (0 = unlimited)
         timeout: int = 30,
+        rate_limit_burst: int = 1,  # Requests allowed back to back before pacing starts
         **kwargs
     ):
         self.source_type = source_type
         self.api_key = api_key
         self.rate_limit = rate_limit
+        self.rate_limit_burst = rate_limit_burst
         self.timeout = timeout
         self.extra_config = kwargs
 
@@ -46,12 +54,25 @@ class BaseDataSource(ABC):
     - fetch(): Retrieve raw data from the source
     - transform(): Convert raw data to unified format
     - validate(): Check data quality and completeness
+
+    Paginated sources can also override fetch_pages() so stream() yields
+    more than one page. HTTP sources should make their requests through
+    http_request() so they share the process-wide connection pool.
+
+    Fetches are paced to ``config.rate_limit`` by a limiter shared by every
+    instance of the source. Sources that send several requests per fetch
+    set ``paces_requests`` and call ``throttle()`` before each one instead.
     """
 
+    paces_requests: bool = False
+
     def __init__(self, config: DataSourceConfig):
         self.config = config
         self.source_type = config.source_type
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.rate_limiter = get_rate_limiter(
+            self.source_type.value, config.rate_limit, config.rate_limit_burst
+        )
 
     @abstractmethod
     async def fetch(self, **kwargs) -> List[Dict[str, Any]]:
@@ -92,6 +113,102 @@ class BaseDataSource(ABC):
         """
         pass
 
+    async def throttle(self) -> float:
+        """
+        Wait until the source's rate limit allows another request
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = await self.rate_limiter.acquire()
+        if waited > 0:
+            self.logger.debug(f"Waited {waited:.2f}s for the {self.source_type.value} rate limit")
+        return waited
+
+    async def paced_fetch(self, **kwargs) -> List[Dict[str, Any]]:
+        """
+        ``fetch`` within the source's rate limit
+
+        Args:
+            **kwargs: Source-specific fetch parameters
+
+        Returns:
+            List of raw data items from the source
+        """
+        if not self.paces_requests:
+            await self.throttle()
+        return await self.fetch(**kwargs)
+
+    async def fetch_pages(self, **kwargs) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Fetch raw data page by page
+
+        The default yields the single page ``fetch`` returns; paginated
+        sources override this.
+
+        Args:
+            **kwargs: Source-specific parameters
+
+        Yields:
+            Lists of raw data items, one per page
+        """
+        yield await self.paced_fetch(**kwargs)
+
+    async def stream(
+        self,
+        max_items: Optional[int] = None,
+        prefetch: int = 1,
+        **kwargs
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yield validated, transformed items page by page
+
+        Pages are fetched by a background task up to ``prefetch`` pages ahead,
+        so the next request is in flight while the caller processes the
+        current page, and memory stays bounded by ``prefetch`` pages.
+
+        Args:
+            max_items: Stop after this many items (None = no budget)
+            prefetch: Pages buffered ahead of the consumer
+            **kwargs: Source-specific ``fetch_pages`` parameters
+
+        Yields:
+            Lists of validated items in unified format
+        """
+        pages: asyncio.Queue = asyncio.Queue(maxsize=max(1, prefetch))
+        done = object()
+
+        async def produce():
+            try:
+                async for page in self.fetch_pages(**kwargs):
+                    await pages.put(page)
+                await pages.put(done)
+            except Exception as e:
+                await pages.put(e)
+
+        producer = asyncio.create_task(produce())
+        remaining = max_items
+        try:
+            while remaining is None or remaining > 0:
+                page = await pages.get()
+                if page is done:
+                    break
+                if isinstance(page, Exception):
+                    raise page
+
+                items = self.transform_and_validate(page)
+                if remaining is not None:
+                    items = items[:remaining]
+                    remaining -= len(items)
+                if items:
+                    yield items
+        finally:
+            producer.cancel()
+            try:
+                await producer
+            except asyncio.CancelledError:
+                pass
+
     def validate(self, data: Dict[str, Any]) -> bool:
         """
         Validate a single data item
@@ -122,6 +239,29 @@ class BaseDataSource(ABC):
 
         return True
 
+    def transform_and_validate(self, raw_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Transform raw data and drop items that fail validation
+
+        Args:
+            raw_data: Raw data from the source
+
+        Returns:
+            List of validated, transformed data items
+        """
+        self.logger.info(f"Transforming {len(raw_data)} items from {self.source_type}")
+        transformed_data = self.transform(raw_data)
+
+        valid_data = [item for item in transformed_data if self.validate(item)]
+
+        if len(valid_data) < len(transformed_data):
+            self.logger.warning(
+                f"Filtered {len(transformed_data) - len(valid_data)} invalid items "
+                f"from {self.source_type}"
+            )
+
+        return valid_data
+
     async def fetch_and_transform(self, **kwargs) -> List[Dict[str, Any]]:
         """
         Convenience method to fetch and transform data in one call
@@ -135,24 +275,14 @@ class BaseDataSource(ABC):
         try:
             # Fetch raw data
             self.logger.info(f"Fetching data from {self.source_type}")
-            raw_data = await self.fetch(**kwargs)
+            raw_data = await self.paced_fetch(**kwargs)
 
             if not raw_data:
                 self.logger.warning(f"No data fetched from {self.source_type}")
                 return []
 
-            # Transform to unified format
-            self.logger.info(f"Transforming {len(raw_data)} items from {self.source_type}")
-            transformed_data = self.transform(raw_data)
-
-            # Validate and filter
-            valid_data = [item for item in transformed_data if self.validate(item)]
-
-            if len(valid_data) < len(transformed_data):
-                self.logger.warning(
-                    f"Filtered {len(transformed_data) - len(valid_data)} invalid items "
-                    f"from {self.source_type}"
-                )
+            # Transform to unified format, then validate and filter
+            valid_data = self.transform_and_validate(raw_data)
 
             self.logger.info(f"Successfully processed {len(valid_data)} items from {self.source_type}")
             return valid_data
@@ -161,6 +291,26 @@ class BaseDataSource(ABC):
             self.logger.error(f"Error processing data from {self.source_type}: {str(e)}")
             raise
 
+    def http_request(self, method: str, url: str, **kwargs) -> Any:
+        """
+        Start a request on the shared, pooled HTTP session
+
+        Use as ``async with self.http_request("GET", url, params=...) as response``.
+        The request defaults to this source's configured timeout and is
+        counted under the source's name in the HTTP pool stats.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Passed through to ``aiohttp.ClientSession.request``
+
+        Returns:
+            aiohttp request context manager
+        """
+        kwargs.setdefault("timeout", aiohttp.ClientTimeout(total=self.config.timeout))
+        kwargs.setdefault("trace_request_ctx", {"source": self.source_type.value})
+        return http_session_manager.session().request(method, url, **kwargs)
+
     def get_metadata(self) -> Dict[str, Any]:
         """
         Get metadata about this data source
@@ -171,6 +321,7 @@ class BaseDataSource(ABC):
         return {
             "source_type": self.source_type.value,
             "rate_limit": self.config.rate_limit,
+            "rate_limiter": self.rate_limiter.get_stats(),
             "timeout": self.config.timeout,
         }
 
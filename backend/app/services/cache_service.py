@@ -2,24 +2,191 @@
 Redis Cache Service
 Provides caching functionality for API endpoints
 """
+import asyncio
+import fnmatch
 import json
 import hashlib
+import inspect
 import logging
-from typing import Any, Optional, Callable
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Optional, Callable, Awaitable, Dict, List, Tuple
 from functools import wraps
 import redis
+from redis import asyncio as aioredis
 from app.core.config import settings
+from app.core.job_lock import get_worker_id
 
 logger = logging.getLogger(__name__)
 
+# Marks an L1 miss (a cached value may itself be falsy)
+_MISSING = object()
+
+# Envelope field of @cached(soft_ttl=...) values: epoch seconds they stay fresh until
+_FRESH_UNTIL = "__fresh_until__"
+
+# Set of every @cached prefix that has a tag set ("tag:<prefix>") of its keys
+_TAG_INDEX_KEY = "tags"
+
+# Keys per SCAN page and per DEL/SREM call
+_BATCH_SIZE = 500
+
+# Release a recompute lock only if this worker still holds it
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Untrack tagged keys that no longer exist, then drop the tag from the index
+# if its set is gone; atomic, so a key written meanwhile stays tracked
+_PRUNE_TAG_SCRIPT = """
+local removed = 0
+for i = 2, #ARGV do
+    if redis.call('EXISTS', ARGV[i]) == 0 then
+        removed = removed + redis.call('SREM', KEYS[1], ARGV[i])
+    end
+end
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    redis.call('SREM', KEYS[2], ARGV[1])
+end
+return removed
+"""
+
+
+class LocalCache:
+    """
+    Size-bounded in-process LRU of decoded cache values
+
+    Entries expire after their own TTL and the least recently used entry is
+    evicted once ``max_entries`` is reached. Values are shared between
+    callers, so they must not be mutated. Thread-safe, since the sync cache
+    API runs on executor threads.
+    """
+
+    def __init__(self, max_entries: int):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Most entries kept at once
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; fills started before one are dropped
+        self.generation = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def get(self, key: str) -> Any:
+        """Cached value, or ``_MISSING``"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                self.stats["expirations"] += 1
+                entry = None
+            if entry is None:
+                self.stats["misses"] += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl: float, generation: Optional[int] = None):
+        """
+        Cache a value
+
+        Args:
+            key: Cache key
+            value: Decoded value
+            ttl: Lifetime in seconds (0 disables L1 for this key)
+            generation: ``self.generation`` when the value was read; the value
+                is dropped if an invalidation happened since
+        """
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def invalidate(self, pattern: str) -> int:
+        """
+        Drop entries whose key matches a Redis-style glob pattern
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            self.generation += 1
+            keys = [key for key in self._entries if fnmatch.fnmatchcase(key, pattern)]
+            for key in keys:
+                del self._entries[key]
+            self.stats["invalidations"] += len(keys)
+        return len(keys)
+
+    def clear(self) -> int:
+        """Drop every entry"""
+        return self.invalidate("*")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Entry count and hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                **self.stats,
+                "hit_rate": self.stats["hits"] / max(lookups, 1) * 100,
+            }
+
 
 class CacheService:
-    """Redis cache service for API responses"""
+    """
+    Redis cache service for API responses
+
+    Two clients share the same keys. The ``aget``/``aset``/... coroutines use
+    a pooled ``redis.asyncio`` client and are what request handlers and
+    ``@cached`` await, so a cache round trip never blocks the event loop. The
+    synchronous ``get``/``set``/... API is kept for scripts and other
+    blocking code.
+
+    The async path has a two-tier lookup: an in-process ``LocalCache`` (L1)
+    in front of Redis (L2), so hot keys skip both the round trip and JSON
+    decoding. Deletes publish their pattern on CACHE_INVALIDATION_CHANNEL and
+    every worker's listener evicts it from its L1. L1 is only served while
+    this worker is subscribed, so it never outlives a missed invalidation by
+    more than it takes to notice the lost subscription.
+    """
 
     def __init__(self):
         """Initialize Redis connection"""
         self._redis_client: Optional[redis.Redis] = None
         self._enabled = settings.CACHE_ENABLED
+        self._async_client: Optional[aioredis.Redis] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_retry_at = 0.0
+        self.local = LocalCache(settings.CACHE_L1_MAX_ENTRIES)
+        self._l1_ttls: Dict[str, float] = {}
+        self._l2_stats = {"hits": 0, "misses": 0}
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribed = False
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._inflight_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._flight_stats = {
+            "computations": 0, "coalesced": 0, "lock_waits": 0, "lock_wait_hits": 0, "lock_timeouts": 0,
+            "stale_served": 0, "refreshes": 0, "refresh_errors": 0
+        }
+        self._refreshers: Dict[str, List[Callable[[], Awaitable[str]]]] = {}
 
     @property
     def redis_client(self) -> Optional[redis.Redis]:
@@ -48,6 +215,157 @@ class CacheService:
 
         return self._redis_client
 
+    async def async_client(self) -> Optional[aioredis.Redis]:
+        """
+        Get or create the pooled asyncio Redis client
+
+        Connections come from a blocking pool of CACHE_POOL_MAX_CONNECTIONS,
+        and every connect, read and pool checkout is bounded by
+        CACHE_SOCKET_TIMEOUT_SECONDS. If Redis can't be reached the client
+        stays off for CACHE_RETRY_SECONDS instead of being retried on every
+        request. A pool is bound to the event loop that created it, so a
+        caller on another loop gets a fresh one.
+
+        Returns:
+            The asyncio client, or None if caching is off or Redis is unreachable
+        """
+        if not self._enabled or time.monotonic() < self._async_retry_at:
+            return None
+
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            pool = aioredis.BlockingConnectionPool(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=settings.REDIS_DB,
+                password=settings.REDIS_PASSWORD or None,
+                decode_responses=True,
+                max_connections=settings.CACHE_POOL_MAX_CONNECTIONS,
+                timeout=settings.CACHE_SOCKET_TIMEOUT_SECONDS,
+                socket_connect_timeout=settings.CACHE_SOCKET_TIMEOUT_SECONDS,
+                socket_timeout=settings.CACHE_SOCKET_TIMEOUT_SECONDS,
+            )
+            client = aioredis.Redis(connection_pool=pool)
+            try:
+                await client.ping()
+            except (redis.ConnectionError, redis.TimeoutError) as e:
+                logger.warning(
+                    f"Async Redis connection failed: {e}. Caching skipped for {settings.CACHE_RETRY_SECONDS}s."
+                )
+                self._async_retry_at = time.monotonic() + settings.CACHE_RETRY_SECONDS
+                await pool.disconnect()
+                return None
+            self._async_client = client
+            self._async_loop = loop
+            logger.info("Async Redis connection pool established")
+
+        return self._async_client
+
+    @property
+    def l1_active(self) -> bool:
+        """Whether L1 is consulted (it is only while invalidations can reach it)"""
+        return self._enabled and settings.CACHE_L1_ENABLED and self._subscribed
+
+    def register_prefix(self, prefix: str, l1_ttl: float):
+        """
+        Set the L1 lifetime of a key prefix
+
+        Args:
+            prefix: Cache key prefix (as passed to ``@cached``)
+            l1_ttl: L1 lifetime in seconds; 0 keeps the prefix out of L1
+        """
+        self._l1_ttls[prefix] = l1_ttl
+
+    def _l1_ttl(self, key: str, ttl: Optional[float] = None) -> float:
+        """L1 lifetime of a key, never longer than its Redis TTL"""
+        prefix = key.split(":", 2)[1] if key.startswith("cache:") and key.count(":") >= 2 else None
+        l1_ttl = self._l1_ttls.get(prefix, settings.CACHE_L1_TTL_SECONDS)
+        return min(l1_ttl, ttl) if ttl else l1_ttl
+
+    def _publish_invalidation(self, pattern: str):
+        """Tell the other workers to evict ``pattern`` from their L1"""
+        if not self.redis_client:
+            return
+        try:
+            self.redis_client.publish(settings.CACHE_INVALIDATION_CHANNEL, self._invalidation_message(pattern))
+        except Exception as e:
+            logger.error(f"Cache invalidation publish error: {e}")
+
+    async def _apublish_invalidation(self, client: aioredis.Redis, pattern: str):
+        try:
+            await client.publish(settings.CACHE_INVALIDATION_CHANNEL, self._invalidation_message(pattern))
+        except Exception as e:
+            logger.error(f"Cache invalidation publish error: {e}")
+
+    @staticmethod
+    def _invalidation_message(pattern: str) -> str:
+        return json.dumps({"pattern": pattern, "origin": get_worker_id()})
+
+    def _apply_invalidation(self, data: str):
+        """Evict a published pattern from this worker's L1"""
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            logger.warning(f"Ignoring malformed cache invalidation: {data!r}")
+            return
+        # Our own deletes already evicted locally
+        if message.get("origin") != get_worker_id():
+            evicted = self.local.invalidate(message["pattern"])
+            logger.debug(f"L1 invalidation '{message['pattern']}': {evicted} entries evicted")
+
+    async def start_invalidation_listener(self):
+        """Start applying other workers' invalidations to this worker's L1"""
+        if not self._enabled or not settings.CACHE_L1_ENABLED:
+            return
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen_for_invalidations())
+
+    async def _listen_for_invalidations(self):
+        """Subscribe to CACHE_INVALIDATION_CHANNEL and resubscribe after errors"""
+        while True:
+            client = await self.async_client()
+            if client is not None:
+                pubsub = client.pubsub()
+                try:
+                    await pubsub.subscribe(settings.CACHE_INVALIDATION_CHANNEL)
+                    # Entries cached while unsubscribed may have missed invalidations
+                    self.local.clear()
+                    self._subscribed = True
+                    logger.info("L1 cache subscribed to invalidations")
+                    while True:
+                        message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                        if message is not None:
+                            self._apply_invalidation(message["data"])
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Cache invalidation subscription lost: {e}")
+                finally:
+                    self._subscribed = False
+                    self.local.clear()
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+            await asyncio.sleep(settings.CACHE_RETRY_SECONDS if client is None else 1.0)
+
+    async def close(self):
+        """Stop the invalidation listener and close the asyncio client's pooled connections"""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener = None
+        if self._async_client is not None:
+            try:
+                await self._async_client.aclose(close_connection_pool=True)
+            except Exception as e:
+                logger.warning(f"Error closing async Redis pool: {e}")
+        self._async_client = None
+        self._async_loop = None
+
     def _generate_cache_key(self, prefix: str, *args, **kwargs) -> str:
         """
         Generate a unique cache key based on function arguments
@@ -121,7 +439,9 @@ class CacheService:
         try:
             ttl = ttl or settings.CACHE_DEFAULT_TTL
             serialized_value = json.dumps(value, default=str)
-            self.redis_client.setex(key, ttl, serialized_value)
+            pipe = self.redis_client.pipeline(transaction=False)
+            _queue_write(pipe, key, ttl, serialized_value)
+            pipe.execute()
             logger.debug(f"Cache SET: {key} (TTL: {ttl}s)")
             return True
         except Exception as e:
@@ -144,15 +464,23 @@ class CacheService:
         try:
             self.redis_client.delete(key)
             logger.debug(f"Cache DELETE: {key}")
-            return True
         except Exception as e:
             logger.error(f"Cache delete error: {e}")
             return False
 
+        self.local.invalidate(key)
+        self._publish_invalidation(key)
+        return True
+
     def delete_pattern(self, pattern: str) -> int:
         """
         Delete all keys matching pattern
 
+        Patterns selecting whole ``@cached`` prefixes (``cache:reddit_*``,
+        ``cache:reddit_posts:*``) are resolved through the prefixes' tag
+        sets; any other pattern is matched with an incremental ``SCAN``.
+        Neither blocks Redis the way ``KEYS`` does.
+
         Args:
             pattern: Pattern to match (e.g., "cache:reddit:*")
 
@@ -163,16 +491,16 @@ class CacheService:
             return 0
 
         try:
-            keys = self.redis_client.keys(pattern)
-            if keys:
-                deleted = self.redis_client.delete(*keys)
-                logger.info(f"Cache DELETE pattern '{pattern}': {deleted} keys deleted")
-                return deleted
-            return 0
+            deleted = self._delete_matching(self.redis_client, pattern)
+            logger.info(f"Cache DELETE pattern '{pattern}': {deleted} keys deleted")
         except Exception as e:
             logger.error(f"Cache delete pattern error: {e}")
             return 0
 
+        self.local.invalidate(pattern)
+        self._publish_invalidation(pattern)
+        return deleted
+
     def clear_all(self) -> bool:
         """
         Clear all cache entries
@@ -186,11 +514,14 @@ class CacheService:
         try:
             self.redis_client.flushdb()
             logger.info("Cache cleared: All keys deleted")
-            return True
         except Exception as e:
             logger.error(f"Cache clear error: {e}")
             return False
 
+        self.local.clear()
+        self._publish_invalidation("*")
+        return True
+
     def get_stats(self) -> dict:
         """
         Get cache statistics
@@ -205,19 +536,218 @@ class CacheService:
             }
 
         try:
-            info = self.redis_client.info()
+            return self._stats_from_info(self.redis_client.info(), self.redis_client.dbsize())
+        except Exception as e:
+            logger.error(f"Cache stats error: {e}")
             return {
                 "enabled": True,
-                "connected": True,
-                "used_memory": info.get("used_memory_human", "N/A"),
-                "total_keys": self.redis_client.dbsize(),
-                "hits": info.get("keyspace_hits", 0),
-                "misses": info.get("keyspace_misses", 0),
-                "hit_rate": (
-                    info.get("keyspace_hits", 0) /
-                    max(info.get("keyspace_hits", 0) + info.get("keyspace_misses", 0), 1)
-                ) * 100
+                "connected": False,
+                "error": str(e)
             }
+
+    def _stats_from_info(self, info: dict, total_keys: int) -> dict:
+        """
+        Cache statistics from Redis ``INFO`` and ``DBSIZE``
+
+        ``hits``/``misses``/``hit_rate`` are Redis-wide keyspace counters;
+        ``l1`` and ``l2`` count this worker's lookups, where ``l2`` only sees
+        the lookups L1 missed; ``single_flight`` counts how its misses were
+        computed, shared or waited out, and how many stale values were served
+        while refreshing in the background.
+        """
+        l2_lookups = self._l2_stats["hits"] + self._l2_stats["misses"]
+        return {
+            "enabled": True,
+            "connected": True,
+            "used_memory": info.get("used_memory_human", "N/A"),
+            "total_keys": total_keys,
+            "hits": info.get("keyspace_hits", 0),
+            "misses": info.get("keyspace_misses", 0),
+            "hit_rate": (
+                info.get("keyspace_hits", 0) /
+                max(info.get("keyspace_hits", 0) + info.get("keyspace_misses", 0), 1)
+            ) * 100,
+            "l1": {
+                "enabled": settings.CACHE_L1_ENABLED,
+                "active": self.l1_active,
+                "default_ttl_seconds": settings.CACHE_L1_TTL_SECONDS,
+                **self.local.get_stats(),
+            },
+            "l2": {
+                **self._l2_stats,
+                "hit_rate": self._l2_stats["hits"] / max(l2_lookups, 1) * 100,
+            },
+            "single_flight": {
+                "in_flight": len(self._inflight),
+                **self._flight_stats,
+            },
+        }
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """
+        Get value from cache without blocking the event loop
+
+        Checks L1 first; an L2 hit is decoded once and kept in L1.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None if not found
+        """
+        if not self._enabled:
+            return None
+
+        l1_active = self.l1_active
+        if l1_active:
+            value = self.local.get(key)
+            if value is not _MISSING:
+                logger.debug(f"Cache L1 HIT: {key}")
+                return value
+
+        client = await self.async_client()
+        if client is None:
+            return None
+
+        try:
+            generation = self.local.generation
+            value = await client.get(key)
+            if value:
+                logger.debug(f"Cache HIT: {key}")
+                self._l2_stats["hits"] += 1
+                decoded = json.loads(value)
+                if l1_active:
+                    self.local.set(key, decoded, self._l1_ttl(key), generation)
+                return decoded
+            logger.debug(f"Cache MISS: {key}")
+            self._l2_stats["misses"] += 1
+            return None
+        except Exception as e:
+            logger.error(f"Cache get error: {e}")
+            return None
+
+    async def aset(self, key: str, value: Any, ttl: int = None) -> bool:
+        """
+        Set value in cache without blocking the event loop
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Time to live in seconds (default: from settings)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        client = await self.async_client()
+        if client is None:
+            return False
+
+        try:
+            ttl = ttl or settings.CACHE_DEFAULT_TTL
+            generation = self.local.generation
+            serialized_value = json.dumps(value, default=str)
+            pipe = client.pipeline(transaction=False)
+            _queue_write(pipe, key, ttl, serialized_value)
+            await pipe.execute()
+            logger.debug(f"Cache SET: {key} (TTL: {ttl}s)")
+            if self.l1_active:
+                # Decoded from JSON, so an L1 hit returns exactly what an L2 hit would
+                self.local.set(key, json.loads(serialized_value), self._l1_ttl(key, ttl), generation)
+            return True
+        except Exception as e:
+            logger.error(f"Cache set error: {e}")
+            return False
+
+    async def adelete(self, key: str) -> bool:
+        """
+        Delete value from cache without blocking the event loop
+
+        Args:
+            key: Cache key
+
+        Returns:
+            True if successful, False otherwise
+        """
+        client = await self.async_client()
+        if client is None:
+            return False
+
+        try:
+            await client.delete(key)
+            logger.debug(f"Cache DELETE: {key}")
+        except Exception as e:
+            logger.error(f"Cache delete error: {e}")
+            return False
+
+        self.local.invalidate(key)
+        await self._apublish_invalidation(client, key)
+        return True
+
+    async def adelete_pattern(self, pattern: str) -> int:
+        """
+        Delete all keys matching pattern without blocking the event loop
+
+        Matches keys like ``delete_pattern``: through tag sets, or ``SCAN``.
+
+        Args:
+            pattern: Pattern to match (e.g., "cache:reddit:*")
+
+        Returns:
+            Number of keys deleted
+        """
+        client = await self.async_client()
+        if client is None:
+            return 0
+
+        try:
+            deleted = await self._adelete_matching(client, pattern)
+            logger.info(f"Cache DELETE pattern '{pattern}': {deleted} keys deleted")
+        except Exception as e:
+            logger.error(f"Cache delete pattern error: {e}")
+            return 0
+
+        self.local.invalidate(pattern)
+        await self._apublish_invalidation(client, pattern)
+        return deleted
+
+    async def aclear_all(self) -> bool:
+        """
+        Clear all cache entries without blocking the event loop
+
+        Returns:
+            True if successful, False otherwise
+        """
+        client = await self.async_client()
+        if client is None:
+            return False
+
+        try:
+            await client.flushdb()
+            logger.info("Cache cleared: All keys deleted")
+        except Exception as e:
+            logger.error(f"Cache clear error: {e}")
+            return False
+
+        self.local.clear()
+        await self._apublish_invalidation(client, "*")
+        return True
+
+    async def aget_stats(self) -> dict:
+        """
+        Get cache statistics without blocking the event loop
+
+        Returns:
+            Dictionary with cache stats
+        """
+        client = await self.async_client()
+        if client is None:
+            return {
+                "enabled": False,
+                "connected": False
+            }
+
+        try:
+            return self._stats_from_info(await client.info(), await client.dbsize())
         except Exception as e:
             logger.error(f"Cache stats error: {e}")
             return {
@@ -226,35 +756,396 @@ class CacheService:
                 "error": str(e)
             }
 
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        refresh: Optional[Callable[[], Awaitable[Any]]] = None
+    ) -> Any:
+        """
+        Cached value of ``key``, computing it at most once per stampede
+
+        Concurrent misses in this worker share one computation. Across
+        workers, a short Redis lock (CACHE_LOCK_TTL_SECONDS) lets one worker
+        recompute while the others poll for its value for up to
+        CACHE_LOCK_WAIT_SECONDS, then compute it themselves. The computation
+        runs as its own task, so a cancelled request doesn't cancel it for
+        the requests sharing it.
+
+        A value written with a soft TTL (see ``@cached``) is still returned
+        once it goes stale, and one background task per key, across workers,
+        refreshes it; only a value past its hard TTL is a miss.
+
+        Args:
+            key: Cache key
+            compute: Coroutine function that computes the value and caches it
+            refresh: Like ``compute``, but safe to run after the request is
+                done (default: ``compute``)
+
+        Returns:
+            The cached or computed value
+        """
+        value = await self.aget(key)
+        if value is not None:
+            if not _is_fresh(value):
+                self._flight_stats["stale_served"] += 1
+                self._start_flight(key, refresh or compute, stale=True)
+            return _unwrap(value)
+
+        task = self._inflight_tasks().get(key)
+        if task is None:
+            task = self._start_flight(key, compute)
+        else:
+            self._flight_stats["coalesced"] += 1
+        result = await asyncio.shield(task)
+        if result is _MISSING:
+            # Joined a background refresh that another worker is running
+            result = await self._compute_once(key, compute)
+        return result
+
+    async def refresh_key(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Recompute ``key`` now, whether or not its cached value is fresh
+
+        Doesn't wait for the recompute lock: a computation already holding
+        it may have read the data this refresh is meant to pick up.
+
+        Args:
+            key: Cache key
+            compute: Coroutine function that computes the value and caches it
+
+        Returns:
+            The computed value
+        """
+        self._flight_stats["refreshes"] += 1
+        self._flight_stats["computations"] += 1
+        return await compute()
+
+    def register_refresher(self, prefix: str, refresher: Callable[[], Awaitable[str]]):
+        """
+        Recompute a hot key whenever its prefix is refreshed
+
+        Args:
+            prefix: Cache key prefix (as passed to ``@cached``)
+            refresher: Coroutine function that recomputes one key and
+                returns it, e.g. ``get_statistics_overview.refresh``
+        """
+        self._refreshers.setdefault(prefix, []).append(refresher)
+
+    async def arefresh_pattern(self, pattern: str) -> Dict[str, int]:
+        """
+        Recompute the registered keys matching pattern and delete the rest
+
+        Used after the data behind the cache changes: hot keys are
+        overwritten with fresh values instead of being left cold for the
+        next request, and refreshers that fail fall back to deletion.
+
+        Args:
+            pattern: Pattern to match (e.g., "cache:analytics_*")
+
+        Returns:
+            Numbers of keys refreshed and deleted
+        """
+        client = await self.async_client()
+        if client is None:
+            return {"refreshed": 0, "deleted": 0}
+
+        refreshed = set()
+        for prefix, refreshers in list(self._refreshers.items()):
+            if not fnmatch.fnmatchcase(f"cache:{prefix}:", pattern):
+                continue
+            for refresher in refreshers:
+                try:
+                    refreshed.add(await refresher())
+                except Exception as e:
+                    self._flight_stats["refresh_errors"] += 1
+                    logger.error(f"Cache refresh error for '{prefix}': {e}")
+
+        deleted = 0
+        try:
+            deleted = await self._adelete_matching(client, pattern, keep=frozenset(refreshed))
+        except Exception as e:
+            logger.error(f"Cache delete pattern error: {e}")
+
+        # Other workers' L1 copies predate the refresh; this worker's just gets re-read
+        self.local.invalidate(pattern)
+        await self._apublish_invalidation(client, pattern)
+        logger.info(f"Cache REFRESH pattern '{pattern}': {len(refreshed)} keys recomputed, {deleted} deleted")
+        return {"refreshed": len(refreshed), "deleted": deleted}
+
+    def _delete_matching(self, client: redis.Redis, pattern: str) -> int:
+        """
+        Delete the keys matching ``pattern``, through tag sets when it selects whole prefixes
+
+        A tag-based delete also prunes every tag set of expired keys and the
+        ``tags`` index of prefixes whose set is gone.
+        """
+        tag_glob = _tag_glob(pattern)
+        deleted = 0
+        if tag_glob is None:
+            batch = []
+            for key in client.scan_iter(match=pattern, count=_BATCH_SIZE):
+                batch.append(key)
+                if len(batch) >= _BATCH_SIZE:
+                    deleted += client.delete(*batch)
+                    batch = []
+            if batch:
+                deleted += client.delete(*batch)
+            return deleted
+
+        tags = client.smembers(_TAG_INDEX_KEY)
+        for tag in tags:
+            if not fnmatch.fnmatchcase(tag, tag_glob):
+                continue
+            members = list(client.smembers(_tag_key(tag)))
+            for start in range(0, len(members), _BATCH_SIZE):
+                batch = members[start:start + _BATCH_SIZE]
+                # Untrack before deleting: a key rewritten in between is then
+                # deleted while still tagged, never left live and untagged
+                client.srem(_tag_key(tag), *batch)
+                deleted += client.delete(*batch)
+
+        for tag in tags:
+            members = list(client.smembers(_tag_key(tag)))
+            for start in range(0, max(len(members), 1), _BATCH_SIZE):
+                client.eval(
+                    _PRUNE_TAG_SCRIPT, 2, _tag_key(tag), _TAG_INDEX_KEY, tag, *members[start:start + _BATCH_SIZE]
+                )
+        return deleted
+
+    async def _adelete_matching(self, client: aioredis.Redis, pattern: str, keep: frozenset = frozenset()) -> int:
+        """Async ``_delete_matching``; keys in ``keep`` are left in place"""
+        tag_glob = _tag_glob(pattern)
+        deleted = 0
+        if tag_glob is None:
+            batch = []
+            async for key in client.scan_iter(match=pattern, count=_BATCH_SIZE):
+                if key in keep:
+                    continue
+                batch.append(key)
+                if len(batch) >= _BATCH_SIZE:
+                    deleted += await client.delete(*batch)
+                    batch = []
+            if batch:
+                deleted += await client.delete(*batch)
+            return deleted
+
+        tags = await client.smembers(_TAG_INDEX_KEY)
+        for tag in tags:
+            if not fnmatch.fnmatchcase(tag, tag_glob):
+                continue
+            members = [key for key in await client.smembers(_tag_key(tag)) if key not in keep]
+            for start in range(0, len(members), _BATCH_SIZE):
+                batch = members[start:start + _BATCH_SIZE]
+                await client.srem(_tag_key(tag), *batch)
+                deleted += await client.delete(*batch)
+
+        for tag in tags:
+            members = list(await client.smembers(_tag_key(tag)))
+            for start in range(0, max(len(members), 1), _BATCH_SIZE):
+                await client.eval(
+                    _PRUNE_TAG_SCRIPT, 2, _tag_key(tag), _TAG_INDEX_KEY, tag, *members[start:start + _BATCH_SIZE]
+                )
+        return deleted
+
+    def _inflight_tasks(self) -> Dict[str, asyncio.Task]:
+        loop = asyncio.get_running_loop()
+        if self._inflight_loop is not loop:
+            self._inflight = {}
+            self._inflight_loop = loop
+        return self._inflight
+
+    def _start_flight(self, key: str, compute: Callable[[], Awaitable[Any]], stale: bool = False) -> asyncio.Task:
+        """The computation of ``key`` in flight, starting one if there is none"""
+        inflight = self._inflight_tasks()
+        task = inflight.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._compute_once(key, compute, stale))
+            inflight[key] = task
+            task.add_done_callback(lambda done: self._finish_flight(key, done, stale))
+        return task
+
+    def _finish_flight(self, key: str, task: asyncio.Task, stale: bool = False):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if task.cancelled():
+            return
+        # Retrieved here too, in case every waiting request was cancelled
+        error = task.exception()
+        if error is not None and stale:
+            self._flight_stats["refresh_errors"] += 1
+            logger.error(f"Cache background refresh error for '{key}': {error}")
+
+    async def _read_l2(self, client: aioredis.Redis, key: str) -> Optional[Any]:
+        """Decoded Redis value of ``key``, without touching L1 or the hit counters"""
+        value = await client.get(key)
+        return json.loads(value) if value else None
+
+    async def _compute_once(self, key: str, compute: Callable[[], Awaitable[Any]], stale: bool = False) -> Any:
+        """
+        Compute ``key`` under its cross-worker recompute lock
+
+        For a ``stale`` refresh, returns ``_MISSING`` instead of waiting
+        when another worker holds the lock, since the request that started
+        it has already been answered.
+        """
+        client = await self.async_client()
+        if client is None or not settings.CACHE_LOCK_ENABLED:
+            self._flight_stats["computations"] += 1
+            return await compute()
+
+        if stale:
+            # Another worker may have refreshed it already; this L1 copy is what's stale
+            try:
+                value = await self._read_l2(client, key)
+            except Exception:
+                value = None
+            if value is not None and _is_fresh(value):
+                if self.l1_active:
+                    self.local.set(key, value, self._l1_ttl(key))
+                return _unwrap(value)
+
+        lock_key = f"lock:{key}"
+        token = uuid.uuid4().hex
+        try:
+            acquired = await client.set(lock_key, token, nx=True, px=int(settings.CACHE_LOCK_TTL_SECONDS * 1000))
+        except Exception as e:
+            logger.warning(f"Cache lock for '{key}' unavailable, computing without it: {e}")
+            token, acquired = None, True
+
+        if not acquired:
+            if stale:
+                return _MISSING
+            self._flight_stats["lock_waits"] += 1
+            deadline = time.monotonic() + settings.CACHE_LOCK_WAIT_SECONDS
+            while time.monotonic() < deadline:
+                await asyncio.sleep(settings.CACHE_LOCK_POLL_SECONDS)
+                try:
+                    value = await self._read_l2(client, key)
+                except Exception as e:
+                    logger.error(f"Cache get error: {e}")
+                    break
+                if value is not None:
+                    self._flight_stats["lock_wait_hits"] += 1
+                    return _unwrap(value)
+            # The holder is slow or gone; don't keep the request waiting
+            self._flight_stats["lock_timeouts"] += 1
+            self._flight_stats["computations"] += 1
+            return await compute()
+
+        try:
+            # Another worker may have filled the key between our miss and the lock
+            try:
+                value = await self._read_l2(client, key)
+            except Exception:
+                value = None
+            if value is not None and _is_fresh(value):
+                return _unwrap(value)
+            self._flight_stats["computations"] += 1
+            return await compute()
+        finally:
+            if token is not None:
+                try:
+                    await client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                except Exception as e:
+                    logger.warning(f"Could not release cache lock for '{key}': {e}")
+
+
+def _tag_key(tag: str) -> str:
+    return f"tag:{tag}"
+
+
+def _tag_glob(pattern: str) -> Optional[str]:
+    """
+    Glob over prefixes that ``pattern`` selects whole
+
+    ``cache:reddit_*`` and ``cache:reddit_posts:*`` select every key of the
+    matching prefixes; other patterns return None and need a key scan.
+    """
+    if not pattern.startswith("cache:"):
+        return None
+    selector = pattern[len("cache:"):]
+    if selector.endswith(":*"):
+        selector = selector[:-2]
+    elif not selector.endswith("*"):
+        return None
+    return None if ":" in selector else selector
+
+
+def _queue_write(pipe, key: str, ttl: int, serialized_value: str):
+    """
+    Queue a cache write and, for ``cache:<prefix>:...`` keys, its tag
+
+    The tag set's TTL is only ever extended, so it outlives every key it
+    tracks even when keys of one prefix are written with different TTLs:
+    ``EXPIRE NX`` sets it on a new set, ``EXPIRE GT`` extends it (Redis 7).
+    """
+    pipe.setex(key, ttl, serialized_value)
+    parts = key.split(":", 2)
+    if len(parts) == 3 and parts[0] == "cache":
+        pipe.sadd(_tag_key(parts[1]), key)
+        pipe.expire(_tag_key(parts[1]), ttl, nx=True)
+        pipe.expire(_tag_key(parts[1]), ttl, gt=True)
+        pipe.sadd(_TAG_INDEX_KEY, parts[1])
+
+
+def _is_fresh(value: Any) -> bool:
+    """Whether a cached value is within its soft TTL (values without one always are)"""
+    if isinstance(value, dict) and _FRESH_UNTIL in value:
+        return time.time() < value[_FRESH_UNTIL]
+    return True
+
+
+def _unwrap(value: Any) -> Any:
+    """A cached value without its soft-TTL envelope"""
+    if isinstance(value, dict) and _FRESH_UNTIL in value:
+        return value["value"]
+    return value
+
 
 # Global cache service instance
 cache_service = CacheService()
 
 
-def cached(prefix: str, ttl: Optional[int] = None):
+def cached(
+    prefix: str,
+    ttl: Optional[int] = None,
+    l1_ttl: Optional[float] = None,
+    soft_ttl: Optional[int] = None
+):
     """
     Decorator to cache function results
 
+    Cache reads and writes go through the asyncio client, so a slow or
+    unreachable Redis never stalls the event loop. Misses are coalesced (see
+    ``CacheService.get_or_compute``), so an expired or invalidated key is
+    recomputed once rather than by every concurrent request.
+
+    With ``soft_ttl``, ``ttl`` is the hard TTL: a value older than
+    ``soft_ttl`` is still served while a background task recomputes it,
+    using its own database session, and only a value older than ``ttl`` is
+    recomputed while the request waits. The wrapper's ``refresh(**kwargs)``
+    recomputes one key on demand, for ``CacheService.register_refresher``.
+
     Args:
         prefix: Cache key prefix
         ttl: Time to live in seconds (optional)
+        l1_ttl: In-process (L1) lifetime in seconds (default:
+            CACHE_L1_TTL_SECONDS, capped at ``ttl``; 0 skips L1)
+        soft_ttl: Seconds a value is served without refreshing it (optional)
 
     Usage:
         @cached(prefix="reddit_posts", ttl=300)
         async def get_posts(subreddit: str = None):
             ...
     """
-    def decorator(func: Callable):
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            # Generate cache key
-            cache_key = cache_service._generate_cache_key(prefix, *args, **kwargs)
+    if l1_ttl is not None:
+        cache_service.register_prefix(prefix, l1_ttl)
 
-            # Try to get from cache
-            cached_result = cache_service.get(cache_key)
-            if cached_result is not None:
-                return cached_result
+    def decorator(func: Callable):
+        signature = inspect.signature(func)
 
+        async def compute(cache_key: str, args: tuple, kwargs: dict):
             # Call function and cache result
             result = await func(*args, **kwargs)
 
@@ -266,9 +1157,58 @@ def cached(prefix: str, ttl: Optional[int] = None):
             else:
                 cache_data = result
 
-            cache_service.set(cache_key, cache_data, ttl)
+            if soft_ttl:
+                cache_data = {_FRESH_UNTIL: time.time() + soft_ttl, "value": cache_data}
+            await cache_service.aset(cache_key, cache_data, ttl)
 
             return result
 
+        def detached(cache_key: str, args: tuple, kwargs: dict):
+            """``compute`` with its own database session, as the request's may be closed"""
+            async def run():
+                if "db" not in kwargs:
+                    return await compute(cache_key, args, kwargs)
+                from app.db import get_session_local
+                db = get_session_local()()
+                try:
+                    return await compute(cache_key, args, {**kwargs, "db": db})
+                finally:
+                    db.close()
+            return run
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            # Generate cache key
+            cache_key = cache_service._generate_cache_key(prefix, *args, **kwargs)
+
+            # Concurrent misses for the key share one computation
+            return await cache_service.get_or_compute(
+                cache_key,
+                lambda: compute(cache_key, args, kwargs),
+                refresh=detached(cache_key, args, kwargs)
+            )
+
+        async def refresh(**kwargs) -> str:
+            """
+            Recompute and cache the value for these arguments
+
+            Omitted arguments take their defaults, as FastAPI would pass them.
+
+            Returns:
+                The refreshed cache key
+            """
+            for name, param in signature.parameters.items():
+                if name in kwargs or param.default is inspect.Parameter.empty:
+                    continue
+                if name == "db":
+                    kwargs[name] = None
+                else:
+                    # Unwrap Query(...) defaults
+                    kwargs[name] = getattr(param.default, "default", param.default)
+            cache_key = cache_service._generate_cache_key(prefix, **kwargs)
+            await cache_service.refresh_key(cache_key, detached(cache_key, (), kwargs))
+            return cache_key
+
+        wrapper.refresh = refresh
         return wrapper
     return decorator
@@ -0,0 +1,221 @@
+"""
+Article Deduplication Service
+Merges article rows that describe the same story into one
+"""
+from typing import List, Dict, Tuple, Optional
+from sqlalchemy import case, func, update
+from sqlalchemy.orm import Session
+import logging
+
+from app.models.article import Article
+from app.models.entity import Entity
+from app.models.keyword import Keyword
+from app.services.news_service import news_article_id
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _group_news_articles(
+    db: Session,
+    scan_size: int,
+    partitions: int = 1,
+    partition: int = 0
+) -> Dict[str, List[Tuple[int, str]]]:
+    """
+    Group stored news articles by their stable ID
+
+    Only the groups of one partition of the stable IDs are kept, so a large
+    table is grouped in several passes instead of all at once in memory.
+
+    Args:
+        db: Database session
+        scan_size: Rows read per query
+        partitions: Number of partitions the stable IDs are split into
+        partition: Partition to group
+
+    Returns:
+        ``stable id -> [(Article.id, external_id), ...]`` in ascending id order
+    """
+    groups: Dict[str, List[Tuple[int, str]]] = {}
+    last_id = 0
+    while True:
+        rows = (
+            db.query(Article.id, Article.external_id, Article.url, Article.title, Article.source_name)
+            .filter(Article.source_type == "news", Article.id > last_id)
+            .order_by(Article.id)
+            .limit(scan_size)
+            .all()
+        )
+        if not rows:
+            return groups
+        last_id = rows[-1].id
+        for row in rows:
+            key = news_article_id(row.url, row.title, row.source_name)
+            if int(key[:8], 16) % partitions == partition:
+                groups.setdefault(key, []).append((row.id, row.external_id))
+
+
+def _merge_children(db: Session, model, merges: List[Tuple[int, List[int]]]) -> int:
+    """
+    Keep one article's worth of child rows per merged group
+
+    A survivor that has no rows of ``model`` adopts those of its first
+    duplicate that does; every other duplicate's rows are deleted.
+
+    Returns:
+        Number of child rows moved to survivors
+    """
+    article_ids = [article_id for survivor, duplicates in merges for article_id in [survivor, *duplicates]]
+    with_children = {
+        article_id for (article_id,) in
+        db.query(model.article_id).filter(model.article_id.in_(article_ids)).distinct()
+    }
+
+    moved = 0
+    for survivor, duplicates in merges:
+        if survivor in with_children:
+            continue
+        donor = next((d for d in duplicates if d in with_children), None)
+        if donor is not None:
+            moved += (
+                db.query(model)
+                .filter(model.article_id == donor)
+                .update({model.article_id: survivor}, synchronize_session=False)
+            )
+
+    duplicate_ids = [d for _, duplicates in merges for d in duplicates]
+    db.query(model).filter(model.article_id.in_(duplicate_ids)).delete(synchronize_session=False)
+    return moved
+
+
+def _repoint_near_duplicates(db: Session, new_ids: Dict[str, str], survivors: List[int]) -> int:
+    """
+    Point ``duplicate_of`` at the stable IDs of re-keyed and merged articles
+
+    Args:
+        db: Database session
+        new_ids: ``old external_id -> stable id`` of the batch's articles
+        survivors: IDs of the batch's surviving articles, which must not end
+            up marked as duplicates of themselves
+
+    Returns:
+        Number of articles repointed
+    """
+    if not new_ids:
+        return 0
+    repointed = (
+        db.query(Article)
+        .filter(Article.duplicate_of.in_(list(new_ids)))
+        .update({Article.duplicate_of: case(new_ids, value=Article.duplicate_of)}, synchronize_session=False)
+    )
+    db.query(Article).filter(
+        Article.id.in_(survivors), Article.duplicate_of == Article.external_id
+    ).update({Article.duplicate_of: None}, synchronize_session=False)
+    return repointed
+
+
+def compact_duplicate_articles(
+    db: Session,
+    batch_size: int = 200,
+    dry_run: bool = False,
+    scan_size: Optional[int] = None,
+    partition_rows: int = 50000
+) -> Dict[str, int]:
+    """
+    Merge duplicate news articles and re-key them to stable IDs
+
+    News articles used to get ``external_id = hash(url)``, which is salted per
+    process, so the same story was stored again on every restart. Rows are
+    grouped by the stable ID their URL now produces; in each group the oldest
+    row survives, keeps (or adopts) entities and keywords, and takes the
+    stable ID. Near-duplicates whose ``duplicate_of`` named a merged or
+    re-keyed row are repointed to its stable ID in the same transaction.
+    Groups are processed ``batch_size`` at a time, each batch in its own
+    transaction, and the table is grouped one partition of about
+    ``partition_rows`` rows at a time.
+
+    Args:
+        db: Database session
+        batch_size: Groups merged per transaction
+        dry_run: Only count what would change
+        scan_size: Rows read per query while grouping (default: INGEST_BATCH_SIZE)
+        partition_rows: Rows grouped in memory at once
+
+    Returns:
+        Dictionary with ``scanned``, ``groups_merged``, ``rows_removed``,
+        ``rekeyed``, ``repointed``, ``entities_moved`` and ``keywords_moved``
+        counts
+    """
+    total = db.query(func.count(Article.id)).filter(Article.source_type == "news").scalar()
+    partitions = max(1, -(-total // max(1, partition_rows)))
+    result = {
+        "scanned": 0,
+        "groups_merged": 0,
+        "rows_removed": 0,
+        "rekeyed": 0,
+        "repointed": 0,
+        "entities_moved": 0,
+        "keywords_moved": 0,
+    }
+
+    for partition in range(partitions):
+        groups = _group_news_articles(db, scan_size or settings.INGEST_BATCH_SIZE, partitions, partition)
+        result["scanned"] += sum(len(members) for members in groups.values())
+        pending = [
+            (key, members) for key, members in groups.items()
+            if len(members) > 1 or members[0][1] != key
+        ]
+
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            merges = [
+                (members[0][0], [article_id for article_id, _ in members[1:]])
+                for _, members in batch if len(members) > 1
+            ]
+            rekeys = [
+                {"id": members[0][0], "external_id": key}
+                for key, members in batch if members[0][1] != key
+            ]
+            new_ids = {
+                external_id: key
+                for key, members in batch for _, external_id in members if external_id != key
+            }
+
+            result["groups_merged"] += len(merges)
+            result["rows_removed"] += sum(len(duplicates) for _, duplicates in merges)
+            result["rekeyed"] += len(rekeys)
+            if dry_run:
+                result["repointed"] += db.query(func.count(Article.id)).filter(
+                    Article.duplicate_of.in_(list(new_ids))
+                ).scalar()
+                continue
+
+            try:
+                if merges:
+                    result["entities_moved"] += _merge_children(db, Entity, merges)
+                    result["keywords_moved"] += _merge_children(db, Keyword, merges)
+                    duplicate_ids = [d for _, duplicates in merges for d in duplicates]
+                    db.query(Article).filter(Article.id.in_(duplicate_ids)).delete(synchronize_session=False)
+                # Duplicates are gone, so survivors can take the stable IDs
+                if rekeys:
+                    db.execute(update(Article), rekeys)
+                result["repointed"] += _repoint_near_duplicates(db, new_ids, [members[0][0] for _, members in batch])
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Compaction batch starting at group {start} failed: {str(e)}")
+                raise
+
+            logger.info(
+                f"Compacted {min(start + batch_size, len(pending))}/{len(pending)} article groups "
+                f"of partition {partition + 1}/{partitions}"
+            )
+
+    logger.info(
+        f"Article compaction {'(dry run) ' if dry_run else ''}finished. "
+        f"Scanned: {result['scanned']}, Groups merged: {result['groups_merged']}, "
+        f"Rows removed: {result['rows_removed']}, Re-keyed: {result['rekeyed']}, "
+        f"Repointed: {result['repointed']}"
+    )
+    return result
@@ -1,6 +1,6 @@
 """
 Health Check Service
-Monitors system health including database, cache, and system metrics
+Monitors system health including database, cache, HTTP pool, source rate limits and system metrics
 """
 import time
 import psutil
@@ -9,6 +9,8 @@ from datetime import datetime
 from sqlalchemy import text
 from app.db.database import get_db
 from app.services.cache_service import CacheService
+from app.core.http import http_session_manager
+from app.core.rate_limit import get_rate_limit_stats
 from app.core.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -191,6 +193,23 @@ def get_system_metrics() -> Dict[str, Any]:
         }
 
 
+def check_http_pool() -> Dict[str, Any]:
+    """
+    Report on the shared HTTP connection pool
+
+    The pool is informational; it does not affect the overall status.
+
+    Returns:
+        Dictionary with pool status and connection reuse statistics
+    """
+    try:
+        stats = http_session_manager.get_stats()
+        return {"status": "active" if stats["active"] else "idle", **stats}
+    except Exception as e:
+        logger.error(f"HTTP pool health check failed: {str(e)}")
+        return {"status": "unknown", "error": str(e)}
+
+
 def get_comprehensive_health() -> Dict[str, Any]:
     """
     Get comprehensive health check including all components
@@ -219,6 +238,8 @@ def get_comprehensive_health() -> Dict[str, Any]:
         "components": {
             "database": database_health,
             "cache": cache_health,
+            "http": check_http_pool(),
+            "rate_limits": get_rate_limit_stats(),
         },
         "system": system_metrics,
     }
@@ -0,0 +1,378 @@
+"""
+Staged Ingestion Engine
+Runs fetch, transform/validate, sentiment, persistence and NER/keyword
+enrichment as separate stages joined by bounded queues
+"""
+import asyncio
+import time
+from typing import List, Dict, Any, Optional, Callable, Awaitable, Iterable
+import logging
+
+from app.core.config import settings
+from app.core.executor import run_blocking
+from app.services.base_source import BaseDataSource
+from app.services.ingestion_service import (
+    build_article_rows,
+    bulk_upsert_articles,
+    enrich_articles,
+    flag_near_duplicates,
+    partition_articles,
+    update_article_engagement
+)
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stage's input; one is sent per downstream worker
+_END = object()
+
+# Stage order; each stage feeds the next through a bounded queue
+STAGES = ("fetch", "transform", "sentiment", "persist", "enrich")
+
+
+class StageMetrics:
+    """Throughput and queue-depth counters for one ingestion stage"""
+
+    def __init__(self, name: str, concurrency: int):
+        self.name = name
+        self.concurrency = concurrency
+        self.items_in = 0
+        self.items_out = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.max_queue_depth = 0
+        self._depth_total = 0
+        self._depth_samples = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def sample_queue(self, depth: int):
+        """Record the input queue depth seen when a worker picks up work"""
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+        self._depth_total += depth
+        self._depth_samples += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert metrics to a JSON-serializable dictionary"""
+        elapsed = (
+            self.finished_at - self.started_at
+            if self.started_at is not None and self.finished_at is not None
+            else 0.0
+        )
+        return {
+            "concurrency": self.concurrency,
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "failed": self.failed,
+            "busy_seconds": round(self.busy_seconds, 4),
+            "elapsed_seconds": round(elapsed, 4),
+            "throughput_per_second": round(self.items_out / elapsed, 2) if elapsed > 0 else 0.0,
+            "max_queue_depth": self.max_queue_depth,
+            "avg_queue_depth": (
+                round(self._depth_total / self._depth_samples, 2) if self._depth_samples else 0.0
+            ),
+        }
+
+
+class IngestionEngine:
+    """
+    Producer/consumer ingestion for ``BaseDataSource`` implementations
+
+    Every stage has its own worker count and reads from a bounded queue, so a
+    slow stage (usually NER) applies backpressure upstream instead of letting
+    fetched data pile up in memory, while faster stages keep working. Blocking
+    stages run in the pipeline executor.
+
+    Usage:
+        engine = IngestionEngine(NewsAPIService(api_key=...))
+        result = await engine.run([{"query": "hasbro", "endpoint": "everything"}])
+    """
+
+    DEFAULT_CONCURRENCY = {
+        "fetch": 2,
+        "transform": 1,
+        "sentiment": 2,
+        "persist": 1,
+        "enrich": 1,
+    }
+
+    def __init__(
+        self,
+        source: BaseDataSource,
+        batch_size: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        concurrency: Optional[Dict[str, int]] = None,
+        enrich: bool = True,
+        reprocess: bool = False
+    ):
+        """
+        Initialize the engine
+
+        Args:
+            source: Data source whose ``fetch``/``transform``/``validate`` are used
+            batch_size: Items per batch passed between stages
+            queue_size: Maximum batches waiting between two stages
+            concurrency: Per-stage worker counts, overriding DEFAULT_CONCURRENCY
+            enrich: Run NER/keyword extraction; if False the enrich stage only
+                collects the stored batches in ``to_enrich`` for the caller
+            reprocess: Score and enrich unchanged articles too, updating them
+                in place (e.g. replaying the archive after a model change)
+        """
+        self.source = source
+        self.batch_size = batch_size or settings.INGEST_QUEUE_BATCH_SIZE
+        self.queue_size = queue_size or settings.INGEST_QUEUE_SIZE
+        self.concurrency = {**self.DEFAULT_CONCURRENCY, **(concurrency or {})}
+        self.metrics = {name: StageMetrics(name, max(1, self.concurrency[name])) for name in STAGES}
+        self.counts = {
+            "stored": 0, "updated": 0, "failed": 0, "skipped_enrichment": 0, "near_duplicates": 0,
+            "entities": 0, "keywords": 0
+        }
+        self.fetch_errors: List[Exception] = []
+        self.enrich = enrich
+        self.reprocess = reprocess
+        self.to_enrich: List[Dict[str, Any]] = []
+
+    def _batches(self, items: List[Any]) -> Iterable[List[Any]]:
+        """Split a list into batches of ``batch_size``"""
+        for start in range(0, len(items), self.batch_size):
+            yield items[start:start + self.batch_size]
+
+    async def _run_stage(
+        self,
+        name: str,
+        inbox: asyncio.Queue,
+        outbox: Optional[asyncio.Queue],
+        handler: Callable[[Any], Awaitable[Iterable[Any]]],
+        size_of: Callable[[Any], int],
+        downstream_workers: int
+    ):
+        """
+        Run one stage's workers until every one has seen the end marker
+
+        Handler errors are logged and counted against the batch instead of
+        stopping the stage.
+        """
+        metrics = self.metrics[name]
+        metrics.started_at = time.perf_counter()
+
+        async def worker():
+            while True:
+                metrics.sample_queue(inbox.qsize())
+                item = await inbox.get()
+                if item is _END:
+                    return
+
+                item_size = size_of(item)
+                metrics.items_in += item_size
+                start = time.perf_counter()
+                try:
+                    outputs = await handler(item)
+                except Exception as e:
+                    logger.error(f"Ingestion stage '{name}' failed on a batch of {item_size}: {str(e)}")
+                    metrics.failed += item_size
+                    continue
+                finally:
+                    metrics.busy_seconds += time.perf_counter() - start
+
+                for output in outputs:
+                    metrics.items_out += size_of(output)
+                    if outbox is not None:
+                        await outbox.put(output)
+
+        await _gather_or_cancel(*(worker() for _ in range(metrics.concurrency)))
+        metrics.finished_at = time.perf_counter()
+
+        if outbox is not None:
+            for _ in range(downstream_workers):
+                await outbox.put(_END)
+
+    async def _fetch(self, request: Dict[str, Any]) -> List[List[Dict[str, Any]]]:
+        """Fetch one request's raw items and split them into batches"""
+        try:
+            raw_data = await self.source.paced_fetch(**request)
+        except Exception as e:
+            self.fetch_errors.append(e)
+            raise
+        return list(self._batches(raw_data or []))
+
+    async def _transform(self, raw_batch: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Transform and validate a raw batch"""
+        valid = self.source.transform_and_validate(raw_batch)
+        self.metrics["transform"].failed += len(raw_batch) - len(valid)
+        return [valid] if valid else []
+
+    async def _sentiment(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Score sentiment and build insertable rows for new or changed articles"""
+        changed, unchanged, rows, failed = await run_blocking(_prepare_rows, articles, self.reprocess)
+        self.counts["failed"] += failed
+        if not rows and not unchanged:
+            return []
+        return [{"articles": changed, "rows": rows, "unchanged": unchanged}]
+
+    async def _persist(self, batch: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Upsert a batch and pass only new or changed, non-duplicate articles on to enrichment"""
+        counts, id_map, duplicates = await run_blocking(_persist_rows, batch["rows"], batch["unchanged"])
+        for key in ("stored", "updated", "failed", "skipped_enrichment", "near_duplicates"):
+            self.counts[key] += counts[key]
+
+        if not id_map:
+            return []
+        return [{
+            "articles": [a for a in batch["articles"] if a["id"] in id_map and a["id"] not in duplicates],
+            "id_map": id_map,
+        }]
+
+    async def _enrich(self, batch: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Extract entities and keywords for newly stored articles"""
+        if not self.enrich:
+            self.to_enrich.append(batch)
+            return [batch]
+        counts = await run_blocking(_enrich_rows, batch["articles"], batch["id_map"])
+        self.counts["entities"] += counts["entities"]
+        self.counts["keywords"] += counts["keywords"]
+        return [batch]
+
+    async def run(self, requests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Ingest everything returned by the given fetch requests
+
+        Args:
+            requests: Keyword arguments for ``source.fetch``, one dict per request
+
+        Returns:
+            Dictionary with ``stored``/``updated``/``failed``/
+            ``skipped_enrichment``/``near_duplicates``/``entities``/``keywords`` counts and
+            per-stage metrics under ``stages``
+
+        Raises:
+            Exception: The first fetch error, if every request failed
+        """
+        queues = {name: asyncio.Queue(maxsize=self.queue_size) for name in STAGES}
+
+        # Unbounded source queue: the requests themselves are already in memory
+        queues["fetch"] = asyncio.Queue()
+        for request in requests:
+            queues["fetch"].put_nowait(request)
+        for _ in range(self.metrics["fetch"].concurrency):
+            queues["fetch"].put_nowait(_END)
+
+        handlers = {
+            "fetch": (self._fetch, lambda item: 1 if isinstance(item, dict) else len(item)),
+            "transform": (self._transform, len),
+            "sentiment": (self._sentiment, _batch_size),
+            "persist": (self._persist, _batch_size),
+            "enrich": (self._enrich, _batch_size),
+        }
+
+        tasks = []
+        for index, name in enumerate(STAGES):
+            next_name = STAGES[index + 1] if index + 1 < len(STAGES) else None
+            handler, size_of = handlers[name]
+            tasks.append(self._run_stage(
+                name,
+                queues[name],
+                queues[next_name] if next_name else None,
+                handler,
+                size_of,
+                self.metrics[next_name].concurrency if next_name else 0
+            ))
+
+        # A stage that dies outside its handler takes the others down with it
+        # rather than leaving them blocked on queues nobody drains or fills
+        await _gather_or_cancel(*tasks)
+
+        if requests and len(self.fetch_errors) == len(requests):
+            raise self.fetch_errors[0]
+
+        self.counts["failed"] += self.metrics["transform"].failed + self.metrics["sentiment"].failed
+        self.counts["failed"] += self.metrics["persist"].failed
+
+        stage_metrics = {name: self.metrics[name].to_dict() for name in STAGES}
+        logger.info(
+            f"Ingestion finished. Stored: {self.counts['stored']}, Updated: {self.counts['updated']}, "
+            f"Failed: {self.counts['failed']}, Unchanged: {self.counts['skipped_enrichment']}, "
+            f"Near-duplicates: {self.counts['near_duplicates']}, "
+            f"Entities: {self.counts['entities']}, "
+            f"Keywords: {self.counts['keywords']}"
+        )
+        return {**self.counts, "stages": stage_metrics}
+
+
+async def _gather_or_cancel(*coroutines: Awaitable[Any]) -> List[Any]:
+    """
+    ``asyncio.gather`` that cancels the remaining tasks once one fails
+
+    The first error is re-raised after the others have finished cancelling.
+    """
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+def _batch_size(batch: Any) -> int:
+    """Number of articles carried by a batch, whatever its shape"""
+    if isinstance(batch, dict):
+        return len(batch.get("rows") or batch.get("articles") or []) + len(batch.get("unchanged") or [])
+    return len(batch)
+
+
+def _prepare_rows(articles: List[Dict[str, Any]], reprocess: bool = False):
+    """
+    Drop unchanged articles (unless reprocessing), then score sentiment for the rest
+
+    Returns:
+        Tuple of (new or changed articles, unchanged ``(id, article)`` pairs,
+        insertable rows, number of articles that failed)
+    """
+    from app.db import get_session_local
+
+    db = get_session_local()()
+    try:
+        changed, unchanged = partition_articles(db, articles, reprocess)
+    finally:
+        db.close()
+    rows, failed = build_article_rows(changed)
+    return changed, unchanged, rows, failed
+
+
+def _persist_rows(rows: List[Dict[str, Any]], unchanged: List[Any]):
+    """
+    Flag near-duplicates, upsert changed rows and refresh engagement of unchanged ones
+
+    Uses a session owned by the executor thread. Flagging happens here rather
+    than in the sentiment stage because this stage runs one batch at a time,
+    so batches are clustered in order.
+
+    Returns:
+        Tuple of (counts, ``external_id -> id`` map of the upserted rows,
+        external ids of near-duplicates)
+    """
+    from app.db import get_session_local
+
+    db = get_session_local()()
+    try:
+        duplicates = flag_near_duplicates(db, "article", rows, "external_id", "published_at")
+        counts, id_map, _ = bulk_upsert_articles(db, rows)
+        engagement = update_article_engagement(db, unchanged)
+        counts["updated"] += engagement["updated"]
+        counts["failed"] += engagement["failed"]
+        counts["skipped_enrichment"] = engagement["updated"]
+        counts["near_duplicates"] = len(duplicates)
+        return counts, id_map, duplicates
+    finally:
+        db.close()
+
+
+def _enrich_rows(articles: List[Dict[str, Any]], id_map: Dict[str, int]) -> Dict[str, int]:
+    """Run NER and keyword extraction with a session owned by the executor thread"""
+    from app.db import get_session_local
+
+    db = get_session_local()()
+    try:
+        return enrich_articles(db, articles, id_map)
+    finally:
+        db.close()
@@ -0,0 +1,661 @@
+"""
+Ingestion Service
+Set-based bulk writes shared by the scheduled pipelines and the backfill script
+"""
+from typing import List, Dict, Any, Iterable, Tuple, Optional, Set
+from datetime import datetime
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects import postgresql, sqlite
+from app.models.reddit_post import RedditPost
+from app.models.article import Article
+from app.services.sentiment_service import SentimentService
+from app.core.config import settings
+from app.core.fingerprint import content_fingerprint
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Sentiment columns keep their previous value when a re-fetch can't be analyzed
+SENTIMENT_COLUMNS = ("sentiment_score", "sentiment_label", "sentiment_analyzed_at")
+
+# Unified article fields (BaseDataSource.transform output) persisted on Article
+ARTICLE_FIELDS = (
+    "source_type", "source_name", "title", "content", "summary", "url",
+    "image_url", "author", "published_at", "source_metadata",
+)
+
+# Engagement columns refreshed on re-fetch when the content is unchanged
+REDDIT_ENGAGEMENT_COLUMNS = ("score", "num_comments", "upvote_ratio")
+ARTICLE_ENGAGEMENT_COLUMNS = ("score", "comment_count", "view_count", "engagement_rate")
+
+
+def dialect_insert(db: Session, model):
+    """
+    Build an INSERT that supports ON CONFLICT for the session's dialect
+
+    PostgreSQL is what runs in production; SQLite is used by the test suite and
+    shares the same ``on_conflict_do_update`` API.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    raise NotImplementedError(f"Bulk upsert is not supported for dialect '{dialect}'")
+
+
+def _chunks(rows: List[Dict[str, Any]], size: int) -> Iterable[List[Dict[str, Any]]]:
+    """Yield consecutive slices of ``rows`` with at most ``size`` items"""
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _stored_fingerprints(db: Session, model, key_column, keys: List[Any]) -> Dict[Any, Tuple[Any, Optional[str]]]:
+    """Look up ``key -> (primary key, content_hash)`` for rows that already exist"""
+    stored: Dict[Any, Tuple[Any, Optional[str]]] = {}
+    for chunk in _chunks(keys, settings.INGEST_BATCH_SIZE):
+        stored.update(
+            (key, (pk, content_hash)) for key, pk, content_hash in
+            db.query(key_column, model.id, model.content_hash).filter(key_column.in_(chunk)).all()
+        )
+    return stored
+
+
+def _update_engagement(
+    db: Session,
+    model,
+    rows: List[Dict[str, Any]],
+    label: str,
+    chunk_size: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Bulk UPDATE engagement columns by primary key
+
+    Each chunk is a single executemany UPDATE, committed on its own.
+
+    Returns:
+        Dictionary with ``updated`` and ``failed`` counts
+    """
+    chunk_size = chunk_size or settings.INGEST_BATCH_SIZE
+    counts = {"updated": 0, "failed": 0}
+
+    for chunk in _chunks(rows, chunk_size):
+        try:
+            # Rows carrying only a primary key have nothing to refresh
+            writable = [row for row in chunk if len(row) > 1]
+            if writable:
+                db.execute(update(model), writable)
+            db.commit()
+            counts["updated"] += len(chunk)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Engagement update of {len(chunk)} {label} failed: {str(e)}")
+            counts["failed"] += len(chunk)
+
+    return counts
+
+
+def flag_near_duplicates(
+    db: Session,
+    kind: str,
+    rows: List[Dict[str, Any]],
+    key_field: str,
+    timestamp_field: str
+) -> Set[str]:
+    """
+    Sign rows with MinHash and mark near-duplicates of recent stories
+
+    Sets ``minhash`` and ``duplicate_of`` on every row. Detection failures
+    are logged and leave the rows untouched, so ingestion never depends on it.
+
+    Args:
+        db: Database session
+        kind: ``"article"`` or ``"reddit"``
+        rows: Rows as produced by ``build_article_rows``/``build_reddit_post_rows``
+        key_field: Row field holding the item's key
+        timestamp_field: Row field holding the item's publish time
+
+    Returns:
+        Keys of the rows that are near-duplicates
+    """
+    if not rows or not settings.NEAR_DUPLICATE_ENABLED:
+        return set()
+
+    from app.services.near_duplicate_service import get_near_duplicate_service
+
+    try:
+        assigned = get_near_duplicate_service().assign(
+            kind,
+            [
+                (row[key_field], f"{row.get('title') or ''} {row.get('content') or ''}", row.get(timestamp_field))
+                for row in rows
+            ],
+            db
+        )
+    except Exception as e:
+        logger.error(f"Near-duplicate detection failed for {len(rows)} {kind} rows: {str(e)}")
+        return set()
+
+    for row in rows:
+        row["minhash"], row["duplicate_of"] = assigned[row[key_field]]
+    return {key for key, (_, canonical) in assigned.items() if canonical is not None}
+
+
+def partition_reddit_posts(
+    db: Session,
+    posts: Iterable[Any],
+    reprocess: bool = False
+) -> Tuple[List[Any], List[Any]]:
+    """
+    Split fetched posts into new/changed posts and posts whose content is unchanged
+
+    Posts are de-duplicated on ``id`` (latest copy wins) and compared with the
+    stored ``content_hash``. Rows stored before fingerprints existed count as
+    changed, so they are fingerprinted on their next fetch.
+
+    Args:
+        db: Database session
+        posts: RedditPostCreate objects
+        reprocess: Treat every post as changed, so sentiment runs again
+
+    Returns:
+        Tuple of (new or changed posts, unchanged posts)
+    """
+    latest = {post.id: post for post in posts}
+    if reprocess:
+        return list(latest.values()), []
+    stored = _stored_fingerprints(db, RedditPost, RedditPost.id, list(latest))
+
+    changed, unchanged = [], []
+    for post_id, post in latest.items():
+        stored_hash = stored.get(post_id, (None, None))[1]
+        if stored_hash is not None and stored_hash == content_fingerprint(post.title, post.content):
+            unchanged.append(post)
+        else:
+            changed.append(post)
+    return changed, unchanged
+
+
+def update_reddit_engagement(
+    db: Session,
+    posts: List[Any],
+    chunk_size: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Refresh score, comment count and upvote ratio of unchanged posts
+
+    Args:
+        db: Database session
+        posts: RedditPostCreate objects that already exist unchanged
+        chunk_size: Rows per statement (default: settings.INGEST_BATCH_SIZE)
+
+    Returns:
+        Dictionary with ``updated`` and ``failed`` counts
+    """
+    rows = [
+        {"id": post.id, **{column: getattr(post, column) for column in REDDIT_ENGAGEMENT_COLUMNS}}
+        for post in posts
+    ]
+    return _update_engagement(db, RedditPost, rows, "Reddit posts", chunk_size)
+
+
+def build_reddit_post_rows(posts: Iterable[Any]) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Run sentiment analysis and convert fetched posts into insertable rows
+
+    Posts fetched from several listings can overlap (e.g. a subreddit's top
+    posts and a search query), so rows are de-duplicated on ``id`` with the
+    latest copy winning. A single INSERT ... ON CONFLICT cannot touch the same
+    row twice.
+
+    Args:
+        posts: RedditPostCreate objects (anything with ``model_dump``)
+
+    Returns:
+        Tuple of (rows keyed by column name, number of posts that failed)
+    """
+    rows: Dict[str, Dict[str, Any]] = {}
+    failed_count = 0
+
+    for post_data in posts:
+        try:
+            sentiment_score, sentiment_label = SentimentService.analyze_reddit_post(
+                title=post_data.title,
+                content=post_data.content
+            )
+
+            row = post_data.model_dump()
+            row["content_hash"] = content_fingerprint(post_data.title, post_data.content)
+            row["sentiment_score"] = sentiment_score
+            row["sentiment_label"] = sentiment_label
+            row["sentiment_analyzed_at"] = datetime.utcnow() if sentiment_score is not None else None
+            rows[row["id"]] = row
+
+        except Exception as e:
+            logger.error(f"Error preparing post {getattr(post_data, 'id', '?')}: {str(e)}")
+            failed_count += 1
+
+    return list(rows.values()), failed_count
+
+
+def bulk_upsert_reddit_posts(
+    db: Session,
+    rows: List[Dict[str, Any]],
+    chunk_size: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Upsert Reddit post rows with INSERT ... ON CONFLICT (id) DO UPDATE
+
+    Each chunk costs two round trips (one to find which ids already exist so
+    stored/updated can be reported, one for the upsert) and is committed on its
+    own, so a bad chunk only fails its own rows.
+
+    Args:
+        db: Database session
+        rows: Rows as produced by ``build_reddit_post_rows``
+        chunk_size: Rows per statement (default: settings.INGEST_BATCH_SIZE)
+
+    Returns:
+        Dictionary with ``stored``, ``updated`` and ``failed`` counts
+    """
+    chunk_size = chunk_size or settings.INGEST_BATCH_SIZE
+    counts = {"stored": 0, "updated": 0, "failed": 0}
+
+    if not rows:
+        return counts
+
+    table = RedditPost.__table__
+
+    for chunk in _chunks(rows, chunk_size):
+        ids = [row["id"] for row in chunk]
+
+        try:
+            existing_ids = {
+                post_id for (post_id,) in
+                db.query(RedditPost.id).filter(RedditPost.id.in_(ids)).all()
+            }
+
+            stmt = dialect_insert(db, RedditPost).values(chunk)
+            update_columns = {
+                key: stmt.excluded[key]
+                for key in chunk[0].keys()
+                if key != "id" and key not in SENTIMENT_COLUMNS
+            }
+            for key in SENTIMENT_COLUMNS:
+                update_columns[key] = func.coalesce(stmt.excluded[key], table.c[key])
+            update_columns["updated_at"] = func.now()
+
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.id],
+                set_=update_columns
+            )
+            db.execute(stmt)
+            db.commit()
+
+            counts["updated"] += len(existing_ids)
+            counts["stored"] += len(chunk) - len(existing_ids)
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Bulk upsert of {len(chunk)} Reddit posts failed: {str(e)}")
+            counts["failed"] += len(chunk)
+
+    logger.info(
+        f"Bulk upserted Reddit posts. Stored: {counts['stored']}, "
+        f"Updated: {counts['updated']}, Failed: {counts['failed']}"
+    )
+    return counts
+
+
+def ingest_reddit_posts(
+    db: Session,
+    posts: Iterable[Any],
+    chunk_size: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Analyze sentiment for new or changed posts and bulk upsert them
+
+    Posts whose title and content are unchanged since the last fetch only
+    get their engagement columns refreshed; sentiment is not re-run. New or
+    changed posts are checked for near-duplicates of recent posts.
+
+    Args:
+        db: Database session
+        posts: RedditPostCreate objects
+        chunk_size: Rows per upsert statement
+
+    Returns:
+        Dictionary with ``stored``, ``updated``, ``failed``,
+        ``sentiment_analyzed``, ``skipped_enrichment`` and
+        ``near_duplicates`` counts
+    """
+    changed, unchanged = partition_reddit_posts(db, posts)
+
+    rows, prepare_failed = build_reddit_post_rows(changed)
+    duplicates = flag_near_duplicates(db, "reddit", rows, "id", "created_utc")
+    counts = bulk_upsert_reddit_posts(db, rows, chunk_size=chunk_size)
+    engagement = update_reddit_engagement(db, unchanged, chunk_size=chunk_size)
+
+    counts["updated"] += engagement["updated"]
+    counts["failed"] += prepare_failed + engagement["failed"]
+    counts["sentiment_analyzed"] = sum(1 for row in rows if row["sentiment_score"] is not None)
+    counts["skipped_enrichment"] = engagement["updated"]
+    counts["near_duplicates"] = len(duplicates)
+    return counts
+
+
+def partition_articles(
+    db: Session,
+    articles: Iterable[Dict[str, Any]],
+    reprocess: bool = False
+) -> Tuple[List[Dict[str, Any]], List[Tuple[int, Dict[str, Any]]]]:
+    """
+    Split transformed articles into new/changed articles and unchanged ones
+
+    Articles are de-duplicated on their source ``id`` (latest copy wins) and
+    compared with the stored ``content_hash``.
+
+    Args:
+        db: Database session
+        articles: Articles in the unified ``BaseDataSource`` format
+        reprocess: Treat every article as changed, so sentiment and
+            enrichment run again
+
+    Returns:
+        Tuple of (new or changed articles, ``(Article.id, article)`` pairs
+        for unchanged articles)
+    """
+    latest = {article["id"]: article for article in articles}
+    if reprocess:
+        return list(latest.values()), []
+    stored = _stored_fingerprints(db, Article, Article.external_id, list(latest))
+
+    changed, unchanged = [], []
+    for external_id, article in latest.items():
+        article_id, stored_hash = stored.get(external_id, (None, None))
+        if stored_hash is not None and stored_hash == content_fingerprint(article.get("title"), article.get("content")):
+            unchanged.append((article_id, article))
+        else:
+            changed.append(article)
+    return changed, unchanged
+
+
+def update_article_engagement(
+    db: Session,
+    unchanged: List[Tuple[int, Dict[str, Any]]],
+    chunk_size: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Refresh engagement columns of unchanged articles
+
+    Only engagement fields the source provides are written; articles
+    without any are counted as updated without a write.
+
+    Args:
+        db: Database session
+        unchanged: ``(Article.id, article)`` pairs from ``partition_articles``
+        chunk_size: Rows per statement (default: settings.INGEST_BATCH_SIZE)
+
+    Returns:
+        Dictionary with ``updated`` and ``failed`` counts
+    """
+    rows = [
+        {"id": article_id, **{
+            column: article[column] for column in ARTICLE_ENGAGEMENT_COLUMNS if column in article
+        }}
+        for article_id, article in unchanged
+    ]
+    return _update_engagement(db, Article, rows, "articles", chunk_size)
+
+
+def build_article_rows(articles: Iterable[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Run sentiment analysis and convert transformed articles into insertable rows
+
+    Rows are de-duplicated on ``external_id`` (the source-specific ``id``) with
+    the latest copy winning.
+
+    Args:
+        articles: Articles in the unified format produced by ``BaseDataSource``
+
+    Returns:
+        Tuple of (rows keyed by Article column name, number of articles that failed)
+    """
+    rows: Dict[str, Dict[str, Any]] = {}
+    failed_count = 0
+
+    for article_data in articles:
+        try:
+            text_to_analyze = f"{article_data.get('title', '')} {article_data.get('content', '')}"
+            sentiment_score, sentiment_label = SentimentService.analyze_text(text_to_analyze)
+
+            row = {"external_id": article_data["id"]}
+            for field in ARTICLE_FIELDS:
+                row[field] = article_data.get(field)
+            row["content_hash"] = content_fingerprint(article_data.get("title"), article_data.get("content"))
+            row["sentiment_score"] = sentiment_score
+            row["sentiment_label"] = sentiment_label
+            row["sentiment_analyzed_at"] = datetime.utcnow() if sentiment_score is not None else None
+            rows[row["external_id"]] = row
+
+        except Exception as e:
+            logger.error(f"Error preparing article: {str(e)}")
+            failed_count += 1
+
+    return list(rows.values()), failed_count
+
+
+def bulk_upsert_articles(
+    db: Session,
+    rows: List[Dict[str, Any]],
+    chunk_size: Optional[int] = None
+) -> Tuple[Dict[str, int], Dict[str, int], set]:
+    """
+    Upsert article rows with INSERT ... ON CONFLICT (external_id) DO UPDATE
+
+    Each chunk costs two round trips: one lookup of the external ids that
+    already exist, and the upsert itself, which RETURNs the primary keys so
+    enrichment never has to re-select the rows.
+
+    Args:
+        db: Database session
+        rows: Rows as produced by ``build_article_rows``
+        chunk_size: Rows per statement (default: settings.INGEST_BATCH_SIZE)
+
+    Returns:
+        Tuple of (``stored``/``updated``/``failed`` counts,
+        ``external_id -> id`` map for every written row,
+        set of external ids that were newly inserted)
+    """
+    chunk_size = chunk_size or settings.INGEST_BATCH_SIZE
+    counts = {"stored": 0, "updated": 0, "failed": 0}
+    id_map: Dict[str, int] = {}
+    new_external_ids = set()
+
+    if not rows:
+        return counts, id_map, new_external_ids
+
+    table = Article.__table__
+
+    for chunk in _chunks(rows, chunk_size):
+        external_ids = [row["external_id"] for row in chunk]
+
+        try:
+            existing_ids = {
+                external_id for (external_id,) in
+                db.query(Article.external_id).filter(Article.external_id.in_(external_ids)).all()
+            }
+
+            stmt = dialect_insert(db, Article).values(chunk)
+            update_columns = {
+                key: stmt.excluded[key]
+                for key in chunk[0].keys()
+                if key != "external_id" and key not in SENTIMENT_COLUMNS
+            }
+            for key in SENTIMENT_COLUMNS:
+                update_columns[key] = func.coalesce(stmt.excluded[key], table.c[key])
+            update_columns["updated_at"] = func.now()
+
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.external_id],
+                set_=update_columns
+            ).returning(table.c.external_id, table.c.id)
+
+            written = dict(db.execute(stmt).all())
+            db.commit()
+
+            id_map.update(written)
+            new_external_ids.update(set(written) - existing_ids)
+            counts["updated"] += len(existing_ids)
+            counts["stored"] += len(chunk) - len(existing_ids)
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Bulk upsert of {len(chunk)} articles failed: {str(e)}")
+            counts["failed"] += len(chunk)
+
+    logger.info(
+        f"Bulk upserted articles. Stored: {counts['stored']}, "
+        f"Updated: {counts['updated']}, Failed: {counts['failed']}"
+    )
+    return counts, id_map, new_external_ids
+
+
+def ingest_articles(
+    db: Session,
+    articles: Iterable[Dict[str, Any]],
+    chunk_size: Optional[int] = None
+) -> Tuple[Dict[str, int], Dict[str, int], set]:
+    """
+    Analyze sentiment for new or changed articles and bulk upsert them
+
+    Articles whose title and content are unchanged since the last fetch only
+    get their engagement columns refreshed and are left out of sentiment and
+    enrichment. Near-duplicates of recent stories are stored but not enriched;
+    their canonical copy carries the entities and keywords.
+
+    Args:
+        db: Database session
+        articles: Articles in the unified ``BaseDataSource`` format
+        chunk_size: Rows per upsert statement
+
+    Returns:
+        Tuple of (``stored``/``updated``/``failed``/``skipped_enrichment``/
+        ``near_duplicates`` counts, ``external_id -> id`` map for the written
+        rows, set of external ids whose content is new or changed and needs
+        enrichment)
+    """
+    changed, unchanged = partition_articles(db, articles)
+
+    rows, prepare_failed = build_article_rows(changed)
+    duplicates = flag_near_duplicates(db, "article", rows, "external_id", "published_at")
+    counts, id_map, _ = bulk_upsert_articles(db, rows, chunk_size=chunk_size)
+    engagement = update_article_engagement(db, unchanged, chunk_size=chunk_size)
+
+    counts["updated"] += engagement["updated"]
+    counts["failed"] += prepare_failed + engagement["failed"]
+    counts["skipped_enrichment"] = engagement["updated"]
+    counts["near_duplicates"] = len(duplicates)
+    return counts, id_map, set(id_map) - duplicates
+
+
+def _enrichment_targets(articles: Iterable[Dict[str, Any]], id_map: Dict[str, int]) -> List[Tuple[int, Dict[str, Any]]]:
+    """``(Article.id, article)`` pairs for the articles present in ``id_map``"""
+    return [(id_map[a["id"]], a) for a in articles if a.get("id") in id_map]
+
+
+def extract_article_entities(
+    db: Session,
+    articles: Iterable[Dict[str, Any]],
+    id_map: Dict[str, int]
+) -> int:
+    """
+    Run NER for articles already written to the database
+
+    Args:
+        db: Database session
+        articles: Articles in the unified ``BaseDataSource`` format
+        id_map: ``external_id -> Article.id`` for the articles to process
+
+    Returns:
+        Number of entities saved
+    """
+    from app.services.ner_service import get_ner_service
+
+    targets = _enrichment_targets(articles, id_map)
+    if not targets:
+        return 0
+
+    logger.info(f"Starting NER processing for {len(targets)} articles")
+    texts_by_article = {
+        article_id: f"{article_data.get('title', '')}\n\n{article_data.get('content') or ''}"
+        for article_id, article_data in targets
+    }
+    return get_ner_service().extract_and_save_entities_batch(texts_by_article, db)
+
+
+def extract_article_keywords(
+    db: Session,
+    articles: Iterable[Dict[str, Any]],
+    id_map: Dict[str, int]
+) -> int:
+    """
+    Run keyword extraction for articles already written to the database
+
+    Args:
+        db: Database session
+        articles: Articles in the unified ``BaseDataSource`` format
+        id_map: ``external_id -> Article.id`` for the articles to process
+
+    Returns:
+        Number of keywords saved
+    """
+    from app.services.keyword_service import get_keyword_service
+
+    targets = _enrichment_targets(articles, id_map)
+    if not targets:
+        return 0
+
+    logger.info(f"Starting keyword extraction for {len(targets)} articles")
+    texts_by_article = {
+        article_id: f"{article_data.get('title', '')} {article_data.get('content') or ''}"
+        for article_id, article_data in targets
+    }
+    return get_keyword_service().extract_and_save_keywords_batch(texts_by_article, db)
+
+
+def enrich_articles(
+    db: Session,
+    articles: Iterable[Dict[str, Any]],
+    id_map: Dict[str, int]
+) -> Dict[str, int]:
+    """
+    Extract entities and keywords for articles already written to the database
+
+    Text comes from the in-memory article dicts and primary keys from
+    ``id_map``, so no article is re-selected. Articles whose ``id`` is not in
+    ``id_map`` are skipped. A failing extractor is logged and counted as 0.
+
+    Args:
+        db: Database session
+        articles: Articles in the unified ``BaseDataSource`` format
+        id_map: ``external_id -> Article.id`` for the articles to enrich
+
+    Returns:
+        Dictionary with ``entities`` and ``keywords`` counts
+    """
+    articles = list(articles)
+    counts = {"entities": 0, "keywords": 0}
+
+    try:
+        counts["entities"] = extract_article_entities(db, articles, id_map)
+    except Exception as ner_batch_error:
+        logger.error(f"NER batch processing failed: {ner_batch_error}")
+
+    try:
+        counts["keywords"] = extract_article_keywords(db, articles, id_map)
+    except Exception as keyword_batch_error:
+        logger.error(f"Keyword batch processing failed: {keyword_batch_error}")
+
+    return counts
@@ -2,22 +2,82 @@
 Keyword Extraction Service
 Extracts and manages keywords from article content using TF-IDF
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Mapping, Set
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import func, desc, insert, select
 from datetime import datetime, timedelta
 import logging
 import re
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer
 from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+from sklearn.preprocessing import normalize
 import numpy as np
 
 from app.models.keyword import Keyword
+from app.models.keyword_document_frequency import KeywordDocumentFrequency
 from app.models.article import Article
 from app.schemas.keyword import KeywordCreate, KeywordResponse
+from app.services.ingestion_service import dialect_insert
+from app.core.config import settings
+from app.core.executor import run_blocking
 
 logger = logging.getLogger(__name__)
 
+# Extended stop words (common words that aren't meaningful keywords)
+CUSTOM_STOP_WORDS = frozenset(ENGLISH_STOP_WORDS).union({
+    'said', 'says', 'new', 'just', 'like', 'way', 'know', 'people',
+    'time', 'year', 'years', 'got', 'going', 'want', 'make', 'lot',
+    'really', 'thing', 'things', 'use', 'used', 'don', 'didn', 've',
+    'll', 're', 'isn', 'wasn', 'weren', 'won', 'shouldn', 'wouldn',
+    'http', 'https', 'com', 'www', 'html'
+})
+
+# Words with 3+ letters
+TOKEN_PATTERN = r'\b[a-zA-Z]{3,}\b'
+
+# Bound on parameters per IN (...) / multi-row INSERT statement
+_SQL_CHUNK_SIZE = 5000
+
+CORPUS_SIZE_BUCKET = KeywordDocumentFrequency.CORPUS_SIZE_BUCKET
+BOOTSTRAP_BUCKET = KeywordDocumentFrequency.BOOTSTRAP_BUCKET
+
+
+def top_k_terms(matrix, feature_names: Mapping[int, str], k: int) -> List[List[Dict[str, Any]]]:
+    """
+    Pick the ``k`` highest-scoring terms of every row of a sparse matrix
+
+    Works on the CSR arrays directly: non-zeros are sorted by (row, -score)
+    in one ``lexsort`` and ranked by their offset from the row start, so no
+    row is densified or sorted in Python.
+
+    Args:
+        matrix: Sparse document-term matrix
+        feature_names: Term for each column (array or column -> term mapping)
+        k: Terms to keep per row
+
+    Returns:
+        One list of ``{"keyword", "score"}`` dicts per row, best first
+    """
+    matrix = matrix.tocsr()
+    results: List[List[Dict[str, Any]]] = [[] for _ in range(matrix.shape[0])]
+    if matrix.nnz == 0 or k <= 0:
+        return results
+
+    rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+    order = np.lexsort((-matrix.data, rows))
+    rank = np.arange(order.size) - matrix.indptr[rows[order]]
+    keep = order[(rank < k) & (matrix.data[order] > 0)]
+
+    for row, column, score in zip(rows[keep], matrix.indices[keep], matrix.data[keep]):
+        results[row].append({"keyword": str(feature_names[column]), "score": float(score)})
+    return results
+
+
+def smooth_idf(document_counts: np.ndarray, corpus_size: int) -> np.ndarray:
+    """Smoothed IDF, as computed by scikit-learn's ``TfidfTransformer``"""
+    return np.log((1 + corpus_size) / (1 + document_counts)) + 1
+
 
 class KeywordService:
     """Service for keyword extraction and analysis"""
@@ -35,14 +95,24 @@ class KeywordService:
         self.min_df = min_df
         self.max_df = max_df
 
-        # Extended stop words (common words that aren't meaningful keywords)
-        self.custom_stop_words = set(ENGLISH_STOP_WORDS).union({
-            'said', 'says', 'new', 'just', 'like', 'way', 'know', 'people',
-            'time', 'year', 'years', 'got', 'going', 'want', 'make', 'lot',
-            'really', 'thing', 'things', 'use', 'used', 'don', 'didn', 've',
-            'll', 're', 'isn', 'wasn', 'weren', 'won', 'shouldn', 'wouldn',
-            'http', 'https', 'com', 'www', 'html'
-        })
+        self.custom_stop_words = CUSTOM_STOP_WORDS
+        self._stop_words_list = sorted(CUSTOM_STOP_WORDS)
+
+        # Terms are hashed into a fixed number of buckets, so document
+        # frequencies can be counted incrementally without a fitted vocabulary
+        self._analyzer = HashingVectorizer(
+            n_features=settings.KEYWORD_HASH_FEATURES,
+            stop_words=self._stop_words_list,
+            ngram_range=(1, 2),  # Consider 1-2 word phrases
+            lowercase=True,
+            token_pattern=TOKEN_PATTERN
+        ).build_analyzer()
+        self._hasher = FeatureHasher(
+            n_features=settings.KEYWORD_HASH_FEATURES,
+            input_type="string",
+            alternate_sign=False,
+            dtype=np.float32
+        )
 
     def _preprocess_text(self, text: str) -> str:
         """
@@ -74,12 +144,136 @@ class KeywordService:
 
         return text
 
-    def extract_keywords_single(self, text: str) -> List[Dict[str, Any]]:
+    def _term_buckets(self, terms: List[str]) -> np.ndarray:
+        """Hash bucket of each term, in input order"""
+        if not terms:
+            return np.empty(0, dtype=np.int32)
+        return self._hasher.transform([[term] for term in terms]).indices
+
+    def _document_frequencies(self, buckets: Iterable[int], db: Session) -> Dict[int, int]:
+        """
+        Look up stored document counts for the given buckets
+
+        The corpus size is always included under ``CORPUS_SIZE_BUCKET``.
+        """
+        wanted = sorted({int(b) for b in buckets} | {CORPUS_SIZE_BUCKET})
+        counts: Dict[int, int] = {}
+        for start in range(0, len(wanted), _SQL_CHUNK_SIZE):
+            chunk = wanted[start:start + _SQL_CHUNK_SIZE]
+            counts.update(
+                db.query(KeywordDocumentFrequency.term_hash, KeywordDocumentFrequency.document_count)
+                .filter(KeywordDocumentFrequency.term_hash.in_(chunk))
+                .all()
+            )
+        return counts
+
+    def corpus_size(self, db: Session) -> int:
+        """Number of documents counted into the document-frequency table"""
+        return self._document_frequencies([], db).get(CORPUS_SIZE_BUCKET, 0)
+
+    def is_bootstrapped(self, db: Session) -> bool:
+        """Whether the counts have been rebuilt from the stored articles at least once"""
+        return db.query(KeywordDocumentFrequency.term_hash).filter(
+            KeywordDocumentFrequency.term_hash == BOOTSTRAP_BUCKET
+        ).first() is not None
+
+    def _add_document_frequencies(self, bucket_counts: Dict[int, int], documents: int, db: Session):
+        """Add per-bucket document counts with INSERT ... ON CONFLICT (caller commits)"""
+        rows = [
+            {"term_hash": bucket, "document_count": count}
+            for bucket, count in sorted(bucket_counts.items())
+        ]
+        # Sorted keys keep concurrent writers locking rows in the same order
+        rows.insert(0, {"term_hash": CORPUS_SIZE_BUCKET, "document_count": documents})
+
+        for start in range(0, len(rows), _SQL_CHUNK_SIZE):
+            stmt = dialect_insert(db, KeywordDocumentFrequency).values(rows[start:start + _SQL_CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[KeywordDocumentFrequency.term_hash],
+                set_={
+                    "document_count": KeywordDocumentFrequency.document_count + stmt.excluded.document_count,
+                    "updated_at": func.now(),
+                }
+            )
+            db.execute(stmt)
+
+    def update_document_frequencies(self, texts: List[str], db: Session) -> int:
+        """
+        Count a batch of new documents into the document-frequency table
+
+        Runs in O(batch): only the buckets present in the batch are touched.
+        The caller commits.
+
+        Args:
+            texts: Raw texts of documents not counted before
+            db: Database session
+
+        Returns:
+            Number of documents counted
+        """
+        term_sets = [set(self._analyzer(clean)) for clean in map(self._preprocess_text, texts) if clean]
+        term_sets = [terms for terms in term_sets if terms]
+        if not term_sets:
+            return 0
+
+        matrix = self._hasher.transform(term_sets).tocsr()
+        matrix.sum_duplicates()
+        # Each bucket appears once per row, so its column count is a document count
+        buckets, counts = np.unique(matrix.indices, return_counts=True)
+        self._add_document_frequencies(dict(zip(buckets.tolist(), counts.tolist())), len(term_sets), db)
+        return len(term_sets)
+
+    def rebuild_document_frequencies(self, db: Session, max_documents: Optional[int] = None) -> int:
+        """
+        Recount document frequencies from the stored article corpus
+
+        Used to bootstrap an empty table or repair it; day-to-day counts are
+        kept current by ``update_document_frequencies``.
+
+        Args:
+            db: Database session
+            max_documents: Newest articles to count (defaults to KEYWORD_MODEL_MAX_DOCUMENTS)
+
+        Returns:
+            Number of documents counted
+        """
+        limit = max_documents or settings.KEYWORD_MODEL_MAX_DOCUMENTS
+        totals = np.zeros(settings.KEYWORD_HASH_FEATURES, dtype=np.int64)
+        documents = 0
+
+        query = (
+            db.query(Article.title, Article.content)
+            .order_by(Article.published_at.desc())
+            .limit(limit)
+            .yield_per(500)
+        )
+        for title, content in query:
+            terms = set(self._analyzer(self._preprocess_text(f"{title} {content or ''}")))
+            if not terms:
+                continue
+            totals[np.unique(self._term_buckets(sorted(terms)))] += 1
+            documents += 1
+
+        try:
+            db.query(KeywordDocumentFrequency).delete(synchronize_session=False)
+            buckets = np.flatnonzero(totals)
+            self._add_document_frequencies(dict(zip(buckets.tolist(), totals[buckets].tolist())), documents, db)
+            db.add(KeywordDocumentFrequency(term_hash=BOOTSTRAP_BUCKET, document_count=documents))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        logger.info(f"Rebuilt keyword document frequencies from {documents} articles ({len(buckets)} terms)")
+        return documents
+
+    def extract_keywords_single(self, text: str, db: Optional[Session] = None) -> List[Dict[str, Any]]:
         """
         Extract keywords from a single text using TF-IDF
 
         Args:
             text: Text to extract keywords from
+            db: Database session for corpus IDF (per-document TF-IDF without one)
 
         Returns:
             List of keyword dictionaries with 'keyword' and 'score'
@@ -87,48 +281,233 @@ class KeywordService:
         if not text or not text.strip():
             return []
 
-        try:
-            # Preprocess text
-            clean_text = self._preprocess_text(text)
-
-            if not clean_text:
-                return []
-
-            # Create TF-IDF vectorizer
-            vectorizer = TfidfVectorizer(
-                max_features=self.max_keywords * 3,  # Get more candidates
-                stop_words=list(self.custom_stop_words),
-                ngram_range=(1, 2),  # Consider 1-2 word phrases
-                min_df=1,
-                max_df=1.0,
-                lowercase=True,
-                token_pattern=r'\b[a-zA-Z]{3,}\b'  # Words with 3+ letters
-            )
-
-            # Fit and transform
-            tfidf_matrix = vectorizer.fit_transform([clean_text])
-            feature_names = vectorizer.get_feature_names_out()
+        return self.extract_keywords_batch([text], db)[0]
 
-            # Get TF-IDF scores
-            tfidf_scores = tfidf_matrix.toarray()[0]
+    def extract_keywords_batch(self, texts: List[str], db: Optional[Session] = None) -> List[List[Dict[str, Any]]]:
+        """
+        Extract keywords from many texts in one sparse matrix operation
 
-            # Create keyword-score pairs
-            keyword_scores = [
-                {"keyword": feature_names[i], "score": float(tfidf_scores[i])}
-                for i in range(len(feature_names))
-                if tfidf_scores[i] > 0
-            ]
+        With a session and a corpus of at least KEYWORD_MODEL_MIN_DOCUMENTS,
+        terms are weighted by the current corpus IDF from the incremental
+        document-frequency table. Otherwise each text falls back to a
+        vectorizer fitted on that text alone, where the score is effectively
+        term frequency.
 
-            # Sort by score and take top keywords
-            keyword_scores.sort(key=lambda x: x['score'], reverse=True)
-            keywords = keyword_scores[:self.max_keywords]
+        Args:
+            texts: Texts to extract keywords from
+            db: Database session for corpus IDF
 
-            logger.debug(f"Extracted {len(keywords)} keywords from text of length {len(text)}")
-            return keywords
+        Returns:
+            One list of keyword dictionaries per input text, in input order.
+            Corpus-scored keywords carry the ``idf`` they were weighted with.
+        """
+        results: List[List[Dict[str, Any]]] = [[] for _ in texts]
+        clean_texts = [self._preprocess_text(text) if text and text.strip() else "" for text in texts]
+        positions = [i for i, clean_text in enumerate(clean_texts) if clean_text]
+        if not positions:
+            return results
 
+        try:
+            scored = self._extract_with_corpus_idf([clean_texts[i] for i in positions], db) if db else None
+            if scored is None:
+                scored = [self._extract_uncalibrated(clean_texts[i]) for i in positions]
+            for position, keywords in zip(positions, scored):
+                results[position] = keywords
         except Exception as e:
             logger.error(f"Error extracting keywords: {e}")
+            return [[] for _ in texts]
+
+        logger.debug(f"Extracted {sum(len(r) for r in results)} keywords from {len(positions)} texts")
+        return results
+
+    def _extract_with_corpus_idf(self, clean_texts: List[str], db: Session) -> Optional[List[List[Dict[str, Any]]]]:
+        """Score texts against the stored document frequencies, or None if the corpus is too small"""
+        term_lists = [self._analyzer(clean_text) for clean_text in clean_texts]
+        vocabulary = sorted(set().union(*term_lists))
+        term_buckets = self._term_buckets(vocabulary)
+
+        frequencies = self._document_frequencies(term_buckets, db)
+        corpus_size = frequencies.get(CORPUS_SIZE_BUCKET, 0)
+        if corpus_size < settings.KEYWORD_MODEL_MIN_DOCUMENTS:
+            return None
+
+        # Term counts per document, one column per hash bucket
+        matrix = self._hasher.transform(term_lists).tocsr()
+        matrix.sum_duplicates()
+
+        buckets = np.unique(matrix.indices)
+        document_counts = np.array([frequencies.get(int(b), 0) for b in buckets], dtype=np.float64)
+        idf = smooth_idf(document_counts, corpus_size)
+        # Terms too rare or too common in the corpus are not keywords
+        idf[(document_counts < self.min_df) | (document_counts > self.max_df * corpus_size)] = 0.0
+
+        column_idf = idf[np.searchsorted(buckets, matrix.indices)]
+        matrix.data = ((1 + np.log(matrix.data)) * column_idf).astype(np.float32)
+        matrix.eliminate_zeros()
+        matrix = normalize(matrix)
+
+        names: Dict[int, str] = {}
+        for bucket, term in zip(term_buckets.tolist(), vocabulary):
+            names.setdefault(bucket, term)
+        idf_by_term = {names[int(b)]: float(value) for b, value in zip(buckets, idf) if int(b) in names}
+
+        scored = top_k_terms(matrix, names, self.max_keywords)
+        for keywords in scored:
+            for kw in keywords:
+                kw["idf"] = idf_by_term[kw["keyword"]]
+        return scored
+
+    def _extract_uncalibrated(self, clean_text: str) -> List[Dict[str, Any]]:
+        """Per-document TF-IDF, used only until the corpus is large enough"""
+        vectorizer = TfidfVectorizer(
+            max_features=self.max_keywords * 3,  # Get more candidates
+            stop_words=self._stop_words_list,
+            ngram_range=(1, 2),
+            min_df=1,
+            max_df=1.0,
+            lowercase=True,
+            token_pattern=TOKEN_PATTERN
+        )
+        try:
+            matrix = vectorizer.fit_transform([clean_text])
+        except ValueError:
+            # Only stop words / short tokens left
             return []
+        return top_k_terms(matrix, vectorizer.get_feature_names_out(), self.max_keywords)[0]
+
+    def extract_and_save_keywords_batch(
+        self,
+        texts_by_article: Dict[int, str],
+        db: Session,
+        count_documents: bool = True
+    ) -> int:
+        """
+        Extract keywords for many articles and save them with one bulk insert
+
+        Articles that have no stored keywords yet are first counted into the
+        document-frequency table, so re-processing an article never counts
+        it twice. Existing keywords for every given article are replaced, so
+        an article whose new text has no keywords is left with none.
+
+        Args:
+            texts_by_article: Text to process keyed by article ID
+            db: Database session
+            count_documents: Count new articles into the document frequencies
+
+        Returns:
+            Number of keywords saved
+        """
+        if not texts_by_article:
+            return 0
+
+        article_ids = list(texts_by_article)
+        try:
+            if count_documents:
+                already_counted: Set[int] = {
+                    article_id for (article_id,) in
+                    db.query(Keyword.article_id).filter(Keyword.article_id.in_(article_ids)).distinct()
+                }
+                self.update_document_frequencies(
+                    [texts_by_article[a] for a in article_ids if a not in already_counted], db
+                )
+
+            extracted = self.extract_keywords_batch([texts_by_article[a] for a in article_ids], db)
+            rows = [
+                {
+                    "article_id": article_id,
+                    "keyword": kw_data["keyword"],
+                    "score": kw_data["score"],
+                    "idf": kw_data.get("idf"),
+                }
+                for article_id, keywords in zip(article_ids, extracted)
+                for kw_data in keywords
+            ]
+
+            db.query(Keyword).filter(Keyword.article_id.in_(article_ids)).delete(synchronize_session=False)
+            if rows:
+                db.execute(insert(Keyword), rows)
+            db.commit()
+            logger.info(f"Saved {len(rows)} keywords for {len(article_ids)} articles")
+            return len(rows)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error saving keywords for {len(article_ids)} articles: {e}")
+            return 0
+
+    def rescore_keywords(self, db: Session, threshold: Optional[float] = None) -> Dict[str, int]:
+        """
+        Re-extract keywords whose IDF has drifted since they were scored
+
+        A stored keyword has drifted when its current corpus IDF differs from
+        the IDF it was scored with by more than ``threshold`` (relative).
+        Keywords from the per-document fallback count as scored with IDF 1.0.
+        Affected articles are re-scored from their text without being counted
+        again, so scores stay normalized per article.
+
+        Args:
+            db: Database session
+            threshold: Relative IDF change that triggers a rescore
+                (defaults to KEYWORD_IDF_DRIFT_THRESHOLD)
+
+        Returns:
+            Dictionary with ``checked`` keywords, ``drifted`` keywords and
+            ``articles`` re-scored
+        """
+        threshold = settings.KEYWORD_IDF_DRIFT_THRESHOLD if threshold is None else threshold
+        result = {"checked": 0, "drifted": 0, "articles": 0}
+
+        corpus_size = self.corpus_size(db)
+        if corpus_size < settings.KEYWORD_MODEL_MIN_DOCUMENTS:
+            logger.info(f"Skipping keyword rescoring: corpus has {corpus_size} documents")
+            return result
+
+        stale_articles: Set[int] = set()
+        last_id = 0
+        while True:
+            chunk = (
+                db.query(Keyword.id, Keyword.article_id, Keyword.keyword, Keyword.idf)
+                .filter(Keyword.id > last_id)
+                .order_by(Keyword.id)
+                .limit(_SQL_CHUNK_SIZE)
+                .all()
+            )
+            if not chunk:
+                break
+            last_id = chunk[-1].id
+
+            buckets = self._term_buckets([row.keyword for row in chunk])
+            frequencies = self._document_frequencies(buckets, db)
+            current = smooth_idf(
+                np.array([frequencies.get(int(b), 0) for b in buckets], dtype=np.float64),
+                corpus_size
+            )
+            scored_with = np.array([row.idf if row.idf is not None else 1.0 for row in chunk])
+            drifted = np.abs(current - scored_with) > threshold * scored_with
+
+            result["checked"] += len(chunk)
+            result["drifted"] += int(drifted.sum())
+            stale_articles.update(row.article_id for row, is_drifted in zip(chunk, drifted) if is_drifted)
+
+        article_ids = sorted(stale_articles)
+        batch_size = settings.INGEST_QUEUE_BATCH_SIZE
+        for start in range(0, len(article_ids), batch_size):
+            rows = (
+                db.query(Article.id, Article.title, Article.content)
+                .filter(Article.id.in_(article_ids[start:start + batch_size]))
+                .all()
+            )
+            texts_by_article = {
+                article_id: f"{title} {content or ''}"
+                for article_id, title, content in rows
+            }
+            self.extract_and_save_keywords_batch(texts_by_article, db, count_documents=False)
+            result["articles"] += len(texts_by_article)
+
+        logger.info(
+            f"Keyword rescoring checked {result['checked']} keywords, "
+            f"{result['drifted']} drifted, {result['articles']} articles re-scored"
+        )
+        return result
 
     def extract_and_save_keywords(
         self,
@@ -147,35 +526,16 @@ class KeywordService:
         Returns:
             List of created Keyword objects
         """
-        # Extract keywords
-        extracted_keywords = self.extract_keywords_single(text)
-
-        if not extracted_keywords:
+        if not self.extract_and_save_keywords_batch({article_id: text}, db):
             logger.debug(f"No keywords found for article {article_id}")
             return []
 
-        # Delete existing keywords for this article (in case of re-processing)
-        db.query(Keyword).filter(Keyword.article_id == article_id).delete()
-
-        # Create Keyword objects and save to database
-        created_keywords = []
-        for kw_data in extracted_keywords:
-            keyword = Keyword(
-                article_id=article_id,
-                keyword=kw_data["keyword"],
-                score=kw_data["score"]
-            )
-            db.add(keyword)
-            created_keywords.append(keyword)
-
-        try:
-            db.commit()
-            logger.info(f"Saved {len(created_keywords)} keywords for article {article_id}")
-            return created_keywords
-        except Exception as e:
-            db.rollback()
-            logger.error(f"Error saving keywords for article {article_id}: {e}")
-            return []
+        return (
+            db.query(Keyword)
+            .filter(Keyword.article_id == article_id)
+            .order_by(Keyword.score.desc())
+            .all()
+        )
 
     def process_article(self, article_id: int, db: Session) -> List[Keyword]:
         """
@@ -247,11 +607,20 @@ class KeywordService:
             "top_keywords": top_keywords_list
         }
 
+    @staticmethod
+    def _unique_story_filters(unique_stories: bool) -> List[Any]:
+        """Filters that drop keywords of articles flagged as near-duplicates"""
+        if not unique_stories:
+            return []
+        duplicates = select(Article.id).where(Article.duplicate_of.isnot(None))
+        return [Keyword.article_id.notin_(duplicates)]
+
     def get_trending_keywords(
         self,
         db: Session,
         time_window: str = "24h",
-        limit: int = 20
+        limit: int = 20,
+        unique_stories: bool = True
     ) -> List[Dict[str, Any]]:
         """
         Get trending keywords based on recent appearance frequency
@@ -260,6 +629,8 @@ class KeywordService:
             db: Database session
             time_window: Time window for trending calculation (24h, 7d, 30d)
             limit: Maximum number of trending keywords to return
+            unique_stories: Count each story once by ignoring articles flagged
+                as near-duplicates of another article
 
         Returns:
             List of trending keywords with their scores
@@ -284,6 +655,7 @@ class KeywordService:
                 func.avg(Keyword.score).label("avg_score")
             )
             .filter(Keyword.created_at >= cutoff)
+            .filter(*self._unique_story_filters(unique_stories))
             .group_by(Keyword.keyword)
             .order_by(desc("mention_count"))
             .limit(limit)
@@ -320,3 +692,34 @@ def get_keyword_service() -> KeywordService:
     if _keyword_service is None:
         _keyword_service = KeywordService()
     return _keyword_service
+
+
+def _rescore_keyword_scores() -> Dict[str, int]:
+    """Rescore drifted keywords with a session owned by the executor thread"""
+    from app.db import get_session_local
+
+    db = get_session_local()()
+    try:
+        keyword_service = get_keyword_service()
+        if not keyword_service.is_bootstrapped(db) and db.query(Article.id).first() is not None:
+            # Bootstrap the incremental counts from articles stored before they existed.
+            # Ingests may already have counted a few documents, so corpus size can't tell.
+            keyword_service.rebuild_document_frequencies(db)
+        return keyword_service.rescore_keywords(db)
+    finally:
+        db.close()
+
+
+async def rescore_keyword_scores() -> Dict[str, int]:
+    """
+    Scheduled job: refresh stored keyword scores whose IDF has drifted
+
+    Returns:
+        Counts from ``KeywordService.rescore_keywords``
+    """
+    logger.info("Checking keyword scores for IDF drift")
+    try:
+        return await run_blocking(_rescore_keyword_scores)
+    except Exception as e:
+        logger.error(f"Keyword rescoring failed: {str(e)}")
+        raise
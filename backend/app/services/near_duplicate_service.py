@@ -0,0 +1,341 @@
+"""
+Near-Duplicate Detection Service
+Clusters syndicated and cross-posted stories with MinHash signatures and an LSH index
+"""
+import hashlib
+import heapq
+import re
+import threading
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple, Set
+import logging
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.models.article import Article
+from app.models.reddit_post import RedditPost
+from app.core.config import settings
+from app.core.fingerprint import normalize_text
+
+logger = logging.getLogger(__name__)
+
+WORD_PATTERN = re.compile(r"\w+")
+
+# Universal hashing h(x) = (a * x + b) mod p, truncated to 32 bits
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+# Seed for the permutation parameters. Signatures are persisted, so changing
+# it (or NEAR_DUPLICATE_NUM_PERM) invalidates every stored signature.
+_PERMUTATION_SEED = 1
+
+# Content kinds with their own index:
+# kind -> (model, key column, timestamp column, last-written column)
+KINDS = {
+    "article": (Article, Article.external_id, Article.published_at, Article.updated_at),
+    "reddit": (RedditPost, RedditPost.id, RedditPost.created_utc, RedditPost.updated_at),
+}
+
+# How far before the last-written mark each reload starts. Write times come
+# from the writer's transaction, which can commit after a later one was loaded.
+_RELOAD_OVERLAP = timedelta(seconds=30)
+
+
+def shingles(text: Optional[str], size: int) -> Set[str]:
+    """
+    Word shingles of normalized text
+
+    Texts shorter than ``size`` words yield a single shingle of the whole text.
+
+    Args:
+        text: Text to shingle
+        size: Words per shingle
+
+    Returns:
+        Set of shingles (empty for empty text)
+    """
+    words = WORD_PATTERN.findall(normalize_text(text))
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+class MinHasher:
+    """Computes fixed-length MinHash signatures that are stable across processes"""
+
+    def __init__(self, num_perm: int, seed: int = _PERMUTATION_SEED):
+        generator = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self._a = generator.randint(1, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+        self._b = generator.randint(0, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+
+    def signature(self, tokens: Set[str]) -> Optional[np.ndarray]:
+        """
+        MinHash signature of a shingle set
+
+        Args:
+            tokens: Shingles
+
+        Returns:
+            ``uint32`` array of length ``num_perm``, or None for an empty set
+        """
+        if not tokens:
+            return None
+        hashes = np.array(
+            [
+                int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest(), "little")
+                for token in tokens
+            ],
+            dtype=np.uint64
+        )
+        # uint64 products wrap around, which keeps this vectorized and is still
+        # a good enough family of permutations
+        with np.errstate(over="ignore"):
+            permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype("<u4")
+
+
+def similarity(first: np.ndarray, second: np.ndarray) -> float:
+    """Jaccard similarity estimated from two MinHash signatures"""
+    return float(np.mean(first == second))
+
+
+class LSHIndex:
+    """
+    Banded locality-sensitive hashing index over MinHash signatures
+
+    Entries older than ``window`` (by their own timestamp) are evicted as new
+    ones arrive, so the index only ever holds recent stories.
+    """
+
+    def __init__(self, bands: int, rows: int, window: timedelta):
+        self.bands = bands
+        self.rows = rows
+        self.window = window
+        self._buckets: List[Dict[bytes, Set[str]]] = [{} for _ in range(bands)]
+        self._signatures: Dict[str, Tuple[np.ndarray, datetime]] = {}
+        self._expiry: List[Tuple[datetime, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._signatures
+
+    def holds(self, key: str, signature: np.ndarray) -> bool:
+        """Whether ``key`` is indexed with exactly this signature"""
+        entry = self._signatures.get(key)
+        return entry is not None and np.array_equal(entry[0], signature)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, key: str, signature: np.ndarray, timestamp: datetime):
+        """Index ``signature`` under ``key``, replacing any previous entry"""
+        self.remove(key)
+        for band, band_key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(band_key, set()).add(key)
+        self._signatures[key] = (signature, timestamp)
+        heapq.heappush(self._expiry, (timestamp, key))
+
+    def remove(self, key: str):
+        """Drop ``key`` from the index if present"""
+        entry = self._signatures.pop(key, None)
+        if entry is None:
+            return
+        for band, band_key in enumerate(self._band_keys(entry[0])):
+            bucket = self._buckets[band].get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][band_key]
+
+    def prune(self, now: Optional[datetime] = None):
+        """Evict entries whose timestamp fell out of the window"""
+        cutoff = (now or datetime.utcnow()) - self.window
+        while self._expiry and self._expiry[0][0] < cutoff:
+            timestamp, key = heapq.heappop(self._expiry)
+            entry = self._signatures.get(key)
+            # A re-added key has a newer heap entry of its own
+            if entry is not None and entry[1] == timestamp:
+                self.remove(key)
+
+    def query(
+        self,
+        signature: np.ndarray,
+        threshold: float,
+        exclude: Optional[str] = None
+    ) -> Optional[Tuple[str, float]]:
+        """
+        Find the most similar indexed entry
+
+        Args:
+            signature: MinHash signature to look up
+            threshold: Minimum estimated Jaccard similarity
+            exclude: Key never to match
+
+        Returns:
+            Tuple of (key, similarity) of the best match, or None
+        """
+        candidates: Set[str] = set()
+        for band, band_key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(band_key, ()))
+        candidates.discard(exclude)
+
+        best: Optional[Tuple[str, float]] = None
+        for key in candidates:
+            score = similarity(signature, self._signatures[key][0])
+            if score >= threshold and (best is None or score > best[1] or (score == best[1] and key < best[0])):
+                best = (key, score)
+        return best
+
+
+class NearDuplicateService:
+    """
+    Service for flagging near-duplicate articles and Reddit posts
+
+    Each kind of content has its own in-memory LSH index of recent canonical
+    stories, built only from persisted rows (``minhash``): it is warmed from
+    the database the first time a process uses it, then every ``assign``
+    loads the rows written since, by any process. Stories from a batch that
+    fails to persist therefore never become canonical.
+    """
+
+    def __init__(
+        self,
+        num_perm: Optional[int] = None,
+        bands: Optional[int] = None,
+        threshold: Optional[float] = None,
+        shingle_size: Optional[int] = None,
+        window_hours: Optional[int] = None
+    ):
+        self.num_perm = num_perm or settings.NEAR_DUPLICATE_NUM_PERM
+        self.bands = bands or settings.NEAR_DUPLICATE_BANDS
+        if self.num_perm % self.bands:
+            raise ValueError("NEAR_DUPLICATE_NUM_PERM must be a multiple of NEAR_DUPLICATE_BANDS")
+        self.threshold = threshold or settings.NEAR_DUPLICATE_THRESHOLD
+        self.shingle_size = shingle_size or settings.NEAR_DUPLICATE_SHINGLE_SIZE
+        self.window = timedelta(hours=window_hours or settings.NEAR_DUPLICATE_WINDOW_HOURS)
+
+        self.hasher = MinHasher(self.num_perm)
+        self._indexes: Dict[str, LSHIndex] = {}
+        # Latest write time loaded into each index
+        self._loaded_until: Dict[str, Optional[datetime]] = {}
+        self._lock = threading.Lock()
+
+    def signature(self, text: Optional[str]) -> Optional[np.ndarray]:
+        """MinHash signature of a text, or None if it has no words"""
+        return self.hasher.signature(shingles(text, self.shingle_size))
+
+    def _index(self, kind: str, db: Session) -> LSHIndex:
+        """
+        Get the index for ``kind``, up to date with the database
+
+        The first call loads every recent canonical row; later calls load
+        the rows written since the last one, adding new canonicals and
+        dropping rows that were re-flagged as duplicates.
+        """
+        model, key_column, timestamp_column, written_column = KINDS[kind]
+        index = self._indexes.get(kind)
+        loaded_until = self._loaded_until.get(kind)
+
+        query = db.query(key_column, model.minhash, model.duplicate_of, timestamp_column, written_column).filter(
+            timestamp_column >= datetime.utcnow() - self.window
+        )
+        if index is None:
+            index = LSHIndex(self.bands, self.num_perm // self.bands, self.window)
+            query = query.filter(model.minhash.isnot(None), model.duplicate_of.is_(None))
+        elif loaded_until is not None:
+            query = query.filter(written_column >= loaded_until - _RELOAD_OVERLAP)
+
+        added = 0
+        for key, minhash, duplicate_of, timestamp, written_at in query:
+            if written_at is not None and (loaded_until is None or written_at > loaded_until):
+                loaded_until = written_at
+            signature = np.frombuffer(minhash, dtype="<u4") if minhash else None
+            if duplicate_of is not None or signature is None or signature.size != self.num_perm:
+                index.remove(key)
+            elif not index.holds(key, signature):
+                index.add(key, signature, timestamp)
+                added += 1
+
+        if kind not in self._indexes:
+            logger.info(f"Loaded {added} recent {kind} signatures into the near-duplicate index")
+            self._indexes[kind] = index
+        self._loaded_until[kind] = loaded_until
+        return index
+
+    def assign(
+        self,
+        kind: str,
+        items: List[Tuple[str, Optional[str], Optional[datetime]]],
+        db: Session
+    ) -> Dict[str, Tuple[Optional[bytes], Optional[str]]]:
+        """
+        Sign items and cluster them against recent content
+
+        Items are processed in order, so an item can be a duplicate of one
+        earlier in the same batch. Items that are not duplicates become
+        canonical once the caller has persisted them with their signature.
+
+        Args:
+            kind: ``"article"`` or ``"reddit"``
+            items: ``(key, text, timestamp)`` tuples
+            db: Database session (used to load the index)
+
+        Returns:
+            ``key -> (signature bytes, canonical key or None)``
+        """
+        now = datetime.utcnow()
+        results: Dict[str, Tuple[Optional[bytes], Optional[str]]] = {}
+
+        with self._lock:
+            index = self._index(kind, db)
+            index.prune(now)
+            # Canonicals of this batch, until they are persisted
+            batch = LSHIndex(index.bands, index.rows, self.window)
+
+            for key, text, timestamp in items:
+                signature = self.signature(text)
+                if signature is None:
+                    results[key] = (None, None)
+                    continue
+
+                # A re-fetched story must not match its own previous version
+                matches = [
+                    match for match in (
+                        index.query(signature, self.threshold, exclude=key),
+                        batch.query(signature, self.threshold, exclude=key),
+                    )
+                    if match is not None
+                ]
+                if matches:
+                    results[key] = (signature.tobytes(), min(matches, key=lambda m: (-m[1], m[0]))[0])
+                    continue
+
+                batch.add(key, signature, timestamp or now)
+                results[key] = (signature.tobytes(), None)
+
+        duplicates = sum(1 for _, canonical in results.values() if canonical is not None)
+        if duplicates:
+            logger.info(f"Flagged {duplicates} of {len(items)} {kind} items as near-duplicates")
+        return results
+
+    def reset(self):
+        """Drop the in-memory indexes; they are reloaded on next use"""
+        with self._lock:
+            self._indexes.clear()
+            self._loaded_until.clear()
+
+
+# Global near-duplicate service instance
+_near_duplicate_service: Optional[NearDuplicateService] = None
+
+
+def get_near_duplicate_service() -> NearDuplicateService:
+    """Get or create the global near-duplicate service instance"""
+    global _near_duplicate_service
+    if _near_duplicate_service is None:
+        _near_duplicate_service = NearDuplicateService()
+    return _near_duplicate_service
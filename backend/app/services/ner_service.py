@@ -3,18 +3,24 @@ Named Entity Recognition Service
 Extracts and manages named entities from article content using spaCy
 """
 import spacy
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import func, desc, insert, select
 from datetime import datetime, timedelta
 import logging
 
 from app.models.entity import Entity
 from app.models.article import Article
 from app.schemas.entity import EntityCreate, EntityResponse
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Pipeline components entity extraction needs; the rest (tagger, parser,
+# lemmatizer, ...) are disabled. The core English pipelines' ner component
+# has its own embedding layer, but tok2vec is kept in case a model shares it.
+NER_PIPES = ("tok2vec", "ner")
+
 
 class NERService:
     """Service for Named Entity Recognition operations"""
@@ -29,6 +35,26 @@ class NERService:
             logger.error("Please run: python -m spacy download en_core_web_sm")
             raise
 
+        unused_pipes = [name for name in getattr(self.nlp, "pipe_names", []) if name not in NER_PIPES]
+        if unused_pipes:
+            self.nlp.select_pipes(disable=unused_pipes)
+            logger.info(f"Disabled spaCy components not needed for NER: {unused_pipes}")
+
+    @staticmethod
+    def _doc_entities(doc) -> List[Dict[str, Any]]:
+        """Convert a processed spaCy Doc into entity dictionaries"""
+        return [
+            {
+                "entity_text": ent.text,
+                "entity_type": ent.label_,
+                "start_char": ent.start_char,
+                "end_char": ent.end_char,
+                # spaCy doesn't provide confidence by default, but we can use entity length as a proxy
+                "confidence": None
+            }
+            for ent in doc.ents
+        ]
+
     def extract_entities(self, text: str) -> List[Dict[str, Any]]:
         """
         Extract named entities from text using spaCy
@@ -43,19 +69,7 @@ class NERService:
             return []
 
         try:
-            doc = self.nlp(text)
-            entities = []
-
-            for ent in doc.ents:
-                entities.append({
-                    "entity_text": ent.text,
-                    "entity_type": ent.label_,
-                    "start_char": ent.start_char,
-                    "end_char": ent.end_char,
-                    # spaCy doesn't provide confidence by default, but we can use entity length as a proxy
-                    "confidence": None
-                })
-
+            entities = self._doc_entities(self.nlp(text))
             logger.debug(f"Extracted {len(entities)} entities from text of length {len(text)}")
             return entities
 
@@ -63,6 +77,92 @@ class NERService:
             logger.error(f"Error extracting entities: {e}")
             return []
 
+    def extract_entities_batch(
+        self,
+        texts: List[str],
+        batch_size: Optional[int] = None,
+        n_process: Optional[int] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Extract named entities from many texts with ``nlp.pipe``
+
+        Args:
+            texts: Texts to extract entities from
+            batch_size: Texts per spaCy batch (defaults to NER_BATCH_SIZE)
+            n_process: spaCy worker processes (defaults to NER_N_PROCESS)
+
+        Returns:
+            One list of entity dictionaries per input text, in input order
+        """
+        results: List[List[Dict[str, Any]]] = [[] for _ in texts]
+        positions = [i for i, text in enumerate(texts) if text and text.strip()]
+        if not positions:
+            return results
+
+        try:
+            docs = self.nlp.pipe(
+                (texts[i] for i in positions),
+                batch_size=batch_size or settings.NER_BATCH_SIZE,
+                n_process=n_process or settings.NER_N_PROCESS
+            )
+            for position, doc in zip(positions, docs):
+                results[position] = self._doc_entities(doc)
+        except Exception as e:
+            logger.error(f"Error extracting entities in batch: {e}")
+            return [[] for _ in texts]
+
+        logger.debug(f"Extracted {sum(len(r) for r in results)} entities from {len(positions)} texts")
+        return results
+
+    def extract_and_save_entities_batch(
+        self,
+        texts_by_article: Dict[int, str],
+        db: Session,
+        batch_size: Optional[int] = None,
+        n_process: Optional[int] = None
+    ) -> int:
+        """
+        Extract entities for many articles and save them with one bulk insert
+
+        Existing entities for every given article are replaced, so an article
+        whose new text has no entities is left with none.
+
+        Args:
+            texts_by_article: Text to process keyed by article ID
+            db: Database session
+            batch_size: Texts per spaCy batch (defaults to NER_BATCH_SIZE)
+            n_process: spaCy worker processes (defaults to NER_N_PROCESS)
+
+        Returns:
+            Number of entities saved
+        """
+        if not texts_by_article:
+            return 0
+
+        article_ids = list(texts_by_article)
+        extracted = self.extract_entities_batch(
+            [texts_by_article[article_id] for article_id in article_ids],
+            batch_size=batch_size,
+            n_process=n_process
+        )
+        rows = [
+            {"article_id": article_id, **entity_data}
+            for article_id, entities in zip(article_ids, extracted)
+            for entity_data in entities
+        ]
+
+        try:
+            db.query(Entity).filter(Entity.article_id.in_(article_ids)).delete(synchronize_session=False)
+            if rows:
+                db.execute(insert(Entity), rows)
+            db.commit()
+            logger.info(f"Saved {len(rows)} entities for {len(article_ids)} articles")
+            return len(rows)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error saving entities for {len(article_ids)} articles: {e}")
+            return 0
+
     def extract_and_save_entities(
         self,
         article_id: int,
@@ -131,6 +231,36 @@ class NERService:
 
         return self.extract_and_save_entities(article_id, text_to_process, db)
 
+    def process_articles(self, article_ids: Iterable[int], db: Session) -> int:
+        """
+        Process several articles in one batch and extract their entities
+
+        Args:
+            article_ids: IDs of the articles to process
+            db: Database session
+
+        Returns:
+            Number of entities saved
+        """
+        ids = list(dict.fromkeys(article_ids))
+        if not ids:
+            return 0
+
+        rows = (
+            db.query(Article.id, Article.title, Article.content)
+            .filter(Article.id.in_(ids))
+            .all()
+        )
+        missing = len(ids) - len(rows)
+        if missing:
+            logger.warning(f"{missing} of {len(ids)} articles not found for entity extraction")
+
+        texts_by_article = {
+            article_id: f"{title}\n\n{content or ''}"
+            for article_id, title, content in rows
+        }
+        return self.extract_and_save_entities_batch(texts_by_article, db)
+
     def get_entity_stats(self, db: Session) -> Dict[str, Any]:
         """
         Get statistics about entities in the database
@@ -185,11 +315,20 @@ class NERService:
             "top_entities": top_entities_list
         }
 
+    @staticmethod
+    def _unique_story_filters(unique_stories: bool) -> List[Any]:
+        """Filters that drop entities of articles flagged as near-duplicates"""
+        if not unique_stories:
+            return []
+        duplicates = select(Article.id).where(Article.duplicate_of.isnot(None))
+        return [Entity.article_id.notin_(duplicates)]
+
     def get_trending_entities(
         self,
         db: Session,
         time_window: str = "24h",
-        limit: int = 20
+        limit: int = 20,
+        unique_stories: bool = True
     ) -> List[Dict[str, Any]]:
         """
         Get trending entities based on recent mention frequency
@@ -198,6 +337,8 @@ class NERService:
             db: Database session
             time_window: Time window for trending calculation (24h, 7d, 30d)
             limit: Maximum number of trending entities to return
+            unique_stories: Count each story once by ignoring articles flagged
+                as near-duplicates of another article
 
         Returns:
             List of trending entities with their scores
@@ -222,6 +363,7 @@ class NERService:
                 func.count(func.distinct(Entity.article_id)).label("article_count")
             )
             .filter(Entity.created_at >= cutoff)
+            .filter(*self._unique_story_filters(unique_stories))
             .group_by(Entity.entity_text, Entity.entity_type)
             .order_by(desc("mention_count"))
             .limit(limit)
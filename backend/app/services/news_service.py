@@ -4,10 +4,15 @@ Implements BaseDataSource interface for consistent multi-source pipeline
 """
 import aiohttp
 import asyncio
-from typing import List, Dict, Any, Optional
+import itertools
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
 from datetime import datetime
 from app.services.base_source import BaseDataSource, DataSourceConfig, SourceType, SourceAPIError, RateLimitError
 from app.core.retry import api_retry, CircuitBreaker
+from app.core.config import settings
+from app.core.fingerprint import canonicalize_url, normalize_text, stable_id
+from app.services.watermark_service import HighWaterMark
+from app.services.payload_archive import payload_archive
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,6 +20,42 @@ logger = logging.getLogger(__name__)
 # Circuit breaker for News API
 news_api_circuit_breaker = CircuitBreaker(failure_threshold=3, timeout=300)
 
+# NewsAPI error code for paging past the plan's result limit
+MAX_RESULTS_REACHED = "maximumResultsReached"
+
+
+class ResultLimitReached(SourceAPIError):
+    """Raised when a request pages past the NewsAPI plan's result limit"""
+    pass
+
+
+def _listing_name(endpoint: str, params: Dict[str, Any]) -> str:
+    """Archive label of a request, e.g. ``everything:hasbro:2``"""
+    target = params.get('q') or params.get('category') or params.get('sources') or ''
+    return f"{endpoint}:{target}:{params.get('page', 1)}"
+
+
+def news_article_id(url: Optional[str], title: Optional[str], source_name: Optional[str]) -> str:
+    """
+    Stable external ID for a news article
+
+    A digest of the canonical URL, so the same story gets the same ID on
+    every run, worker and backfill. Articles without a URL fall back to
+    their normalized title and source name.
+
+    Args:
+        url: Article URL
+        title: Article title
+        source_name: Publication name
+
+    Returns:
+        Hex digest ID
+    """
+    canonical_url = canonicalize_url(url)
+    if canonical_url:
+        return stable_id("url", canonical_url)
+    return stable_id("title", normalize_text(title), normalize_text(source_name))
+
 
 class NewsAPIService(BaseDataSource):
     """
@@ -30,6 +71,9 @@ class NewsAPIService(BaseDataSource):
 
     BASE_URL = "https://newsapi.org/v2"
 
+    # Pagination sends several requests per fetch; _fetch_page paces each one
+    paces_requests = True
+
     def __init__(self, api_key: str, **config_kwargs):
         """
         Initialize News API service
@@ -38,6 +82,7 @@ class NewsAPIService(BaseDataSource):
             api_key: NewsAPI.org API key
             **config_kwargs: Additional configuration (rate_limit, timeout, etc.)
         """
+        config_kwargs.setdefault('rate_limit', 60 * settings.NEWS_API_REQUESTS_PER_SECOND)
         config = DataSourceConfig(
             source_type=SourceType.NEWS,
             api_key=api_key,
@@ -46,31 +91,55 @@ class NewsAPIService(BaseDataSource):
         super().__init__(config)
         self.api_key = api_key
 
-    @api_retry
-    async def fetch(
+        # High-water marks keyed by the ``watermark_key`` passed to fetch
+        self.watermarks: Dict[str, HighWaterMark] = {}
+
+    def _build_params(
         self,
-        query: Optional[str] = None,
-        sources: Optional[str] = None,
-        category: Optional[str] = None,
-        language: str = 'en',
-        page_size: int = 20,
-        endpoint: str = 'top-headlines',
-        **kwargs
-    ) -> List[Dict[str, Any]]:
+        query: Optional[str],
+        sources: Optional[str],
+        category: Optional[str],
+        language: str,
+        page_size: int,
+        endpoint: str,
+        watermark_key: Optional[str],
+        extra: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build NewsAPI query parameters, asking only for articles past the watermark"""
+        params = {
+            'apiKey': self.api_key,
+            'language': language,
+            'pageSize': min(page_size, 100),  # API max is 100
+        }
+
+        # Add optional parameters
+        if query:
+            params['q'] = query
+        if sources:
+            params['sources'] = sources
+        if category and endpoint == 'top-headlines':
+            params['category'] = category
+
+        mark = self.watermarks.get(watermark_key) if watermark_key else None
+        if mark is not None and mark.cutoff is not None and endpoint == 'everything':
+            params['from'] = mark.cutoff.strftime('%Y-%m-%dT%H:%M:%S')
+            params['sortBy'] = 'publishedAt'
+
+        # Additional parameters from kwargs
+        params.update(extra)
+        return params
+
+    @api_retry
+    async def _fetch_page(self, endpoint: str, params: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], int]:
         """
-        Fetch news articles from NewsAPI
+        Request one page from NewsAPI
 
         Args:
-            query: Search keywords (e.g., "artificial intelligence", "climate change")
-            sources: Comma-separated source IDs (e.g., "bbc-news,cnn")
-            category: Category (business, entertainment, health, science, sports, technology)
-            language: Language code (default: 'en')
-            page_size: Number of articles to fetch (max 100)
             endpoint: API endpoint ('top-headlines' or 'everything')
-            **kwargs: Additional parameters
+            params: Query parameters
 
         Returns:
-            List of raw article data from NewsAPI
+            Tuple of (raw articles, total results available)
 
         Raises:
             SourceAPIError: If API request fails
@@ -81,64 +150,55 @@ class NewsAPIService(BaseDataSource):
             logger.error("News API circuit breaker is open, skipping fetch")
             raise SourceAPIError("News API circuit breaker is open")
 
+        # Every page and retry counts against the NewsAPI quota
+        await self.throttle()
+
         try:
-            # Build API request
             url = f"{self.BASE_URL}/{endpoint}"
-            params = {
-                'apiKey': self.api_key,
-                'language': language,
-                'pageSize': min(page_size, 100),  # API max is 100
-            }
-
-            # Add optional parameters
-            if query:
-                params['q'] = query
-            if sources:
-                params['sources'] = sources
-            if category and endpoint == 'top-headlines':
-                params['category'] = category
-
-            # Additional parameters from kwargs
-            params.update(kwargs)
-
-            self.logger.info(f"Fetching from News API: endpoint={endpoint}, query={query}, sources={sources}")
-
-            # Make async HTTP request
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url,
-                    params=params,
-                    timeout=aiohttp.ClientTimeout(total=self.config.timeout)
-                ) as response:
-                    # Check for rate limiting
-                    if response.status == 429:
-                        news_api_circuit_breaker.record_failure()
-                        raise RateLimitError("News API rate limit exceeded")
-
-                    # Check for API errors
-                    if response.status != 200:
-                        news_api_circuit_breaker.record_failure()
-                        error_data = await response.json()
-                        raise SourceAPIError(
-                            f"News API error: {response.status} - {error_data.get('message', 'Unknown error')}"
-                        )
-
-                    data = await response.json()
-
-                    # Check API response status
-                    if data.get('status') != 'ok':
-                        news_api_circuit_breaker.record_failure()
-                        raise SourceAPIError(f"News API returned error: {data.get('message', 'Unknown error')}")
-
-                    articles = data.get('articles', [])
-                    total_results = data.get('totalResults', 0)
-
-                    self.logger.info(f"Fetched {len(articles)} articles (total available: {total_results})")
-
-                    # Record success
-                    news_api_circuit_breaker.record_success()
-
-                    return articles
+
+            self.logger.info(
+                f"Fetching from News API: endpoint={endpoint}, query={params.get('q')}, "
+                f"sources={params.get('sources')}, page={params.get('page', 1)}"
+            )
+
+            # Make async HTTP request over the shared connection pool
+            async with self.http_request("GET", url, params=params) as response:
+                # Check for rate limiting
+                if response.status == 429:
+                    news_api_circuit_breaker.record_failure()
+                    raise RateLimitError("News API rate limit exceeded")
+
+                # Check for API errors
+                if response.status != 200:
+                    error_data = await response.json()
+                    if error_data.get('code') == MAX_RESULTS_REACHED:
+                        # Plan limit on paging depth, not an outage
+                        raise ResultLimitReached(error_data.get('message', 'Result limit reached'))
+                    news_api_circuit_breaker.record_failure()
+                    raise SourceAPIError(
+                        f"News API error: {response.status} - {error_data.get('message', 'Unknown error')}"
+                    )
+
+                data = await response.json()
+
+                # Check API response status
+                if data.get('status') != 'ok':
+                    news_api_circuit_breaker.record_failure()
+                    raise SourceAPIError(f"News API returned error: {data.get('message', 'Unknown error')}")
+
+                articles = data.get('articles', [])
+                total_results = data.get('totalResults', 0)
+
+                self.logger.info(f"Fetched {len(articles)} articles (total available: {total_results})")
+
+                # Record success
+                news_api_circuit_breaker.record_success()
+
+                # Archiving is file I/O; keep it off the event loop
+                await asyncio.to_thread(
+                    payload_archive.write, "news", articles, listing=_listing_name(endpoint, params)
+                )
+                return articles, total_results
 
         except aiohttp.ClientError as e:
             news_api_circuit_breaker.record_failure()
@@ -148,11 +208,179 @@ class NewsAPIService(BaseDataSource):
             news_api_circuit_breaker.record_failure()
             self.logger.error("Timeout fetching from News API")
             raise SourceAPIError("Request timeout")
+        except (SourceAPIError, RateLimitError):
+            raise
         except Exception as e:
             news_api_circuit_breaker.record_failure()
             self.logger.error(f"Unexpected error fetching from News API: {str(e)}")
             raise
 
+    async def fetch(
+        self,
+        query: Optional[str] = None,
+        sources: Optional[str] = None,
+        category: Optional[str] = None,
+        language: str = 'en',
+        page_size: int = 20,
+        endpoint: str = 'top-headlines',
+        watermark_key: Optional[str] = None,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch one page of news articles from NewsAPI
+
+        With a ``watermark_key`` whose mark is in ``watermarks``, only articles
+        newer than the mark are returned: 'everything' requests ask for them
+        with ``from``/``sortBy=publishedAt``, and 'top-headlines' results are
+        filtered. A successful fetch advances the mark.
+
+        Args:
+            query: Search keywords (e.g., "artificial intelligence", "climate change")
+            sources: Comma-separated source IDs (e.g., "bbc-news,cnn")
+            category: Category (business, entertainment, health, science, sports, technology)
+            language: Language code (default: 'en')
+            page_size: Number of articles to fetch (max 100)
+            endpoint: API endpoint ('top-headlines' or 'everything')
+            watermark_key: Listing key for incremental fetching
+            **kwargs: Additional parameters
+
+        Returns:
+            List of raw article data from NewsAPI
+
+        Raises:
+            SourceAPIError: If API request fails
+            RateLimitError: If rate limit is exceeded
+        """
+        params = self._build_params(query, sources, category, language, page_size, endpoint, watermark_key, kwargs)
+        articles, _ = await self._fetch_page(endpoint, params)
+
+        if watermark_key:
+            articles = self._after_watermark(
+                watermark_key, articles, newest_first=params.get('sortBy') == 'publishedAt'
+            )
+        return articles
+
+    async def fetch_pages(
+        self,
+        query: Optional[str] = None,
+        sources: Optional[str] = None,
+        category: Optional[str] = None,
+        language: str = 'en',
+        page_size: int = 100,
+        endpoint: str = 'top-headlines',
+        watermark_key: Optional[str] = None,
+        max_pages: Optional[int] = None,
+        start_page: int = 1,
+        **kwargs
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yield raw articles page by page until the results run out
+
+        Paging stops at the last page, at ``max_pages``, when the plan's
+        result limit is reached, or (for incremental 'everything' requests)
+        at the first page that reaches already-seen articles. Requests are
+        spaced by the service's rate limit.
+
+        Args:
+            query: Search keywords
+            sources: Comma-separated source IDs
+            category: Category (top-headlines only)
+            language: Language code
+            page_size: Articles per page (max 100)
+            endpoint: API endpoint ('top-headlines' or 'everything')
+            watermark_key: Listing key for incremental fetching
+            max_pages: Maximum pages to request
+            start_page: First page to request, e.g. to resume a backfill
+            **kwargs: Additional parameters
+
+        Yields:
+            Lists of raw article data, one per page
+        """
+        params = self._build_params(query, sources, category, language, page_size, endpoint, watermark_key, kwargs)
+        newest_first = params.get('sortBy') == 'publishedAt'
+        # Every page is compared with the mark the listing started from; it
+        # only advances once the last page was consumed, so a consumer that
+        # stops early gets the remaining articles on its next run
+        mark = self.watermarks.get(watermark_key, HighWaterMark()) if watermark_key else None
+        seen: List[Tuple[str, datetime]] = []
+        fetched = (start_page - 1) * params['pageSize']
+
+        for page in itertools.count(start_page):
+            try:
+                articles, total_results = await self._fetch_page(endpoint, {**params, 'page': page})
+            except ResultLimitReached as e:
+                if page == 1:
+                    raise
+                self.logger.info(f"Stopping after page {page - 1}: {str(e)}")
+                break
+
+            page_count = len(articles)
+            fetched += page_count
+            reached_known = False
+            if mark is not None:
+                fresh = self._filter_known(mark, articles, newest_first)
+                reached_known = newest_first and len(fresh) < page_count
+                seen.extend((article_id, published_at) for article_id, published_at, _ in fresh)
+                articles = [article for _, _, article in fresh]
+
+            if articles:
+                yield articles
+
+            if (
+                reached_known
+                or page_count < params['pageSize']
+                or fetched >= total_results
+                or (max_pages is not None and page >= max_pages)
+            ):
+                break
+
+        if mark is not None:
+            self.watermarks[watermark_key] = mark.advance(seen)
+
+    def _filter_known(
+        self,
+        mark: HighWaterMark,
+        articles: List[Dict[str, Any]],
+        newest_first: bool
+    ) -> List[Tuple[str, datetime, Dict[str, Any]]]:
+        """
+        Drop articles at or below a high-water mark
+
+        Args:
+            mark: Listing's high-water mark
+            articles: Raw articles from NewsAPI
+            newest_first: Whether ``articles`` are sorted by publish time,
+                so everything after the first old article can be skipped
+
+        Returns:
+            ``(id, published_at, article)`` for articles newer than the mark
+        """
+        fresh = []
+        for article in articles:
+            article_id = self._generate_id(article)
+            published_at = self._parse_date(article.get('publishedAt'))
+            if newest_first and mark.is_past(published_at):
+                break
+            if mark.is_known(article_id, published_at):
+                continue
+            fresh.append((article_id, published_at, article))
+
+        if len(fresh) < len(articles):
+            self.logger.info(f"Skipped {len(articles) - len(fresh)} articles already seen")
+        return fresh
+
+    def _after_watermark(
+        self,
+        key: str,
+        articles: List[Dict[str, Any]],
+        newest_first: bool
+    ) -> List[Dict[str, Any]]:
+        """Drop articles at or below a listing's high-water mark, then advance it"""
+        mark = self.watermarks.get(key, HighWaterMark())
+        fresh = self._filter_known(mark, articles, newest_first)
+        self.watermarks[key] = mark.advance((article_id, published_at) for article_id, published_at, _ in fresh)
+        return [article for _, _, article in fresh]
+
     def transform(self, raw_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Transform News API articles to unified format
@@ -205,15 +433,12 @@ class NewsAPIService(BaseDataSource):
         return transformed
 
     def _generate_id(self, article: Dict[str, Any]) -> str:
-        """Generate unique ID for article"""
-        url = article.get('url', '')
-        if url:
-            # Use hash of URL as ID
-            return str(hash(url))
-        # Fallback to hash of title + source
-        title = article.get('title', '')
-        source = article.get('source', {}).get('name', '')
-        return str(hash(f"{title}_{source}"))
+        """Generate a stable ID for an article (see ``news_article_id``)"""
+        return news_article_id(
+            article.get('url'),
+            article.get('title'),
+            (article.get('source') or {}).get('name')
+        )
 
     def _parse_date(self, date_string: Optional[str]) -> datetime:
         """Parse ISO 8601 date string"""
@@ -290,3 +515,45 @@ class NewsAPIService(BaseDataSource):
             **kwargs
         )
         return self.transform(raw_data)
+
+    async def stream_articles(
+        self,
+        query: str,
+        language: str = 'en',
+        page_size: int = 100,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        max_items: Optional[int] = None,
+        prefetch: Optional[int] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Search all articles, yielding transformed pages as they arrive
+
+        Args:
+            query: Search query
+            language: Language code
+            page_size: Articles per page (max 100)
+            from_date: Start date (YYYY-MM-DD)
+            to_date: End date (YYYY-MM-DD)
+            max_items: Article budget; paging stops once it is spent
+            prefetch: Pages fetched ahead (default: NEWS_STREAM_PREFETCH_PAGES)
+
+        Yields:
+            Lists of transformed articles, one per page
+        """
+        kwargs = {}
+        if from_date:
+            kwargs['from'] = from_date
+        if to_date:
+            kwargs['to'] = to_date
+
+        async for page in self.stream(
+            max_items=max_items,
+            prefetch=prefetch or settings.NEWS_STREAM_PREFETCH_PAGES,
+            query=query,
+            language=language,
+            page_size=page_size,
+            endpoint='everything',
+            **kwargs
+        ):
+            yield page
@@ -0,0 +1,214 @@
+"""
+Payload Archive
+Raw source payloads kept as gzip-compressed NDJSON, for offline replay
+"""
+import gzip
+import json
+import os
+import threading
+import uuid
+from datetime import datetime, date
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterator
+import logging
+
+from app.core.config import settings
+from app.core.executor import run_blocking
+from app.services.base_source import BaseDataSource, DataSourceConfig
+
+logger = logging.getLogger(__name__)
+
+
+def _as_date(value: Optional[str]) -> Optional[date]:
+    return date.fromisoformat(value) if value else None
+
+
+class PayloadArchive:
+    """
+    Append-only archive of raw fetch results
+
+    Each fetch is written as its own ``<root>/<source>/<YYYY-MM-DD>/<time>-<id>.ndjson.gz``
+    file, one JSON record per line, so concurrent fetches never share a file
+    and a day's partition can be copied or deleted on its own. Archiving is
+    best effort: a write error is logged and never fails the fetch.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        """
+        Initialize the archive
+
+        Args:
+            root: Archive directory (default: PAYLOAD_ARCHIVE_DIR)
+        """
+        self._root = root
+        self._lock = threading.Lock()
+        self.stats = {"files_written": 0, "records_written": 0, "write_errors": 0}
+
+    @property
+    def root(self) -> Path:
+        return Path(self._root or settings.PAYLOAD_ARCHIVE_DIR)
+
+    @property
+    def enabled(self) -> bool:
+        return settings.PAYLOAD_ARCHIVE_ENABLED
+
+    def write(self, source: str, payloads: List[Dict[str, Any]], listing: Optional[str] = None) -> Optional[Path]:
+        """
+        Archive one fetch's raw payloads
+
+        Args:
+            source: Source name ("reddit", "news"), the first partition level
+            payloads: JSON-serializable raw items, as returned by the source
+            listing: What was fetched (e.g. ``r/python``), stored with each record
+
+        Returns:
+            The written file, or None if archiving is off, there was nothing
+            to write, or the write failed
+        """
+        if not self.enabled or not payloads:
+            return None
+
+        fetched_at = datetime.utcnow()
+        partition = self.root / source / fetched_at.strftime("%Y-%m-%d")
+        path = partition / f"{fetched_at.strftime('%H%M%S%f')}-{uuid.uuid4().hex[:8]}.ndjson.gz"
+        try:
+            partition.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.tmp")
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                for payload in payloads:
+                    record = {"fetched_at": fetched_at.isoformat(), "listing": listing, "payload": payload}
+                    f.write(json.dumps(record, default=str) + "\n")
+            # Readers never see a half-written file
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not archive {len(payloads)} {source} payloads: {str(e)}")
+            with self._lock:
+                self.stats["write_errors"] += 1
+            return None
+
+        with self._lock:
+            self.stats["files_written"] += 1
+            self.stats["records_written"] += len(payloads)
+        return path
+
+    def files(self, source: str, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Path]:
+        """
+        Archive files of a source, oldest first
+
+        Args:
+            source: Source name
+            start_date: First partition to include (YYYY-MM-DD)
+            end_date: Last partition to include (YYYY-MM-DD)
+        """
+        start, end = _as_date(start_date), _as_date(end_date)
+        source_dir = self.root / source
+        if not source_dir.is_dir():
+            return []
+
+        files = []
+        for partition in sorted(source_dir.iterdir()):
+            try:
+                day = date.fromisoformat(partition.name)
+            except ValueError:
+                continue
+            if (start and day < start) or (end and day > end):
+                continue
+            files.extend(sorted(partition.glob("*.ndjson.gz")))
+        return files
+
+    def read(
+        self,
+        source: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield archived payloads in the order they were fetched
+
+        Args:
+            source: Source name
+            start_date: First partition to include (YYYY-MM-DD)
+            end_date: Last partition to include (YYYY-MM-DD)
+
+        Yields:
+            Raw payloads as they were archived
+        """
+        for path in self.files(source, start_date, end_date):
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)["payload"]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Archive settings and write counters"""
+        return {"enabled": self.enabled, "root": str(self.root), **self.stats}
+
+
+def load_payloads(
+    source: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    root: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Read a source's archived payloads into a list
+
+    A module-level function so it can run in either pipeline executor type.
+
+    Args:
+        source: Source name
+        start_date: First partition to include (YYYY-MM-DD)
+        end_date: Last partition to include (YYYY-MM-DD)
+        root: Archive directory (default: PAYLOAD_ARCHIVE_DIR)
+    """
+    return list(PayloadArchive(root).read(source, start_date, end_date))
+
+
+class ReplaySource(BaseDataSource):
+    """
+    Serve archived payloads through another source's transform and validate
+
+    Lets the ingestion engine re-ingest an archive with no network access:
+    every fetch returns the archived raw items of ``archive_source``.
+    """
+
+    def __init__(
+        self,
+        source: BaseDataSource,
+        archive_source: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        root: Optional[str] = None
+    ):
+        """
+        Initialize the replay source
+
+        Args:
+            source: Source whose ``transform``/``validate`` parse the payloads
+            archive_source: Archive partition to read ("news")
+            start_date: First archive day to replay (YYYY-MM-DD)
+            end_date: Last archive day to replay (YYYY-MM-DD)
+            root: Archive directory (default: PAYLOAD_ARCHIVE_DIR)
+        """
+        # Nothing to pace: replays never reach the network
+        super().__init__(DataSourceConfig(source_type=source.source_type, rate_limit=0))
+        self.source = source
+        self.archive_source = archive_source
+        self.start_date = start_date
+        self.end_date = end_date
+        self.root = root
+
+    async def fetch(self, **kwargs) -> List[Dict[str, Any]]:
+        payloads = await run_blocking(load_payloads, self.archive_source, self.start_date, self.end_date, self.root)
+        self.logger.info(f"Replaying {len(payloads)} archived {self.archive_source} payloads")
+        return payloads
+
+    def transform(self, raw_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return self.source.transform(raw_data)
+
+    def validate(self, data: Dict[str, Any]) -> bool:
+        return self.source.validate(data)
+
+
+# Global payload archive
+payload_archive = PayloadArchive()
@@ -0,0 +1,281 @@
+"""
+Pipeline Registry
+Named pipelines defined as DAGs of stages, with per-stage retries and timings
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Callable, Awaitable, Tuple
+import logging
+
+from app.core.config import settings
+from app.core.executor import run_blocking
+from app.services.pipeline_run_service import start_pipeline_run, complete_pipeline_run, fail_pipeline_run
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PipelineContext:
+    """
+    State shared by the stages of one pipeline run
+
+    ``results`` holds each finished stage's return value, so a stage reads
+    its inputs from there and a retried stage never re-runs its upstream.
+    ``stage_details`` lets a stage attach extra metrics to its own entry in
+    the run's stage metrics.
+    """
+    run_id: Optional[str]
+    trigger_type: str
+    params: Dict[str, Any]
+    results: Dict[str, Any] = field(default_factory=dict)
+    counts: Dict[str, int] = field(default_factory=dict)
+    source_metrics: Dict[str, Any] = field(default_factory=dict)
+    stage_details: Dict[str, Any] = field(default_factory=dict)
+
+    def add_counts(self, counts: Dict[str, int]):
+        """Accumulate record counts reported by a stage"""
+        for key, value in counts.items():
+            self.counts[key] = self.counts.get(key, 0) + value
+
+
+@dataclass
+class Stage:
+    """
+    One step of a pipeline
+
+    Attributes:
+        name: Stage name, unique within its pipeline
+        run: ``async (context) -> result``
+        depends_on: Stages that must succeed before this one starts
+        retries: Extra attempts after a failure (None = PIPELINE_STAGE_RETRIES)
+    """
+    name: str
+    run: Callable[[PipelineContext], Awaitable[Any]]
+    depends_on: Tuple[str, ...] = ()
+    retries: Optional[int] = None
+
+
+class PipelineError(Exception):
+    """Pipeline definition or lookup error"""
+    pass
+
+
+class Pipeline:
+    """
+    A named DAG of stages
+
+    Every stage starts as soon as all of its dependencies have succeeded,
+    so independent branches run concurrently. A stage that still fails after
+    its retries causes its dependents to be skipped; unrelated branches keep
+    running.
+    """
+
+    def __init__(self, name: str, stages: List[Stage], description: str = ""):
+        self.name = name
+        self.description = description
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise PipelineError(f"Pipeline '{name}' has duplicate stage names")
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        """Stage names with every stage after its dependencies"""
+        for stage in self.stages.values():
+            missing = [dep for dep in stage.depends_on if dep not in self.stages]
+            if missing:
+                raise PipelineError(f"Stage '{stage.name}' of '{self.name}' depends on unknown stages {missing}")
+
+        order: List[str] = []
+        remaining = dict(self.stages)
+        while remaining:
+            ready = [name for name, stage in remaining.items() if all(dep in order for dep in stage.depends_on)]
+            if not ready:
+                raise PipelineError(f"Pipeline '{self.name}' has a dependency cycle among {sorted(remaining)}")
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+        return order
+
+    async def _run_stage(self, stage: Stage, context: PipelineContext, metrics: Dict[str, Any]) -> Any:
+        """Run a stage, retrying it with exponential backoff"""
+        retries = settings.PIPELINE_STAGE_RETRIES if stage.retries is None else stage.retries
+        attempt = 0
+        while True:
+            attempt += 1
+            metrics["attempts"] = attempt
+            try:
+                return await stage.run(context)
+            except Exception as e:
+                if attempt > retries:
+                    raise
+                delay = settings.PIPELINE_STAGE_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+                logger.warning(
+                    f"Stage '{stage.name}' of '{self.name}' failed (attempt {attempt}/{retries + 1}): "
+                    f"{str(e)}. Retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+
+    async def execute(self, context: PipelineContext) -> Tuple[Dict[str, Dict[str, Any]], List[Exception]]:
+        """
+        Run every stage in dependency order
+
+        Args:
+            context: Run state; stage results are stored in ``context.results``
+
+        Returns:
+            Tuple of (per-stage metrics, errors of the stages that failed)
+        """
+        started = time.perf_counter()
+        metrics: Dict[str, Dict[str, Any]] = {
+            name: {"status": "pending", "depends_on": list(self.stages[name].depends_on), "attempts": 0}
+            for name in self.order
+        }
+        errors: List[Exception] = []
+        running: Dict[asyncio.Task, str] = {}
+
+        async def timed(stage: Stage) -> Any:
+            stage_metrics = metrics[stage.name]
+            stage_metrics["started_offset_seconds"] = round(time.perf_counter() - started, 4)
+            stage_start = time.perf_counter()
+            try:
+                return await self._run_stage(stage, context, stage_metrics)
+            finally:
+                stage_metrics["duration_seconds"] = round(time.perf_counter() - stage_start, 4)
+                if stage.name in context.stage_details:
+                    stage_metrics["details"] = context.stage_details[stage.name]
+
+        def launch_ready():
+            # In topological order, so a skip reaches every later dependent in one pass
+            for name in self.order:
+                stage_metrics = metrics[name]
+                if stage_metrics["status"] != "pending":
+                    continue
+                dep_statuses = {metrics[dep]["status"] for dep in self.stages[name].depends_on}
+                if dep_statuses & {"failed", "skipped"}:
+                    stage_metrics["status"] = "skipped"
+                elif dep_statuses <= {"success"}:
+                    stage_metrics["status"] = "running"
+                    running[asyncio.create_task(timed(self.stages[name]))] = name
+
+        launch_ready()
+        while running:
+            finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                name = running.pop(task)
+                try:
+                    context.results[name] = task.result()
+                    metrics[name]["status"] = "success"
+                except Exception as e:
+                    metrics[name]["status"] = "failed"
+                    metrics[name]["error"] = str(e)
+                    errors.append(e)
+                    logger.error(f"Stage '{name}' of '{self.name}' failed: {str(e)}")
+            launch_ready()
+
+        return metrics, errors
+
+    def describe(self) -> Dict[str, Any]:
+        """JSON-serializable summary of the pipeline's stages"""
+        return {
+            "name": self.name,
+            "description": self.description,
+            "stages": [
+                {
+                    "name": name,
+                    "depends_on": list(self.stages[name].depends_on),
+                    "retries": (
+                        settings.PIPELINE_STAGE_RETRIES if self.stages[name].retries is None
+                        else self.stages[name].retries
+                    ),
+                }
+                for name in self.order
+            ],
+        }
+
+
+# Registered pipelines by name
+_pipelines: Dict[str, Pipeline] = {}
+
+
+def register_pipeline(pipeline: Pipeline) -> Pipeline:
+    """Register (or replace) a pipeline under its name"""
+    _pipelines[pipeline.name] = pipeline
+    return pipeline
+
+
+def _load_builtin_pipelines():
+    """Import the modules that define the built-in pipelines"""
+    import app.api.pipeline  # noqa: F401 - registers reddit_pipeline
+    import app.api.articles  # noqa: F401 - registers news_pipeline
+
+
+def get_pipeline(name: str) -> Pipeline:
+    """
+    Look up a registered pipeline
+
+    Raises:
+        PipelineError: If no pipeline has that name
+    """
+    _load_builtin_pipelines()
+    pipeline = _pipelines.get(name)
+    if pipeline is None:
+        raise PipelineError(f"Unknown pipeline '{name}'. Registered: {sorted(_pipelines)}")
+    return pipeline
+
+
+def list_pipelines() -> List[Dict[str, Any]]:
+    """Describe every registered pipeline"""
+    _load_builtin_pipelines()
+    return [_pipelines[name].describe() for name in sorted(_pipelines)]
+
+
+async def run_pipeline(pipeline_name: str, trigger_type: str = "scheduled", **params) -> Dict[str, Any]:
+    """
+    Run a registered pipeline and record it as a PipelineRun
+
+    The run is "success" if every stage succeeded, "partial" if some stages
+    failed after others succeeded, and "failed" if nothing succeeded; a
+    failed run re-raises the first stage error.
+
+    Args:
+        pipeline_name: Registered pipeline name
+        trigger_type: How the pipeline was triggered (manual, scheduled, api)
+        **params: Pipeline parameters, available to stages as ``context.params``
+
+    Returns:
+        Dictionary with ``run_id``, ``status``, ``counts`` and ``stages``
+    """
+    pipeline = get_pipeline(pipeline_name)
+    run_id = await run_blocking(start_pipeline_run, pipeline_name, trigger_type)
+    context = PipelineContext(run_id=run_id, trigger_type=trigger_type, params=params)
+    logger.info(f"Starting {pipeline_name} (run_id={run_id}) with {params}")
+
+    start_time = time.time()
+    stage_metrics, errors = await pipeline.execute(context)
+    duration = time.time() - start_time
+
+    succeeded = any(m["status"] == "success" for m in stage_metrics.values())
+    status = "success" if not errors else ("partial" if succeeded else "failed")
+
+    if status == "failed":
+        await run_blocking(fail_pipeline_run, run_id, duration, errors[0], stage_metrics=stage_metrics)
+        raise errors[0]
+
+    await run_blocking(
+        complete_pipeline_run,
+        run_id,
+        duration,
+        context.counts,
+        source_metrics=context.source_metrics,
+        stage_metrics=stage_metrics,
+        status=status,
+        retry_count=sum(m["attempts"] - 1 for m in stage_metrics.values() if m["attempts"] > 1)
+    )
+
+    logger.info(
+        f"{pipeline_name} finished with status {status} (run_id={run_id}) in {duration:.2f}s. "
+        f"Counts: {context.counts}. Stage times: "
+        + ", ".join(f"{name}={m.get('duration_seconds', 0)}s" for name, m in stage_metrics.items())
+    )
+    return {"run_id": run_id, "status": status, "counts": context.counts, "stages": stage_metrics}
@@ -0,0 +1,144 @@
+"""
+Pipeline Run Service
+Records PipelineRun rows for pipelines that run outside a request session
+"""
+from typing import Dict, Any, Optional
+from datetime import datetime
+import json
+import logging
+import traceback
+import uuid
+
+from app.models.pipeline_run import PipelineRun
+
+logger = logging.getLogger(__name__)
+
+
+def start_pipeline_run(pipeline_name: str, trigger_type: str) -> str:
+    """
+    Create a PipelineRun in the "running" state
+
+    Args:
+        pipeline_name: Pipeline identifier (e.g., "news_pipeline")
+        trigger_type: How the pipeline was triggered (manual, scheduled, api)
+
+    Returns:
+        The new run's UUID
+    """
+    from app.db import get_session_local
+
+    run_id = str(uuid.uuid4())
+    db = get_session_local()()
+    try:
+        db.add(PipelineRun(
+            run_id=run_id,
+            pipeline_name=pipeline_name,
+            trigger_type=trigger_type,
+            status="running"
+        ))
+        db.commit()
+        return run_id
+    finally:
+        db.close()
+
+
+def complete_pipeline_run(
+    run_id: str,
+    duration_seconds: float,
+    counts: Dict[str, int],
+    source_metrics: Optional[Dict[str, Any]] = None,
+    stage_metrics: Optional[Dict[str, Any]] = None,
+    status: str = "success",
+    retry_count: int = 0
+):
+    """
+    Mark a PipelineRun finished and store its metrics
+
+    Args:
+        run_id: UUID returned by ``start_pipeline_run``
+        duration_seconds: Wall time of the run
+        counts: ``stored``, ``updated`` and ``failed`` record counts, plus
+            ``skipped_enrichment`` for unchanged records
+        source_metrics: Per-source stats, stored as JSON
+        stage_metrics: Per-stage stats, stored as JSON
+        status: Final status ("success" or "partial")
+        retry_count: Stage attempts that had to be retried
+    """
+    from app.db import get_session_local
+
+    db = get_session_local()()
+    try:
+        pipeline_run = db.query(PipelineRun).filter(PipelineRun.run_id == run_id).first()
+        if not pipeline_run:
+            logger.warning(f"Pipeline run {run_id} not found")
+            return
+
+        stored = counts.get("stored", 0)
+        updated = counts.get("updated", 0)
+        failed = counts.get("failed", 0)
+        total_processed = stored + updated + failed
+
+        pipeline_run.status = status
+        pipeline_run.retry_count = retry_count
+        pipeline_run.completed_at = datetime.utcnow()
+        pipeline_run.duration_seconds = duration_seconds
+        pipeline_run.records_processed = total_processed
+        pipeline_run.records_stored = stored
+        pipeline_run.records_updated = updated
+        pipeline_run.records_failed = failed
+        pipeline_run.enrichment_skipped = counts.get("skipped_enrichment", 0)
+        pipeline_run.avg_processing_time_ms = (
+            duration_seconds * 1000 / total_processed if total_processed else 0
+        )
+        pipeline_run.data_quality_score = (
+            ((total_processed - failed) / total_processed) * 100 if total_processed else 100.0
+        )
+        if source_metrics is not None:
+            pipeline_run.source_metrics = json.dumps(source_metrics)
+        if stage_metrics is not None:
+            pipeline_run.stage_metrics = json.dumps(stage_metrics)
+
+        db.commit()
+    finally:
+        db.close()
+
+
+def fail_pipeline_run(
+    run_id: str,
+    duration_seconds: float,
+    error: Exception,
+    stage_metrics: Optional[Dict[str, Any]] = None
+):
+    """
+    Mark a PipelineRun failed and store the error details
+
+    Args:
+        run_id: UUID returned by ``start_pipeline_run``
+        duration_seconds: Wall time until the failure
+        error: The exception that ended the run
+        stage_metrics: Per-stage stats, stored as JSON
+    """
+    from app.db import get_session_local
+
+    db = get_session_local()()
+    try:
+        pipeline_run = db.query(PipelineRun).filter(PipelineRun.run_id == run_id).first()
+        if not pipeline_run:
+            logger.warning(f"Pipeline run {run_id} not found")
+            return
+
+        pipeline_run.status = "failed"
+        pipeline_run.completed_at = datetime.utcnow()
+        pipeline_run.duration_seconds = duration_seconds
+        pipeline_run.error_message = str(error)
+        pipeline_run.error_type = type(error).__name__
+        pipeline_run.stack_trace = "".join(traceback.format_exception(error))
+        if stage_metrics is not None:
+            pipeline_run.stage_metrics = json.dumps(stage_metrics)
+
+        db.commit()
+    except Exception as commit_error:
+        logger.error(f"Failed to update pipeline run with error: {str(commit_error)}")
+        db.rollback()
+    finally:
+        db.close()
@@ -3,11 +3,16 @@ Reddit API Service
 Handles fetching data from Reddit using PRAW
 """
 import praw
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Dict, Any, Callable, Tuple, Iterable
 from app.core.config import settings
 from app.schemas.reddit import RedditPostCreate
 from app.core.retry import api_retry, CircuitBreaker
+from app.services.watermark_service import HighWaterMark
+from app.services.payload_archive import payload_archive
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,19 +20,208 @@ logger = logging.getLogger(__name__)
 # Circuit breaker for Reddit API
 reddit_circuit_breaker = CircuitBreaker(failure_threshold=3, timeout=300)
 
+# Listing fetch threads are shared by every RedditService in the process and
+# keep their PRAW clients (and OAuth tokens) from one run to the next
+_fetch_threads = threading.local()
+_fetch_executor: Optional[ThreadPoolExecutor] = None
+_fetch_executor_workers = 0
+_fetch_executor_lock = threading.Lock()
+
+
+def _init_fetch_thread():
+    _fetch_threads.worker = True
+
+
+def get_fetch_executor() -> ThreadPoolExecutor:
+    """
+    Get or create the process-wide listing fetch executor
+
+    Sized by REDDIT_FETCH_CONCURRENCY, so the bound also holds across runs
+    that overlap; replaced if the setting changes.
+    """
+    global _fetch_executor, _fetch_executor_workers
+    workers = max(1, settings.REDDIT_FETCH_CONCURRENCY)
+    with _fetch_executor_lock:
+        if _fetch_executor is None or _fetch_executor_workers != workers:
+            if _fetch_executor is not None:
+                _fetch_executor.shutdown(wait=False)
+            _fetch_executor = ThreadPoolExecutor(
+                max_workers=workers,
+                thread_name_prefix="reddit-fetch",
+                initializer=_init_fetch_thread
+            )
+            _fetch_executor_workers = workers
+        return _fetch_executor
+
+
+def shutdown_fetch_executor(wait: bool = True):
+    """
+    Shut down the listing fetch executor, dropping its threads' clients
+
+    Args:
+        wait: Wait for running fetches to finish
+    """
+    global _fetch_executor
+    with _fetch_executor_lock:
+        executor, _fetch_executor = _fetch_executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+def submission_payload(submission) -> Dict[str, Any]:
+    """
+    Raw, JSON-serializable fields of a PRAW submission
+
+    This is what the payload archive stores for Reddit; ``post_from_payload``
+    turns it into a RedditPostCreate, live or on replay.
+    """
+    return {
+        "id": submission.id,
+        "subreddit": submission.subreddit.display_name,
+        "title": submission.title,
+        "author": str(submission.author) if submission.author else None,
+        "selftext": submission.selftext,
+        "url": submission.url,
+        "score": submission.score,
+        "num_comments": submission.num_comments,
+        "upvote_ratio": submission.upvote_ratio,
+        "created_utc": submission.created_utc,
+        "is_self": submission.is_self,
+        "is_video": submission.is_video,
+        "over_18": submission.over_18,
+    }
+
+
+def post_from_payload(payload: Dict[str, Any]) -> RedditPostCreate:
+    """Build a RedditPostCreate from ``submission_payload`` output"""
+    return RedditPostCreate(
+        id=payload["id"],
+        subreddit=payload["subreddit"],
+        title=payload["title"],
+        author=payload["author"] or "[deleted]",
+        content=payload["selftext"] if payload["is_self"] else None,
+        url=payload["url"],
+        score=payload["score"],
+        num_comments=payload["num_comments"],
+        upvote_ratio=payload["upvote_ratio"],
+        created_utc=datetime.fromtimestamp(payload["created_utc"]),
+        is_self=payload["is_self"],
+        is_video=payload["is_video"],
+        over_18=payload["over_18"]
+    )
+
 
 class RedditService:
     """Service for interacting with Reddit API"""
 
     def __init__(self):
         """Initialize Reddit API client"""
-        self.reddit = praw.Reddit(
+        self.reddit = self._create_client()
+        self.subreddits = settings.REDDIT_SUBREDDITS.split(',')
+        self.search_queries = [q.strip() for q in settings.REDDIT_SEARCH_QUERIES.split(',') if q.strip()]
+
+        # PRAW is not thread-safe, so each thread gets its own client: fetch
+        # executor threads keep one for their lifetime, other threads one
+        # per service
+        self._local = threading.local()
+        self._local.reddit = self.reddit
+
+        # Per-listing timings from the last fetch_posts_from_all_* calls,
+        # keyed "r/<subreddit>" or "search:<query>"
+        self.source_metrics: Dict[str, Dict[str, Any]] = {}
+
+        # Per-listing high-water marks, same keys. Listings with a mark are
+        # fetched newest-first and stop at known posts; every successful
+        # fetch advances its listing's mark.
+        self.watermarks: Dict[str, HighWaterMark] = {}
+
+    def _create_client(self) -> praw.Reddit:
+        """Create a PRAW client for the configured Reddit app"""
+        return praw.Reddit(
             client_id=settings.REDDIT_CLIENT_ID,
             client_secret=settings.REDDIT_CLIENT_SECRET,
             user_agent=settings.REDDIT_USER_AGENT
         )
-        self.subreddits = settings.REDDIT_SUBREDDITS.split(',')
-        self.search_queries = [q.strip() for q in settings.REDDIT_SEARCH_QUERIES.split(',') if q.strip()]
+
+    def _client(self) -> praw.Reddit:
+        """Get the PRAW client owned by the calling thread"""
+        local = _fetch_threads if getattr(_fetch_threads, "worker", False) else self._local
+        client = getattr(local, "reddit", None)
+        if client is None:
+            client = self._create_client()
+            local.reddit = client
+        return client
+
+    def _run_listings(
+        self,
+        listings: List[Tuple[str, Callable[[], List[RedditPostCreate]]]]
+    ) -> List[RedditPostCreate]:
+        """
+        Run listing fetches with at most REDDIT_FETCH_CONCURRENCY in flight
+
+        Failures are logged and recorded in ``source_metrics`` rather than
+        raised, so one bad subreddit or query doesn't sink the others. Rate
+        limiting is left to PRAW: every client paces itself against the
+        X-Ratelimit headers Reddit returns for the shared OAuth app, and each
+        fetch still feeds ``reddit_circuit_breaker``.
+
+        Args:
+            listings: (label, fetch function) pairs
+
+        Returns:
+            Combined posts, in the order the listings were given
+        """
+        def run(label: str, fetch: Callable[[], List[RedditPostCreate]]) -> List[RedditPostCreate]:
+            start = time.perf_counter()
+            try:
+                posts = fetch()
+                self.source_metrics[label] = {
+                    "status": "success",
+                    "posts": len(posts),
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                }
+                return posts
+            except Exception as e:
+                logger.error(f"Failed to fetch {label}: {str(e)}")
+                self.source_metrics[label] = {
+                    "status": "failed",
+                    "posts": 0,
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                    "error": str(e),
+                }
+                return []
+
+        if settings.REDDIT_FETCH_CONCURRENCY <= 1 or len(listings) <= 1:
+            results = [run(label, fetch) for label, fetch in listings]
+        else:
+            executor = get_fetch_executor()
+            futures = [executor.submit(run, label, fetch) for label, fetch in listings]
+            results = [future.result() for future in futures]
+
+        return [post for posts in results for post in posts]
+
+    def _collect(self, key: str, submissions: Iterable[Any], incremental: bool) -> List[RedditPostCreate]:
+        """
+        Convert a listing's submissions and advance its high-water mark
+
+        Incremental listings are newest-first, so iteration (and with it
+        PRAW's pagination) stops at the first post older than the mark.
+        """
+        mark = self.watermarks.get(key, HighWaterMark())
+        payloads = []
+        for submission in submissions:
+            if incremental:
+                created = datetime.fromtimestamp(submission.created_utc)
+                if mark.is_past(created):
+                    break
+                if mark.is_known(submission.id, created):
+                    continue
+            payloads.append(submission_payload(submission))
+
+        payload_archive.write("reddit", payloads, listing=key)
+        posts = [post_from_payload(payload) for payload in payloads]
+        self.watermarks[key] = mark.advance((post.id, post.created_utc) for post in posts)
+        return posts
 
     @api_retry
     def fetch_posts(
@@ -39,6 +233,10 @@ class RedditService:
         """
         Fetch posts from a specific subreddit
 
+        With a high-water mark for ``r/<subreddit>`` in ``watermarks``, only
+        posts newer than the mark are fetched from the ``new`` listing;
+        otherwise the ``top`` posts for ``time_filter`` are.
+
         Args:
             subreddit_name: Name of the subreddit
             limit: Maximum number of posts to fetch
@@ -53,12 +251,13 @@ class RedditService:
             raise Exception("Reddit API circuit breaker is open")
 
         try:
-            subreddit = self.reddit.subreddit(subreddit_name)
-            posts = []
+            subreddit = self._client().subreddit(subreddit_name)
+            key = f"r/{subreddit_name}"
 
-            for submission in subreddit.top(time_filter=time_filter, limit=limit):
-                post_data = self._submission_to_schema(submission)
-                posts.append(post_data)
+            if key in self.watermarks:
+                posts = self._collect(key, subreddit.new(limit=limit), incremental=True)
+            else:
+                posts = self._collect(key, subreddit.top(time_filter=time_filter, limit=limit), incremental=False)
 
             logger.info(f"Fetched {len(posts)} posts from r/{subreddit_name}")
             reddit_circuit_breaker.record_success()
@@ -77,6 +276,8 @@ class RedditService:
         """
         Fetch posts from all configured subreddits
 
+        Subreddits are fetched concurrently (see REDDIT_FETCH_CONCURRENCY).
+
         Args:
             limit_per_subreddit: Maximum posts per subreddit
             time_filter: Time filter
@@ -84,19 +285,18 @@ class RedditService:
         Returns:
             Combined list of posts from all subreddits
         """
-        all_posts = []
-
-        for subreddit_name in self.subreddits:
-            try:
-                posts = self.fetch_posts(
-                    subreddit_name.strip(),
+        listings = [
+            (
+                f"r/{name.strip()}",
+                lambda name=name.strip(): self.fetch_posts(
+                    name,
                     limit=limit_per_subreddit,
                     time_filter=time_filter
                 )
-                all_posts.extend(posts)
-            except Exception as e:
-                logger.error(f"Failed to fetch from r/{subreddit_name}: {str(e)}")
-                continue
+            )
+            for name in self.subreddits
+        ]
+        all_posts = self._run_listings(listings)
 
         logger.info(f"Total posts fetched: {len(all_posts)}")
         return all_posts
@@ -111,21 +311,7 @@ class RedditService:
         Returns:
             RedditPostCreate object
         """
-        return RedditPostCreate(
-            id=submission.id,
-            subreddit=submission.subreddit.display_name,
-            title=submission.title,
-            author=str(submission.author) if submission.author else "[deleted]",
-            content=submission.selftext if submission.is_self else None,
-            url=submission.url,
-            score=submission.score,
-            num_comments=submission.num_comments,
-            upvote_ratio=submission.upvote_ratio,
-            created_utc=datetime.fromtimestamp(submission.created_utc),
-            is_self=submission.is_self,
-            is_video=submission.is_video,
-            over_18=submission.over_18
-        )
+        return post_from_payload(submission_payload(submission))
 
     @api_retry
     def search_posts(
@@ -138,6 +324,10 @@ class RedditService:
         """
         Search for posts across all of Reddit matching a query
 
+        With a high-water mark for ``search:<query>`` in ``watermarks``,
+        results are sorted by ``new`` and only posts newer than the mark are
+        fetched.
+
         Args:
             query: Search query string
             limit: Maximum number of posts to fetch
@@ -153,16 +343,19 @@ class RedditService:
             raise Exception("Reddit API circuit breaker is open")
 
         try:
-            posts = []
+            key = f"search:{query}"
+            incremental = key in self.watermarks
 
-            for submission in self.reddit.subreddit("all").search(
-                query=query,
-                sort=sort,
-                time_filter=time_filter,
-                limit=limit
-            ):
-                post_data = self._submission_to_schema(submission)
-                posts.append(post_data)
+            posts = self._collect(
+                key,
+                self._client().subreddit("all").search(
+                    query=query,
+                    sort="new" if incremental else sort,
+                    time_filter=time_filter,
+                    limit=limit
+                ),
+                incremental=incremental
+            )
 
             logger.info(f"Search for '{query}' returned {len(posts)} posts")
             reddit_circuit_breaker.record_success()
@@ -173,6 +366,52 @@ class RedditService:
             reddit_circuit_breaker.record_failure()
             raise
 
+    @api_retry
+    def search_page(
+        self,
+        query: str,
+        time_filter: str = "all",
+        sort: str = "top",
+        after: Optional[str] = None,
+        page_size: int = 100
+    ) -> Tuple[List[RedditPostCreate], Optional[str]]:
+        """
+        Fetch one page of search results across all of Reddit
+
+        Args:
+            query: Search query string
+            time_filter: Time filter (hour, day, week, month, year, all)
+            sort: Sort method (relevance, hot, top, new, comments)
+            after: Fullname of the last post of the previous page
+            page_size: Posts per page (Reddit's max is 100)
+
+        Returns:
+            Tuple of (posts, ``after`` for the next page or None on the last page)
+        """
+        if reddit_circuit_breaker.is_open():
+            logger.error(f"Circuit breaker is open, skipping search for '{query}'")
+            raise Exception("Reddit API circuit breaker is open")
+
+        try:
+            submissions = list(self._client().subreddit("all").search(
+                query=query,
+                sort=sort,
+                time_filter=time_filter,
+                limit=page_size,
+                params={"after": after} if after else {}
+            ))
+            reddit_circuit_breaker.record_success()
+        except Exception as e:
+            logger.error(f"Error searching for '{query}' after {after}: {str(e)}")
+            reddit_circuit_breaker.record_failure()
+            raise
+
+        payloads = [submission_payload(submission) for submission in submissions]
+        payload_archive.write("reddit", payloads, listing=f"search:{query}")
+        posts = [post_from_payload(payload) for payload in payloads]
+        next_after = submissions[-1].fullname if len(submissions) >= page_size else None
+        return posts, next_after
+
     def fetch_posts_from_all_search_queries(
         self,
         limit_per_query: int = 100,
@@ -181,6 +420,8 @@ class RedditService:
         """
         Search for posts matching all configured search queries
 
+        Queries are fetched concurrently (see REDDIT_FETCH_CONCURRENCY).
+
         Args:
             limit_per_query: Maximum posts per search query
             time_filter: Time filter
@@ -188,19 +429,18 @@ class RedditService:
         Returns:
             Combined list of posts from all search queries
         """
-        all_posts = []
-
-        for query in self.search_queries:
-            try:
-                posts = self.search_posts(
+        listings = [
+            (
+                f"search:{query}",
+                lambda query=query: self.search_posts(
                     query=query,
                     limit=limit_per_query,
                     time_filter=time_filter
                 )
-                all_posts.extend(posts)
-            except Exception as e:
-                logger.error(f"Failed to search for '{query}': {str(e)}")
-                continue
+            )
+            for query in self.search_queries
+        ]
+        all_posts = self._run_listings(listings)
 
         logger.info(f"Total posts from search queries: {len(all_posts)}")
         return all_posts
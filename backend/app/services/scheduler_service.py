@@ -5,29 +5,198 @@ Handles automated scheduling of data pipeline jobs using APScheduler
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
-from apscheduler.jobstores.base import JobLookupError
-from datetime import datetime
+from apscheduler.jobstores.base import BaseJobStore, JobLookupError
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.job import Job
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Any, Optional
+import asyncio
 import logging
 
+from app.core.config import settings
+from app.core.job_lock import job_lock
+
 logger = logging.getLogger(__name__)
 
+# Lock held by the one worker whose scheduler processes the persistent job store
+LEADER_LOCK_ID = "scheduler_leader"
+
+
+async def run_scheduled_job(job_id: str, func, *args, **kwargs):
+    """
+    Run a scheduled job on whichever worker takes its lock first
+
+    Every worker process schedules the same jobs; the lock makes each run
+    happen once. After the run the lock is held until halfway to the job's
+    next run, so workers whose trigger fires a little later skip this run.
+
+    Args:
+        job_id: Scheduled job ID
+        func: Job function
+        *args: Positional arguments for ``func``
+        **kwargs: Keyword arguments for ``func``
+    """
+    job = scheduler_service.scheduler.get_job(job_id)
+    hold_seconds = 0.0
+    if job is not None and job.next_run_time is not None:
+        hold_seconds = max(0.0, (job.next_run_time - datetime.now(timezone.utc)).total_seconds() / 2)
+
+    await job_lock.run(job_id, func, *args, hold_seconds=hold_seconds, **kwargs)
+
+
+def _default_jobstore() -> BaseJobStore:
+    """Job store from settings: the app database, or memory when persistence is off"""
+    if not settings.SCHEDULER_PERSIST_JOBS:
+        return MemoryJobStore()
+    from app.db.database import get_engine
+    return SQLAlchemyJobStore(engine=get_engine(), tablename="apscheduler_jobs")
+
+
+def _same_schedule(job: Job, trigger, args: tuple, kwargs: dict) -> bool:
+    """True if a stored job already runs ``args``/``kwargs`` on ``trigger``'s schedule"""
+    return (
+        type(job.trigger) is type(trigger)
+        and str(job.trigger) == str(trigger)
+        and tuple(job.args) == tuple(args)
+        and dict(job.kwargs) == dict(kwargs)
+    )
+
 
 class SchedulerService:
-    """Service for managing scheduled jobs"""
+    """
+    Service for managing scheduled jobs
+
+    Jobs are kept in the app database (``apscheduler_jobs``), so schedules,
+    their next run times and jobs added through the API survive restarts.
+    Runs missed while the app was down are coalesced into one catch-up run
+    per job, and those catch-up runs are spread out after startup.
+
+    APScheduler 3 doesn't support several schedulers processing one job store,
+    so with a persistent store every worker starts its scheduler paused and
+    only the worker holding the ``scheduler_leader`` job lock resumes it. The
+    paused schedulers still read and change the stored jobs for the API. With
+    a memory store every worker runs its own jobs and the per-job lock keeps
+    each run to one worker.
+    """
+
+    def __init__(self, jobstore: Optional[BaseJobStore] = None):
+        """
+        Initialize the scheduler
 
-    def __init__(self):
-        """Initialize the scheduler"""
-        self.scheduler = AsyncIOScheduler()
+        Args:
+            jobstore: Job store to use (default: from SCHEDULER_PERSIST_JOBS)
+        """
+        misfire_grace = settings.SCHEDULER_MISFIRE_GRACE_SECONDS
+        jobstore = jobstore or _default_jobstore()
+        self.persistent = not isinstance(jobstore, MemoryJobStore)
+        self.scheduler = AsyncIOScheduler(
+            jobstores={"default": jobstore},
+            job_defaults={
+                "coalesce": True,  # Several missed runs become one
+                "misfire_grace_time": misfire_grace if misfire_grace > 0 else None,
+            }
+        )
         self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._leader = False
+        self._leadership: Optional[asyncio.Task] = None
+
+    @property
+    def is_leader(self) -> bool:
+        """True if this worker's scheduler is processing jobs"""
+        return self._leader
 
     def start(self):
-        """Start the scheduler"""
-        if not self.scheduler.running:
-            self.scheduler.start()
-            logger.info("Scheduler started successfully")
-        else:
+        """
+        Start the scheduler
+
+        A memory store is processed right away. A persistent store is only
+        processed once this worker becomes the leader (see ``_lead``).
+        """
+        if self.scheduler.running:
             logger.warning("Scheduler is already running")
+            return
+
+        self.scheduler.start(paused=True)
+        if self.persistent and job_lock.enabled:
+            self._leadership = asyncio.get_event_loop().create_task(self._lead())
+            logger.info("Scheduler started; waiting to lead before running jobs")
+        else:
+            self._take_over()
+            logger.info("Scheduler started successfully")
+
+    async def _lead(self):
+        """
+        Take and keep the leader lock, running the scheduler while it's held
+
+        Tries every third of SCHEDULER_LOCK_TTL_SECONDS, so a follower takes
+        over within one TTL of the leader dying. On the leader the same tick
+        renews the lock and wakes the scheduler, so jobs added through other
+        workers are picked up.
+        """
+        interval = settings.SCHEDULER_LOCK_TTL_SECONDS / 3
+        try:
+            while True:
+                try:
+                    if not self._leader:
+                        if await job_lock.acquire(LEADER_LOCK_ID):
+                            self._take_over()
+                    elif await job_lock.renew(LEADER_LOCK_ID):
+                        self.scheduler.wakeup()
+                    else:
+                        self._step_down("lost the leader lock")
+                except Exception as e:
+                    if self._leader:
+                        self._step_down(f"could not renew the leader lock: {e}")
+                    else:
+                        logger.warning(f"Could not take the scheduler leader lock: {e}")
+                await asyncio.sleep(interval)
+        finally:
+            if self._leader:
+                self._leader = False
+                await job_lock.release(LEADER_LOCK_ID)
+
+    def _take_over(self):
+        """Start processing jobs, staggering catch-up runs of jobs missed while down"""
+        self._leader = True
+        self._stagger_missed_runs()
+        self.scheduler.resume()
+        if self.persistent:
+            logger.info(f"Worker {job_lock.worker_id} is now the scheduler leader")
+
+    def _step_down(self, reason: str):
+        """Stop processing jobs (running ones finish); another worker takes over"""
+        self._leader = False
+        self.scheduler.pause()
+        logger.warning(f"Worker {job_lock.worker_id} stopped running scheduled jobs: {reason}")
+
+    def _stagger_missed_runs(self) -> int:
+        """
+        Spread out the catch-up runs of overdue stored jobs
+
+        Without this every overdue job would fire the moment the scheduler
+        starts. Jobs past their misfire grace time are left alone; the
+        scheduler skips them to their next regular run.
+
+        Returns:
+            Number of jobs rescheduled
+        """
+        now = datetime.now(timezone.utc)
+        overdue = sorted(
+            (
+                job for job in self.scheduler.get_jobs()
+                if job.next_run_time is not None and job.next_run_time <= now
+                and (job.misfire_grace_time is None
+                     or (now - job.next_run_time).total_seconds() <= job.misfire_grace_time)
+            ),
+            key=lambda job: job.next_run_time
+        )
+        spacing = timedelta(seconds=settings.SCHEDULER_CATCHUP_SPACING_SECONDS)
+        for position, job in enumerate(overdue):
+            catch_up_at = now + position * spacing
+            job.modify(next_run_time=catch_up_at)
+            logger.info(f"Job '{job.id}' missed a run while the app was down; catching up at {catch_up_at}")
+        return len(overdue)
 
     def shutdown(self, wait: bool = True):
         """
@@ -36,6 +205,10 @@ class SchedulerService:
         Args:
             wait: Wait for all running jobs to complete
         """
+        if self._leadership is not None:
+            # Gives up the leader lock once the task unwinds
+            self._leadership.cancel()
+            self._leadership = None
         if self.scheduler.running:
             self.scheduler.shutdown(wait=wait)
             logger.info("Scheduler shut down successfully")
@@ -82,27 +255,29 @@ class SchedulerService:
             else:
                 raise ValueError(f"Unsupported trigger type: {trigger_type}")
 
-            # Add job to scheduler
+            # A stored job with the same schedule keeps its next run time, so a
+            # restart doesn't push it back by a whole interval
+            job_args = (job_id, func, *(args or ()))
+            existing = self.scheduler.get_job(job_id)
+            if existing is not None and _same_schedule(existing, trigger, job_args, kwargs or {}):
+                self._jobs[job_id] = self._metadata(func, trigger_type, trigger_args, args, kwargs, existing)
+                logger.info(f"Job '{job_id}' restored from the job store. Next run: {existing.next_run_time}")
+                return True
+
+            # Add job to scheduler, guarded by the cross-worker job lock
             job = self.scheduler.add_job(
-                func,
+                run_scheduled_job,
                 trigger,
-                args=args or (),
+                args=job_args,
                 kwargs=kwargs or {},
                 id=job_id,
+                name=func.__name__,
                 replace_existing=True,
                 max_instances=1  # Prevent overlapping executions
             )
 
             # Store job metadata
-            self._jobs[job_id] = {
-                "function": func.__name__,
-                "trigger_type": trigger_type,
-                "trigger_args": trigger_args,
-                "function_args": args,
-                "function_kwargs": kwargs,
-                "next_run_time": job.next_run_time,
-                "added_at": datetime.utcnow()
-            }
+            self._jobs[job_id] = self._metadata(func, trigger_type, trigger_args, args, kwargs, job)
 
             logger.info(f"Job '{job_id}' added successfully. Next run: {job.next_run_time}")
             return True
@@ -111,6 +286,43 @@ class SchedulerService:
             logger.error(f"Error adding job '{job_id}': {str(e)}")
             return False
 
+    @staticmethod
+    def _metadata(func, trigger_type: str, trigger_args: dict, args, kwargs, job: Job) -> Dict[str, Any]:
+        return {
+            "function": func.__name__,
+            "trigger_type": trigger_type,
+            "trigger_args": trigger_args,
+            "function_args": args,
+            "function_kwargs": kwargs,
+            "next_run_time": job.next_run_time,
+            "added_at": datetime.utcnow()
+        }
+
+    def _job_info(self, job: Job) -> Dict[str, Any]:
+        """
+        Describe a job
+
+        Metadata recorded when the job was added in this process is used if
+        present; jobs loaded from the job store get it from the stored job.
+        """
+        metadata = self._jobs.get(job.id)
+        if metadata is None:
+            func = job.args[1] if len(job.args) > 1 else job.func
+            metadata = {
+                "function": getattr(func, "__name__", str(func)),
+                "trigger_type": "cron" if isinstance(job.trigger, CronTrigger) else "interval",
+                "function_args": tuple(job.args[2:]) or None,
+                "function_kwargs": job.kwargs or None,
+            }
+        return {
+            "id": job.id,
+            "name": job.name or job.func.__name__,
+            "next_run_time": job.next_run_time.isoformat() if job.next_run_time else None,
+            "trigger": str(job.trigger),
+            "pending": job.pending,
+            "metadata": metadata
+        }
+
     def remove_job(self, job_id: str) -> bool:
         """
         Remove a scheduled job
@@ -191,14 +403,7 @@ class SchedulerService:
             if not job:
                 return None
 
-            return {
-                "id": job.id,
-                "name": job.name or job.func.__name__,
-                "next_run_time": job.next_run_time.isoformat() if job.next_run_time else None,
-                "trigger": str(job.trigger),
-                "pending": job.pending,
-                "metadata": self._jobs.get(job_id, {})
-            }
+            return self._job_info(job)
         except Exception as e:
             logger.error(f"Error getting job '{job_id}': {str(e)}")
             return None
@@ -210,18 +415,7 @@ class SchedulerService:
         Returns:
             List of job dictionaries
         """
-        jobs = []
-        for job in self.scheduler.get_jobs():
-            job_info = {
-                "id": job.id,
-                "name": job.name or job.func.__name__,
-                "next_run_time": job.next_run_time.isoformat() if job.next_run_time else None,
-                "trigger": str(job.trigger),
-                "pending": job.pending,
-                "metadata": self._jobs.get(job.id, {})
-            }
-            jobs.append(job_info)
-        return jobs
+        return [self._job_info(job) for job in self.scheduler.get_jobs()]
 
     def is_running(self) -> bool:
         """Check if scheduler is running"""
@@ -236,10 +430,30 @@ class SchedulerService:
         """
         return {
             "running": self.scheduler.running,
+            "leader": self._leader,
             "total_jobs": len(self.scheduler.get_jobs()),
-            "jobs": self.get_all_jobs()
+            "jobs": self.get_all_jobs(),
+            "lock": job_lock.get_info()
         }
 
+    async def get_status_with_locks(self) -> Dict[str, Any]:
+        """
+        Get scheduler status including which worker holds each job's lock
+
+        Returns:
+            Dict with scheduler status information; each job gets a ``lock``
+            entry with its ``holder`` (worker ID or None)
+        """
+        status = self.get_status()
+        holders = await job_lock.get_holders([job["id"] for job in status["jobs"]])
+        for job in status["jobs"]:
+            holder = holders.get(job["id"])
+            job["lock"] = {
+                "holder": holder,
+                "held_by_this_worker": holder == job_lock.worker_id
+            }
+        return status
+
 
 # Global scheduler instance
 scheduler_service = SchedulerService()
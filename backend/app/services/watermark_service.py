@@ -0,0 +1,155 @@
+"""
+Watermark Service
+Per-source high-water marks for incremental fetching
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Iterable, Tuple, Optional
+import logging
+
+from sqlalchemy.orm import Session
+
+from app.models.source_watermark import SourceWatermark
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Naive UTC datetime, whatever the input's timezone"""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+@dataclass
+class HighWaterMark:
+    """
+    Newest item seen on one listing
+
+    Fetches re-request a small overlap below ``last_seen_at``
+    (WATERMARK_OVERLAP_MINUTES) to catch items the source indexed late;
+    ``last_seen_ids`` lets the items already seen in that overlap be skipped.
+    """
+    last_seen_at: Optional[datetime] = None
+    last_seen_ids: List[str] = field(default_factory=list)
+
+    @property
+    def cutoff(self) -> Optional[datetime]:
+        """Oldest timestamp still worth requesting, or None without a mark"""
+        if self.last_seen_at is None:
+            return None
+        return self.last_seen_at - timedelta(minutes=settings.WATERMARK_OVERLAP_MINUTES)
+
+    def is_past(self, seen_at: Optional[datetime]) -> bool:
+        """True for items older than the overlap window; newest-first listings can stop here"""
+        cutoff = self.cutoff
+        return cutoff is not None and seen_at is not None and _as_utc(seen_at) < cutoff
+
+    def is_known(self, item_id: str, seen_at: Optional[datetime]) -> bool:
+        """True for items this listing has already returned"""
+        return self.is_past(seen_at) or item_id in self.last_seen_ids
+
+    def advance(self, items: Iterable[Tuple[str, Optional[datetime]]]) -> "HighWaterMark":
+        """
+        Mark after a successful fetch of ``items``
+
+        Args:
+            items: ``(id, timestamp)`` pairs that were fetched
+
+        Returns:
+            New mark; unchanged if ``items`` holds nothing newer
+        """
+        seen = [(item_id, _as_utc(seen_at)) for item_id, seen_at in items if seen_at is not None]
+        if self.last_seen_at is not None:
+            seen.extend((item_id, self.last_seen_at) for item_id in self.last_seen_ids)
+        if not seen:
+            return HighWaterMark(self.last_seen_at, list(self.last_seen_ids))
+
+        newest = max(seen_at for _, seen_at in seen)
+        cutoff = newest - timedelta(minutes=settings.WATERMARK_OVERLAP_MINUTES)
+        recent = sorted({item_id for item_id, seen_at in seen if seen_at >= cutoff})
+        return HighWaterMark(newest, recent[-settings.WATERMARK_MAX_IDS:])
+
+
+def load_watermarks(db: Session, source: str) -> Dict[str, HighWaterMark]:
+    """
+    Load every stored high-water mark of a source
+
+    Args:
+        db: Database session
+        source: Source name (e.g., "reddit", "news")
+
+    Returns:
+        ``listing key -> HighWaterMark``
+    """
+    return {
+        row.key: HighWaterMark(row.last_seen_at, list(row.last_seen_ids or []))
+        for row in db.query(SourceWatermark).filter(SourceWatermark.source == source).all()
+    }
+
+
+def save_watermarks(db: Session, source: str, marks: Dict[str, HighWaterMark]) -> int:
+    """
+    Persist high-water marks of a source
+
+    Call this only after the fetched items were stored; a mark saved for
+    items that were then lost would skip them on every later fetch.
+
+    Args:
+        db: Database session
+        source: Source name (e.g., "reddit", "news")
+        marks: ``listing key -> HighWaterMark``
+
+    Returns:
+        Number of marks written
+    """
+    marks = {key: mark for key, mark in marks.items() if mark.last_seen_at is not None}
+    if not marks:
+        return 0
+
+    try:
+        existing = {
+            row.key: row for row in
+            db.query(SourceWatermark).filter(
+                SourceWatermark.source == source,
+                SourceWatermark.key.in_(list(marks))
+            ).all()
+        }
+        for key, mark in marks.items():
+            row = existing.get(key)
+            if row is None:
+                row = SourceWatermark(source=source, key=key)
+                db.add(row)
+            row.last_seen_at = mark.last_seen_at
+            row.last_seen_ids = mark.last_seen_ids
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error saving {source} watermarks: {str(e)}")
+        raise
+
+    logger.info(f"Saved {len(marks)} {source} watermarks")
+    return len(marks)
+
+
+def load_source_watermarks(source: str) -> Dict[str, HighWaterMark]:
+    """``load_watermarks`` with its own session, for use outside a request"""
+    from app.db import get_session_local
+
+    db = get_session_local()()
+    try:
+        return load_watermarks(db, source)
+    finally:
+        db.close()
+
+
+def save_source_watermarks(source: str, marks: Dict[str, HighWaterMark]) -> int:
+    """``save_watermarks`` with its own session, for use outside a request"""
+    from app.db import get_session_local
+
+    db = get_session_local()()
+    try:
+        return save_watermarks(db, source, marks)
+    finally:
+        db.close()
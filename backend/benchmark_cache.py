@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark for cached endpoints
+
+Serves one synthetic endpoint twice, once behind the old blocking cache path
+(sync ``cache_service.get``/``set`` inside the coroutine) and once behind
+``@cached`` (the asyncio client), from a single-worker uvicorn in a child
+process, and drives each with requests arriving at a fixed rate. Latency is
+measured from each request's scheduled start, so time spent queued behind a
+blocked event loop shows up in it. Reports p50/p95/p99 per path.
+
+Needs a reachable Redis (REDIS_HOST/REDIS_PORT). ``--latency-ms`` puts a
+local proxy in front of it that delays every packet, to mimic a Redis on
+another host.
+
+Usage:
+    source venv/bin/activate
+    python benchmark_cache.py
+    python benchmark_cache.py --rate 200 --requests 5000 --latency-ms 2
+"""
+import argparse
+import asyncio
+import multiprocessing
+import statistics
+import sys
+import os
+import threading
+import time
+from functools import wraps
+
+# Add app to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+from app.core.config import settings
+from app.services.cache_service import cache_service, cached
+import logging
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def blocking_cached(prefix: str, ttl: int = None):
+    """The pre-asyncio ``@cached``: sync Redis calls on the event loop"""
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            cache_key = cache_service._generate_cache_key(prefix, *args, **kwargs)
+            cached_result = cache_service.get(cache_key)
+            if cached_result is not None:
+                return cached_result
+            result = await func(*args, **kwargs)
+            cache_service.set(cache_key, result, ttl)
+            return result
+        return wrapper
+    return decorator
+
+
+def _payload(page: int):
+    return {
+        "page": page,
+        "posts": [{"id": f"{page}-{i}", "title": "x" * 80, "score": i} for i in range(50)],
+    }
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/sync")
+    @blocking_cached(prefix="bench_sync", ttl=60)
+    async def sync_endpoint(page: int = 1):
+        return _payload(page)
+
+    @app.get("/async")
+    @cached(prefix="bench_async", ttl=60)
+    async def async_endpoint(page: int = 1):
+        return _payload(page)
+
+    return app
+
+
+def serve(port: int, redis_host: str, redis_port: int):
+    """Run the benchmark app (child process entry point)"""
+    settings.REDIS_HOST, settings.REDIS_PORT = redis_host, redis_port
+    uvicorn.run(build_app(), host="127.0.0.1", port=port, log_level="warning")
+
+
+class LatencyProxy:
+    """TCP proxy on its own thread that delays each forwarded chunk"""
+
+    def __init__(self, target_host: str, target_port: int, delay: float):
+        self.target = (target_host, target_port)
+        self.delay = delay
+        self.port = None
+        self._ready = threading.Event()
+
+    async def _pipe(self, reader, writer):
+        try:
+            while data := await reader.read(65536):
+                await asyncio.sleep(self.delay)
+                writer.write(data)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _handle(self, client_reader, client_writer):
+        server_reader, server_writer = await asyncio.open_connection(*self.target)
+        await asyncio.gather(
+            self._pipe(client_reader, server_writer),
+            self._pipe(server_reader, client_writer),
+        )
+
+    async def _serve(self):
+        server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        async with server:
+            await server.serve_forever()
+
+    def start(self) -> int:
+        threading.Thread(target=lambda: asyncio.run(self._serve()), daemon=True).start()
+        self._ready.wait()
+        return self.port
+
+
+async def run_load(base_url: str, path: str, requests: int, rate: float, keys: int):
+    """Latencies (ms) of ``requests`` GETs started ``rate`` per second"""
+    latencies = []
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=100)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def request(n: int):
+            scheduled = started + n / rate
+            await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+            response = await client.get(path, params={"page": n % keys})
+            latencies.append((time.perf_counter() - scheduled) * 1000)
+            response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(request(n) for n in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "p50": quantiles[49],
+        "p95": quantiles[94],
+        "p99": quantiles[98],
+        "max": max(latencies),
+        "rps": requests / elapsed,
+    }
+
+
+async def main():
+    """Benchmark both cache paths"""
+    parser = argparse.ArgumentParser(description="p99 latency of a cached endpoint, blocking vs asyncio Redis")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per path")
+    parser.add_argument("--rate", type=float, default=100.0, help="Requests started per second")
+    parser.add_argument("--keys", type=int, default=100, help="Distinct cache keys (first use of each is a miss)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added one-way delay to Redis")
+    parser.add_argument("--port", type=int, default=8765, help="Port of the benchmark server")
+    args = parser.parse_args()
+
+    if args.latency_ms:
+        proxy = LatencyProxy(settings.REDIS_HOST, settings.REDIS_PORT, args.latency_ms / 1000)
+        settings.REDIS_HOST, settings.REDIS_PORT = "127.0.0.1", proxy.start()
+
+    if cache_service.redis_client is None or await cache_service.async_client() is None:
+        logger.error(f"Redis at {settings.REDIS_HOST}:{settings.REDIS_PORT} is not reachable")
+        return
+    await cache_service.adelete_pattern("cache:bench_*")
+
+    # Spawned, not forked, so the server doesn't share this process's Redis sockets
+    server = multiprocessing.get_context("spawn").Process(
+        target=serve, args=(args.port, settings.REDIS_HOST, settings.REDIS_PORT), daemon=True
+    )
+    server.start()
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        async with httpx.AsyncClient(base_url=base_url) as client:
+            for _ in range(100):
+                try:
+                    await client.get("/docs")
+                    break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.1)
+
+        logger.info(
+            f"{args.requests} requests per path at {args.rate:g}/s, "
+            f"{args.keys} keys, +{args.latency_ms}ms Redis latency"
+        )
+        for label, path in (("blocking", "/sync"), ("asyncio", "/async")):
+            result = await run_load(base_url, path, args.requests, args.rate, args.keys)
+            logger.info(
+                f"{label:8}  p50={result['p50']:.2f}ms  p95={result['p95']:.2f}ms  "
+                f"p99={result['p99']:.2f}ms  max={result['max']:.2f}ms  {result['rps']:.0f} req/s"
+            )
+    finally:
+        server.terminate()
+        server.join()
+        await cache_service.adelete_pattern("cache:bench_*")
+        await cache_service.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
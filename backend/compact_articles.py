@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+One-off compaction of duplicate news articles
+
+News articles used to be keyed by Python's per-process ``hash(url)``, so every
+restart or backfill stored the same stories again. This merges the duplicates
+(with their entities and keywords) and re-keys every news article to the
+stable URL digest, then recounts keyword document frequencies.
+
+Usage:
+    source venv/bin/activate
+    python compact_articles.py --dry-run
+    python compact_articles.py --batch-size 200
+"""
+import argparse
+import sys
+import os
+
+# Add app to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.db import get_session_local
+from app.services.dedupe_service import compact_duplicate_articles
+import logging
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Run the compaction"""
+    parser = argparse.ArgumentParser(description="Merge duplicate news articles")
+    parser.add_argument("--batch-size", type=int, default=200, help="Article groups merged per transaction")
+    parser.add_argument(
+        "--partition-rows", type=int, default=50000, help="Articles grouped in memory at once"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would change")
+    args = parser.parse_args()
+
+    db = get_session_local()()
+    try:
+        result = compact_duplicate_articles(
+            db, batch_size=args.batch_size, dry_run=args.dry_run, partition_rows=args.partition_rows
+        )
+
+        # Removed duplicates were counted into keyword document frequencies
+        if result["rows_removed"] and not args.dry_run:
+            from app.services.keyword_service import get_keyword_service
+            get_keyword_service().rebuild_document_frequencies(db)
+
+        logger.info(f"Result: {result}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,8 @@
 Tests for the jobs / pipeline-run endpoints (`app/api/jobs.py`).
 
 Read-only endpoints are exercised against the DB and scheduler service.
-Job scheduling (which would start real APScheduler jobs) is intentionally not
-tested here.
+Job scheduling is tested with the scheduler's ``add_job`` faked, so no real
+APScheduler job is started.
 """
 
 
@@ -58,3 +58,44 @@ class TestJobLookup:
     def test_remove_missing_job_returns_404(self, client):
         response = client.delete("/api/v1/jobs/no-such-job")
         assert response.status_code == 404
+
+
+class TestSchedulePipelineByName:
+    def test_lists_registered_pipelines(self, client):
+        response = client.get("/api/v1/jobs/pipelines")
+        assert response.status_code == 200
+        pipelines = {p["name"]: p for p in response.json()["pipelines"]}
+        assert {"reddit_pipeline", "news_pipeline"} <= set(pipelines)
+        stages = {s["name"]: s["depends_on"] for s in pipelines["news_pipeline"]["stages"]}
+        assert stages["ner"] == stages["keywords"] == ["ingest"]
+
+    def test_unknown_pipeline_is_rejected(self, client):
+        response = client.post("/api/v1/jobs/schedule", json={
+            "job_id": "nope", "pipeline_name": "no_such_pipeline",
+            "trigger_type": "interval", "trigger_args": {"hours": 1},
+        })
+        assert response.status_code == 400
+        assert "no_such_pipeline" in response.json()["error"]["message"]
+
+    def test_schedules_the_named_pipeline(self, client, monkeypatch):
+        import app.api.jobs as jobs_mod
+        from app.services.pipeline_registry import run_pipeline
+
+        added = {}
+
+        def fake_add_job(func, job_id, trigger_type, kwargs=None, **trigger_args):
+            added.update(func=func, job_id=job_id, kwargs=kwargs, trigger_args=trigger_args)
+            return True
+
+        monkeypatch.setattr(jobs_mod.scheduler_service, "add_job", fake_add_job)
+        monkeypatch.setattr(jobs_mod.scheduler_service, "get_job", lambda job_id: {"id": job_id})
+
+        response = client.post("/api/v1/jobs/schedule", json={
+            "job_id": "news_hasbro", "pipeline_name": "news_pipeline",
+            "trigger_type": "interval", "trigger_args": {"hours": 6},
+            "params": {"query": "hasbro"},
+        })
+        assert response.status_code == 201
+        assert added["func"] is run_pipeline
+        assert added["kwargs"] == {"pipeline_name": "news_pipeline", "trigger_type": "scheduled", "query": "hasbro"}
+        assert added["trigger_args"] == {"hours": 6}
@@ -24,7 +24,7 @@ class TestRunPipeline:
         # Replace the background executor so no real Reddit fetch happens.
         called = {}
 
-        async def fake_execute(time_filter="day", trigger_type="scheduled"):
+        async def fake_execute(time_filter="day", trigger_type="scheduled", **kwargs):
             called["time_filter"] = time_filter
 
         monkeypatch.setattr(pipeline_module, "_execute_pipeline", fake_execute)
@@ -5,6 +5,7 @@ All external I/O is mocked — the Reddit service and sentiment analyzer are
 faked, and the DB session factory is pointed at the in-memory test engine — so
 the ingest/store/metrics logic is exercised deterministically with no network.
 """
+import json
 from datetime import datetime
 
 import pytest
@@ -12,6 +13,7 @@ from sqlalchemy.orm import sessionmaker
 
 import app.db as appdb
 import app.api.pipeline as pipeline_mod
+import app.services.ingestion_service as ingestion_mod
 from app.models.reddit_post import RedditPost
 from app.models.pipeline_run import PipelineRun
 
@@ -19,10 +21,13 @@ from app.models.pipeline_run import PipelineRun
 class FakePost:
     """Stand-in for the RedditPost schema the service yields."""
 
-    def __init__(self, pid: str):
+    def __init__(self, pid: str, score: int = 10, title: str = None):
         self.id = pid
-        self.title = f"title-{pid}"
+        self.title = title or f"title-{pid}"
         self.content = "body"
+        self.score = score
+        self.num_comments = 2
+        self.upvote_ratio = 0.9
 
     def model_dump(self):
         return {
@@ -32,9 +37,9 @@ class FakePost:
             "subreddit": "python",
             "content": self.content,
             "url": f"https://reddit.com/{self.id}",
-            "score": 10,
-            "num_comments": 2,
-            "upvote_ratio": 0.9,
+            "score": self.score,
+            "num_comments": self.num_comments,
+            "upvote_ratio": self.upvote_ratio,
             "created_utc": datetime.utcnow(),
             "is_self": True,
             "is_video": False,
@@ -49,7 +54,7 @@ def use_test_db(test_engine, monkeypatch):
     monkeypatch.setattr(appdb, "get_session_local", lambda: factory)
     # Sentiment analysis is deterministic + offline.
     monkeypatch.setattr(
-        pipeline_mod.SentimentService,
+        ingestion_mod.SentimentService,
         "analyze_reddit_post",
         lambda title, content: (0.5, "positive"),
     )
@@ -59,6 +64,7 @@ class TestExecutePipeline:
     async def test_stores_fetched_posts_and_records_success(self, use_test_db, test_db, monkeypatch):
         class FakeReddit:
             search_queries = []
+            source_metrics = {}
 
             def fetch_posts_from_all_subreddits(self, **kwargs):
                 return [FakePost("p1"), FakePost("p2")]
@@ -73,10 +79,89 @@ class TestExecutePipeline:
         assert run.status == "success"
         assert run.records_stored == 2
         assert run.data_quality_score == 100.0
+        assert json.loads(run.source_metrics) == {}
+
+    async def test_refetched_posts_are_counted_as_updates(self, use_test_db, test_db, monkeypatch):
+        class FakeReddit:
+            search_queries = ["hasbro"]
+            source_metrics = {}
+
+            def fetch_posts_from_all_subreddits(self, **kwargs):
+                return [FakePost("p1"), FakePost("p2")]
+
+            def fetch_posts_from_all_search_queries(self, **kwargs):
+                # Overlaps with the subreddit listing; must not double-insert.
+                return [FakePost("p2"), FakePost("p3")]
+
+        monkeypatch.setattr(pipeline_mod, "RedditService", lambda: FakeReddit())
+
+        await pipeline_mod._execute_pipeline(trigger_type="manual")
+        await pipeline_mod._execute_pipeline(trigger_type="scheduled")
+
+        assert test_db.query(RedditPost).count() == 3
+        run = test_db.query(PipelineRun).filter_by(trigger_type="scheduled").first()
+        assert run.records_stored == 0
+        assert run.records_updated == 3
+        assert run.records_failed == 0
+        assert run.enrichment_skipped == 3
+
+    async def test_unchanged_posts_only_refresh_engagement(self, use_test_db, test_db, monkeypatch):
+        analyzed = []
+        monkeypatch.setattr(
+            ingestion_mod.SentimentService, "analyze_reddit_post",
+            lambda title, content: analyzed.append(title) or (0.5, "positive")
+        )
+        batches = iter([
+            [FakePost("p1"), FakePost("p2")],
+            [FakePost("p1", score=99), FakePost("p2", title="Edited title")],
+        ])
+
+        class FakeReddit:
+            search_queries = []
+            source_metrics = {}
+
+            def fetch_posts_from_all_subreddits(self, **kwargs):
+                return next(batches)
+
+        monkeypatch.setattr(pipeline_mod, "RedditService", lambda: FakeReddit())
+
+        await pipeline_mod._execute_pipeline(trigger_type="manual")
+        await pipeline_mod._execute_pipeline(trigger_type="scheduled")
+
+        # Only the edited post is re-analyzed; the unchanged one gets its new score
+        assert analyzed == ["title-p1", "title-p2", "Edited title"]
+        test_db.expire_all()
+        assert test_db.get(RedditPost, "p1").score == 99
+        assert test_db.get(RedditPost, "p2").title == "Edited title"
+        run = test_db.query(PipelineRun).filter_by(trigger_type="scheduled").first()
+        assert run.records_updated == 2
+        assert run.enrichment_skipped == 1
+
+    async def test_high_water_marks_persist_between_runs(self, use_test_db, test_db, monkeypatch):
+        from app.services.watermark_service import HighWaterMark
+
+        seen_marks = []
+
+        class FakeReddit:
+            search_queries = []
+            source_metrics = {}
+
+            def fetch_posts_from_all_subreddits(self, **kwargs):
+                seen_marks.append(dict(self.watermarks))
+                self.watermarks["r/python"] = HighWaterMark(datetime(2026, 1, 1), ["p1"])
+                return [FakePost("p1")]
+
+        monkeypatch.setattr(pipeline_mod, "RedditService", lambda: FakeReddit())
+
+        await pipeline_mod._execute_pipeline(trigger_type="manual")
+        await pipeline_mod._execute_pipeline(trigger_type="scheduled")
+
+        assert seen_marks == [{}, {"r/python": HighWaterMark(datetime(2026, 1, 1), ["p1"])}]
 
     async def test_marks_run_failed_and_reraises_on_error(self, use_test_db, test_db, monkeypatch):
         class BrokenReddit:
             search_queries = []
+            source_metrics = {}
 
             def fetch_posts_from_all_subreddits(self, **kwargs):
                 raise RuntimeError("reddit is down")
@@ -90,3 +175,44 @@ class TestExecutePipeline:
         assert run is not None
         assert run.status == "failed"
         assert run.error_message
+
+
+class TestEventLoopResponsiveness:
+    async def test_requests_stay_fast_while_pipeline_runs(self, use_test_db, test_db, monkeypatch):
+        """A slow, blocking fetch must not stall requests served by the same loop."""
+        import asyncio
+        import time
+
+        import httpx
+        from app.main import app
+
+        fetch_seconds = 0.5
+
+        class SlowReddit:
+            search_queries = []
+            source_metrics = {}
+
+            def fetch_posts_from_all_subreddits(self, **kwargs):
+                time.sleep(fetch_seconds)  # Blocking, like a PRAW listing
+                return [FakePost("p1")]
+
+        monkeypatch.setattr(pipeline_mod, "RedditService", lambda: SlowReddit())
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            run = asyncio.create_task(pipeline_mod._execute_pipeline(trigger_type="manual"))
+            await asyncio.sleep(0.05)  # Let the run get into its blocking fetch
+
+            latencies = []
+            while not run.done():
+                start = time.perf_counter()
+                response = await client.get("/health")
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200
+                await asyncio.sleep(0.02)
+
+            await run
+
+        assert latencies, "pipeline finished before any request was measured"
+        assert max(latencies) < fetch_seconds / 2
+        assert test_db.query(RedditPost).count() == 1
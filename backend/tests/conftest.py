@@ -2,6 +2,8 @@
 Test Configuration and Fixtures
 Provides shared fixtures for all tests
 """
+import threading
+
 import pytest
 from unittest.mock import Mock, MagicMock, patch
 from sqlalchemy import create_engine
@@ -42,6 +44,22 @@ def _isolate_external_side_effects(monkeypatch):
     monkeypatch.setattr(email_service, "send_contact_notification", _no_send, raising=False)
 
 
+@pytest.fixture(autouse=True)
+def _fresh_near_duplicate_index(monkeypatch):
+    """Each test gets its own database, so it needs its own near-duplicate index too."""
+    import app.services.near_duplicate_service as near_duplicate_mod
+
+    monkeypatch.setattr(near_duplicate_mod, "_near_duplicate_service", None)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_rate_limiters(monkeypatch):
+    """Source rate limiters are process-wide; don't let one test's requests slow the next."""
+    import app.core.rate_limit as rate_limit_mod
+
+    monkeypatch.setattr(rate_limit_mod, "_rate_limiters", {})
+
+
 # Use in-memory SQLite database for testing
 TEST_DATABASE_URL = "sqlite:///:memory:"
 
@@ -78,6 +96,38 @@ def test_db(test_engine):
         db.close()
 
 
+class _SerializedSession(Session):
+    """
+    One executor session at a time
+
+    Pipeline code opens its own sessions on executor threads. In production each
+    gets its own pooled connection; the in-memory test database has just one,
+    which SQLite can't share between threads mid-transaction.
+    """
+
+    _lock = threading.RLock()
+
+    def __init__(self, *args, **kwargs):
+        self._lock.acquire()
+        super().__init__(*args, **kwargs)
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self._lock.release()
+
+
+@pytest.fixture
+def executor_sessions(test_engine, monkeypatch):
+    """Point ``get_session_local`` at the test engine, one session at a time across threads"""
+    import app.db as appdb
+
+    factory = sessionmaker(bind=test_engine, class_=_SerializedSession)
+    monkeypatch.setattr(appdb, "get_session_local", lambda: factory)
+    return factory
+
+
 @pytest.fixture(scope="function")
 def client(test_engine):
     """Create a test client with database dependency override"""
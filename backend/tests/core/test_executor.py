@@ -0,0 +1,48 @@
+"""Tests for the pipeline executor (`app/core/executor.py`)."""
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+import pytest
+
+import app.core.executor as executor_mod
+from app.core.config import settings
+
+
+@pytest.fixture(autouse=True)
+def fresh_executor():
+    executor_mod.shutdown_pipeline_executor()
+    yield
+    executor_mod.shutdown_pipeline_executor()
+
+
+def _add(a, b=0):
+    return a + b
+
+
+class TestGetPipelineExecutor:
+    def test_thread_pool_by_default(self, monkeypatch):
+        monkeypatch.setattr(settings, "PIPELINE_EXECUTOR_TYPE", "thread")
+        executor = executor_mod.get_pipeline_executor()
+        assert isinstance(executor, ThreadPoolExecutor)
+        assert executor_mod.get_pipeline_executor() is executor
+
+    def test_process_pool_when_configured(self, monkeypatch):
+        monkeypatch.setattr(settings, "PIPELINE_EXECUTOR_TYPE", "process")
+        assert isinstance(executor_mod.get_pipeline_executor(), ProcessPoolExecutor)
+
+    def test_unknown_type_raises(self, monkeypatch):
+        monkeypatch.setattr(settings, "PIPELINE_EXECUTOR_TYPE", "fibers")
+        with pytest.raises(ValueError, match="Unsupported executor type"):
+            executor_mod.get_pipeline_executor()
+
+
+class TestRunBlocking:
+    async def test_runs_off_the_event_loop_thread(self):
+        caller = threading.get_ident()
+        worker = await executor_mod.run_blocking(threading.get_ident)
+        assert worker != caller
+
+    async def test_passes_arguments_and_reraises(self):
+        assert await executor_mod.run_blocking(_add, 2, b=3) == 5
+        with pytest.raises(TypeError):
+            await executor_mod.run_blocking(_add, None, b=1)
@@ -0,0 +1,86 @@
+"""
+Tests for the shared HTTP session manager (`app/core/http.py`).
+
+A local aiohttp test server stands in for the remote APIs, so connection
+pooling and the reuse counters are exercised over real sockets without any
+network access.
+"""
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.core.http import HTTPSessionManager
+from app.services.base_source import BaseDataSource, DataSourceConfig, SourceType
+
+
+@pytest.fixture
+async def server():
+    async def ok(request):
+        return web.json_response({"path": request.path})
+
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", ok)
+    test_server = TestServer(app)
+    await test_server.start_server()
+    yield test_server
+    await test_server.close()
+
+
+@pytest.fixture
+async def manager():
+    manager = HTTPSessionManager()
+    yield manager
+    await manager.close()
+
+
+class _Source(BaseDataSource):
+    async def fetch(self, **kwargs):
+        return []
+
+    def transform(self, raw_data):
+        return raw_data
+
+
+class TestHTTPSessionManager:
+    async def test_session_is_shared_until_closed(self, manager):
+        session = manager.session()
+        assert manager.session() is session
+        assert manager.get_stats()["active"] is True
+
+        await manager.close()
+        assert session.closed
+        assert manager.get_stats()["active"] is False
+        assert manager.session() is not session
+
+    async def test_connections_are_reused(self, manager, server):
+        for path in ("/a", "/b", "/c"):
+            async with manager.session().get(server.make_url(path)) as response:
+                assert (await response.json())["path"] == path
+
+        stats = manager.get_stats()
+        assert stats["requests"] == 3
+        assert stats["connections_created"] == 1
+        assert stats["connections_reused"] == 2
+        assert stats["reuse_ratio"] == pytest.approx(2 / 3, abs=1e-4)
+
+    async def test_failed_requests_are_counted(self, manager, server):
+        url = server.make_url("/")
+        await server.close()
+        with pytest.raises(Exception):
+            async with manager.session().get(url):
+                pass
+        assert manager.get_stats()["request_errors"] == 1
+
+    async def test_source_requests_are_counted_per_source(self, manager, server, monkeypatch):
+        import app.services.base_source as base_mod
+
+        monkeypatch.setattr(base_mod, "http_session_manager", manager)
+        source = _Source(DataSourceConfig(source_type=SourceType.NEWS, timeout=5))
+
+        for _ in range(2):
+            async with source.http_request("GET", server.make_url("/news")) as response:
+                assert response.status == 200
+
+        assert manager.get_stats()["sources"] == {
+            "news": {"requests": 2, "connections_created": 1, "connections_reused": 1}
+        }
@@ -0,0 +1,247 @@
+"""
+Tests for the cross-worker scheduled job lock (`app/core/job_lock.py`).
+
+Two JobLock instances with different worker IDs stand in for two worker
+processes. They share an in-memory stand-in for the handful of Redis commands
+the lock uses (the suite never talks to a real Redis). Advisory locks run
+against a SQLite file whose connections get ``pg_try_advisory_lock`` and
+``pg_advisory_unlock`` functions sharing one table of holders.
+"""
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import create_engine, event
+
+import app.core.job_lock as job_lock_mod
+from app.core.job_lock import JobLock
+from app.models.job_lock_hold import JobLockHold
+
+
+class FakeRedis:
+    """SET NX PX / GET / MGET plus the lock's Lua scripts, with expiry; ``down`` fails every call"""
+
+    def __init__(self, down=False):
+        self.values = {}
+        self.expires = {}
+        self.down = down
+
+    def _check(self):
+        if self.down:
+            raise ConnectionError("redis is down")
+
+    def _get(self, key):
+        if key in self.expires and self.expires[key] <= time.monotonic():
+            self.values.pop(key, None)
+            self.expires.pop(key, None)
+        return self.values.get(key)
+
+    def _pexpire(self, key, ms):
+        self.expires[key] = time.monotonic() + int(ms) / 1000
+        return 1
+
+    async def set(self, key, value, nx=False, px=None):
+        self._check()
+        if nx and self._get(key) is not None:
+            return None
+        self.values[key] = value
+        self._pexpire(key, px)
+        return True
+
+    async def get(self, key):
+        self._check()
+        return self._get(key)
+
+    async def mget(self, keys):
+        self._check()
+        return [self._get(key) for key in keys]
+
+    def register_script(self, source):
+        async def script(keys, args):
+            self._check()
+            key, owner, ms = keys[0], args[0], int(args[1])
+            holder = self._get(key)
+            if source == job_lock_mod._CLAIM_SCRIPT and holder is None:
+                self.values[key] = owner
+                return self._pexpire(key, ms)
+            if holder != owner:
+                return 0
+            if source == job_lock_mod._RELEASE_SCRIPT and ms == 0:
+                self.values.pop(key, None)
+                return 1
+            return self._pexpire(key, ms)
+        return script
+
+
+def _lock(redis, worker_id):
+    lock = JobLock(worker_id=worker_id)
+    lock._redis = redis
+    lock._renew_script = redis.register_script(job_lock_mod._RENEW_SCRIPT)
+    lock._claim_script = redis.register_script(job_lock_mod._CLAIM_SCRIPT)
+    lock._release_script = redis.register_script(job_lock_mod._RELEASE_SCRIPT)
+    return lock
+
+
+@pytest.fixture(autouse=True)
+def redis_only(monkeypatch):
+    """Like a non-Postgres database: no advisory locks unless a test adds them"""
+    monkeypatch.setattr(job_lock_mod, "_uses_advisory_locks", lambda: False)
+
+
+@pytest.fixture
+def advisory_locks(tmp_path, monkeypatch):
+    """Advisory lock holders, ``key -> DBAPI connection``"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'locks.db'}", connect_args={"check_same_thread": False})
+    held = {}
+
+    @event.listens_for(engine, "connect")
+    def add_lock_functions(dbapi_connection, record):
+        def try_lock(key):
+            return int(held.setdefault(key, dbapi_connection) is dbapi_connection)
+
+        def unlock(key):
+            return int(held.get(key) is dbapi_connection and held.pop(key) is dbapi_connection)
+
+        dbapi_connection.create_function("pg_try_advisory_lock", 1, try_lock)
+        dbapi_connection.create_function("pg_advisory_unlock", 1, unlock)
+
+    JobLockHold.__table__.create(engine)
+    monkeypatch.setattr(job_lock_mod, "get_engine", lambda: engine)
+    monkeypatch.setattr(job_lock_mod, "_uses_advisory_locks", lambda: True)
+    yield held
+    engine.dispose()
+
+
+@pytest.fixture
+def workers():
+    redis = FakeRedis()
+    return _lock(redis, "worker-a"), _lock(redis, "worker-b")
+
+
+class TestJobLock:
+    async def test_only_one_worker_runs_a_job(self, workers):
+        runs = []
+
+        async def job(name):
+            await asyncio.sleep(0.02)
+            runs.append(name)
+
+        results = await asyncio.gather(
+            *(lock.run("reddit", job, lock.worker_id) for lock in workers)
+        )
+        assert sorted(results) == [False, True]
+        assert len(runs) == 1
+
+    async def test_lock_is_released_after_the_run(self, workers):
+        a, b = workers
+        assert await a.run("reddit", lambda: None) is True
+        assert await b.run("reddit", lambda: None) is True
+
+    async def test_hold_skips_late_siblings_of_the_same_run(self, workers):
+        a, b = workers
+        await a.run("reddit", lambda: None, hold_seconds=60)
+        assert await b.run("reddit", lambda: None) is False
+        assert await b.get_holders(["reddit", "news"]) == {"reddit": "worker-a", "news": None}
+
+    async def test_lock_is_renewed_while_the_job_runs(self, workers, monkeypatch):
+        a, b = workers
+        a.ttl_ms = b.ttl_ms = 60  # Renewed every 20ms
+
+        async def long_job():
+            await asyncio.sleep(0.15)
+            assert await b.acquire("reddit") is False
+
+        assert await a.run("reddit", long_job) is True
+
+    async def test_job_errors_still_release_the_lock(self, workers):
+        a, b = workers
+
+        async def broken():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            await a.run("reddit", broken)
+        assert await b.acquire("reddit") is True
+
+    async def test_skips_the_run_without_any_lock_backend(self):
+        lock = _lock(FakeRedis(down=True), "worker-a")
+        ran = []
+        assert await lock.run("reddit", ran.append, 1) is False
+        assert ran == []
+
+    async def test_takes_the_advisory_lock_along_with_redis(self, advisory_locks):
+        redis = FakeRedis()
+        a, b = _lock(redis, "worker-a"), _lock(redis, "worker-b")
+
+        async def job():
+            assert len(advisory_locks) == 1
+            assert redis.values == {"scheduler:lock:reddit": "worker-a"}
+
+        assert await a.run("reddit", job) is True
+        assert advisory_locks == {}
+        assert await b.run("reddit", lambda: None) is True
+
+    async def test_falls_back_to_the_advisory_lock_without_redis(self, advisory_locks):
+        redis = FakeRedis(down=True)
+        a, b = _lock(redis, "worker-a"), _lock(redis, "worker-b")
+        runs = []
+
+        async def job(name):
+            await asyncio.sleep(0.02)
+            runs.append(name)
+
+        results = await asyncio.gather(*(lock.run("reddit", job, lock.worker_id) for lock in (a, b)))
+        assert sorted(results) == [False, True]
+        assert len(runs) == 1
+        assert advisory_locks == {}
+        assert await b.run("reddit", lambda: None) is True
+
+    async def test_redis_coming_back_never_gives_the_job_to_a_second_worker(self, advisory_locks):
+        redis = FakeRedis(down=True)
+        a, b = _lock(redis, "worker-a"), _lock(redis, "worker-b")
+        assert await a.acquire("reddit") is True
+
+        redis.down = False
+        # b gets the free Redis key but not the advisory lock, and lets the key go
+        assert await b.acquire("reddit") is False
+        assert redis.values == {}
+
+        # a's renewal takes the Redis key back
+        assert await a.renew("reddit") is True
+        assert redis.values == {"scheduler:lock:reddit": "worker-a"}
+        assert await b.acquire("reddit") is False
+        await a.release("reddit")
+        assert await b.acquire("reddit") is True
+
+    async def test_renewal_steps_down_if_another_worker_has_the_redis_key(self, advisory_locks):
+        redis = FakeRedis(down=True)
+        a = _lock(redis, "worker-a")
+        assert await a.acquire("reddit") is True
+
+        redis.down = False
+        redis.values["scheduler:lock:reddit"] = "worker-c"
+        assert await a.renew("reddit") is False
+        assert advisory_locks == {}
+
+    async def test_hold_is_stored_without_keeping_a_connection(self, advisory_locks):
+        redis = FakeRedis(down=True)
+        a, b = _lock(redis, "worker-a"), _lock(redis, "worker-b")
+
+        assert await a.run("reddit", lambda: None, hold_seconds=0.1) is True
+        assert advisory_locks == {}
+        assert await b.run("reddit", lambda: None) is False
+
+        # Redis is back, but the run's hold still holds
+        redis.down = False
+        assert await b.run("reddit", lambda: None) is False
+        assert redis.values == {}
+
+        await asyncio.sleep(0.15)
+        assert await b.run("reddit", lambda: None) is True
+
+    async def test_disabled_lock_always_runs(self, workers, monkeypatch):
+        a, b = workers
+        monkeypatch.setattr(job_lock_mod.settings, "SCHEDULER_LOCK_ENABLED", False)
+        await a.acquire("reddit")
+        assert await b.run("reddit", lambda: None) is True
+        assert await b.get_holders(["reddit"]) == {}
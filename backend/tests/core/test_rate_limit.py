@@ -0,0 +1,91 @@
+"""
+Tests for the source rate limiter (`app/core/rate_limit.py`).
+
+Waits are kept to tens of milliseconds. The Redis backend is exercised through
+a stand-in script object, since the suite never talks to a real Redis.
+"""
+import asyncio
+import time
+
+import pytest
+
+import app.core.rate_limit as rate_limit_mod
+from app.core.rate_limit import RateLimiter, get_rate_limiter, get_rate_limit_stats
+
+
+class TestRateLimiter:
+    async def test_burst_passes_without_waiting(self):
+        limiter = RateLimiter("test", rate_per_minute=60, burst=3)
+        waits = [await limiter.acquire() for _ in range(3)]
+        assert waits == [0.0, 0.0, 0.0]
+
+    async def test_paces_instead_of_rejecting(self):
+        limiter = RateLimiter("test", rate_per_minute=1200)  # one request per 50ms
+        start = time.monotonic()
+        for _ in range(4):
+            await limiter.acquire()
+        assert time.monotonic() - start >= 0.15
+
+        stats = limiter.get_stats()
+        assert stats["acquired"] == 4
+        assert stats["waited"] == 3
+        assert stats["max_wait_seconds"] > 0
+
+    async def test_concurrent_callers_are_served_in_order(self):
+        limiter = RateLimiter("test", rate_per_minute=1200)
+        finished = []
+
+        async def request(n):
+            await limiter.acquire()
+            finished.append(n)
+
+        await asyncio.gather(*(request(n) for n in range(4)))
+        assert finished == [0, 1, 2, 3]
+        assert limiter.get_stats()["total_wait_seconds"] == pytest.approx(0.05 + 0.1 + 0.15, abs=0.02)
+
+    async def test_zero_rate_is_unlimited(self):
+        limiter = RateLimiter("test", rate_per_minute=0)
+        assert [await limiter.acquire() for _ in range(5)] == [0.0] * 5
+        assert limiter.acquired == 0
+
+
+class TestSharedRateLimiter:
+    async def test_waits_for_the_redis_schedule(self):
+        calls = []
+
+        async def script(keys, args):
+            calls.append((keys, args))
+            return 20  # milliseconds
+
+        limiter = RateLimiter("news", rate_per_minute=60, burst=2, shared=True)
+        limiter._script = script
+
+        assert await limiter.acquire() == 0.02
+        assert calls == [(["ratelimit:source:news"], [1000, 1000])]
+        assert limiter.get_stats()["backend"] == "redis"
+
+    async def test_falls_back_to_local_pacing_when_redis_fails(self):
+        async def script(keys, args):
+            raise ConnectionError("redis is down")
+
+        limiter = RateLimiter("news", rate_per_minute=1200, shared=True)
+        limiter._script = script
+
+        await limiter.acquire()
+        assert await limiter.acquire() > 0
+        assert limiter.get_stats()["shared_errors"] == 2
+
+
+class TestRegistry:
+    def test_same_source_and_rate_share_a_limiter(self):
+        assert get_rate_limiter("news", 60) is get_rate_limiter("news", 60)
+        assert get_rate_limiter("news", 60) is not get_rate_limiter("news", 120)
+
+    def test_shared_backend_follows_settings(self, monkeypatch):
+        monkeypatch.setattr(rate_limit_mod.settings, "SOURCE_RATE_LIMIT_SHARED", True)
+        assert get_rate_limiter("github", 30).shared is True
+
+    def test_stats_skip_unlimited_sources(self):
+        get_rate_limiter("news", 60)
+        get_rate_limiter("stub", 0)
+        assert set(get_rate_limit_stats()) == {"news"}
@@ -0,0 +1,274 @@
+"""
+Tests for the checkpointed backfill engine (`app/services/backfill_service.py`).
+
+Fake Reddit and NewsAPI sources serve fixed pages, sentiment and NER/keyword
+extraction are faked, and checkpoints live in the in-memory test database, so
+batching, concurrency and resume-after-crash run with no network.
+"""
+import pickle
+import threading
+import time
+from datetime import date, datetime
+
+import pytest
+
+import app.core.executor as executor_mod
+import app.services.backfill_service as backfill_mod
+import app.services.ingestion_service as ingestion_mod
+from app.models.article import Article
+from app.models.backfill_checkpoint import BackfillCheckpoint
+from app.models.reddit_post import RedditPost
+from app.schemas.reddit import RedditPostCreate
+from app.services.backfill_service import BackfillEngine, BackfillSlice, plan_news_slices, plan_reddit_slices
+
+
+class FakeNews:
+    """``pages`` pages of ``page_size`` articles per query and day"""
+
+    def __init__(self, pages=3):
+        self.pages = pages
+        self.requested = []
+
+    async def fetch_pages(self, query, page_size, start_page=1, **kwargs):
+        for page in range(start_page, self.pages + 1):
+            self.requested.append((query, kwargs["from"][:10], page))
+            yield [{"id": f"{query}-{kwargs['from'][:10]}-p{page}-{i}"} for i in range(page_size)]
+
+    def transform_and_validate(self, raw):
+        return [
+            {
+                "id": item["id"],
+                "title": f"story {item['id']}",
+                "content": "body",
+                "published_at": datetime(2026, 9, 1),
+                "source_type": "news",
+                "source_name": "Stub",
+            }
+            for item in raw
+        ]
+
+
+class FakeReddit:
+    """Two search pages per slice; the second one is short, ending the slice"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def search_page(self, query, time_filter, after=None, page_size=100):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+
+        page = 2 if after else 1
+        count = page_size if page == 1 else 1
+        posts = [
+            RedditPostCreate(
+                id=f"{query}-{time_filter}-{page}-{i}", title=f"post {i}", author="a", subreddit="python",
+                content="body", url="https://reddit.com/x", score=1, num_comments=0, upvote_ratio=1.0,
+                created_utc=datetime(2026, 9, 1), is_self=True, is_video=False, over_18=False
+            )
+            for i in range(count)
+        ]
+        return posts, ("t3_next" if page == 1 else None)
+
+
+def _search_in_worker(query, time_filter, after, page_size):
+    """Module-level search page, so a process pool worker can run it"""
+    return FakeReddit().search_page(query, time_filter, after, page_size)
+
+
+@pytest.fixture
+def offline(executor_sessions, monkeypatch):
+    monkeypatch.setattr(ingestion_mod.SentimentService, "analyze_text", lambda text: (0.2, "positive"))
+    monkeypatch.setattr(ingestion_mod.SentimentService, "analyze_reddit_post", lambda title, content: (0.2, "positive"))
+
+    class FakeNER:
+        def extract_and_save_entities_batch(self, texts_by_article, db):
+            return len(texts_by_article)
+
+    class FakeKeywords:
+        def extract_and_save_keywords_batch(self, texts_by_article, db):
+            return len(texts_by_article)
+
+    monkeypatch.setattr("app.services.ner_service.get_ner_service", lambda: FakeNER())
+    monkeypatch.setattr("app.services.keyword_service.get_keyword_service", lambda: FakeKeywords())
+    monkeypatch.setattr(backfill_mod.settings, "BACKFILL_REDDIT_RATE_LIMIT", 0)
+
+
+@pytest.fixture
+def commits(monkeypatch):
+    """Record the item IDs of every committed batch"""
+    batches = []
+    commit = backfill_mod._commit_batch
+
+    def recording_commit(backfill_slice, items, checkpoint):
+        counts = commit(backfill_slice, items, checkpoint)
+        batches.append([item["id"] for item in items])
+        return counts
+
+    monkeypatch.setattr(backfill_mod, "_commit_batch", recording_commit)
+    return batches
+
+
+NEWS_SLICE = BackfillSlice("news", "hasbro", "2026-09-01")
+
+
+def _checkpoint(test_db, backfill_slice):
+    test_db.expire_all()
+    return test_db.query(BackfillCheckpoint).filter_by(
+        source=backfill_slice.source, query=backfill_slice.query, slice_key=backfill_slice.slice_key
+    ).one()
+
+
+class TestSlicePlanning:
+    def test_news_slices_are_days_newest_first(self):
+        slices = plan_news_slices(["hasbro"], days_back=3, end=date(2026, 9, 3))
+        assert [s.slice_key for s in slices] == ["2026-09-03", "2026-09-02", "2026-09-01"]
+
+    def test_reddit_slices_are_time_filters(self):
+        slices = plan_reddit_slices(["a", "b"], ["year", "all"])
+        assert {str(s) for s in slices} == {"reddit:a:year", "reddit:a:all", "reddit:b:year", "reddit:b:all"}
+
+
+class TestBackfillEngine:
+    async def test_commits_fixed_size_batches_and_finishes_the_slice(self, offline, test_db, commits):
+        engine = BackfillEngine(news_service=FakeNews(pages=3), batch_size=2, page_size=5)
+        summary = await engine.run([NEWS_SLICE])
+
+        assert [len(batch) for batch in commits] == [2, 2, 1] * 3
+        assert summary["items"] == 15
+        assert summary["stored"] == 15
+        assert summary["slices"] == {"total": 1, "done": 1, "paused": 0, "failed": 0, "skipped": 0}
+        assert test_db.query(Article).count() == 15
+
+        checkpoint = _checkpoint(test_db, NEWS_SLICE)
+        assert checkpoint.status == "done"
+        assert checkpoint.items_fetched == 15
+        assert checkpoint.records_stored == 15
+        assert checkpoint.page == 4
+        assert checkpoint.completed_at is not None
+
+    async def test_resumes_at_the_first_uncommitted_item(self, offline, test_db, commits, monkeypatch):
+        recording_commit = backfill_mod._commit_batch
+        calls = []
+
+        def crashing_commit(backfill_slice, items, checkpoint):
+            calls.append(1)
+            if len(calls) == 5:  # Second batch of page 2
+                raise ConnectionError("database went away")
+            return recording_commit(backfill_slice, items, checkpoint)
+
+        monkeypatch.setattr(backfill_mod, "_commit_batch", crashing_commit)
+        first = await BackfillEngine(news_service=FakeNews(pages=3), batch_size=2, page_size=5).run([NEWS_SLICE])
+        assert first["slices"]["failed"] == 1
+        checkpoint = _checkpoint(test_db, NEWS_SLICE)
+        assert (checkpoint.status, checkpoint.page, checkpoint.page_offset) == ("failed", 2, 2)
+        assert "database went away" in checkpoint.error_message
+
+        monkeypatch.setattr(backfill_mod, "_commit_batch", recording_commit)
+        news = FakeNews(pages=3)
+        second = await BackfillEngine(news_service=news, batch_size=2, page_size=5).run([NEWS_SLICE])
+
+        # Page 1 isn't re-requested and page 2 continues after its committed items
+        assert [page for _, _, page in news.requested] == [2, 3]
+        assert commits[4][0] == "hasbro-2026-09-01-p2-2"
+        committed = [item for batch in commits for item in batch]
+        assert len(committed) == len(set(committed)) == 15
+        assert second["slices"]["done"] == 1
+        assert _checkpoint(test_db, NEWS_SLICE).items_fetched == 15
+        assert test_db.query(Article).count() == 15
+
+    async def test_slice_that_spends_its_budget_resumes_on_the_next_run(self, offline, test_db, commits):
+        first = await BackfillEngine(
+            news_service=FakeNews(pages=3), batch_size=2, page_size=5, max_items=5
+        ).run([NEWS_SLICE])
+        assert first["slices"]["paused"] == 1
+        assert first["slices"]["done"] == 0
+        checkpoint = _checkpoint(test_db, NEWS_SLICE)
+        assert (checkpoint.status, checkpoint.page, checkpoint.page_offset) == ("pending", 2, 0)
+        assert checkpoint.completed_at is None
+
+        news = FakeNews(pages=3)
+        second = await BackfillEngine(news_service=news, batch_size=2, page_size=5, max_items=15).run([NEWS_SLICE])
+
+        # The budget is per run: the rest of the slice is fetched until the results run out
+        assert [page for _, _, page in news.requested] == [2, 3]
+        assert second["slices"]["done"] == 1
+        committed = [item for batch in commits for item in batch]
+        assert len(committed) == len(set(committed)) == 15
+        checkpoint = _checkpoint(test_db, NEWS_SLICE)
+        assert (checkpoint.status, checkpoint.items_fetched) == ("done", 15)
+
+    async def test_budget_spent_on_the_last_reddit_page_finishes_the_slice(self, offline, test_db):
+        slices = plan_reddit_slices(["a"], ["year"])
+        summary = await BackfillEngine(
+            search_page=FakeReddit().search_page, page_size=3, max_items=4
+        ).run(slices)
+
+        assert summary["slices"]["done"] == 1
+        assert _checkpoint(test_db, slices[0]).status == "done"
+
+    async def test_finished_slices_are_skipped_unless_reset(self, offline, test_db):
+        await BackfillEngine(news_service=FakeNews(pages=1), page_size=5).run([NEWS_SLICE])
+
+        news = FakeNews(pages=1)
+        summary = await BackfillEngine(news_service=news, page_size=5).run([NEWS_SLICE])
+        assert news.requested == []
+        assert summary["slices"]["skipped"] == 1
+
+        summary = await BackfillEngine(news_service=news, page_size=5).run([NEWS_SLICE], reset=True)
+        assert len(news.requested) == 1
+        assert summary["updated"] == 5
+        assert _checkpoint(test_db, NEWS_SLICE).items_fetched == 5
+
+    async def test_runs_slices_concurrently_up_to_the_limit(self, offline, test_db):
+        reddit = FakeReddit(delay=0.05)
+        slices = plan_reddit_slices(["a", "b"], ["year", "all"])
+        summary = await BackfillEngine(search_page=reddit.search_page, concurrency=2, page_size=3).run(slices)
+
+        assert reddit.max_active == 2
+        assert summary["slices"]["done"] == 4
+        assert summary["items"] == 4 * (3 + 1)
+        assert test_db.query(RedditPost).count() == 16
+
+        checkpoint = _checkpoint(test_db, slices[0])
+        assert (checkpoint.status, checkpoint.page, checkpoint.cursor) == ("done", 3, None)
+
+    async def test_failed_slice_does_not_stop_the_others(self, offline, test_db):
+        class FlakyReddit(FakeReddit):
+            def search_page(self, query, *args, **kwargs):
+                if query == "broken":
+                    raise RuntimeError("search failed")
+                return super().search_page(query, *args, **kwargs)
+
+        slices = plan_reddit_slices(["broken", "ok"], ["year"])
+        summary = await BackfillEngine(search_page=FlakyReddit().search_page, page_size=3).run(slices)
+
+        assert summary["slices"]["failed"] == 1
+        assert summary["slices"]["done"] == 1
+        assert _checkpoint(test_db, slices[0]).status == "failed"
+        assert _checkpoint(test_db, slices[1]).status == "done"
+
+    async def test_reddit_pages_are_fetched_in_a_process_pool(self, monkeypatch):
+        monkeypatch.setattr(backfill_mod.settings, "BACKFILL_REDDIT_RATE_LIMIT", 0)
+        monkeypatch.setattr(executor_mod.settings, "PIPELINE_EXECUTOR_TYPE", "process")
+        monkeypatch.setattr(executor_mod.settings, "PIPELINE_EXECUTOR_WORKERS", 1)
+        executor_mod.shutdown_pipeline_executor()
+        try:
+            engine = BackfillEngine(search_page=_search_in_worker, page_size=3)
+            state = {"page": 0, "cursor": None}
+            pages = [page async for page in engine._pages(BackfillSlice("reddit", "hasbro", "year"), state)]
+        finally:
+            executor_mod.shutdown_pipeline_executor()
+
+        assert [len(posts) for posts, _ in pages] == [3, 1]
+        assert pages[0][1] == {"page": 1, "cursor": "t3_next"}
+        assert pages[1][1] == {"page": 2, "cursor": None, "status": "done"}
+        # The default search builds its client inside the worker, so it pickles too
+        assert pickle.loads(pickle.dumps(BackfillEngine().search_page)) is backfill_mod._search_page
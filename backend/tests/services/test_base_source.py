@@ -61,6 +61,7 @@ class TestMetadataAndConfig:
         assert meta["source_type"] == "news"
         assert meta["rate_limit"] == 42
         assert meta["timeout"] == 7
+        assert meta["rate_limiter"]["rate_per_minute"] == 42
 
     def test_source_type_enum_values(self):
         assert SourceType.REDDIT.value == "reddit"
@@ -79,3 +80,76 @@ class TestFetchAndTransform:
     async def test_empty_fetch_returns_empty(self):
         source = _StubSource(_config(), [])
         assert await source.fetch_and_transform() == []
+
+
+class _PagedSource(_StubSource):
+    """Yields ``pages`` one at a time, recording when each is requested."""
+
+    def __init__(self, pages):
+        super().__init__(_config(), [])
+        self.pages = pages
+        self.requested = []
+
+    async def fetch_pages(self, **kwargs):
+        for number, page in enumerate(self.pages, start=1):
+            self.requested.append(number)
+            yield page
+
+
+def _page(prefix, count):
+    return [{**VALID_ITEM, "id": f"{prefix}-{i}"} for i in range(count)]
+
+
+class TestRateLimit:
+    async def test_fetch_and_transform_takes_a_rate_limit_slot(self):
+        source = _StubSource(_config(), [VALID_ITEM])
+        await source.fetch_and_transform()
+        assert source.rate_limiter.get_stats()["acquired"] == 1
+
+    async def test_instances_of_a_source_share_one_limiter(self):
+        assert _StubSource(_config(), []).rate_limiter is _StubSource(_config(), []).rate_limiter
+
+    async def test_sources_that_pace_requests_are_not_charged_per_fetch(self):
+        class PagedSource(_StubSource):
+            paces_requests = True
+
+        source = PagedSource(_config(), [VALID_ITEM])
+        await source.fetch_and_transform()
+        assert source.rate_limiter.get_stats()["acquired"] == 0
+
+
+class TestStream:
+    async def test_default_stream_is_a_single_page(self):
+        pages = [page async for page in _StubSource(_config(), [VALID_ITEM]).stream()]
+        assert pages == [[VALID_ITEM]]
+
+    async def test_prefetches_the_next_page(self):
+        import asyncio
+
+        source = _PagedSource([_page("a", 2), _page("b", 2), _page("c", 2)])
+        stream = source.stream(prefetch=1)
+        first = await stream.__anext__()
+        await asyncio.sleep(0)  # Let the producer run while the page is "persisted"
+
+        assert [item["id"] for item in first] == ["a-0", "a-1"]
+        assert source.requested == [1, 2, 3]
+        assert len([page async for page in stream]) == 2
+
+    async def test_stops_at_the_item_budget(self):
+        source = _PagedSource([_page("a", 3), _page("b", 3), _page("c", 3), _page("d", 3)])
+        pages = [page async for page in source.stream(max_items=4)]
+
+        assert [len(page) for page in pages] == [3, 1]
+        # Prefetch is bounded, so the source isn't drained past the budget
+        assert len(source.requested) < 4
+
+    async def test_fetch_errors_reach_the_consumer(self):
+        class Broken(_StubSource):
+            async def fetch_pages(self, **kwargs):
+                yield _page("a", 1)
+                raise RuntimeError("page 2 failed")
+
+        stream = Broken(_config(), []).stream()
+        assert len(await stream.__anext__()) == 1
+        with pytest.raises(RuntimeError, match="page 2 failed"):
+            await stream.__anext__()
@@ -1,7 +1,16 @@
 """Tests for the Redis cache service (`app/services/cache_service.py`)."""
-from unittest.mock import MagicMock
+import asyncio
+import fnmatch
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock
 
-from app.services.cache_service import CacheService
+import pytest
+import redis
+from redis import asyncio as aioredis
+
+import app.services.cache_service as cache_mod
+from app.services.cache_service import CacheService, LocalCache, cached, _MISSING
 
 
 class TestDisabledCache:
@@ -47,7 +56,9 @@ class TestEnabledCacheWithMockRedis:
     def test_set_serializes_and_returns_true(self):
         cs = self._mocked()
         assert cs.set("k", {"value": 42}, ttl=60) is True
-        cs._redis_client.setex.assert_called_once()
+        pipe = cs._redis_client.pipeline.return_value
+        pipe.setex.assert_called_once_with("k", 60, '{"value": 42}')
+        pipe.execute.assert_called_once()
 
     def test_delete_returns_true(self):
         cs = self._mocked()
@@ -68,3 +79,640 @@ class TestCacheKeyGeneration:
         with_db = cs._generate_cache_key("p", page=1, db="a-session-object")
         without_db = cs._generate_cache_key("p", page=1)
         assert with_db == without_db
+
+
+class FakeAsyncRedis:
+    """Dict-backed stand-in for the asyncio client, with a per-call delay"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.store = {}
+        self.ttls = {}
+        self.gets = 0
+        self.published = []
+        self.scans = 0
+
+    async def get(self, key):
+        self.gets += 1
+        await asyncio.sleep(self.delay)
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        await asyncio.sleep(self.delay)
+        self.store[key] = value
+
+    async def scan_iter(self, match, count=None):
+        self.scans += 1
+        for key in [key for key in self.store if fnmatch.fnmatchcase(key, match)]:
+            yield key
+
+    async def delete(self, *keys):
+        return sum(self.store.pop(key, None) is not None for key in keys)
+
+    async def sadd(self, key, *members):
+        self.store.setdefault(key, set()).update(members)
+
+    async def srem(self, key, *members):
+        before = len(self.store.get(key, set()))
+        self.store.get(key, set()).difference_update(members)
+        removed = before - len(self.store.get(key, set()))
+        if key in self.store and self.store[key] == set():
+            del self.store[key]  # Redis drops empty sets
+        return removed
+
+    async def smembers(self, key):
+        return set(self.store.get(key, set()))
+
+    async def expire(self, key, ttl, nx=False, gt=False):
+        # A key without a TTL counts as an infinite one for GT, like Redis
+        current = self.ttls.get(key)
+        if key not in self.store or (nx and current is not None) or (gt and (current is None or ttl <= current)):
+            return False
+        self.ttls[key] = ttl
+        return True
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def publish(self, channel, message):
+        self.published.append((channel, json.loads(message)))
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    async def eval(self, script, numkeys, key, *args):
+        if script == cache_mod._PRUNE_TAG_SCRIPT:
+            index, tag, members = args[0], args[1], args[2:]
+            removed = await self.srem(key, *[m for m in members if m not in self.store])
+            if key not in self.store:
+                await self.srem(index, tag)
+            return removed
+        # Compare-and-delete, like _RELEASE_LOCK_SCRIPT
+        token = args[0]
+        if self.store.get(key) == token:
+            del self.store[key]
+            return 1
+        return 0
+
+
+class FakePipeline:
+    """Queues calls to a FakeAsyncRedis and runs them on ``execute``"""
+
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((getattr(self.client, name), args, kwargs))
+
+    async def execute(self):
+        return [await method(*args, **kwargs) for method, args, kwargs in self.calls]
+
+
+def _with_async_client(cs, client):
+    cs._enabled = True
+    cs._async_client = client
+    cs._async_loop = asyncio.get_running_loop()
+    return cs
+
+
+class TestAsyncCache:
+    async def test_disabled_cache_skips_redis(self):
+        cs = CacheService()
+        cs._enabled = False
+        assert await cs.aget("k") is None
+        assert await cs.aset("k", 1) is False
+        assert await cs.adelete_pattern("cache:*") == 0
+        assert (await cs.aget_stats())["enabled"] is False
+
+    async def test_get_and_set_round_trip(self):
+        cs = _with_async_client(CacheService(), FakeAsyncRedis())
+        assert await cs.aget("k") is None
+        assert await cs.aset("k", {"value": 42}, ttl=60) is True
+        assert await cs.aget("k") == {"value": 42}
+
+    async def test_delete_pattern_deletes_matching_keys(self):
+        client = FakeAsyncRedis()
+        cs = _with_async_client(CacheService(), client)
+        for key in ("cache:reddit_posts:a", "cache:reddit_posts:b", "cache:stats_overview:a"):
+            await cs.aset(key, 1, ttl=60)
+        assert await cs.adelete_pattern("cache:reddit_*") == 2
+        assert [key for key in client.store if key.startswith("cache:")] == ["cache:stats_overview:a"]
+
+
+class TestTagInvalidation:
+    async def test_writes_register_keys_under_their_prefix(self):
+        client = FakeAsyncRedis()
+        cs = _with_async_client(CacheService(), client)
+        await cs.aset("cache:reddit_posts:a", 1, ttl=60)
+        await cs.aset("other", 1, ttl=60)
+        assert client.store["tag:reddit_posts"] == {"cache:reddit_posts:a"}
+        assert client.store["tags"] == {"reddit_posts"}
+
+    async def test_prefix_patterns_use_tags_and_others_scan(self):
+        client = FakeAsyncRedis()
+        cs = _with_async_client(CacheService(), client)
+        for key in ("cache:reddit_posts:a", "cache:reddit_post:b", "cache:stats_overview:c"):
+            await cs.aset(key, 1, ttl=60)
+
+        assert await cs.adelete_pattern("cache:reddit_posts:*") == 1
+        assert await cs.adelete_pattern("cache:reddit_*") == 1
+        assert client.scans == 0
+        assert "tag:reddit_posts" not in client.store
+        assert client.store["tags"] == {"stats_overview"}
+        assert "cache:stats_overview:c" in client.store
+
+        assert await cs.adelete_pattern("cache:stats_overview:c") == 1
+        assert client.scans == 1
+
+    async def test_keys_tagged_during_an_invalidation_stay_tracked(self):
+        client = FakeAsyncRedis()
+        cs = _with_async_client(CacheService(), client)
+        await cs.aset("cache:reddit_posts:a", 1, ttl=60)
+        smembers = client.smembers
+
+        async def racing_smembers(key):
+            members = await smembers(key)
+            if key == "tag:reddit_posts":
+                await cs.aset("cache:reddit_posts:b", 2, ttl=60)
+            return members
+
+        client.smembers = racing_smembers
+        assert await cs.adelete_pattern("cache:reddit_*") == 1
+        assert client.store["tag:reddit_posts"] == {"cache:reddit_posts:b"}
+
+    async def test_keys_rewritten_mid_batch_are_never_left_untracked(self):
+        client = FakeAsyncRedis()
+        cs = _with_async_client(CacheService(), client)
+        await cs.aset("cache:reddit_posts:a", 1, ttl=60)
+        calls = []
+
+        def racing(name):
+            command = getattr(client, name)
+
+            async def call(*args):
+                result = await command(*args)
+                calls.append(name)
+                if len(calls) == 1:  # A reader recomputes the key between the two steps
+                    await cs.aset("cache:reddit_posts:a", 2, ttl=60)
+                return result
+            return call
+
+        client.delete, client.srem = racing("delete"), racing("srem")
+        await cs.adelete_pattern("cache:reddit_*")
+
+        assert calls[:2] == ["srem", "delete"]
+        # Deleted while still tagged: a stale member is harmless (and pruned), a live untagged key isn't
+        assert "cache:reddit_posts:a" not in client.store
+        assert "tag:reddit_posts" not in client.store
+
+    async def test_tag_ttl_is_only_ever_extended(self):
+        client = FakeAsyncRedis()
+        cs = _with_async_client(CacheService(), client)
+        await cs.aset("cache:reddit_posts:a", 1, ttl=600)
+        await cs.aset("cache:reddit_posts:b", 1, ttl=60)
+        assert client.ttls["tag:reddit_posts"] == 600
+
+        await cs.aset("cache:reddit_posts:c", 1, ttl=900)
+        assert client.ttls["tag:reddit_posts"] == 900
+
+    async def test_deletes_prune_expired_members_and_gone_tags(self):
+        client = FakeAsyncRedis()
+        cs = _with_async_client(CacheService(), client)
+        for key in ("cache:reddit_posts:a", "cache:reddit_posts:b", "cache:stats_overview:c"):
+            await cs.aset(key, 1, ttl=60)
+        # Expired in Redis: the key and the whole stats tag set are gone, their entries aren't
+        del client.store["cache:reddit_posts:a"]
+        del client.store["tag:stats_overview"]
+        await client.sadd("tags", "analytics_overview")
+
+        assert await cs.adelete_pattern("cache:analytics_*") == 0
+        assert client.store["tag:reddit_posts"] == {"cache:reddit_posts:b"}
+        assert client.store["tags"] == {"reddit_posts"}
+
+    def test_sync_delete_pattern_uses_tags(self):
+        cs = CacheService()
+        cs._enabled = True
+        cs._redis_client = MagicMock()
+        cs._redis_client.smembers.side_effect = lambda key: (
+            {"reddit_posts", "stats_overview"} if key == "tags" else {"cache:reddit_posts:a"}
+        )
+        cs._redis_client.delete.return_value = 1
+        assert cs.delete_pattern("cache:reddit_*") == 1
+        cs._redis_client.delete.assert_called_once_with("cache:reddit_posts:a")
+        cs._redis_client.srem.assert_called_once_with("tag:reddit_posts", "cache:reddit_posts:a")
+        order = [name for name, _, _ in cs._redis_client.method_calls if name in ("srem", "delete")]
+        assert order == ["srem", "delete"]
+        # Both tags are pruned afterwards
+        assert cs._redis_client.eval.call_count == 2
+        cs._redis_client.keys.assert_not_called()
+        cs._redis_client.scan_iter.assert_not_called()
+
+    async def test_redis_errors_are_cache_misses(self):
+        client = AsyncMock()
+        client.get.side_effect = redis.TimeoutError("slow")
+        cs = _with_async_client(CacheService(), client)
+        assert await cs.aget("k") is None
+
+    async def test_unreachable_redis_is_not_retried_on_every_call(self, monkeypatch):
+        pings = []
+
+        async def failing_ping(self):
+            pings.append(1)
+            raise redis.ConnectionError("refused")
+
+        monkeypatch.setattr(aioredis.Redis, "ping", failing_ping)
+        cs = CacheService()
+        cs._enabled = True
+        assert await cs.aget("k") is None
+        assert await cs.aset("k", 1) is False
+        assert len(pings) == 1
+        assert cs._async_retry_at > time.monotonic()
+
+    async def test_client_from_another_event_loop_is_replaced(self, monkeypatch):
+        monkeypatch.setattr(aioredis.Redis, "ping", AsyncMock(return_value=True))
+        cs = CacheService()
+        cs._enabled = True
+        stale = MagicMock()
+        cs._async_client, cs._async_loop = stale, object()
+
+        client = await cs.async_client()
+        assert client is not stale
+        assert await cs.async_client() is client
+        await cs.close()
+
+
+class TestCachedDecorator:
+    async def test_second_call_is_served_from_cache(self, monkeypatch):
+        cs = _with_async_client(CacheService(), FakeAsyncRedis())
+        monkeypatch.setattr(cache_mod, "cache_service", cs)
+        calls = []
+
+        @cached(prefix="test_endpoint", ttl=60)
+        async def endpoint(page: int = 1):
+            calls.append(page)
+            return {"page": page}
+
+        assert await endpoint(page=2) == {"page": 2}
+        assert await endpoint(page=2) == {"page": 2}
+        assert calls == [2]
+
+    async def test_slow_redis_does_not_block_the_event_loop(self, monkeypatch):
+        cs = _with_async_client(CacheService(), FakeAsyncRedis(delay=0.05))
+        # The blocking client must not be touched by the request path
+        cs._redis_client = MagicMock(side_effect=AssertionError("sync client used"))
+        monkeypatch.setattr(cache_mod, "cache_service", cs)
+
+        @cached(prefix="test_endpoint", ttl=60)
+        async def endpoint(page: int = 1):
+            return {"page": page}
+
+        start = time.perf_counter()
+        await asyncio.gather(*(endpoint(page=n) for n in range(20)))
+        # 20 misses (get + set) overlap instead of taking 20 x 0.1s in turn
+        assert time.perf_counter() - start < 0.5
+        cs._redis_client.get.assert_not_called()
+
+
+class TestLocalCache:
+    def test_evicts_least_recently_used(self):
+        lru = LocalCache(max_entries=2)
+        lru.set("a", 1, ttl=60)
+        lru.set("b", 2, ttl=60)
+        assert lru.get("a") == 1  # "b" is now least recently used
+        lru.set("c", 3, ttl=60)
+        assert lru.get("b") is _MISSING
+        assert (lru.get("a"), lru.get("c")) == (1, 3)
+        assert lru.get_stats()["evictions"] == 1
+
+    def test_entries_expire(self, monkeypatch):
+        lru = LocalCache(max_entries=10)
+        lru.set("a", 1, ttl=5)
+        now = time.monotonic()
+        monkeypatch.setattr(cache_mod.time, "monotonic", lambda: now + 6)
+        assert lru.get("a") is _MISSING
+        assert lru.get_stats()["expirations"] == 1
+
+    def test_invalidate_matches_redis_globs(self):
+        lru = LocalCache(max_entries=10)
+        for key in ("cache:reddit_posts:1", "cache:reddit_post:2", "cache:stats_overview:3"):
+            lru.set(key, 1, ttl=60)
+        assert lru.invalidate("cache:reddit_*") == 2
+        assert lru.get("cache:stats_overview:3") == 1
+
+    def test_fill_started_before_an_invalidation_is_dropped(self):
+        lru = LocalCache(max_entries=10)
+        generation = lru.generation
+        lru.invalidate("cache:*")
+        lru.set("cache:stats_overview:1", "stale", ttl=60, generation=generation)
+        assert lru.get("cache:stats_overview:1") is _MISSING
+
+
+def _two_tier(client):
+    cs = _with_async_client(CacheService(), client)
+    cs._subscribed = True
+    return cs
+
+
+class TestTwoTierCache:
+    async def test_l1_hit_skips_redis(self):
+        client = FakeAsyncRedis()
+        cs = _two_tier(client)
+        await cs.aset("cache:stats_overview:1", {"total": 3}, ttl=60)
+        assert await cs.aget("cache:stats_overview:1") == {"total": 3}
+        assert client.gets == 0
+
+        stats = cs._stats_from_info({}, 1)
+        assert stats["l1"]["hits"] == 1
+        assert stats["l2"]["hits"] == 0
+
+    async def test_l2_hit_is_kept_in_l1(self):
+        client = FakeAsyncRedis()
+        client.store["cache:stats_overview:1"] = '{"total": 3}'
+        cs = _two_tier(client)
+        assert await cs.aget("cache:stats_overview:1") == {"total": 3}
+        assert await cs.aget("cache:stats_overview:1") == {"total": 3}
+        assert client.gets == 1
+
+        stats = cs._stats_from_info({}, 1)
+        assert (stats["l1"]["hits"], stats["l1"]["misses"]) == (1, 1)
+        assert (stats["l2"]["hits"], stats["l2"]["misses"]) == (1, 0)
+
+    async def test_l1_is_off_while_unsubscribed(self):
+        client = FakeAsyncRedis()
+        cs = _two_tier(client)
+        cs._subscribed = False
+        await cs.aset("cache:stats_overview:1", {"total": 3}, ttl=60)
+        await cs.aget("cache:stats_overview:1")
+        assert client.gets == 1
+        assert cs.local.get_stats()["entries"] == 0
+
+    async def test_prefix_l1_ttl_is_capped_by_the_redis_ttl(self):
+        cs = CacheService()
+        cs.register_prefix("analytics_overview", 120)
+        cs.register_prefix("reddit_post", 0)
+        assert cs._l1_ttl("cache:analytics_overview:x", ttl=60) == 60
+        assert cs._l1_ttl("cache:analytics_overview:x", ttl=600) == 120
+        assert cs._l1_ttl("cache:reddit_post:x", ttl=60) == 0
+        assert cs._l1_ttl("cache:stats_overview:x") == cache_mod.settings.CACHE_L1_TTL_SECONDS
+
+    async def test_delete_pattern_evicts_l1_and_notifies_other_workers(self):
+        client = FakeAsyncRedis()
+        cs = _two_tier(client)
+        await cs.aset("cache:reddit_posts:1", [1], ttl=60)
+        await cs.aset("cache:stats_overview:1", {"total": 3}, ttl=60)
+
+        assert await cs.adelete_pattern("cache:reddit_*") == 1
+        assert cs.local.get("cache:reddit_posts:1") is _MISSING
+        assert cs.local.get("cache:stats_overview:1") == {"total": 3}
+        channel, message = client.published[0]
+        assert channel == cache_mod.settings.CACHE_INVALIDATION_CHANNEL
+        assert message["pattern"] == "cache:reddit_*"
+
+    async def test_invalidations_from_other_workers_evict_l1(self):
+        cs = _two_tier(FakeAsyncRedis())
+        cs.local.set("cache:reddit_posts:1", [1], ttl=60)
+        cs.local.set("cache:stats_overview:1", [2], ttl=60)
+
+        cs._apply_invalidation(json.dumps({"pattern": "cache:reddit_*", "origin": "other-host:1"}))
+        assert cs.local.get("cache:reddit_posts:1") is _MISSING
+        assert cs.local.get("cache:stats_overview:1") == [2]
+
+    async def test_listener_applies_published_invalidations(self, monkeypatch):
+        monkeypatch.setattr(cache_mod.settings, "CACHE_L1_ENABLED", True)
+
+        queue = asyncio.Queue()
+
+        class FakePubSub:
+            async def subscribe(self, channel):
+                pass
+
+            async def get_message(self, ignore_subscribe_messages, timeout):
+                try:
+                    return await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    return None
+
+            async def aclose(self):
+                pass
+
+        client = FakeAsyncRedis()
+        client.pubsub = FakePubSub
+        cs = _with_async_client(CacheService(), client)
+        await cs.start_invalidation_listener()
+        await asyncio.sleep(0)
+        assert cs.l1_active
+
+        cs.local.set("cache:stats_overview:1", [1], ttl=60)
+        await queue.put({"type": "message", "data": json.dumps({"pattern": "cache:stats_*", "origin": "w2"})})
+        await asyncio.sleep(0.01)
+        assert cs.local.get("cache:stats_overview:1") is _MISSING
+
+        cs._async_client = None  # nothing to close
+        await cs.close()
+        assert not cs.l1_active
+
+
+class TestStampedeProtection:
+    @pytest.fixture
+    async def service(self, monkeypatch):
+        client = FakeAsyncRedis()
+        cs = _with_async_client(CacheService(), client)
+        monkeypatch.setattr(cache_mod, "cache_service", cs)
+        monkeypatch.setattr(cache_mod.settings, "CACHE_LOCK_POLL_SECONDS", 0.01)
+        return cs, client
+
+    def _endpoint(self, calls, delay=0.05, error=None):
+        @cached(prefix="analytics_overview", ttl=60)
+        async def endpoint(days: int = 30):
+            calls.append(days)
+            await asyncio.sleep(delay)
+            if error:
+                raise error
+            return {"days": days}
+        return endpoint
+
+    async def test_concurrent_misses_share_one_computation(self, service):
+        cs, client = service
+        calls = []
+        endpoint = self._endpoint(calls)
+
+        results = await asyncio.gather(*(endpoint(days=7) for _ in range(10)))
+        assert results == [{"days": 7}] * 10
+        assert calls == [7]
+        assert cs._flight_stats["coalesced"] == 9
+        # The recompute lock was released
+        assert not [key for key in client.store if key.startswith("lock:")]
+
+    async def test_cancelled_request_does_not_cancel_the_shared_computation(self, service):
+        calls = []
+        endpoint = self._endpoint(calls)
+
+        first = asyncio.create_task(endpoint(days=7))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(endpoint(days=7))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert await second == {"days": 7}
+        assert calls == [7]
+
+    async def test_errors_reach_every_waiter_and_are_not_cached(self, service):
+        calls = []
+        endpoint = self._endpoint(calls, error=RuntimeError("query failed"))
+
+        results = await asyncio.gather(*(endpoint(days=7) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert calls == [7]
+
+        with pytest.raises(RuntimeError):
+            await endpoint(days=7)
+        assert calls == [7, 7]
+
+    async def test_waits_for_the_worker_holding_the_lock(self, service):
+        cs, client = service
+        calls = []
+        endpoint = self._endpoint(calls)
+        key = cs._generate_cache_key("analytics_overview", days=7)
+        client.store[f"lock:{key}"] = "other-worker"
+
+        async def other_worker_finishes():
+            await asyncio.sleep(0.05)
+            client.store[key] = json.dumps({"days": 7, "from": "other worker"})
+
+        asyncio.create_task(other_worker_finishes())
+        assert await endpoint(days=7) == {"days": 7, "from": "other worker"}
+        assert calls == []
+        assert cs._flight_stats["lock_wait_hits"] == 1
+
+    async def test_computes_when_the_lock_holder_never_delivers(self, service, monkeypatch):
+        cs, client = service
+        monkeypatch.setattr(cache_mod.settings, "CACHE_LOCK_WAIT_SECONDS", 0.05)
+        calls = []
+        endpoint = self._endpoint(calls, delay=0)
+        key = cs._generate_cache_key("analytics_overview", days=7)
+        client.store[f"lock:{key}"] = "crashed-worker"
+
+        assert await endpoint(days=7) == {"days": 7}
+        assert calls == [7]
+        assert cs._flight_stats["lock_timeouts"] == 1
+        # Someone else's lock is left for its TTL to expire
+        assert client.store[f"lock:{key}"] == "crashed-worker"
+
+
+class TestStaleWhileRevalidate:
+    @pytest.fixture
+    async def service(self, monkeypatch):
+        client = FakeAsyncRedis()
+        cs = _with_async_client(CacheService(), client)
+        monkeypatch.setattr(cache_mod, "cache_service", cs)
+        return cs, client
+
+    def _endpoint(self, calls, delay=0.0):
+        @cached(prefix="analytics_overview", ttl=600, soft_ttl=60)
+        async def endpoint(days: int = 30):
+            calls.append(days)
+            await asyncio.sleep(delay)
+            return {"days": days, "run": len(calls)}
+        return endpoint
+
+    def _age(self, client, key, seconds):
+        entry = json.loads(client.store[key])
+        entry["__fresh_until__"] -= seconds
+        client.store[key] = json.dumps(entry)
+
+    async def test_stale_value_is_served_while_refreshing(self, service):
+        cs, client = service
+        calls = []
+        endpoint = self._endpoint(calls, delay=0.02)
+        key = cs._generate_cache_key("analytics_overview", days=7)
+
+        assert await endpoint(days=7) == {"days": 7, "run": 1}
+        assert await endpoint(days=7) == {"days": 7, "run": 1}
+        assert calls == [7]
+
+        self._age(client, key, 120)
+        results = await asyncio.gather(*(endpoint(days=7) for _ in range(5)))
+        assert results == [{"days": 7, "run": 1}] * 5
+        assert cs._flight_stats["stale_served"] == 5
+
+        await asyncio.sleep(0.05)
+        assert calls == [7, 7]
+        assert await endpoint(days=7) == {"days": 7, "run": 2}
+        assert not [k for k in client.store if k.startswith("lock:")]
+
+    async def test_refresh_is_skipped_while_another_worker_holds_the_lock(self, service):
+        cs, client = service
+        calls = []
+        endpoint = self._endpoint(calls)
+        key = cs._generate_cache_key("analytics_overview", days=7)
+        await endpoint(days=7)
+        self._age(client, key, 120)
+        client.store[f"lock:{key}"] = "other-worker"
+
+        assert await endpoint(days=7) == {"days": 7, "run": 1}
+        await asyncio.sleep(0.01)
+        assert calls == [7]
+
+    async def test_refresh_fills_defaults_and_uses_its_own_session(self, service, monkeypatch):
+        cs, client = service
+        sessions = []
+
+        class FakeSession:
+            closed = False
+
+            def close(self):
+                self.closed = True
+
+        def session_local():
+            sessions.append(FakeSession())
+            return sessions[-1]
+
+        monkeypatch.setattr("app.db.get_session_local", lambda: session_local)
+
+        @cached(prefix="stats_overview", ttl=600, soft_ttl=60)
+        async def endpoint(days: int = 30, db=None):
+            assert db is sessions[-1]
+            return {"days": days}
+
+        key = await endpoint.refresh()
+        assert key == cs._generate_cache_key("stats_overview", days=30)
+        assert json.loads(client.store[key])["value"] == {"days": 30}
+        assert len(sessions) == 1 and sessions[0].closed
+
+    async def test_refresh_pattern_recomputes_registered_keys_and_deletes_the_rest(self, service):
+        cs, client = service
+        calls = []
+        endpoint = self._endpoint(calls)
+        # FastAPI passes every query parameter, defaults included
+        await endpoint(days=30)
+        await endpoint(days=7)
+        hot = cs._generate_cache_key("analytics_overview", days=30)
+        cold = cs._generate_cache_key("analytics_overview", days=7)
+
+        async def failing():
+            raise RuntimeError("query failed")
+
+        cs.register_refresher("analytics_overview", endpoint.refresh)
+        cs.register_refresher("stats_overview", failing)
+
+        assert await cs.arefresh_pattern("cache:analytics_*") == {"refreshed": 1, "deleted": 1}
+        assert calls == [30, 7, 30]
+        assert json.loads(client.store[hot])["value"] == {"days": 30, "run": 3}
+        assert cold not in client.store
+        assert client.published[-1][1]["pattern"] == "cache:analytics_*"
+        # Refreshers of other prefixes don't run
+        assert cs._flight_stats["refresh_errors"] == 0
+
+    async def test_failed_refresh_falls_back_to_deleting(self, service):
+        cs, client = service
+        await self._endpoint([])(days=30)
+
+        async def failing():
+            raise RuntimeError("query failed")
+
+        cs.register_refresher("analytics_overview", failing)
+        assert await cs.arefresh_pattern("cache:analytics_*") == {"refreshed": 0, "deleted": 1}
+        assert cs._flight_stats["refresh_errors"] == 1
@@ -0,0 +1,120 @@
+"""
+Tests for duplicate article compaction (`app/services/dedupe_service.py`).
+
+Rows are stored with the old per-process ``hash(url)`` style IDs, then merged
+and re-keyed against the in-memory test database.
+"""
+from datetime import datetime
+
+from app.models.article import Article
+from app.models.entity import Entity
+from app.models.keyword import Keyword
+from app.services.dedupe_service import compact_duplicate_articles
+from app.services.news_service import news_article_id
+
+
+def _article(db, external_id, url, title="Story", source_type="news"):
+    article = Article(
+        external_id=external_id,
+        source_type=source_type,
+        source_name="BBC News",
+        title=title,
+        url=url,
+        published_at=datetime(2024, 1, 1),
+    )
+    db.add(article)
+    db.flush()
+    return article
+
+
+def _entity(db, article, text):
+    db.add(Entity(article_id=article.id, entity_text=text, entity_type="ORG"))
+
+
+def _keyword(db, article, word):
+    db.add(Keyword(article_id=article.id, keyword=word, score=0.5))
+
+
+class TestCompactDuplicateArticles:
+    def test_merges_duplicates_into_the_oldest_row(self, test_db):
+        url = "https://news.example.com/story"
+        first = _article(test_db, "111", url)
+        second = _article(test_db, "222", url + "?utm_source=feed")
+        third = _article(test_db, "333", "http://www.news.example.com/story/")
+        _keyword(test_db, first, "hasbro")
+        _entity(test_db, second, "Hasbro")
+        _entity(test_db, third, "Mattel")
+        _keyword(test_db, third, "toys")
+        test_db.commit()
+
+        result = compact_duplicate_articles(test_db, batch_size=1)
+
+        assert result["groups_merged"] == 1
+        assert result["rows_removed"] == 2
+        assert result["entities_moved"] == 1
+        assert result["keywords_moved"] == 0
+        test_db.expire_all()
+        [survivor] = test_db.query(Article).all()
+        assert survivor.id == first.id
+        assert survivor.external_id == news_article_id(url, "Story", "BBC News")
+        # The survivor keeps its keywords and adopts the first duplicate's entities
+        assert [e.entity_text for e in test_db.query(Entity).all()] == ["Hasbro"]
+        assert [k.keyword for k in test_db.query(Keyword).all()] == ["hasbro"]
+
+    def test_rekeys_unique_rows_and_ignores_other_sources(self, test_db):
+        news = _article(test_db, "-42", "https://news.example.com/a")
+        reddit = _article(test_db, "abc", "https://reddit.com/r/x", source_type="reddit")
+        test_db.commit()
+
+        result = compact_duplicate_articles(test_db)
+
+        assert result["rekeyed"] == 1
+        assert result["rows_removed"] == 0
+        test_db.expire_all()
+        assert test_db.get(Article, news.id).external_id == news_article_id(news.url, None, None)
+        assert test_db.get(Article, reddit.id).external_id == "abc"
+        # A second pass has nothing left to do
+        assert compact_duplicate_articles(test_db)["rekeyed"] == 0
+
+    def test_dry_run_changes_nothing(self, test_db):
+        _article(test_db, "1", "https://news.example.com/a")
+        _article(test_db, "2", "https://news.example.com/a#top")
+        test_db.commit()
+
+        result = compact_duplicate_articles(test_db, dry_run=True)
+
+        assert result["rows_removed"] == 1
+        assert test_db.query(Article).count() == 2
+
+    def test_near_duplicates_are_repointed_to_the_stable_id(self, test_db):
+        url = "https://news.example.com/story"
+        survivor = _article(test_db, "111", url)
+        merged = _article(test_db, "222", url + "#top")
+        follower = _article(test_db, "333", "https://other.example.com/copy", title="Copy")
+        follower.duplicate_of = "222"
+        survivor.duplicate_of = "222"
+        test_db.commit()
+        merged_id = merged.id
+
+        assert compact_duplicate_articles(test_db, dry_run=True)["repointed"] == 2
+        result = compact_duplicate_articles(test_db)
+
+        assert result["repointed"] == 2
+        test_db.expire_all()
+        stable = news_article_id(url, None, None)
+        assert test_db.get(Article, merged_id) is None
+        assert test_db.get(Article, follower.id).duplicate_of == stable
+        # A survivor never ends up as a duplicate of itself
+        assert test_db.get(Article, survivor.id).duplicate_of is None
+
+    def test_large_tables_are_grouped_in_partitions(self, test_db):
+        for i in range(6):
+            _article(test_db, f"{i}a", f"https://news.example.com/{i}")
+            _article(test_db, f"{i}b", f"https://news.example.com/{i}?utm_source=feed")
+        test_db.commit()
+
+        result = compact_duplicate_articles(test_db, partition_rows=4)
+
+        assert result["scanned"] == 12
+        assert result["groups_merged"] == 6
+        assert test_db.query(Article).count() == 6
@@ -72,6 +72,17 @@ class TestCacheCheck:
         assert data["total_keys"] == 5
 
 
+class TestHTTPPoolCheck:
+    def test_idle_before_any_source_request(self, monkeypatch):
+        from app.core.http import HTTPSessionManager
+
+        monkeypatch.setattr(hc, "http_session_manager", HTTPSessionManager())
+        data = hc.check_http_pool()
+        assert data["status"] == "idle"
+        assert data["requests"] == 0
+        assert data["reuse_ratio"] == 0.0
+
+
 class TestComprehensiveHealth:
     def test_healthy_when_all_components_healthy(self, monkeypatch):
         monkeypatch.setattr(hc, "check_database", lambda: {"status": "healthy"})
@@ -80,6 +91,8 @@ class TestComprehensiveHealth:
         assert data["status"] == "healthy"
         assert "database" in data["components"]
         assert "cache" in data["components"]
+        assert "connections_reused" in data["components"]["http"]
+        assert "rate_limits" in data["components"]
 
     def test_degraded_when_one_component_unhealthy(self, monkeypatch):
         monkeypatch.setattr(hc, "check_database", lambda: {"status": "unhealthy"})
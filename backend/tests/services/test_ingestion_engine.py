@@ -0,0 +1,189 @@
+"""
+Tests for the staged ingestion engine (`app/services/ingestion_engine.py`).
+
+A stub data source stands in for NewsAPI, sentiment is deterministic, and the
+NER/keyword services are faked, so the queueing, backpressure and metrics logic
+runs against the in-memory test database with no network or NLP models.
+"""
+import asyncio
+import json
+import time
+from datetime import datetime
+
+import pytest
+
+import app.services.ingestion_service as ingestion_mod
+from app.services.base_source import BaseDataSource, DataSourceConfig, SourceType
+from app.services.ingestion_engine import IngestionEngine, STAGES
+from app.models.article import Article
+from app.models.pipeline_run import PipelineRun
+
+
+class _StubSource(BaseDataSource):
+    """Returns ``count`` raw articles per request, tagged with the request's query."""
+
+    def __init__(self, count=5, fail_queries=()):
+        # Unlimited: the stub has no quota to pace
+        super().__init__(DataSourceConfig(source_type=SourceType.NEWS, rate_limit=0))
+        self.count = count
+        self.fail_queries = set(fail_queries)
+
+    async def fetch(self, query="q", **kwargs):
+        if query in self.fail_queries:
+            raise RuntimeError(f"fetch failed for {query}")
+        await asyncio.sleep(0)
+        return [{"id": f"{query}-{i}", "title": f"{query} story {i}"} for i in range(self.count)]
+
+    def transform(self, raw_data):
+        return [
+            {
+                "id": item["id"],
+                "title": item["title"],
+                "content": "body",
+                "published_at": datetime.utcnow(),
+                "source_type": "news",
+                "source_name": "Stub",
+            }
+            for item in raw_data
+        ]
+
+
+@pytest.fixture
+def offline(executor_sessions, monkeypatch):
+    monkeypatch.setattr(ingestion_mod.SentimentService, "analyze_text", lambda text: (0.2, "positive"))
+
+    enriched = []
+
+    class FakeNER:
+        def extract_and_save_entities_batch(self, texts_by_article, db):
+            time.sleep(0.01)  # NER is the slow stage
+            enriched.extend(texts_by_article)
+            return len(texts_by_article)
+
+    class FakeKeywords:
+        def extract_and_save_keywords_batch(self, texts_by_article, db):
+            return 2 * len(texts_by_article)
+
+    monkeypatch.setattr("app.services.ner_service.get_ner_service", lambda: FakeNER())
+    monkeypatch.setattr("app.services.keyword_service.get_keyword_service", lambda: FakeKeywords())
+    return enriched
+
+
+class TestIngestionEngine:
+    async def test_ingests_all_requests_through_every_stage(self, offline, test_db):
+        engine = IngestionEngine(_StubSource(count=7), batch_size=3, queue_size=1)
+        result = await engine.run([{"query": "a"}, {"query": "b"}])
+
+        assert result["stored"] == 14
+        assert result["updated"] == 0
+        assert result["failed"] == 0
+        assert result["entities"] == 14
+        assert result["keywords"] == 28
+        assert test_db.query(Article).count() == 14
+        assert len(offline) == 14
+
+        stages = result["stages"]
+        assert set(stages) == set(STAGES)
+        assert stages["fetch"]["items_in"] == 2
+        assert stages["transform"]["items_out"] == 14
+        assert stages["enrich"]["items_out"] == 14
+        for name in STAGES[1:]:
+            # Every queue after the request queue is bounded by queue_size
+            assert stages[name]["max_queue_depth"] <= 1
+            assert "throughput_per_second" in stages[name]
+        # JSON-serializable for PipelineRun.stage_metrics
+        json.dumps(stages)
+
+    async def test_only_new_articles_are_enriched(self, offline, test_db):
+        await IngestionEngine(_StubSource(count=3)).run([{"query": "a"}])
+        offline.clear()
+
+        result = await IngestionEngine(_StubSource(count=4)).run([{"query": "a"}])
+        assert result["updated"] == 3
+        assert result["stored"] == 1
+        assert result["skipped_enrichment"] == 3
+        assert len(offline) == 1
+
+    async def test_changed_articles_are_re_enriched(self, offline, test_db, monkeypatch):
+        await IngestionEngine(_StubSource(count=2)).run([{"query": "a"}])
+        offline.clear()
+
+        class EditedSource(_StubSource):
+            async def fetch(self, query="q", **kwargs):
+                items = await super().fetch(query, **kwargs)
+                items[0]["title"] = "A correction to story 0"
+                return items
+
+        result = await IngestionEngine(EditedSource(count=2)).run([{"query": "a"}])
+        assert result["updated"] == 2
+        assert result["skipped_enrichment"] == 1
+        assert offline == [test_db.query(Article).filter_by(external_id="a-0").one().id]
+
+    async def test_fetching_finishes_before_slow_enrichment(self, offline):
+        # The queues between stages can hold every batch, so fetching never waits on NER
+        engine = IngestionEngine(_StubSource(count=4), batch_size=1, queue_size=12)
+        result = await engine.run([{"query": q} for q in "abc"])
+
+        # Fetch isn't held up for the whole run by the slow NER stage
+        assert engine.metrics["fetch"].finished_at < engine.metrics["enrich"].finished_at
+        assert result["stored"] == 12
+
+    async def test_partial_fetch_failures_are_tolerated(self, offline):
+        result = await IngestionEngine(_StubSource(count=2, fail_queries={"bad"})).run(
+            [{"query": "good"}, {"query": "bad"}]
+        )
+        assert result["stored"] == 2
+        assert result["stages"]["fetch"]["failed"] == 1
+
+    async def test_raises_when_every_fetch_fails(self, offline):
+        with pytest.raises(RuntimeError, match="fetch failed"):
+            await IngestionEngine(_StubSource(fail_queries={"bad"})).run([{"query": "bad"}])
+
+
+    async def test_a_failing_stage_cancels_the_others(self, offline, monkeypatch):
+        import app.services.ingestion_engine as engine_mod
+
+        real_batch_size = engine_mod._batch_size
+
+        def broken_size(batch):
+            # Fails in the sentiment stage's own bookkeeping, outside its handler
+            if isinstance(batch, dict) and "rows" in batch:
+                raise RuntimeError("sentiment worker crashed")
+            return real_batch_size(batch)
+
+        monkeypatch.setattr(engine_mod, "_batch_size", broken_size)
+        engine = IngestionEngine(_StubSource(count=9), batch_size=1, queue_size=1)
+
+        with pytest.raises(RuntimeError, match="sentiment worker crashed"):
+            await asyncio.wait_for(engine.run([{"query": "a"}, {"query": "b"}]), timeout=5)
+        # No stage is left running or blocked on its queue
+        assert [t for t in asyncio.all_tasks() if t is not asyncio.current_task()] == []
+
+
+class TestNewsSync:
+    async def test_records_pipeline_run_with_stage_metrics(self, offline, test_db, monkeypatch):
+        import app.api.articles as articles_mod
+
+        monkeypatch.setattr(articles_mod, "NewsAPIService", lambda api_key: _StubSource(count=3))
+        await articles_mod._sync_news_articles(query="hasbro", trigger_type="manual")
+
+        run = test_db.query(PipelineRun).filter_by(pipeline_name="news_pipeline").one()
+        assert run.status == "success"
+        assert run.records_stored == 3
+        stage_metrics = json.loads(run.stage_metrics)
+        assert set(stage_metrics) == {"ingest", "ner", "keywords", "watermarks", "cache_refresh"}
+        assert all(m["status"] == "success" for m in stage_metrics.values())
+        assert set(stage_metrics["ingest"]["details"]) == set(STAGES)
+
+    async def test_failed_sync_marks_run_failed(self, offline, test_db, monkeypatch):
+        import app.api.articles as articles_mod
+
+        monkeypatch.setattr(
+            articles_mod, "NewsAPIService", lambda api_key: _StubSource(fail_queries={"hasbro"})
+        )
+        with pytest.raises(RuntimeError):
+            await articles_mod._sync_news_articles(query="hasbro")
+
+        run = test_db.query(PipelineRun).filter_by(pipeline_name="news_pipeline").one()
+        assert run.status == "failed"
+        assert "fetch failed" in run.stack_trace
@@ -0,0 +1,173 @@
+"""Tests for the bulk ingestion helpers (`app/services/ingestion_service.py`)."""
+from datetime import datetime
+
+import pytest
+
+import app.services.ingestion_service as ingestion_mod
+from app.services.ingestion_service import (
+    build_reddit_post_rows,
+    bulk_upsert_reddit_posts,
+    ingest_reddit_posts,
+    ingest_articles,
+    enrich_articles,
+)
+from app.models.reddit_post import RedditPost
+from app.models.article import Article
+from app.schemas.reddit import RedditPostCreate
+
+
+def _post(pid: str, score: int = 10, title: str = None) -> RedditPostCreate:
+    return RedditPostCreate(
+        id=pid,
+        subreddit="python",
+        title=title or f"title-{pid}",
+        author="author",
+        content="body",
+        url=f"https://reddit.com/{pid}",
+        score=score,
+        num_comments=2,
+        upvote_ratio=0.9,
+        created_utc=datetime.utcnow(),
+    )
+
+
+@pytest.fixture(autouse=True)
+def offline_sentiment(monkeypatch):
+    monkeypatch.setattr(
+        ingestion_mod.SentimentService,
+        "analyze_reddit_post",
+        lambda title, content: (0.5, "positive"),
+    )
+    monkeypatch.setattr(
+        ingestion_mod.SentimentService,
+        "analyze_text",
+        lambda text: (0.5, "positive"),
+    )
+
+
+class TestBuildRows:
+    def test_deduplicates_on_id_keeping_latest(self):
+        rows, failed = build_reddit_post_rows([_post("a", score=1), _post("a", score=7)])
+        assert failed == 0
+        assert len(rows) == 1
+        assert rows[0]["score"] == 7
+        assert rows[0]["sentiment_label"] == "positive"
+
+    def test_counts_posts_that_fail_preparation(self):
+        class Broken:
+            id = "x"
+            title = "t"
+            content = None
+
+            def model_dump(self):
+                raise ValueError("bad post")
+
+        rows, failed = build_reddit_post_rows([_post("a"), Broken()])
+        assert len(rows) == 1
+        assert failed == 1
+
+
+class TestBulkUpsert:
+    def test_inserts_then_updates_in_chunks(self, test_db):
+        rows, _ = build_reddit_post_rows([_post(f"p{i}") for i in range(5)])
+        counts = bulk_upsert_reddit_posts(test_db, rows, chunk_size=2)
+        assert counts == {"stored": 5, "updated": 0, "failed": 0}
+
+        rows, _ = build_reddit_post_rows([_post("p0", score=99), _post("p9")])
+        counts = bulk_upsert_reddit_posts(test_db, rows, chunk_size=2)
+        assert counts == {"stored": 1, "updated": 1, "failed": 0}
+
+        test_db.expire_all()
+        assert test_db.query(RedditPost).count() == 6
+        assert test_db.get(RedditPost, "p0").score == 99
+
+    def test_missing_sentiment_keeps_previous_value(self, test_db, monkeypatch):
+        ingest_reddit_posts(test_db, [_post("a")])
+
+        monkeypatch.setattr(
+            ingestion_mod.SentimentService,
+            "analyze_reddit_post",
+            lambda title, content: (None, None),
+        )
+        counts = ingest_reddit_posts(test_db, [_post("a", score=50)])
+        assert counts["updated"] == 1
+        assert counts["sentiment_analyzed"] == 0
+
+        test_db.expire_all()
+        post = test_db.get(RedditPost, "a")
+        assert post.score == 50
+        assert post.sentiment_label == "positive"
+
+    def test_empty_batch_is_a_no_op(self, test_db):
+        assert bulk_upsert_reddit_posts(test_db, []) == {"stored": 0, "updated": 0, "failed": 0}
+
+
+def _article(external_id: str, title: str = None) -> dict:
+    return {
+        "id": external_id,
+        "title": title or f"headline-{external_id}",
+        "content": "Hasbro announced new board games.",
+        "summary": "summary",
+        "url": f"https://news.example.com/{external_id}",
+        "image_url": None,
+        "author": "reporter",
+        "published_at": datetime.utcnow(),
+        "source_type": "news",
+        "source_name": "Example News",
+        "source_metadata": {"source_id": "example"},
+    }
+
+
+class TestArticleUpsert:
+    def test_returns_id_map_and_ids_to_enrich(self, test_db):
+        counts, id_map, new_ids = ingest_articles(test_db, [_article("a"), _article("b")])
+        assert counts == {"stored": 2, "updated": 0, "failed": 0, "skipped_enrichment": 0, "near_duplicates": 0}
+        assert new_ids == {"a", "b"}
+        assert id_map == {
+            a.external_id: a.id for a in test_db.query(Article).all()
+        }
+
+        counts, id_map2, new_ids = ingest_articles(
+            test_db, [_article("a", title="updated"), _article("b"), _article("c")]
+        )
+        assert counts == {"stored": 1, "updated": 2, "failed": 0, "skipped_enrichment": 1, "near_duplicates": 0}
+        # "a" changed and "c" is new; unchanged "b" is not enriched again
+        assert new_ids == {"a", "c"}
+        assert id_map2["a"] == id_map["a"]
+
+        test_db.expire_all()
+        assert test_db.query(Article).count() == 3
+        assert test_db.get(Article, id_map["a"]).title == "updated"
+
+    def test_near_duplicates_are_stored_but_not_enriched(self, test_db):
+        syndicated = {**_article("copy"), "title": "headline-a"}
+        counts, id_map, new_ids = ingest_articles(test_db, [_article("a"), syndicated, _article("b", title="other")])
+
+        assert counts["stored"] == 3
+        assert counts["near_duplicates"] == 1
+        assert new_ids == {"a", "b"}
+        copy = test_db.get(Article, id_map["copy"])
+        assert copy.duplicate_of == "a"
+        assert copy.minhash is not None
+        assert test_db.get(Article, id_map["a"]).duplicate_of is None
+
+    def test_enrich_uses_id_map_without_reselecting(self, test_db, monkeypatch):
+        calls = []
+
+        class FakeNER:
+            def extract_and_save_entities_batch(self, texts_by_article, db):
+                calls.extend(("ner", article_id) for article_id in texts_by_article)
+                return len(texts_by_article)
+
+        class FakeKeywords:
+            def extract_and_save_keywords_batch(self, texts_by_article, db):
+                calls.extend(("kw", article_id) for article_id in texts_by_article)
+                return 2 * len(texts_by_article)
+
+        monkeypatch.setattr("app.services.ner_service.get_ner_service", lambda: FakeNER())
+        monkeypatch.setattr("app.services.keyword_service.get_keyword_service", lambda: FakeKeywords())
+
+        articles = [_article("a"), _article("b")]
+        counts = enrich_articles(test_db, articles, {"b": 42})
+        assert counts == {"entities": 1, "keywords": 2}
+        assert calls == [("ner", 42), ("kw", 42)]
@@ -1,6 +1,12 @@
 """Tests for the keyword extraction service (`app/services/keyword_service.py`)."""
-from app.services.keyword_service import KeywordService
+from datetime import datetime
+
+import numpy as np
+from scipy import sparse
+
+from app.services.keyword_service import KeywordService, top_k_terms
 from app.models.keyword import Keyword
+from app.models.article import Article
 
 
 class TestPreprocess:
@@ -54,3 +60,158 @@ class TestStats:
 
     def test_trending_empty_database(self, test_db):
         assert KeywordService().get_trending_keywords(test_db, time_window="7d") == []
+
+    def test_trending_counts_each_story_once(self, test_db):
+        for external_id, duplicate_of in (("story", None), ("copy", "story")):
+            article = Article(
+                external_id=external_id, source_type="news", source_name="Wire", title="Hasbro",
+                published_at=datetime.utcnow(), duplicate_of=duplicate_of
+            )
+            test_db.add(article)
+            test_db.flush()
+            test_db.add(Keyword(article_id=article.id, keyword="hasbro", score=0.5))
+        test_db.commit()
+
+        [unique] = KeywordService().get_trending_keywords(test_db)
+        [raw] = KeywordService().get_trending_keywords(test_db, unique_stories=False)
+        assert unique["article_count"] == 1
+        assert raw["article_count"] == 2
+
+
+def _corpus_articles(db, count=30):
+    topics = ["kubernetes containers", "machine learning models", "football season", "stock market"]
+    for i in range(count):
+        topic = topics[i % len(topics)]
+        db.add(Article(
+            external_id=f"doc-{i}", source_type="news", source_name="Wire",
+            title=f"Report {i} on {topic}", content=f"Analysts discuss {topic} and pipelines.",
+            url=f"https://e.com/{i}", published_at=datetime(2024, 1, 1 + i % 28)
+        ))
+    db.commit()
+
+
+class TestCorpusModel:
+    def test_top_k_terms_ranks_each_row(self):
+        matrix = sparse.csr_matrix(np.array([[0.1, 0.5, 0.0, 0.3], [0.0, 0.0, 0.0, 0.0], [0.9, 0.2, 0.4, 0.0]]))
+        names = np.array(["a", "b", "c", "d"])
+        result = top_k_terms(matrix, names, 2)
+        assert [[kw["keyword"] for kw in row] for row in result] == [["b", "d"], [], ["a", "c"]]
+
+    def test_small_corpus_keeps_per_document_fallback(self, test_db):
+        svc = KeywordService()
+        svc.update_document_frequencies(["kubernetes containers", "stock market"], test_db)
+        test_db.commit()
+
+        [keywords] = svc.extract_keywords_batch(["Kubernetes orchestrates containers"], test_db)
+        assert keywords != []
+        assert all("idf" not in kw for kw in keywords)
+
+    def test_document_frequencies_accumulate_per_batch(self, test_db):
+        svc = KeywordService()
+        svc.update_document_frequencies(["kubernetes containers", "kubernetes kubernetes clusters"], test_db)
+        svc.update_document_frequencies(["stock market", ""], test_db)
+        test_db.commit()
+
+        assert svc.corpus_size(test_db) == 3
+        [bucket] = svc._term_buckets(["kubernetes"])
+        assert svc._document_frequencies([bucket], test_db)[int(bucket)] == 2
+
+    def test_rebuild_matches_incremental_counts(self, test_db):
+        _corpus_articles(test_db)
+        svc = KeywordService()
+        assert svc.rebuild_document_frequencies(test_db) == 30
+
+        [bucket] = svc._term_buckets(["kubernetes"])
+        assert svc.corpus_size(test_db) == 30
+        assert svc._document_frequencies([bucket], test_db)[int(bucket)] == 8
+
+    def test_corpus_idf_downweights_common_terms(self, test_db):
+        _corpus_articles(test_db)
+        svc = KeywordService(max_keywords=3)
+        svc.rebuild_document_frequencies(test_db)
+
+        [keywords] = svc.extract_keywords_batch(["Analysts discuss kubernetes containers and pipelines"], test_db)
+        top = [kw["keyword"] for kw in keywords]
+        assert "kubernetes" in " ".join(top)
+        assert "analysts" not in top
+        assert all(kw["idf"] > 1.0 for kw in keywords)
+
+    def test_batch_save_counts_new_articles_once(self, test_db):
+        _corpus_articles(test_db)
+        svc = KeywordService()
+        svc.rebuild_document_frequencies(test_db)
+
+        texts = {1: "stock market rally", 2: "machine learning models", 3: ""}
+        saved = svc.extract_and_save_keywords_batch(texts, test_db)
+        assert saved == test_db.query(Keyword).count()
+        assert test_db.query(Keyword).filter(Keyword.idf.is_(None)).count() == 0
+        assert svc.corpus_size(test_db) == 32
+
+        # Re-processing replaces keywords without counting the articles again
+        svc.extract_and_save_keywords_batch(texts, test_db)
+        assert svc.corpus_size(test_db) == 32
+
+    def test_batch_save_clears_articles_that_no_longer_have_keywords(self, test_db):
+        svc = KeywordService()
+        svc.extract_and_save_keywords_batch({1: "stock market rally", 2: "machine learning models"}, test_db)
+        assert test_db.query(Keyword).filter_by(article_id=2).count() > 0
+
+        assert svc.extract_and_save_keywords_batch({2: ""}, test_db) == 0
+        assert test_db.query(Keyword).filter_by(article_id=2).count() == 0
+        assert test_db.query(Keyword).filter_by(article_id=1).count() > 0
+
+    def test_rescore_refreshes_drifted_articles(self, test_db):
+        _corpus_articles(test_db)
+        svc = KeywordService()
+        svc.rebuild_document_frequencies(test_db)
+        article = test_db.query(Article).filter(Article.title.like("%stock market%")).first()
+        svc.extract_and_save_keywords_batch({article.id: f"{article.title} {article.content}"}, test_db)
+
+        # Nothing has changed since scoring
+        assert svc.rescore_keywords(test_db, threshold=0.1)["drifted"] == 0
+
+        # Many new stock market stories make those terms far less distinctive
+        svc.update_document_frequencies(["stock market rally"] * 40, test_db)
+        test_db.commit()
+        old_idf = dict(test_db.query(Keyword.keyword, Keyword.idf).all())
+
+        result = svc.rescore_keywords(test_db, threshold=0.1)
+        assert result["drifted"] > 0
+        assert result["articles"] == 1
+        new_idf = dict(test_db.query(Keyword.keyword, Keyword.idf).all())
+        assert new_idf["stock"] < old_idf["stock"]
+
+    def test_legacy_keywords_are_rescored(self, test_db):
+        _corpus_articles(test_db, count=21)
+        svc = KeywordService()
+        article = test_db.query(Article).first()
+        svc.extract_and_save_keywords_batch({article.id: article.title}, test_db)
+        assert test_db.query(Keyword).filter(Keyword.idf.is_(None)).count() > 0
+
+        svc.rebuild_document_frequencies(test_db)
+        assert svc.rescore_keywords(test_db)["articles"] == 1
+        assert test_db.query(Keyword).filter(Keyword.idf.is_(None)).count() == 0
+
+    def test_first_rescore_bootstraps_after_an_earlier_ingest(self, test_db, executor_sessions, monkeypatch):
+        from app.services import keyword_service as keyword_mod
+
+        _corpus_articles(test_db)
+        svc = KeywordService()
+        monkeypatch.setattr(keyword_mod, "_keyword_service", svc)
+        # An ingest before the first rescore counts only its own documents
+        svc.update_document_frequencies(["stock market rally", "kubernetes release"], test_db)
+        test_db.commit()
+        assert svc.corpus_size(test_db) == 2
+        assert not svc.is_bootstrapped(test_db)
+
+        keyword_mod._rescore_keyword_scores()
+        test_db.expire_all()
+        assert svc.is_bootstrapped(test_db)
+        assert svc.corpus_size(test_db) == 30
+
+        # Later rescores keep the incremental counts
+        svc.update_document_frequencies(["stock market rally"], test_db)
+        test_db.commit()
+        keyword_mod._rescore_keyword_scores()
+        test_db.expire_all()
+        assert svc.corpus_size(test_db) == 31
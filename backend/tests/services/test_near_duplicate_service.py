@@ -0,0 +1,106 @@
+"""
+Tests for near-duplicate detection (`app/services/near_duplicate_service.py`).
+
+MinHash/LSH runs for real on small texts; the index is warmed from the
+in-memory test database.
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app.models.article import Article
+from app.services.near_duplicate_service import MinHasher, NearDuplicateService, shingles, similarity
+
+STORY = (
+    "Hasbro reported quarterly revenue above expectations on Tuesday as demand "
+    "for board games and trading cards lifted sales across every region"
+)
+SYNDICATED = STORY + " (Reuters)"
+UNRELATED = (
+    "The city council approved a new budget for road repairs after a long "
+    "debate about parking fees and bus lanes in the downtown district"
+)
+
+
+class TestMinHash:
+    def test_signatures_are_stable_across_instances(self):
+        tokens = shingles(STORY, 3)
+        first = MinHasher(64).signature(tokens)
+        assert np.array_equal(first, MinHasher(64).signature(tokens))
+        assert first.dtype == np.dtype("<u4") and first.size == 64
+
+    def test_similarity_tracks_overlap(self):
+        hasher = MinHasher(128)
+        story = hasher.signature(shingles(STORY, 3))
+        assert similarity(story, hasher.signature(shingles(SYNDICATED, 3))) > 0.8
+        assert similarity(story, hasher.signature(shingles(UNRELATED, 3))) < 0.2
+
+    def test_empty_text_has_no_signature(self):
+        assert MinHasher(16).signature(shingles("  ", 3)) is None
+
+
+def _persist(db, service, key, text, published_at=None, duplicate_of=None):
+    """Store an article with its signature, as the ingest path does after ``assign``"""
+    db.add(Article(
+        external_id=key, source_type="news", source_name="Wire", title="Hasbro",
+        published_at=published_at or datetime.utcnow(), minhash=service.signature(text).tobytes(),
+        duplicate_of=duplicate_of
+    ))
+    db.commit()
+
+
+class TestAssign:
+    def test_clusters_within_a_batch(self, test_db):
+        service = NearDuplicateService()
+        result = service.assign("article", [("a", STORY, None), ("b", SYNDICATED, None), ("c", UNRELATED, None)], test_db)
+
+        assert result["a"][1] is None
+        assert result["b"][1] == "a"
+        assert result["c"][1] is None
+        assert isinstance(result["b"][0], bytes)
+
+    def test_refetched_story_does_not_match_itself(self, test_db):
+        service = NearDuplicateService()
+        _persist(test_db, service, "a", STORY)
+        assert service.assign("article", [("a", SYNDICATED, None)], test_db)["a"][1] is None
+
+    def test_stories_outside_the_window_are_evicted(self, test_db):
+        service = NearDuplicateService(window_hours=24)
+        _persist(test_db, service, "old", STORY, published_at=datetime.utcnow() - timedelta(days=3))
+        assert service.assign("article", [("new", SYNDICATED, None)], test_db)["new"][1] is None
+
+    def test_index_is_warmed_from_persisted_signatures(self, test_db):
+        signature, _ = NearDuplicateService().assign("article", [("stored", STORY, None)], test_db)["stored"]
+        test_db.add(Article(
+            external_id="stored", source_type="news", source_name="Wire", title="Hasbro",
+            published_at=datetime.utcnow(), minhash=signature
+        ))
+        test_db.commit()
+
+        # A fresh process has only the database to go on
+        result = NearDuplicateService().assign("article", [("copy", SYNDICATED, None)], test_db)
+        assert result["copy"][1] == "stored"
+
+    def test_unpersisted_canonicals_are_not_indexed(self, test_db):
+        service = NearDuplicateService()
+        service.assign("article", [("lost", STORY, None)], test_db)
+        # The batch holding "lost" failed to persist
+        assert service.assign("article", [("copy", SYNDICATED, None)], test_db)["copy"][1] is None
+
+    def test_rows_written_by_other_processes_after_warm_up_are_seen(self, test_db):
+        service = NearDuplicateService()
+        service.assign("article", [("unrelated", UNRELATED, None)], test_db)
+
+        # Another worker stores a story this process has never seen
+        _persist(test_db, NearDuplicateService(), "elsewhere", STORY)
+        assert service.assign("article", [("copy", SYNDICATED, None)], test_db)["copy"][1] == "elsewhere"
+
+    def test_rows_reflagged_as_duplicates_leave_the_index(self, test_db):
+        service = NearDuplicateService()
+        _persist(test_db, service, "a", STORY)
+        service.assign("article", [("unrelated", UNRELATED, None)], test_db)
+
+        article = test_db.query(Article).filter_by(external_id="a").one()
+        article.duplicate_of = "z"
+        test_db.commit()
+        assert service.assign("article", [("copy", SYNDICATED, None)], test_db)["copy"][1] is None
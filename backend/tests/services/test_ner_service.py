@@ -6,10 +6,12 @@ is patched with a fake pipeline. This keeps the extraction + persistence logic
 under test without a multi-hundred-MB model download.
 """
 import pytest
+from datetime import datetime
 
 import app.services.ner_service as ner_module
 from app.services.ner_service import NERService
 from app.models.entity import Entity
+from app.models.article import Article
 
 
 class _FakeEnt:
@@ -28,10 +30,21 @@ class _FakeDoc:
 class _FakeNLP:
     def __init__(self, ents):
         self._ents = ents
+        self.pipe_names = ["tok2vec", "tagger", "parser", "ner"]
+        self.disabled = []
+        self.pipe_calls = []
 
     def __call__(self, text):
         return _FakeDoc(self._ents)
 
+    def select_pipes(self, disable):
+        self.disabled = list(disable)
+
+    def pipe(self, texts, batch_size, n_process):
+        texts = list(texts)
+        self.pipe_calls.append((texts, batch_size, n_process))
+        return (_FakeDoc(self._ents) for _ in texts)
+
 
 @pytest.fixture
 def ner(monkeypatch):
@@ -60,6 +73,53 @@ class TestPersistence:
         assert ner.process_article(article_id=99999, db=test_db) == []
 
 
+class TestBatch:
+    def test_unused_pipes_are_disabled(self, ner):
+        assert ner.nlp.disabled == ["tagger", "parser"]
+
+    def test_batch_streams_texts_through_pipe(self, ner):
+        results = ner.extract_entities_batch(["OpenAI", "  ", "SF"], batch_size=8, n_process=2)
+        assert [len(r) for r in results] == [2, 0, 2]
+        assert ner.nlp.pipe_calls == [(["OpenAI", "SF"], 8, 2)]
+
+    def test_batch_save_replaces_entities_in_one_pass(self, ner, test_db):
+        test_db.add(Entity(article_id=1, entity_text="Old", entity_type="ORG"))
+        test_db.commit()
+
+        saved = ner.extract_and_save_entities_batch({1: "OpenAI", 2: "SF", 3: ""}, test_db)
+        assert saved == 4
+        assert len(ner.nlp.pipe_calls) == 1
+        assert test_db.query(Entity).filter_by(article_id=1).count() == 2
+        assert test_db.query(Entity).filter_by(entity_text="Old").count() == 0
+        assert test_db.query(Entity).filter_by(article_id=3).count() == 0
+
+    def test_batch_save_clears_articles_that_no_longer_have_entities(self, ner, test_db):
+        test_db.add(Entity(article_id=1, entity_text="Old", entity_type="ORG"))
+        test_db.add(Entity(article_id=2, entity_text="Stale", entity_type="GPE"))
+        test_db.commit()
+
+        assert ner.extract_and_save_entities_batch({1: "OpenAI", 2: ""}, test_db) == 2
+        assert test_db.query(Entity).filter_by(article_id=2).count() == 0
+
+        # No new entities at all still clears the old ones
+        assert ner.extract_and_save_entities_batch({1: "  "}, test_db) == 0
+        assert test_db.query(Entity).count() == 0
+
+    def test_process_articles_reads_articles_once(self, ner, test_db):
+        for external_id in ("x", "y"):
+            test_db.add(Article(
+                external_id=external_id, source_type="news", source_name="Wire",
+                title=f"Title {external_id}", url=f"https://e.com/{external_id}",
+                published_at=datetime(2024, 1, 1)
+            ))
+        test_db.commit()
+        ids = [a.id for a in test_db.query(Article).all()]
+
+        assert ner.process_articles(ids + [99999], test_db) == 4
+        assert len(ner.nlp.pipe_calls) == 1
+        assert len(ner.nlp.pipe_calls[0][0]) == 2
+
+
 class TestStats:
     def test_entity_stats_empty(self, ner, test_db):
         stats = ner.get_entity_stats(test_db)
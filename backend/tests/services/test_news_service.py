@@ -1,11 +1,15 @@
 """
 Tests for the News API service (`app/services/news_service.py`).
 
-The pure transform/parse helpers are exercised directly. The network `fetch`
-path is not called (no HTTP is made in these tests).
+The pure transform/parse helpers are exercised directly. The HTTP path only
+ever talks to a local aiohttp test server; no external network is used.
 """
+import threading
 from datetime import datetime
 
+import pytest_asyncio
+
+from app.core.fingerprint import stable_id
 from app.services.news_service import NewsAPIService
 
 
@@ -13,6 +17,14 @@ def _service():
     return NewsAPIService(api_key="test-key")
 
 
+def _paced(svc, fetch_page):
+    """Wrap a canned ``_fetch_page`` so it takes a rate-limit slot like the real one"""
+    async def paced(endpoint, params):
+        await svc.throttle()
+        return await fetch_page(endpoint, params)
+    return paced
+
+
 RAW_ARTICLE = {
     "source": {"id": "bbc-news", "name": "BBC News"},
     "author": "Jane Doe",
@@ -68,6 +80,176 @@ class TestGenerateId:
         other = {**RAW_ARTICLE, "url": "https://news.example.com/other"}
         assert svc._generate_id(RAW_ARTICLE) != svc._generate_id(other)
 
+    def test_id_is_stable_across_processes(self):
+        # A fixed digest, unlike the per-process salted hash() it replaces
+        article = {**RAW_ARTICLE, "url": "https://news.example.com/story"}
+        assert _service()._generate_id(article) == stable_id("url", "news.example.com/story")
+        assert len(_service()._generate_id(article)) == 32
+
+    def test_url_variants_share_an_id(self):
+        svc = _service()
+        base = {**RAW_ARTICLE, "url": "https://news.example.com/story?id=7&page=2"}
+        variant = {
+            **RAW_ARTICLE,
+            "url": "http://WWW.news.example.com:80/story/?page=2&utm_source=feed&id=7#comments",
+        }
+        assert svc._generate_id(base) == svc._generate_id(variant)
+
+    def test_falls_back_to_title_and_source(self):
+        svc = _service()
+        article = {**RAW_ARTICLE, "url": None}
+        assert svc._generate_id(article) == svc._generate_id({**article, "title": article["title"].upper()})
+        assert svc._generate_id(article) != svc._generate_id({**article, "source": {"name": "Other"}})
+
+
+class TestWatermarks:
+    def _raw(self, path, published_at):
+        return {**RAW_ARTICLE, "url": f"https://news.example.com/{path}", "publishedAt": published_at}
+
+    def test_drops_known_articles_and_advances_the_mark(self):
+        from app.services.watermark_service import HighWaterMark
+
+        svc = _service()
+        seen = self._raw("seen", "2026-01-15T10:30:00Z")
+        svc.watermarks["everything:hasbro"] = HighWaterMark(
+            datetime(2026, 1, 15, 10, 30), [svc._generate_id(seen)]
+        )
+        fresh = svc._after_watermark(
+            "everything:hasbro",
+            [
+                self._raw("new", "2026-01-15T11:00:00Z"),
+                seen,
+                self._raw("old", "2026-01-14T08:00:00Z"),
+                self._raw("newer-but-unsorted", "2026-01-15T11:30:00Z"),
+            ],
+            newest_first=True
+        )
+
+        assert [a["url"] for a in fresh] == ["https://news.example.com/new"]
+        assert svc.watermarks["everything:hasbro"].last_seen_at == datetime(2026, 1, 15, 11, 0)
+
+    def test_first_fetch_keeps_everything(self):
+        svc = _service()
+        raw = [self._raw("a", "2026-01-15T10:30:00Z"), self._raw("b", "2026-01-15T09:30:00Z")]
+        assert svc._after_watermark("top-headlines::", raw, newest_first=False) == raw
+        assert svc.watermarks["top-headlines::"].last_seen_at == datetime(2026, 1, 15, 10, 30)
+
+
+class TestPagination:
+    def _paged(self, svc, pages, total, limit_after=None):
+        """Replace the HTTP call with canned pages"""
+        from app.services.news_service import ResultLimitReached
+
+        requested = []
+
+        async def fake_fetch_page(endpoint, params):
+            requested.append(params["page"])
+            if limit_after is not None and params["page"] > limit_after:
+                raise ResultLimitReached("Developer accounts are limited to 100 results")
+            return pages[params["page"] - 1], total
+
+        svc._fetch_page = fake_fetch_page
+        return requested
+
+    def _raw_page(self, page, count):
+        return [
+            {**RAW_ARTICLE, "url": f"https://news.example.com/{page}-{i}"} for i in range(count)
+        ]
+
+    async def test_pages_until_total_results(self):
+        svc = _service()
+        requested = self._paged(svc, [self._raw_page(1, 2), self._raw_page(2, 2), self._raw_page(3, 1)], total=5)
+        pages = [page async for page in svc.fetch_pages(query="hasbro", page_size=2, endpoint="everything")]
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert requested == [1, 2, 3]
+
+    async def test_stops_at_the_plan_result_limit(self):
+        svc = _service()
+        requested = self._paged(svc, [self._raw_page(1, 2)] * 3, total=500, limit_after=1)
+        pages = [page async for page in svc.fetch_pages(query="hasbro", page_size=2, endpoint="everything")]
+        assert len(pages) == 1
+        assert requested == [1, 2]
+
+    async def test_stream_articles_transforms_within_budget(self):
+        svc = _service()
+        self._paged(svc, [self._raw_page(1, 2), self._raw_page(2, 2), self._raw_page(3, 2)], total=6)
+        pages = [page async for page in svc.stream_articles(query="hasbro", page_size=2, max_items=3)]
+        assert [len(page) for page in pages] == [2, 1]
+        assert pages[0][0]["source_type"] == "news"
+
+    async def test_requests_are_spaced_by_the_rate_limit(self):
+        import time
+
+        svc = NewsAPIService(api_key="test-key", rate_limit=1200)  # one request per 50ms
+        start = time.monotonic()
+        for _ in range(3):
+            await svc.throttle()
+        assert time.monotonic() - start >= 0.1
+
+    async def test_every_page_is_paced(self):
+        svc = NewsAPIService(api_key="test-key", rate_limit=6000)
+        self._paged(svc, [self._raw_page(1, 2), self._raw_page(2, 2), self._raw_page(3, 1)], total=5)
+        svc._fetch_page = _paced(svc, svc._fetch_page)
+        [page async for page in svc.stream_articles(query="hasbro", page_size=2)]
+        # One slot per page; fetch itself isn't charged again
+        assert svc.rate_limiter.get_stats()["acquired"] == 3
+
+
+@pytest_asyncio.fixture
+async def local_newsapi(monkeypatch):
+    """A NewsAPIService talking to a local /everything with two one-article pages"""
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+    import app.services.base_source as base_mod
+    from app.core.http import HTTPSessionManager
+
+    async def everything(request):
+        return web.json_response(
+            {"status": "ok", "totalResults": 2, "articles": [{**RAW_ARTICLE, "url": request.query["page"]}]}
+        )
+
+    app = web.Application()
+    app.router.add_get("/everything", everything)
+    server = TestServer(app)
+    await server.start_server()
+    manager = HTTPSessionManager()
+    monkeypatch.setattr(base_mod, "http_session_manager", manager)
+    svc = NewsAPIService(api_key="test-key", rate_limit=0)
+    svc.BASE_URL = str(server.make_url("")).rstrip("/")
+    try:
+        yield svc, manager
+    finally:
+        await manager.close()
+        await server.close()
+
+
+class TestSharedSession:
+    async def test_pages_reuse_one_pooled_connection(self, local_newsapi):
+        svc, manager = local_newsapi
+        pages = [page async for page in svc.fetch_pages(query="hasbro", page_size=1, endpoint="everything")]
+
+        assert [page[0]["url"] for page in pages] == ["1", "2"]
+        assert manager.get_stats()["sources"]["news"] == {
+            "requests": 2, "connections_created": 1, "connections_reused": 1
+        }
+
+
+class TestPayloadArchiving:
+    async def test_archive_writes_run_off_the_event_loop(self, local_newsapi, monkeypatch):
+        import app.services.news_service as news_mod
+
+        svc, _ = local_newsapi
+        writes = []
+        monkeypatch.setattr(
+            news_mod.payload_archive, "write",
+            lambda source, payloads, listing=None: writes.append((threading.get_ident(), source, len(payloads)))
+        )
+        [page async for page in svc.fetch_pages(query="hasbro", page_size=1, endpoint="everything")]
+
+        assert [(source, count) for _, source, count in writes] == [("news", 1), ("news", 1)]
+        assert threading.get_ident() not in {thread for thread, _, _ in writes}
+
 
 class TestValidateInheritedFromBase:
     def test_transformed_article_is_valid(self):
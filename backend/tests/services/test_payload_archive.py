@@ -0,0 +1,191 @@
+"""
+Tests for the raw payload archive and offline replay (`app/services/payload_archive.py`).
+
+The archive is pointed at a temporary directory; replays run the Reddit and
+news pipelines against the in-memory test database while the live clients are
+patched to fail, proving no network access is needed.
+"""
+import gzip
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+import app.api.articles as articles_mod
+import app.api.pipeline as pipeline_mod
+import app.services.ingestion_service as ingestion_mod
+import app.services.payload_archive as archive_mod
+from app.models.article import Article
+from app.models.pipeline_run import PipelineRun
+from app.models.reddit_post import RedditPost
+from app.services.payload_archive import PayloadArchive, load_payloads
+from app.services.reddit_service import RedditService, post_from_payload, submission_payload
+
+
+@pytest.fixture
+def archive_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive_mod.settings, "PAYLOAD_ARCHIVE_ENABLED", True)
+    monkeypatch.setattr(archive_mod.settings, "PAYLOAD_ARCHIVE_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def offline(executor_sessions, monkeypatch):
+    monkeypatch.setattr(ingestion_mod.SentimentService, "analyze_text", lambda text: (0.2, "positive"))
+    monkeypatch.setattr(ingestion_mod.SentimentService, "analyze_reddit_post", lambda title, content: (0.2, "positive"))
+
+    class FakeNER:
+        def extract_and_save_entities_batch(self, texts_by_article, db):
+            return len(texts_by_article)
+
+    class FakeKeywords:
+        def extract_and_save_keywords_batch(self, texts_by_article, db):
+            return len(texts_by_article)
+
+    monkeypatch.setattr("app.services.ner_service.get_ner_service", lambda: FakeNER())
+    monkeypatch.setattr("app.services.keyword_service.get_keyword_service", lambda: FakeKeywords())
+
+    async def no_cache(pattern):
+        return {"refreshed": 0, "deleted": 0}
+
+    monkeypatch.setattr(pipeline_mod.cache_service, "arefresh_pattern", no_cache)
+
+
+def _submission(pid, created_utc=1788220800.0):
+    return SimpleNamespace(
+        id=pid, subreddit=SimpleNamespace(display_name="python"), title=f"post {pid}", author="someone",
+        selftext="body", url=f"https://reddit.com/{pid}", score=3, num_comments=1, upvote_ratio=0.9,
+        created_utc=created_utc, is_self=True, is_video=False, over_18=False
+    )
+
+
+def _news_payload(i):
+    return {
+        "source": {"id": None, "name": "Stub"},
+        "author": "reporter",
+        "title": f"Archived story {i}",
+        "description": "summary",
+        "url": f"https://example.com/story-{i}",
+        "urlToImage": None,
+        "publishedAt": "2026-09-01T12:00:00Z",
+        "content": "body",
+    }
+
+
+class TestPayloadArchive:
+    def test_round_trips_payloads_partitioned_by_source_and_day(self, archive_dir):
+        archive = PayloadArchive()
+        path = archive.write("news", [{"a": 1}, {"a": 2}], listing="everything:hasbro:1")
+
+        assert path.parent.parent == archive_dir / "news"
+        assert path.parent.name == datetime.utcnow().strftime("%Y-%m-%d")
+        with gzip.open(path, "rt") as f:
+            records = [json.loads(line) for line in f]
+        assert [r["listing"] for r in records] == ["everything:hasbro:1"] * 2
+        assert list(archive.read("news")) == [{"a": 1}, {"a": 2}]
+        assert archive.get_stats()["records_written"] == 2
+
+    def test_reads_only_the_requested_days(self, archive_dir):
+        for day in ("2026-09-01", "2026-09-02", "2026-09-03"):
+            partition = archive_dir / "news" / day
+            partition.mkdir(parents=True)
+            with gzip.open(partition / "000000000000-x.ndjson.gz", "wt") as f:
+                f.write(json.dumps({"payload": {"day": day}}) + "\n")
+
+        assert load_payloads("news", "2026-09-02") == [{"day": "2026-09-02"}, {"day": "2026-09-03"}]
+        assert load_payloads("news", "2026-09-01", "2026-09-01") == [{"day": "2026-09-01"}]
+        assert load_payloads("reddit") == []
+
+    def test_disabled_archive_writes_nothing(self, archive_dir, monkeypatch):
+        monkeypatch.setattr(archive_mod.settings, "PAYLOAD_ARCHIVE_ENABLED", False)
+        assert PayloadArchive().write("news", [{"a": 1}]) is None
+        assert not (archive_dir / "news").exists()
+
+    def test_write_errors_never_fail_the_fetch(self, archive_dir):
+        (archive_dir / "news").write_text("not a directory")
+        archive = PayloadArchive()
+        assert archive.write("news", [{"a": 1}]) is None
+        assert archive.get_stats()["write_errors"] == 1
+
+
+class TestRedditArchive:
+    def test_collect_archives_the_raw_submissions(self, archive_dir):
+        service = RedditService.__new__(RedditService)
+        service.watermarks = {}
+        posts = service._collect("r/python", [_submission("a"), _submission("b")], incremental=False)
+
+        payloads = load_payloads("reddit")
+        assert [p["id"] for p in payloads] == ["a", "b"]
+        assert [post_from_payload(p) for p in payloads] == posts
+
+    def test_payload_round_trips_to_the_same_post(self):
+        submission = _submission("a")
+        submission.author = None
+        post = post_from_payload(json.loads(json.dumps(submission_payload(submission))))
+        assert post.author == "[deleted]"
+        assert post.created_utc == datetime.fromtimestamp(submission.created_utc)
+
+
+class TestReplay:
+    async def test_reddit_pipeline_replays_without_reddit(self, archive_dir, offline, test_db, monkeypatch):
+        PayloadArchive().write("reddit", [submission_payload(_submission(pid)) for pid in "abc"])
+
+        def no_network(*args, **kwargs):
+            raise AssertionError("replay must not contact Reddit")
+
+        monkeypatch.setattr(pipeline_mod, "RedditService", no_network)
+        saved = []
+        monkeypatch.setattr(pipeline_mod, "save_source_watermarks", lambda *args: saved.append(args))
+        await pipeline_mod._execute_pipeline(trigger_type="manual", replay=True)
+
+        assert test_db.query(RedditPost).count() == 3
+        run = test_db.query(PipelineRun).filter_by(pipeline_name="reddit_pipeline").one()
+        assert run.status == "success"
+        assert run.records_stored == 3
+        assert saved == []
+
+    async def test_news_sync_replays_without_newsapi(self, archive_dir, offline, test_db, monkeypatch):
+        PayloadArchive().write("news", [_news_payload(i) for i in range(4)], listing="everything:hasbro:1")
+
+        async def no_network(self, *args, **kwargs):
+            raise AssertionError("replay must not contact NewsAPI")
+
+        monkeypatch.setattr(articles_mod.NewsAPIService, "fetch", no_network)
+        await articles_mod._sync_news_articles(query="hasbro", trigger_type="manual", replay=True)
+
+        assert test_db.query(Article).count() == 4
+        run = test_db.query(PipelineRun).filter_by(pipeline_name="news_pipeline").one()
+        assert run.status == "success"
+        assert run.records_stored == 4
+
+    async def test_reprocessing_replay_rescores_unchanged_items_in_place(
+        self, archive_dir, offline, test_db, monkeypatch
+    ):
+        PayloadArchive().write("reddit", [submission_payload(_submission(pid)) for pid in "ab"])
+        PayloadArchive().write("news", [_news_payload(i) for i in range(2)], listing="everything:hasbro:1")
+        monkeypatch.setattr(pipeline_mod, "save_source_watermarks", lambda *args: None)
+        await pipeline_mod._execute_pipeline(trigger_type="manual", replay=True)
+        await articles_mod._sync_news_articles(query="hasbro", trigger_type="manual", replay=True)
+
+        # A new sentiment model: a plain replay skips the unchanged items, reprocess doesn't
+        monkeypatch.setattr(ingestion_mod.SentimentService, "analyze_text", lambda text: (-0.5, "negative"))
+        monkeypatch.setattr(
+            ingestion_mod.SentimentService, "analyze_reddit_post", lambda title, content: (-0.5, "negative")
+        )
+        await pipeline_mod._execute_pipeline(trigger_type="manual", replay=True)
+        await articles_mod._sync_news_articles(query="hasbro", trigger_type="manual", replay=True)
+        test_db.expire_all()
+        assert {post.sentiment_label for post in test_db.query(RedditPost)} == {"positive"}
+        assert {article.sentiment_label for article in test_db.query(Article)} == {"positive"}
+
+        await pipeline_mod._execute_pipeline(trigger_type="manual", replay=True, reprocess=True)
+        await articles_mod._sync_news_articles(query="hasbro", trigger_type="manual", replay=True, reprocess=True)
+        test_db.expire_all()
+        assert test_db.query(RedditPost).count() == 2
+        assert test_db.query(Article).count() == 2
+        assert {post.sentiment_label for post in test_db.query(RedditPost)} == {"negative"}
+        assert {article.sentiment_label for article in test_db.query(Article)} == {"negative"}
+
+        runs = test_db.query(PipelineRun).filter_by(pipeline_name="news_pipeline").order_by(PipelineRun.id).all()
+        assert [run.enrichment_skipped for run in runs] == [0, 2, 0]
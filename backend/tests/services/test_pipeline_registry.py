@@ -0,0 +1,214 @@
+"""
+Tests for the pipeline registry and DAG executor (`app/services/pipeline_registry.py`).
+
+Stages are small async functions, so ordering, parallelism, retries and the
+recorded PipelineRun are checked without touching any data source.
+"""
+import asyncio
+import json
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+import app.db as appdb
+import app.services.pipeline_registry as registry_mod
+from app.models.pipeline_run import PipelineRun
+from app.services.pipeline_registry import (
+    Pipeline,
+    PipelineContext,
+    PipelineError,
+    Stage,
+    get_pipeline,
+    register_pipeline,
+    run_pipeline
+)
+
+
+@pytest.fixture(autouse=True)
+def _fast_retries(monkeypatch):
+    monkeypatch.setattr(registry_mod.settings, "PIPELINE_STAGE_RETRY_BACKOFF_SECONDS", 0)
+
+
+@pytest.fixture
+def use_test_db(test_engine, monkeypatch):
+    """Point PipelineRun bookkeeping at the in-memory test engine."""
+    monkeypatch.setattr(appdb, "get_session_local", lambda: sessionmaker(bind=test_engine))
+
+
+@pytest.fixture
+def registered(monkeypatch):
+    """Register pipelines for one test only."""
+    monkeypatch.setattr(registry_mod, "_pipelines", dict(registry_mod._pipelines))
+    return register_pipeline
+
+
+def _context(**params):
+    return PipelineContext(run_id=None, trigger_type="manual", params=params)
+
+
+def _stage(name, calls, depends_on=(), result=None, fail_times=0, delay=0.0, retries=None):
+    """Stage that records its calls and fails its first ``fail_times`` attempts"""
+    async def run(context):
+        calls.append(name)
+        await asyncio.sleep(delay)
+        if calls.count(name) <= fail_times:
+            raise RuntimeError(f"{name} failed")
+        return result if result is not None else name
+    return Stage(name, run, depends_on=depends_on, retries=retries)
+
+
+class TestPipelineDefinition:
+    def test_orders_stages_after_their_dependencies(self):
+        calls = []
+        pipeline = Pipeline("p", [
+            _stage("cache", calls, depends_on=("ner", "keywords")),
+            _stage("ner", calls, depends_on=("fetch",)),
+            _stage("fetch", calls),
+            _stage("keywords", calls, depends_on=("fetch",)),
+        ])
+        order = pipeline.order
+        assert order[0] == "fetch"
+        assert order[-1] == "cache"
+
+    def test_rejects_cycles_and_unknown_dependencies(self):
+        calls = []
+        with pytest.raises(PipelineError, match="cycle"):
+            Pipeline("p", [_stage("a", calls, depends_on=("b",)), _stage("b", calls, depends_on=("a",))])
+        with pytest.raises(PipelineError, match="unknown"):
+            Pipeline("p", [_stage("a", calls, depends_on=("missing",))])
+
+    def test_unknown_pipeline_name(self):
+        with pytest.raises(PipelineError, match="no_such_pipeline"):
+            registry_mod.get_pipeline("no_such_pipeline")
+
+
+class TestPipelineExecution:
+    async def test_independent_branches_run_in_parallel(self):
+        calls = []
+        pipeline = Pipeline("p", [
+            _stage("fetch", calls),
+            _stage("ner", calls, depends_on=("fetch",), delay=0.1),
+            _stage("keywords", calls, depends_on=("fetch",), delay=0.1),
+            _stage("cache", calls, depends_on=("ner", "keywords")),
+        ])
+        metrics, errors = await pipeline.execute(_context())
+
+        assert errors == []
+        assert calls[0] == "fetch" and calls[-1] == "cache"
+        # Both branches started before either finished
+        ner, keywords = metrics["ner"], metrics["keywords"]
+        assert abs(ner["started_offset_seconds"] - keywords["started_offset_seconds"]) < 0.05
+        assert metrics["cache"]["started_offset_seconds"] < 0.2 + 0.05
+        assert all(m["duration_seconds"] >= 0 for m in metrics.values())
+
+    async def test_failed_stage_is_retried_without_rerunning_upstream(self):
+        calls = []
+        pipeline = Pipeline("p", [
+            _stage("fetch", calls, result=[1, 2, 3]),
+            _stage("persist", calls, depends_on=("fetch",), fail_times=2),
+        ])
+        context = _context()
+        metrics, errors = await pipeline.execute(context)
+
+        assert errors == []
+        assert calls == ["fetch", "persist", "persist", "persist"]
+        assert metrics["persist"]["attempts"] == 3
+        assert metrics["fetch"]["attempts"] == 1
+        assert context.results["fetch"] == [1, 2, 3]
+
+    async def test_dependents_of_a_failed_stage_are_skipped(self):
+        calls = []
+        pipeline = Pipeline("p", [
+            _stage("fetch", calls),
+            _stage("ner", calls, depends_on=("fetch",), fail_times=9, retries=1),
+            _stage("keywords", calls, depends_on=("fetch",)),
+            _stage("cache", calls, depends_on=("ner", "keywords")),
+        ])
+        metrics, errors = await pipeline.execute(_context())
+
+        assert [str(e) for e in errors] == ["ner failed"]
+        assert metrics["ner"]["status"] == "failed"
+        assert metrics["ner"]["attempts"] == 2
+        assert metrics["keywords"]["status"] == "success"
+        assert metrics["cache"]["status"] == "skipped"
+        assert "cache" not in calls
+
+    async def test_stage_details_are_attached_to_its_metrics(self):
+        async def ingest(context):
+            context.stage_details["ingest"] = {"fetch": {"items_in": 2}}
+
+        metrics, _ = await Pipeline("p", [Stage("ingest", ingest)]).execute(_context())
+        assert metrics["ingest"]["details"] == {"fetch": {"items_in": 2}}
+
+
+class TestRunPipeline:
+    async def test_records_status_counts_and_stage_timings(self, use_test_db, test_db, registered):
+        async def fetch(context):
+            context.add_counts({"stored": 2})
+            return context.params["limit"]
+
+        async def flaky(context, attempts=[]):
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("transient")
+            context.add_counts({"updated": 1})
+
+        registered(Pipeline("test_pipeline", [
+            Stage("fetch", fetch),
+            Stage("persist", flaky, depends_on=("fetch",)),
+        ]))
+        result = await run_pipeline("test_pipeline", trigger_type="manual", limit=5)
+
+        assert result["status"] == "success"
+        assert result["counts"] == {"stored": 2, "updated": 1}
+        run = test_db.query(PipelineRun).filter_by(run_id=result["run_id"]).one()
+        assert run.status == "success"
+        assert run.records_stored == 2
+        assert run.retry_count == 1
+        stages = json.loads(run.stage_metrics)
+        assert stages["persist"]["attempts"] == 2
+        assert "duration_seconds" in stages["fetch"]
+
+    async def test_partial_run_when_a_branch_fails(self, use_test_db, test_db, registered):
+        calls = []
+        registered(Pipeline("test_pipeline", [
+            _stage("fetch", calls),
+            _stage("ner", calls, depends_on=("fetch",), fail_times=9, retries=0),
+        ]))
+        result = await run_pipeline("test_pipeline", trigger_type="manual")
+
+        assert result["status"] == "partial"
+        run = test_db.query(PipelineRun).filter_by(run_id=result["run_id"]).one()
+        assert run.status == "partial"
+        assert json.loads(run.stage_metrics)["ner"]["error"] == "ner failed"
+
+    async def test_failed_run_reraises(self, use_test_db, test_db, registered):
+        calls = []
+        registered(Pipeline("test_pipeline", [_stage("fetch", calls, fail_times=9, retries=0)]))
+
+        with pytest.raises(RuntimeError, match="fetch failed"):
+            await run_pipeline("test_pipeline", trigger_type="manual")
+
+        run = test_db.query(PipelineRun).filter_by(pipeline_name="test_pipeline").one()
+        assert run.status == "failed"
+        assert json.loads(run.stage_metrics)["fetch"]["status"] == "failed"
+
+
+class TestNewsPipeline:
+    def test_cache_is_refreshed_after_enrichment(self):
+        pipeline = get_pipeline("news_pipeline")
+        assert set(pipeline.stages["cache_refresh"].depends_on) == {"ner", "keywords"}
+        order = pipeline.order
+        assert order.index("cache_refresh") > max(order.index("ner"), order.index("keywords"))
+
+    async def test_cache_refresh_stage_refreshes_article_prefixes(self, monkeypatch):
+        from app.api import articles
+        patterns = []
+
+        async def refresh(pattern):
+            patterns.append(pattern)
+            return {"refreshed": 0, "deleted": 0}
+
+        monkeypatch.setattr(articles.cache_service, "arefresh_pattern", refresh)
+        await get_pipeline("news_pipeline").stages["cache_refresh"].run(_context())
+        assert patterns == ["cache:articles_*", "cache:news_*"]
@@ -4,7 +4,14 @@ Test Reddit Service
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime
-from app.services.reddit_service import RedditService
+from app.services.reddit_service import RedditService, shutdown_fetch_executor
+
+
+@pytest.fixture(autouse=True)
+def fresh_fetch_threads():
+    # Fetch threads keep their clients, which would otherwise be another test's mock
+    yield
+    shutdown_fetch_executor()
 
 
 class TestRedditService:
@@ -263,3 +270,166 @@ class TestRedditService:
 
         # Should have at least some posts from successful subreddits
         assert isinstance(posts, list)
+
+
+class TestConcurrentFetch:
+    """Tests for the bounded, concurrent listing fetch"""
+
+    def _post(self, pid):
+        from app.schemas.reddit import RedditPostCreate
+        return RedditPostCreate(id=pid, subreddit="Python", title=pid, created_utc=datetime.utcnow())
+
+    @patch('app.services.reddit_service.praw.Reddit')
+    def test_in_flight_listings_are_bounded(self, mock_reddit_class, monkeypatch):
+        import threading
+        import time
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "REDDIT_FETCH_CONCURRENCY", 2)
+        service = RedditService()
+        service.subreddits = ["a", "b", "c", "d", "e"]
+
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+
+        def fake_fetch(name, limit=100, time_filter="day"):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+            return [self._post(name)]
+
+        monkeypatch.setattr(service, "fetch_posts", fake_fetch)
+        posts = service.fetch_posts_from_all_subreddits(limit_per_subreddit=5)
+
+        # Results keep the configured subreddit order regardless of completion order
+        assert [p.id for p in posts] == ["a", "b", "c", "d", "e"]
+        assert peak == 2
+
+    @patch('app.services.reddit_service.praw.Reddit')
+    def test_records_per_listing_metrics(self, mock_reddit_class, monkeypatch):
+        service = RedditService()
+        service.search_queries = ["hasbro", "broken"]
+
+        def fake_search(query, limit=100, time_filter="day"):
+            if query == "broken":
+                raise Exception("search failed")
+            return [self._post("p1"), self._post("p2")]
+
+        monkeypatch.setattr(service, "search_posts", fake_search)
+        posts = service.fetch_posts_from_all_search_queries()
+
+        assert len(posts) == 2
+        assert service.source_metrics["search:hasbro"]["status"] == "success"
+        assert service.source_metrics["search:hasbro"]["posts"] == 2
+        assert service.source_metrics["search:broken"]["status"] == "failed"
+        assert "duration_ms" in service.source_metrics["search:broken"]
+
+    @patch('app.services.reddit_service.praw.Reddit')
+    def test_worker_threads_get_their_own_client(self, mock_reddit_class):
+        import threading
+
+        service = RedditService()
+        main_client = service._client()
+
+        other = {}
+        thread = threading.Thread(target=lambda: other.setdefault("client", service._client()))
+        thread.start()
+        thread.join()
+
+        assert main_client is service.reddit
+        assert mock_reddit_class.call_count == 2
+
+    @patch('app.services.reddit_service.praw.Reddit')
+    def test_fetch_threads_and_clients_outlive_a_run(self, mock_reddit_class, monkeypatch):
+        import threading
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "REDDIT_FETCH_CONCURRENCY", 2)
+        threads = set()
+        mock_reddit_class.return_value.subreddit.return_value.top.side_effect = (
+            lambda **kwargs: threads.add(threading.current_thread().name) or []
+        )
+
+        first = RedditService()
+        first.subreddits = ["a", "b", "c", "d"]
+        first.fetch_posts_from_all_subreddits()
+        clients_after_first_run = mock_reddit_class.call_count
+
+        second = RedditService()
+        second.subreddits = ["a", "b", "c", "d"]
+        second.fetch_posts_from_all_subreddits()
+
+        assert len(threads) <= 2
+        # Only the second service's own client is new; the fetch threads reuse theirs
+        assert mock_reddit_class.call_count == clients_after_first_run + 1
+
+
+class TestIncrementalFetch:
+    """Listings with a high-water mark read ``new`` and stop at known posts"""
+
+    def _submission(self, pid, created):
+        submission = Mock()
+        submission.id = pid
+        submission.title = f"title {pid}"
+        submission.author = None
+        submission.subreddit.display_name = "python"
+        submission.selftext = ""
+        submission.url = f"https://reddit.com/{pid}"
+        submission.score = 1
+        submission.num_comments = 0
+        submission.upvote_ratio = 1.0
+        submission.created_utc = created.timestamp()
+        submission.is_self = True
+        submission.is_video = False
+        submission.over_18 = False
+        return submission
+
+    @patch('app.services.reddit_service.praw.Reddit')
+    def test_first_fetch_uses_top_and_records_a_mark(self, mock_reddit_class):
+        newest = datetime(2026, 1, 1, 12, 0)
+        mock_subreddit = mock_reddit_class.return_value.subreddit.return_value
+        mock_subreddit.top.return_value = [self._submission("a", newest)]
+
+        service = RedditService()
+        service.fetch_posts("python")
+
+        mock_subreddit.new.assert_not_called()
+        assert service.watermarks["r/python"].last_seen_at == newest
+
+    @patch('app.services.reddit_service.praw.Reddit')
+    def test_stops_at_posts_older_than_the_mark(self, mock_reddit_class):
+        from datetime import timedelta
+        from app.services.watermark_service import HighWaterMark
+
+        mark_time = datetime(2026, 1, 1, 12, 0)
+        consumed = []
+
+        def listing(limit=None):
+            for pid, created in [
+                ("fresh", mark_time + timedelta(minutes=5)),
+                ("seen", mark_time),
+                ("late", mark_time - timedelta(minutes=10)),
+                ("old", mark_time - timedelta(days=1)),
+                ("older", mark_time - timedelta(days=2)),
+            ]:
+                consumed.append(pid)
+                yield self._submission(pid, created)
+
+        mock_subreddit = mock_reddit_class.return_value.subreddit.return_value
+        mock_subreddit.new.side_effect = listing
+
+        service = RedditService()
+        service.watermarks["r/python"] = HighWaterMark(mark_time, ["seen"])
+        posts = service.fetch_posts("python")
+
+        # "seen" is skipped, the late-indexed post in the overlap is kept
+        assert [post.id for post in posts] == ["fresh", "late"]
+        # Pagination stops at the first post below the overlap window
+        assert consumed == ["fresh", "seen", "late", "old"]
+        mock_subreddit.top.assert_not_called()
+        assert service.watermarks["r/python"].last_seen_at == mark_time + timedelta(minutes=5)
@@ -3,10 +3,19 @@ Tests for the scheduler service (`app/services/scheduler_service.py`).
 
 The AsyncIOScheduler is started inside the test event loop (as it is in
 production via the app lifespan) so jobs get a real `next_run_time`. Jobs use a
-60s interval, so nothing actually fires during a test.
+60s interval, so nothing actually fires during a test. Most tests use an
+in-memory job store; the persistence tests use a SQLite file per test and an
+in-memory stand-in for the scheduler leader lock.
 """
+import asyncio
+from datetime import datetime, timedelta, timezone
+
 import pytest
 import pytest_asyncio
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.schedulers.base import STATE_PAUSED, STATE_RUNNING
+from sqlalchemy import create_engine
 
 from app.services.scheduler_service import SchedulerService
 
@@ -17,7 +26,7 @@ def _noop():
 
 @pytest_asyncio.fixture
 async def scheduler():
-    svc = SchedulerService()
+    svc = SchedulerService(jobstore=MemoryJobStore())
     svc.start()
     yield svc
     if svc.scheduler.running:
@@ -73,3 +82,196 @@ class TestStatus:
 
     async def test_is_running(self, scheduler):
         assert scheduler.is_running() is True
+
+
+class TestJobLocking:
+    async def test_jobs_run_through_the_job_lock(self, scheduler, monkeypatch):
+        import app.services.scheduler_service as scheduler_mod
+
+        calls = []
+
+        class FakeLock:
+            async def run(self, job_id, func, *args, hold_seconds=0, **kwargs):
+                calls.append((job_id, func, args, kwargs))
+                return True
+
+        monkeypatch.setattr(scheduler_mod, "job_lock", FakeLock())
+        scheduler.add_job(_noop, "locked", "interval", args=(1,), kwargs={"x": 2}, seconds=60)
+
+        job = scheduler.scheduler.get_job("locked")
+        assert job.name == "_noop"
+        await job.func(*job.args, **job.kwargs)
+        assert calls == [("locked", _noop, (1,), {"x": 2})]
+
+    async def test_status_reports_lock_holders(self, scheduler, monkeypatch):
+        import app.services.scheduler_service as scheduler_mod
+
+        async def holders(job_ids):
+            return {"a": scheduler_mod.job_lock.worker_id, "b": "other-host:42"}
+
+        monkeypatch.setattr(scheduler_mod.job_lock, "get_holders", holders)
+        scheduler.add_job(_noop, "a", "interval", seconds=60)
+        scheduler.add_job(_noop, "b", "interval", seconds=60)
+
+        status = await scheduler.get_status_with_locks()
+        locks = {job["id"]: job["lock"] for job in status["jobs"]}
+        assert locks == {
+            "a": {"holder": scheduler_mod.job_lock.worker_id, "held_by_this_worker": True},
+            "b": {"holder": "other-host:42", "held_by_this_worker": False},
+        }
+        assert status["lock"]["worker_id"] == scheduler_mod.job_lock.worker_id
+
+
+class FakeLeaderLock:
+    """One lock shared by every SchedulerService in the test"""
+
+    enabled = True
+    worker_id = "worker-a"
+
+    def __init__(self):
+        self.held = False
+
+    async def acquire(self, job_id):
+        if self.held:
+            return False
+        self.held = True
+        return True
+
+    async def renew(self, job_id):
+        return self.held
+
+    async def release(self, job_id, hold_seconds=0):
+        self.held = False
+
+    def get_info(self):
+        return {}
+
+
+class TestPersistentJobStore:
+    @pytest.fixture
+    def db_url(self, tmp_path):
+        return f"sqlite:///{tmp_path / 'jobs.db'}"
+
+    @pytest.fixture(autouse=True)
+    def leader_lock(self, monkeypatch):
+        import app.services.scheduler_service as scheduler_mod
+
+        lock = FakeLeaderLock()
+        monkeypatch.setattr(scheduler_mod, "job_lock", lock)
+        monkeypatch.setattr(scheduler_mod.settings, "SCHEDULER_LOCK_TTL_SECONDS", 0.03)
+        return lock
+
+    def _service(self, db_url):
+        return SchedulerService(jobstore=SQLAlchemyJobStore(engine=create_engine(db_url)))
+
+    async def _restart(self, svc, db_url):
+        svc.shutdown(wait=False)
+        await asyncio.sleep(0)  # Let the leader lock go
+        restarted = self._service(db_url)
+        restarted.start()
+        return restarted
+
+    async def test_only_the_leader_processes_the_store(self, db_url, leader_lock):
+        a, b = self._service(db_url), self._service(db_url)
+        a.start()
+        await asyncio.sleep(0.02)
+        b.start()
+        await asyncio.sleep(0.02)
+        try:
+            assert (a.is_leader, b.is_leader) == (True, False)
+            assert (a.scheduler.state, b.scheduler.state) == (STATE_RUNNING, STATE_PAUSED)
+            assert b.get_status()["leader"] is False
+
+            # A follower still manages the stored jobs
+            b.add_job(_noop, "api-job", "interval", hours=6)
+            assert a.get_job("api-job") is not None
+
+            # The follower takes over once the leader goes away
+            a.shutdown(wait=False)
+            await asyncio.sleep(0.05)
+            assert b.is_leader
+            assert b.scheduler.state == STATE_RUNNING
+        finally:
+            a.shutdown(wait=False)
+            b.shutdown(wait=False)
+
+    async def test_leader_steps_down_when_it_loses_the_lock(self, db_url, leader_lock):
+        svc = self._service(db_url)
+        svc.start()
+        await asyncio.sleep(0.02)
+        try:
+            assert svc.is_leader
+
+            # Expired (e.g. Redis was unreachable) and another worker took it
+            async def taken(job_id):
+                return False
+
+            leader_lock.renew = leader_lock.acquire = taken
+            await asyncio.sleep(0.03)
+            assert not svc.is_leader
+            assert svc.scheduler.state == STATE_PAUSED
+        finally:
+            svc.shutdown(wait=False)
+
+    async def test_jobs_survive_a_restart(self, db_url):
+        svc = self._service(db_url)
+        svc.start()
+        svc.add_job(_noop, "api-job", "interval", kwargs={"x": 1}, hours=6)
+
+        restarted = await self._restart(svc, db_url)
+        try:
+            info = restarted.get_job("api-job")
+            assert info["name"] == "_noop"
+            assert info["metadata"]["function"] == "_noop"
+            assert info["metadata"]["function_kwargs"] == {"x": 1}
+        finally:
+            restarted.shutdown(wait=False)
+
+    async def test_re_adding_an_unchanged_job_keeps_its_next_run(self, db_url):
+        svc = self._service(db_url)
+        svc.start()
+        svc.add_job(_noop, "reddit", "interval", hours=6)
+        due = datetime.now(timezone.utc) + timedelta(minutes=5)
+        svc.scheduler.modify_job("reddit", next_run_time=due)
+
+        restarted = await self._restart(svc, db_url)
+        try:
+            restarted.add_job(_noop, "reddit", "interval", hours=6)
+            assert restarted.scheduler.get_job("reddit").next_run_time == due
+
+            # A changed schedule replaces the stored job
+            restarted.add_job(_noop, "reddit", "interval", hours=12)
+            assert restarted.scheduler.get_job("reddit").next_run_time > due
+        finally:
+            restarted.shutdown(wait=False)
+
+    async def test_missed_runs_catch_up_once_and_staggered(self, db_url, monkeypatch):
+        import app.services.scheduler_service as scheduler_mod
+
+        monkeypatch.setattr(scheduler_mod.settings, "SCHEDULER_CATCHUP_SPACING_SECONDS", 30)
+        svc = self._service(db_url)
+        svc.start()
+        svc.add_job(_noop, "a", "interval", hours=6)
+        svc.add_job(_noop, "b", "interval", hours=6)
+        svc.add_job(_noop, "stale", "interval", hours=6)
+        svc.scheduler.pause()  # Don't let this instance run them
+        now = datetime.now(timezone.utc)
+        # Down for a day: several runs of a and b were missed
+        svc.scheduler.modify_job("a", next_run_time=now - timedelta(hours=20))
+        svc.scheduler.modify_job("b", next_run_time=now - timedelta(hours=19))
+        svc.scheduler.modify_job("stale", next_run_time=now - timedelta(days=3), misfire_grace_time=3600)
+        svc.shutdown(wait=False)
+
+        restarted = self._service(db_url)
+        restarted.scheduler.start(paused=True)
+        try:
+            assert restarted._stagger_missed_runs() == 2
+            a = restarted.scheduler.get_job("a")
+            b = restarted.scheduler.get_job("b")
+            assert a.coalesce is True
+            assert abs((a.next_run_time - now).total_seconds()) < 5
+            assert (b.next_run_time - a.next_run_time).total_seconds() == pytest.approx(30, abs=1)
+            # Past its grace time: left for the scheduler to skip to the next run
+            assert restarted.scheduler.get_job("stale").next_run_time < now
+        finally:
+            restarted.scheduler.shutdown(wait=False)
@@ -0,0 +1,44 @@
+"""Tests for per-source high-water marks (`app/services/watermark_service.py`)."""
+from datetime import datetime, timedelta, timezone
+
+from app.services.watermark_service import HighWaterMark, load_watermarks, save_watermarks
+
+NOON = datetime(2026, 1, 1, 12, 0)
+
+
+class TestHighWaterMark:
+    def test_empty_mark_knows_nothing(self):
+        mark = HighWaterMark()
+        assert mark.cutoff is None
+        assert not mark.is_known("a", NOON - timedelta(days=365))
+
+    def test_overlap_window(self):
+        mark = HighWaterMark(NOON, ["a"])
+        assert mark.is_known("a", NOON)
+        assert not mark.is_known("b", NOON - timedelta(minutes=30))
+        assert mark.is_past(NOON - timedelta(hours=2))
+
+    def test_advance_keeps_ids_inside_the_overlap(self):
+        mark = HighWaterMark(NOON, ["a"]).advance([
+            ("b", NOON + timedelta(minutes=30)),
+            ("c", NOON - timedelta(hours=5)),
+        ])
+        assert mark.last_seen_at == NOON + timedelta(minutes=30)
+        assert mark.last_seen_ids == ["a", "b"]
+
+    def test_advance_normalizes_aware_timestamps(self):
+        mark = HighWaterMark().advance([("a", datetime(2026, 1, 1, 13, 0, tzinfo=timezone(timedelta(hours=1))))])
+        assert mark.last_seen_at == NOON
+
+    def test_advance_without_items_keeps_the_mark(self):
+        assert HighWaterMark(NOON, ["a"]).advance([]) == HighWaterMark(NOON, ["a"])
+
+
+class TestPersistence:
+    def test_round_trip_and_update(self, test_db):
+        save_watermarks(test_db, "reddit", {"r/python": HighWaterMark(NOON, ["a"]), "r/empty": HighWaterMark()})
+        save_watermarks(test_db, "reddit", {"r/python": HighWaterMark(NOON + timedelta(hours=1), ["b"])})
+
+        marks = load_watermarks(test_db, "reddit")
+        assert marks == {"r/python": HighWaterMark(NOON + timedelta(hours=1), ["b"])}
+        assert load_watermarks(test_db, "news") == {}
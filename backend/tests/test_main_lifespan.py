@@ -26,6 +26,12 @@ def test_lifespan_runs_startup_and_shutdown(monkeypatch):
         assert health.status_code == 200
         assert health.json()["status"] == "healthy"
 
+        from app.core.http import http_session_manager
+        assert http_session_manager.get_stats()["active"] is True
+
+    # Shutdown closes the pooled connections
+    assert http_session_manager.get_stats()["active"] is False
+
 
 def test_root_and_health_endpoints():
     # Without entering the lifespan context (no startup side effects).